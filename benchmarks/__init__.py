@@ -0,0 +1 @@
+"""Benchmarks for the NerdQAxe+ integration."""
@@ -0,0 +1,97 @@
+"""Benchmark the ``/api/system/info`` decode path.
+
+Compares the previous path (``response.json()``: decode the body to ``str``,
+parse it with the standard library and keep the whole dict) with
+``decode_payload`` (orjson straight from the bytes, projected down to
+``SNAPSHOT_KEYS``) and with the full coordinator path, which also parses the
+projection into the ``MinerSnapshot`` kept as ``coordinator.data``, and
+with the telemetry tier, which leaves the configuration fields out and
+merges the rest into the previous snapshot. Reports the decode time per poll
+and the memory retained per miner.
+
+Run from the repository root with the development dependencies installed::
+
+    python -m benchmarks.decode
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+from timeit import Timer
+import tracemalloc
+from typing import Any
+
+from custom_components.nerdqaxe.coordinator import TELEMETRY_KEYS, decode_payload
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+
+from .payload import SYSTEM_INFO
+
+PREVIOUS = MinerSnapshot.from_payload(SYSTEM_INFO)
+
+
+def decode_full(body: bytes) -> dict[str, Any]:
+    """Decode a body the way ``aiohttp.ClientResponse.json()`` does."""
+    result: dict[str, Any] = json.loads(body.decode("utf-8"))
+    return result
+
+
+def decode_snapshot(body: bytes) -> MinerSnapshot:
+    """Decode a body the way the coordinator does, down to the snapshot."""
+    return MinerSnapshot.from_payload(decode_payload(body))
+
+
+def decode_telemetry(body: bytes) -> MinerSnapshot:
+    """Decode a body the way the coordinator does between slow-tier refreshes."""
+    return PREVIOUS.merge(decode_payload(body, TELEMETRY_KEYS))
+
+
+def _time_per_call(func: Any, body: bytes, repeat: int) -> float:
+    """Return the best time per call, in microseconds, over ``repeat`` runs."""
+    timer = Timer(lambda: func(body))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def _retained_bytes(func: Any, body: bytes, miners: int) -> float:
+    """Return the memory retained per miner by the decoded payloads."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept = [func(body) for _ in range(miners)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return (after - before) / miners
+
+
+def main() -> None:
+    """Run the benchmark and print one line per decode path."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--miners", type=int, default=200)
+    args = parser.parse_args()
+
+    body = json.dumps(SYSTEM_INFO).encode()
+    print(f"payload: {len(body)} bytes, {len(SYSTEM_INFO)} top-level keys")
+    print(f"{'path':<12}{'keys':>6}{'decode (us)':>14}{'retained (B/miner)':>22}")
+    paths: tuple[tuple[str, Any], ...] = (
+        ("full", decode_full),
+        ("projected", decode_payload),
+        ("snapshot", decode_snapshot),
+        ("telemetry", decode_telemetry),
+    )
+    projections = {
+        "snapshot": len(decode_payload(body)),
+        "telemetry": len(decode_payload(body, TELEMETRY_KEYS)),
+    }
+    for name, func in paths:
+        keys = projections.get(name) or len(func(body))
+        micros = _time_per_call(func, body, args.repeat)
+        retained = _retained_bytes(func, body, args.miners)
+        print(f"{name:<12}{keys:>6}{micros:>14.1f}{retained:>22.0f}")
+
+
+if __name__ == "__main__":
+    main()
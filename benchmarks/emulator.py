@@ -0,0 +1,488 @@
+"""Local NerdQAxe firmware emulator for offline load testing.
+
+Each emulated miner is a small aiohttp server speaking the subset of the
+ESP-Miner HTTP API the integration uses:
+
+- ``GET /api/system/info``: a full payload, shaped like ``payload.py`` and
+  derived from the miner's model and current settings
+- ``PATCH /api/system``: settings changes (frequency, core voltage, ...)
+- ``POST /api/system/restart``: reboot
+- ``POST /api/system/OTA/github``: ``202 Accepted``, then flashing in the
+  background and a reboot into the new version (``409`` while busy)
+
+Network behaviour is configurable per fleet (:class:`EmulatorConfig`): added
+latency and jitter, a share of requests whose connection is dropped, a cap
+on concurrent requests (the ESP32 web server only has a few sockets), and how
+long reboots and OTA flashing take. While a miner reboots its server is
+stopped, so clients get the same connection errors as with real hardware.
+
+One process can run hundreds of miners, each on its own port::
+
+    python -m benchmarks.emulator --miners 200 --base-port 8100 --latency 0.05
+
+then add ``127.0.0.1:8100`` (and so on) as miners in Home Assistant, or pass
+``--emulator`` to ``benchmarks.fleet``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass
+import logging
+import random
+import re
+from time import monotonic
+from types import TracebackType
+from typing import Any, Self
+
+from aiohttp import web
+
+from .payload import SYSTEM_INFO
+
+_LOGGER = logging.getLogger(__name__)
+
+_Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+# Version of the factory image a GitHub OTA URL points to, e.g.
+# ``.../esp-miner-factory-NerdQAxe++-v1.0.41.bin``
+_OTA_VERSION = re.compile(r"-(v[\w.\-]+?)\.bin$")
+
+# Settings a PATCH may change, with their type
+_SETTINGS: dict[str, type] = {
+    "frequency": int,
+    "coreVoltage": int,
+    "hostname": str,
+    "stratumURL": str,
+    "stratumPort": int,
+    "stratumUser": str,
+    "fallbackStratumURL": str,
+    "fallbackStratumPort": int,
+    "fallbackStratumUser": str,
+    "autofanspeed": int,
+    "fanspeed": float,
+    "flipscreen": int,
+    "invertscreen": int,
+}
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class MinerModel:
+    """Hardware of an emulated miner."""
+
+    name: str
+    asic_model: str
+    asic_count: int
+    fan_count: int
+    # Hash rate of one ASIC per MHz of frequency, in GH/s
+    hashrate_per_mhz: float
+    default_frequency: int
+    default_core_voltage: int
+
+
+MODELS: dict[str, MinerModel] = {
+    model.name: model
+    for model in (
+        MinerModel(
+            name="NerdAxe",
+            asic_model="BM1366",
+            asic_count=1,
+            fan_count=1,
+            hashrate_per_mhz=1.0,
+            default_frequency=485,
+            default_core_voltage=1200,
+        ),
+        MinerModel(
+            name="NerdQAxe+",
+            asic_model="BM1368",
+            asic_count=4,
+            fan_count=1,
+            hashrate_per_mhz=1.3,
+            default_frequency=490,
+            default_core_voltage=1200,
+        ),
+        MinerModel(
+            name="NerdQAxe++",
+            asic_model="BM1370",
+            asic_count=4,
+            fan_count=2,
+            hashrate_per_mhz=2.0,
+            default_frequency=600,
+            default_core_voltage=1150,
+        ),
+        MinerModel(
+            name="NerdOCTAXE-γ",  # noqa: RUF001 (the model name the firmware reports)
+            asic_model="BM1370",
+            asic_count=8,
+            fan_count=2,
+            hashrate_per_mhz=2.0,
+            default_frequency=600,
+            default_core_voltage=1150,
+        ),
+    )
+}
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class EmulatorConfig:
+    """Network and timing behaviour shared by the miners of a fleet."""
+
+    # Delay added to every response, in seconds, plus a uniform random
+    # +/- jitter
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Share of requests (0-1) whose connection is dropped without a response
+    drop_rate: float = 0.0
+    # Concurrent requests a miner serves; the connection of any request
+    # beyond is dropped
+    max_connections: int = 4
+    # Time the server stays down on a reboot, and an OTA takes to flash
+    reboot_seconds: float = 5.0
+    ota_seconds: float = 30.0
+
+
+class EmulatedMiner:
+    """One emulated miner, served on its own port."""
+
+    def __init__(
+        self,
+        index: int,
+        model: MinerModel,
+        config: EmulatorConfig,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the miner; it is served once :meth:`async_start` is called.
+
+        Args:
+            index: Position of the miner in its fleet, used for its identity
+            model: Emulated hardware
+            config: Network and timing behaviour
+            host: Address to listen on
+            port: Port to listen on, 0 for any free port
+            seed: Seed of the miner's random readings and faults
+
+        """
+        self.index = index
+        self.model = model
+        self.config = config
+        self.host = host
+        self.port = port
+        self.version = SYSTEM_INFO["version"]
+        self.settings: dict[str, Any] = {
+            key: SYSTEM_INFO[key] for key in _SETTINGS if key in SYSTEM_INFO
+        }
+        self.settings.update(
+            hostname=f"nerdqaxe-{index:03d}",
+            frequency=model.default_frequency,
+            coreVoltage=model.default_core_voltage,
+        )
+        self.requests = 0
+        self.dropped = 0
+        self._random = random.Random(index if seed is None else seed)  # noqa: S311
+        self._booted = monotonic()
+        self._in_flight = 0
+        self._ota_task: asyncio.Task[None] | None = None
+        self._reboot_task: asyncio.Task[None] | None = None
+        self._runner: web.AppRunner | None = None
+        self._site: web.TCPSite | None = None
+
+    @property
+    def address(self) -> str:
+        """Return the ``host:port`` to configure the miner with."""
+        return f"{self.host}:{self.port}"
+
+    @property
+    def rebooting(self) -> bool:
+        """Return True while the server is down for a reboot."""
+        return self._reboot_task is not None and not self._reboot_task.done()
+
+    @property
+    def ota_running(self) -> bool:
+        """Return True while an OTA is flashing."""
+        return self._ota_task is not None and not self._ota_task.done()
+
+    def payload(self) -> dict[str, Any]:
+        """Return the ``/api/system/info`` payload for the current state."""
+        model = self.model
+        frequency = self.settings["frequency"]
+        noise = self._random.uniform(-0.03, 0.03)
+        hashrate = frequency * model.hashrate_per_mhz * model.asic_count
+        temp = 40 + frequency / 30 + self._random.uniform(-0.5, 0.5)
+        power = hashrate * 0.016 * self.settings["coreVoltage"] / 1150
+        fan_rpm = 2500 + frequency * 2 + self._random.randint(-30, 30)
+        mac_suffix = f"{self.index // 256:02X}:{self.index % 256:02X}"
+        payload: dict[str, Any] = {
+            **SYSTEM_INFO,
+            **self.settings,
+            "version": self.version,
+            "deviceModel": model.name,
+            "ASICModel": model.asic_model,
+            "asicCount": model.asic_count,
+            "macAddr": f"AA:BB:CC:DD:{mac_suffix}",
+            "hostip": self.host,
+            "uptimeSeconds": int(monotonic() - self._booted),
+            "hashRate": round(hashrate * (1 + noise), 2),
+            "hashRate_1m": round(hashrate * (1 + noise / 3), 2),
+            "hashRate_10m": round(hashrate * (1 + noise / 10), 2),
+            "hashRate_1h": round(hashrate, 2),
+            "hashRate_1d": round(hashrate, 2),
+            "temp": round(temp, 2),
+            "vrTemp": round(temp + 3, 2),
+            "asicTemps": [
+                round(temp + self._random.uniform(-1, 1), 1)
+                for _ in range(model.asic_count)
+            ],
+            "power": round(power, 2),
+            "current": round(power / SYSTEM_INFO["voltage"], 2),
+            "coreVoltageActual": self.settings["coreVoltage"] - 14,
+            "fanrpm": fan_rpm,
+            "fanCount": model.fan_count,
+            "fanspeed2": self.settings.get("fanspeed", 0) if model.fan_count > 1 else 0,
+            "fanrpm2": fan_rpm - 14 if model.fan_count > 1 else 0,
+        }
+        return payload
+
+    async def async_start(self) -> None:
+        """Start serving the miner."""
+        app = web.Application(middlewares=[self._network_middleware])
+        app.router.add_get("/api/system/info", self._handle_info)
+        app.router.add_patch("/api/system", self._handle_patch)
+        app.router.add_post("/api/system/restart", self._handle_restart)
+        app.router.add_post("/api/system/OTA/github", self._handle_ota)
+        self._runner = web.AppRunner(app, handle_signals=False)
+        await self._runner.setup()
+        await self._async_listen()
+
+    async def async_stop(self) -> None:
+        """Stop serving the miner and cancel any reboot or OTA in progress."""
+        for task in (self._ota_task, self._reboot_task):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _async_listen(self) -> None:
+        assert self._runner is not None
+        self._site = web.TCPSite(self._runner, self.host, self.port)
+        await self._site.start()
+        if self.port == 0:
+            # Keep the port across reboots
+            server = self._site._server
+            assert isinstance(server, asyncio.Server)
+            self.port = server.sockets[0].getsockname()[1]
+
+    def reboot(self) -> None:
+        """Take the server down for ``reboot_seconds``, then boot again."""
+        if not self.rebooting:
+            self._reboot_task = asyncio.create_task(self._async_reboot())
+
+    async def _async_reboot(self) -> None:
+        # Let the response that triggered the reboot go out first
+        await asyncio.sleep(0.05)
+        if self._site is not None:
+            await self._site.stop()
+        # A reboot also drops every kept-alive connection
+        assert self._runner is not None and self._runner.server is not None
+        for connection in list(self._runner.server.connections):
+            connection.force_close()
+        await asyncio.sleep(self.config.reboot_seconds)
+        self._booted = monotonic()
+        await self._async_listen()
+
+    async def _async_flash(self, version: str) -> None:
+        await asyncio.sleep(self.config.ota_seconds)
+        self.version = version
+        self.reboot()
+
+    @web.middleware
+    async def _network_middleware(
+        self, request: web.Request, handler: _Handler
+    ) -> web.StreamResponse:
+        """Apply the configured latency, drops and connection cap."""
+        self.requests += 1
+        if (
+            self._in_flight >= self.config.max_connections
+            or self._random.random() < self.config.drop_rate
+        ):
+            self.dropped += 1
+            _drop_connection(request)
+        self._in_flight += 1
+        try:
+            delay = self.config.latency + self._random.uniform(
+                -self.config.jitter, self.config.jitter
+            )
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return await handler(request)
+        finally:
+            self._in_flight -= 1
+
+    async def _handle_info(self, request: web.Request) -> web.Response:
+        return web.json_response(self.payload())
+
+    async def _handle_patch(self, request: web.Request) -> web.Response:
+        try:
+            changes = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Invalid JSON") from None
+        if not isinstance(changes, dict):
+            raise web.HTTPBadRequest(text="Expected an object")
+        for key, value in changes.items():
+            if (kind := _SETTINGS.get(key)) is not None:
+                try:
+                    self.settings[key] = kind(value)
+                except (TypeError, ValueError) as err:
+                    raise web.HTTPBadRequest(text=f"Invalid {key}") from err
+        return web.Response()
+
+    async def _handle_restart(self, request: web.Request) -> web.Response:
+        self.reboot()
+        return web.Response(text="System will restart shortly.")
+
+    async def _handle_ota(self, request: web.Request) -> web.Response:
+        if self.ota_running:
+            raise web.HTTPConflict(text="OTA already in progress")
+        try:
+            body = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Invalid JSON") from None
+        url = body.get("url") if isinstance(body, dict) else None
+        if not isinstance(url, str) or not url.startswith("https://"):
+            raise web.HTTPBadRequest(text="Missing or unsafe firmware URL")
+        match = _OTA_VERSION.search(url)
+        version = match.group(1) if match else self.version
+        self._ota_task = asyncio.create_task(self._async_flash(version))
+        return web.json_response({"status": "started"}, status=202)
+
+
+def _drop_connection(request: web.Request) -> None:
+    """Close the connection of a request without answering it."""
+    if request.transport is not None:
+        request.transport.close()
+    raise asyncio.CancelledError
+
+
+class EmulatedFleet:
+    """A fleet of emulated miners served from one process.
+
+    Use as an async context manager::
+
+        async with EmulatedFleet(200, EmulatorConfig(latency=0.05)) as fleet:
+            hosts = fleet.addresses
+    """
+
+    def __init__(
+        self,
+        count: int,
+        config: EmulatorConfig | None = None,
+        models: list[MinerModel] | None = None,
+        host: str = "127.0.0.1",
+        base_port: int = 0,
+    ) -> None:
+        """Initialize the fleet.
+
+        Args:
+            count: Number of miners
+            config: Network and timing behaviour of every miner
+            models: Hardware of the miners, assigned in turn
+            host: Address to listen on
+            base_port: Port of the first miner, the next ones following; 0
+                for any free ports
+
+        """
+        models = models or list(MODELS.values())
+        config = config or EmulatorConfig()
+        self.miners = [
+            EmulatedMiner(
+                index,
+                models[index % len(models)],
+                config,
+                host=host,
+                port=base_port + index if base_port else 0,
+            )
+            for index in range(count)
+        ]
+
+    @property
+    def addresses(self) -> list[str]:
+        """Return the ``host:port`` of every miner."""
+        return [miner.address for miner in self.miners]
+
+    async def async_start(self) -> None:
+        """Start serving every miner."""
+        await asyncio.gather(*(miner.async_start() for miner in self.miners))
+
+    async def async_stop(self) -> None:
+        """Stop serving every miner."""
+        await asyncio.gather(*(miner.async_stop() for miner in self.miners))
+
+    async def __aenter__(self) -> Self:
+        await self.async_start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.async_stop()
+
+
+async def _serve(fleet: EmulatedFleet) -> None:
+    async with fleet:
+        for miner in fleet.miners:
+            print(f"{miner.address}\t{miner.model.name}")
+        print(f"{len(fleet.miners)} miners running, Ctrl+C to stop", flush=True)
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    """Run an emulated fleet until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--miners", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=8100)
+    parser.add_argument(
+        "--model",
+        nargs="+",
+        choices=list(MODELS),
+        default=list(MODELS),
+        help="models assigned to the miners in turn",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="0-1")
+    parser.add_argument("--max-connections", type=int, default=4)
+    parser.add_argument("--reboot-seconds", type=float, default=5.0)
+    parser.add_argument("--ota-seconds", type=float, default=30.0)
+    args = parser.parse_args()
+
+    config = EmulatorConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        max_connections=args.max_connections,
+        reboot_seconds=args.reboot_seconds,
+        ota_seconds=args.ota_seconds,
+    )
+    fleet = EmulatedFleet(
+        args.miners,
+        config,
+        models=[MODELS[name] for name in args.model],
+        host=args.host,
+        base_port=args.base_port,
+    )
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_serve(fleet))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""Benchmark the coordinator refresh and entity fan-out across a fleet.
+
+Runs a real (test) Home Assistant instance against simulated miners that all
+serve the payload from ``benchmarks/payload.py``, and measures, for each
+fleet size:
+
+- ``decode``: decoding one payload per miner, down to the snapshot
+- ``refresh``: ``_async_update_data`` of every coordinator, run concurrently
+- ``entities``: evaluating ``native_value``/``extra_state_attributes`` of
+  every sensor and ``is_on`` of every binary sensor of every miner
+- ``setup``: setting up every config entry, all platforms included
+
+With ``--emulator`` the miners are served by ``benchmarks/emulator.py`` over
+real sockets, through the integration's connection pool, instead of an
+in-memory session; ``--latency`` then adds a network delay to every request.
+
+Results can be written as JSON (``--json``) and compared with a previous run
+(``--compare``), e.g. one taken on another commit::
+
+    python -m benchmarks.fleet --json before.json
+    git checkout my-branch
+    python -m benchmarks.fleet --compare before.json
+
+Run from the repository root with the development dependencies installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from datetime import UTC, datetime
+from http import HTTPStatus
+import json
+import logging
+from pathlib import Path
+import platform
+from statistics import median
+import subprocess
+from time import perf_counter
+from typing import Any, Self
+from unittest.mock import patch
+
+from homeassistant import loader
+from homeassistant.const import CONF_HOST, __version__ as ha_version
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.nerdqaxe.binary_sensor import (
+    BINARY_SENSORS,
+    NerdQAxeBinarySensor,
+)
+from custom_components.nerdqaxe.const import DOMAIN
+from custom_components.nerdqaxe.coordinator import (
+    NerdQAxeDataUpdateCoordinator,
+    decode_payload,
+)
+from custom_components.nerdqaxe.sensor import SENSORS, NerdQAxeSensor
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+
+from .emulator import EmulatedFleet, EmulatorConfig
+from .payload import SYSTEM_INFO
+
+BODY = json.dumps(SYSTEM_INFO).encode()
+
+# Bump when the meaning of a measurement changes, so that results taken
+# before and after are not compared.
+SCHEMA_VERSION = 1
+
+
+class _FakeResponse:
+    """Response served by :class:`_FakeSession`."""
+
+    status = HTTPStatus.OK
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+        self.headers: dict[str, str] = {}
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def json(self) -> Any:
+        return json.loads(self._body)
+
+
+class _FakeSession:
+    """Session serving the benchmark payload to every miner.
+
+    GitHub release checks get an empty release list, so no benchmark ever
+    leaves the machine.
+    """
+
+    def get(self, url: str, **kwargs: Any) -> _FakeResponse:
+        return _FakeResponse(BODY if url.startswith("http://") else b"[]")
+
+
+# Minimum duration of one timed sample: shorter runs are looped until they
+# take this long, so that sub-millisecond measurements stay comparable.
+MIN_SAMPLE_SECONDS = 0.05
+
+
+async def _measure(
+    run: Callable[[], Awaitable[None]],
+    repeat: int,
+    setup: Callable[[], Awaitable[None]] | None = None,
+) -> list[float]:
+    """Return the duration of ``repeat`` runs, in milliseconds.
+
+    Without ``setup`` the run is looped within each sample, as
+    ``timeit.Timer.autorange`` does, and the duration of one run is reported.
+    With ``setup`` (runs that cannot be repeated back to back) each sample is
+    a single run.
+    """
+    number = 1
+    if setup is None:
+        while True:
+            start = perf_counter()
+            for _ in range(number):
+                await run()
+            if perf_counter() - start >= MIN_SAMPLE_SECONDS:
+                break
+            number *= 2
+
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            await setup()
+        start = perf_counter()
+        for _ in range(number):
+            await run()
+        timings.append((perf_counter() - start) * 1000 / number)
+    return timings
+
+
+async def bench_decode(
+    hass: HomeAssistant, hosts: list[str], repeat: int
+) -> list[float]:
+    """Decode one payload per miner."""
+
+    async def run() -> None:
+        for _ in hosts:
+            MinerSnapshot.from_payload(decode_payload(BODY))
+
+    return await _measure(run, repeat)
+
+
+def _coordinators(
+    hass: HomeAssistant, hosts: list[str]
+) -> list[NerdQAxeDataUpdateCoordinator]:
+    return [
+        NerdQAxeDataUpdateCoordinator(hass, host=host, scan_interval=30)
+        for host in hosts
+    ]
+
+
+async def bench_refresh(
+    hass: HomeAssistant, hosts: list[str], repeat: int
+) -> list[float]:
+    """Run ``_async_update_data`` of every coordinator concurrently."""
+    coordinators = _coordinators(hass, hosts)
+
+    async def run() -> None:
+        await asyncio.gather(*(c._async_update_data() for c in coordinators))
+
+    return await _measure(run, repeat)
+
+
+async def bench_entities(
+    hass: HomeAssistant, hosts: list[str], repeat: int
+) -> list[float]:
+    """Evaluate the state of every sensor and binary sensor of every miner."""
+    sensors: list[NerdQAxeSensor] = []
+    binary_sensors: list[NerdQAxeBinarySensor] = []
+    for coordinator in _coordinators(hass, hosts):
+        coordinator.data = await coordinator._async_update_data()
+        sensors.extend(NerdQAxeSensor(coordinator, d) for d in SENSORS)
+        binary_sensors.extend(
+            NerdQAxeBinarySensor(coordinator, d) for d in BINARY_SENSORS
+        )
+
+    async def run() -> None:
+        for sensor in sensors:
+            _ = sensor.native_value
+            _ = sensor.extra_state_attributes
+        for binary_sensor in binary_sensors:
+            _ = binary_sensor.is_on
+
+    return await _measure(run, repeat)
+
+
+async def bench_setup(
+    hass: HomeAssistant, hosts: list[str], repeat: int
+) -> list[float]:
+    """Set up every config entry of the fleet, all platforms included."""
+    entries: list[MockConfigEntry] = []
+
+    async def add_entries() -> None:
+        for entry in entries:
+            await hass.config_entries.async_remove(entry.entry_id)
+        entries.clear()
+        for index, host in enumerate(hosts):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                data={CONF_HOST: host},
+                unique_id=f"AA:BB:CC:DD:{index // 256:02X}:{index % 256:02X}",
+            )
+            entry.add_to_hass(hass)
+            entries.append(entry)
+
+    async def run() -> None:
+        await asyncio.gather(
+            *(hass.config_entries.async_setup(entry.entry_id) for entry in entries)
+        )
+        await hass.async_block_till_done()
+
+    try:
+        return await _measure(run, repeat, setup=add_entries)
+    finally:
+        for entry in entries:
+            await hass.config_entries.async_remove(entry.entry_id)
+
+
+BENCHMARKS: dict[
+    str, Callable[[HomeAssistant, list[str], int], Awaitable[list[float]]]
+] = {
+    "decode": bench_decode,
+    "refresh": bench_refresh,
+    "entities": bench_entities,
+    "setup": bench_setup,
+}
+
+
+async def run_benchmarks(
+    names: list[str],
+    fleet_sizes: list[int],
+    repeat: int,
+    emulator: EmulatorConfig | None = None,
+) -> list[dict[str, Any]]:
+    """Run the selected benchmarks for every fleet size.
+
+    Args:
+        names: Benchmarks to run
+        fleet_sizes: Number of miners to run each benchmark with
+        repeat: Number of timed samples per measurement
+        emulator: Serve the miners from emulated firmware with this
+            behaviour, instead of an in-memory session
+
+    Returns:
+        list: One result per benchmark and fleet size
+
+    """
+    results = []
+    async with AsyncExitStack() as stack:
+        hass = await stack.enter_async_context(async_test_home_assistant())
+        # Let the loader find the integration under custom_components/
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+        # GitHub release checks never leave the machine
+        stack.enter_context(
+            patch(
+                "custom_components.nerdqaxe.releases.async_get_clientsession",
+                return_value=_FakeSession(),
+            )
+        )
+        if emulator is None:
+            stack.enter_context(
+                patch(
+                    "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+                    return_value=_FakeSession(),
+                )
+            )
+            hosts = [
+                f"10.0.{index // 256}.{index % 256}"
+                for index in range(max(fleet_sizes))
+            ]
+        else:
+            fleet = await stack.enter_async_context(
+                EmulatedFleet(max(fleet_sizes), emulator)
+            )
+            hosts = fleet.addresses
+
+        for name in names:
+            for miners in fleet_sizes:
+                timings = await BENCHMARKS[name](hass, hosts[:miners], repeat)
+                results.append(
+                    {
+                        "benchmark": name,
+                        "miners": miners,
+                        "unit": "ms",
+                        "best": min(timings),
+                        "median": median(timings),
+                        "per_miner": min(timings) / miners,
+                    }
+                )
+        await hass.async_stop(force=True)
+    return results
+
+
+def _commit() -> str | None:
+    """Return the current commit, if run from a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=False,
+            text=True,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _print_results(
+    results: list[dict[str, Any]], baseline: dict[tuple[str, int], float]
+) -> None:
+    header = f"{'benchmark':<10}{'miners':>8}{'best (ms)':>12}{'median (ms)':>13}"
+    header += f"{'per miner (ms)':>16}"
+    if baseline:
+        header += f"{'vs baseline':>13}"
+    print(header)
+    for result in results:
+        line = f"{result['benchmark']:<10}{result['miners']:>8}"
+        line += f"{result['best']:>12.3f}{result['median']:>13.3f}"
+        line += f"{result['per_miner']:>16.4f}"
+        if before := baseline.get((result["benchmark"], result["miners"])):
+            line += f"{(result['best'] - before) / before:>+13.1%}"
+        print(line)
+
+
+def _load_baseline(
+    path: Path, transport: dict[str, Any]
+) -> dict[tuple[str, int], float]:
+    """Return the best timings of a previous run, keyed by measurement."""
+    previous = json.loads(path.read_text())
+    if previous.get("schema") != SCHEMA_VERSION:
+        raise SystemExit(f"{path} was produced by an incompatible benchmark version")
+    if previous.get("transport") != transport:
+        raise SystemExit(
+            f"{path} was run against {previous.get('transport')}, not {transport}"
+        )
+    return {
+        (result["benchmark"], result["miners"]): result["best"]
+        for result in previous["results"]
+    }
+
+
+def main() -> None:
+    """Run the benchmarks, print the results and optionally save them."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--miners", type=int, nargs="+", default=[1, 10, 50, 200], metavar="N"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS)
+    )
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument(
+        "--compare", type=Path, help="compare with the results of a previous run"
+    )
+    parser.add_argument(
+        "--emulator",
+        action="store_true",
+        help="serve the miners from emulated firmware over real sockets",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="network delay of the emulated miners, in seconds",
+    )
+    args = parser.parse_args()
+
+    emulator = EmulatorConfig(latency=args.latency) if args.emulator else None
+    transport = {
+        "emulator": args.emulator,
+        "latency": args.latency if args.emulator else 0.0,
+    }
+
+    # The integration logs every setup and unload at info level
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+    baseline = _load_baseline(args.compare, transport) if args.compare else {}
+
+    results = asyncio.run(run_benchmarks(args.only, args.miners, args.repeat, emulator))
+    _print_results(results, baseline)
+
+    if args.json:
+        report = {
+            "schema": SCHEMA_VERSION,
+            "commit": _commit(),
+            "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "homeassistant": ha_version,
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "transport": transport,
+            "results": results,
+        }
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
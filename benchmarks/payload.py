@@ -0,0 +1,107 @@
+"""Realistic miner payload shared by the benchmarks."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# A full payload as reported by recent NerdQAxe++ firmware. Only about half
+# of the fields are read by the integration.
+SYSTEM_INFO: dict[str, Any] = {
+    "power": 76.54,
+    "maxPower": 100,
+    "minPower": 5,
+    "voltage": 11.96,
+    "maxVoltage": 13,
+    "minVoltage": 11,
+    "current": 6.4,
+    "temp": 58.25,
+    "vrTemp": 61,
+    "asicTemps": [58.1, 58.4, 57.9, 58.6],
+    "hashRateTimestamp": 1739123456789,
+    "hashRate": 4812.33,
+    "hashRate_1m": 4790.2,
+    "hashRate_10m": 4801.7,
+    "hashRate_1h": 4805.9,
+    "hashRate_1d": 4799.4,
+    "jobInterval": 1200,
+    "bestDiff": "4.21G",
+    "bestSessionDiff": "512M",
+    "stratumDifficulty": 4096,
+    "freeHeap": 187432,
+    "freeHeapInt": 94216,
+    "coreVoltage": 1200,
+    "coreVoltageActual": 1186,
+    "frequency": 600,
+    "ssid": "farm-2g",
+    "hostname": "nerdqaxe-07",
+    "wifiStatus": "Connected!",
+    "wifiRSSI": -61,
+    "macAddr": "AA:BB:CC:DD:EE:07",
+    "hostip": "192.168.1.107",
+    "sharesAccepted": 48211,
+    "sharesRejected": 37,
+    "uptimeSeconds": 1209600,
+    "asicCount": 4,
+    "smallCoreCount": 894,
+    "ASICModel": "BM1370",
+    "deviceModel": "NerdQAxe++",
+    "boardVersion": "1.2",
+    "stratumURL": "public-pool.io",
+    "stratumPort": 21496,
+    "stratumUser": "bc1qexampleexampleexampleexampleexample.nerdqaxe07",
+    "fallbackStratumURL": "solo.ckpool.org",
+    "fallbackStratumPort": 3333,
+    "fallbackStratumUser": "bc1qexampleexampleexampleexampleexample.nerdqaxe07",
+    "isUsingFallbackStratum": 0,
+    "isStratumConnected": 1,
+    "version": "v1.0.40",
+    "runningPartition": "ota_1",
+    "flipscreen": 1,
+    "invertscreen": 0,
+    "autoscreenoff": 0,
+    "invertfanpolarity": 1,
+    "autofanspeed": 2,
+    "fanspeed": 47.5,
+    "fanrpm": 3712,
+    "fanspeed2": 47.5,
+    "fanrpm2": 3698,
+    "fanCount": 2,
+    "pidTargetTemp": 60,
+    "pidP": 6,
+    "pidI": 0.1,
+    "pidD": 10,
+    "overheat_temp": 70,
+    "overclockEnabled": 1,
+    "lastResetReason": "Software reset",
+    "history": {"hashrate_10m": [], "hashrate_1h": [], "hashrate_1d": []},
+    "foundBlocks": 0,
+    "totalFoundBlocks": 1,
+    "networkDifficulty": 114167270716407,
+    "blockHeight": 884213,
+    "stratum": {
+        "poolMode": 0,
+        "activePoolMode": 0,
+        "usingFallback": False,
+        "totalBestDiff": 4210000000,
+        "pools": [
+            {
+                "connected": True,
+                "active": True,
+                "poolDiffErr": False,
+                "poolDifficulty": 4096,
+                "accepted": 48211,
+                "rejected": 37,
+                "bestDiff": 4210000000,
+            },
+            {
+                "connected": False,
+                "active": False,
+                "poolDiffErr": False,
+                "poolDifficulty": 0,
+                "accepted": 0,
+                "rejected": 0,
+                "bestDiff": 0,
+            },
+        ],
+    },
+}
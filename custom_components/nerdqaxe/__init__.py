@@ -3,22 +3,46 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.typing import ConfigType
 
+from .autotune import AutoTuner, async_remove_autotune_results
+from .budget import async_get_power_budget
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_COMPACT_ASIC_TEMPS,
     CONF_HOST,
+    CONF_IMPORT_STATISTICS,
+    CONF_MAX_CONCURRENT_POLLS,
+    CONF_PUSH_UPDATES,
     CONF_SCAN_INTERVAL,
+    CONF_STATISTICS_WINDOW,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_COMPACT_ASIC_TEMPS,
+    DEFAULT_IMPORT_STATISTICS,
+    DEFAULT_MAX_CONCURRENT_POLLS,
+    DEFAULT_PUSH_UPDATES,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATISTICS_WINDOW,
     DOMAIN,
     NerdQAxeConfigEntry,
     NerdQAxeRuntimeData,
 )
 from .coordinator import NerdQAxeDataUpdateCoordinator
+from .longterm import async_remove_statistics_bucket
+from .scheduler import async_get_fleet_scheduler
+from .services import async_setup_services
+from .session import async_close_miner_pool
 
 __all__ = [
     "DOMAIN",
@@ -32,6 +56,8 @@ _LOGGER = logging.getLogger(__name__)
 # Current ConfigEntry version - increment when data structure changes
 CONFIGENTRY_VERSION = 2
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
@@ -40,12 +66,55 @@ PLATFORMS: list[Platform] = [
     Platform.NUMBER,
 ]
 
+OPTION_DEFAULTS: dict[str, Any] = {
+    CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
+    CONF_MAX_CONCURRENT_POLLS: DEFAULT_MAX_CONCURRENT_POLLS,
+    CONF_PUSH_UPDATES: DEFAULT_PUSH_UPDATES,
+    CONF_ADAPTIVE_POLLING: DEFAULT_ADAPTIVE_POLLING,
+    CONF_STATISTICS_WINDOW: DEFAULT_STATISTICS_WINDOW,
+    CONF_IMPORT_STATISTICS: DEFAULT_IMPORT_STATISTICS,
+    CONF_COMPACT_ASIC_TEMPS: DEFAULT_COMPACT_ASIC_TEMPS,
+}
+
+# Options applied to the running coordinator and scheduler. The others
+# change which entities exist or how they write their state, and reload the
+# entry.
+LIVE_OPTIONS: frozenset[str] = frozenset(
+    {
+        CONF_SCAN_INTERVAL,
+        CONF_MAX_CONCURRENT_POLLS,
+        CONF_PUSH_UPDATES,
+        CONF_ADAPTIVE_POLLING,
+        CONF_STATISTICS_WINDOW,
+    }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the NerdQAxe+ Miner integration.
+
+    Registers the integration services, which target miners by device, and
+    restores the fleet power budget.
+
+    Args:
+        hass: Home Assistant instance
+        config: Home Assistant configuration
+
+    Returns:
+        bool: True if setup was successful
+
+    """
+    async_setup_services(hass)
+    await async_get_power_budget(hass).async_load()
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: NerdQAxeConfigEntry) -> bool:
     """Set up NerdQAxe+ Miner integration from a config entry.
 
-    Creates the data update coordinator and initializes all platforms
-    (sensors, binary sensors, buttons, updates, numbers).
+    Creates the data update coordinator, hands its poll timing to the
+    hass-wide fleet scheduler and initializes all platforms (sensors, binary
+    sensors, buttons, updates, numbers).
 
     Args:
         hass: Home Assistant instance
@@ -60,6 +129,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: NerdQAxeConfigEntry) ->
     """
     host = entry.data[CONF_HOST]
     scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    max_concurrent_polls = entry.options.get(
+        CONF_MAX_CONCURRENT_POLLS, DEFAULT_MAX_CONCURRENT_POLLS
+    )
 
     _LOGGER.info(
         "Setting up NerdQAxe+ integration for %s (scan interval: %ds)",
@@ -67,22 +139,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: NerdQAxeConfigEntry) ->
         scan_interval,
     )
 
+    scheduler = async_get_fleet_scheduler(hass)
     coordinator = NerdQAxeDataUpdateCoordinator(
         hass,
         host=host,
         scan_interval=scan_interval,
+        scheduler=scheduler,
+        adaptive=entry.options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+        statistics_window=entry.options.get(
+            CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW
+        ),
+        import_statistics=entry.options.get(
+            CONF_IMPORT_STATISTICS, DEFAULT_IMPORT_STATISTICS
+        ),
     )
+    entry.async_on_unload(scheduler.async_register(coordinator, max_concurrent_polls))
 
     try:
         await coordinator.async_config_entry_first_refresh()
     except Exception as err:
         raise ConfigEntryNotReady(f"Failed to connect to miner at {host}") from err
 
-    entry.runtime_data = NerdQAxeRuntimeData(coordinator=coordinator)
+    autotune = AutoTuner(hass, coordinator)
+    await autotune.async_load()
+
+    entry.runtime_data = NerdQAxeRuntimeData(
+        coordinator=coordinator, autotune=autotune, options=dict(entry.options)
+    )
+
+    if entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES):
+        coordinator.async_start_push()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(coordinator.async_start_device_updates())
 
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     _LOGGER.debug("NerdQAxe+ integration setup completed for %s", host)
     return True
@@ -100,23 +191,82 @@ async def async_unload_entry(hass: HomeAssistant, entry: NerdQAxeConfigEntry) ->
 
     """
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        _LOGGER.info(
-            "Unloaded NerdQAxe+ integration for %s",
-            entry.runtime_data.coordinator.host,
-        )
+        coordinator = entry.runtime_data.coordinator
+        # Restore the settings of an interrupted auto-tune before the last
+        # settings write goes out
+        await entry.runtime_data.autotune.async_stop()
+        await coordinator.async_shutdown()
+        # Release the pooled keep-alive connections with the last miner
+        if not hass.config_entries.async_loaded_entries(DOMAIN):
+            await async_close_miner_pool(hass)
+        _LOGGER.info("Unloaded NerdQAxe+ integration for %s", coordinator.host)
 
     return unload_ok
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: NerdQAxeConfigEntry) -> None:
-    """Reload config entry when options change.
+async def async_remove_entry(hass: HomeAssistant, entry: NerdQAxeConfigEntry) -> None:
+    """Delete the data stored for a removed miner.
 
     Args:
         hass: Home Assistant instance
-        entry: Config entry to reload
+        entry: Config entry being removed
 
     """
-    await hass.config_entries.async_reload(entry.entry_id)
+    unique_id_base = entry.unique_id or entry.data[CONF_HOST]
+    await async_remove_autotune_results(hass, unique_id_base)
+    await async_remove_statistics_bucket(hass, unique_id_base)
+
+
+async def async_update_options(hass: HomeAssistant, entry: NerdQAxeConfigEntry) -> None:
+    """Apply changed options, reloading the entry only when required.
+
+    Polling options (``LIVE_OPTIONS``) are applied to the running coordinator
+    and fleet scheduler, so bulk option changes across a fleet do not set
+    every entry up again. Any other change reloads the entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry whose options changed
+
+    """
+    runtime_data = entry.runtime_data
+    previous, options = runtime_data.options, dict(entry.options)
+    changed = {
+        key
+        for key, default in OPTION_DEFAULTS.items()
+        if previous.get(key, default) != options.get(key, default)
+    }
+    if changed - LIVE_OPTIONS:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    runtime_data.options = options
+    if not changed:
+        return
+
+    def option(key: str) -> Any:
+        return options.get(key, OPTION_DEFAULTS[key])
+
+    coordinator = runtime_data.coordinator
+    coordinator.async_configure(
+        scan_interval=option(CONF_SCAN_INTERVAL),
+        adaptive=option(CONF_ADAPTIVE_POLLING),
+        statistics_window=option(CONF_STATISTICS_WINDOW),
+    )
+    if coordinator.scheduler is not None:
+        coordinator.scheduler.async_set_max_concurrent(
+            coordinator, option(CONF_MAX_CONCURRENT_POLLS)
+        )
+    if CONF_PUSH_UPDATES in changed:
+        if option(CONF_PUSH_UPDATES):
+            coordinator.async_start_push()
+        else:
+            await coordinator.async_stop_push()
+
+    _LOGGER.info(
+        "Applied options %s to %s without reload",
+        ", ".join(sorted(changed)),
+        coordinator.host,
+    )
 
 
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
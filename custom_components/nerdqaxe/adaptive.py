@@ -0,0 +1,132 @@
+"""Adaptive poll interval for the NerdQAxe+ coordinator.
+
+With a fixed scan interval an offline miner still costs a connect timeout on
+every cycle, while a miner being tuned is sampled no faster than when it sits
+idle. In adaptive mode the interval is recomputed after every poll instead:
+
+- while the miner fails, it doubles on each failure, and snaps back to the
+  configured interval as soon as a poll succeeds again;
+- while key metrics move quickly (a frequency/voltage change, a fan ramping
+  up), it is halved;
+- while consecutive payloads are effectively identical, it grows by half.
+
+The interval always stays within ``MIN_SCAN_INTERVAL``/``MAX_SCAN_INTERVAL``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Final
+
+from .const import MAX_SCAN_INTERVAL, MIN_SCAN_INTERVAL
+
+if TYPE_CHECKING:
+    from .snapshot import MinerSnapshot
+
+# Snapshot fields whose movement drives the interval. The instantaneous hash
+# rate is left out: it is noisy enough to look volatile on a perfectly steady
+# miner.
+VOLATILITY_FIELDS: Final = (
+    "hashrate_1m",
+    "temp",
+    "vr_temp",
+    "power",
+    "fan_rpm",
+    "frequency",
+    "core_voltage",
+)
+
+# Relative change between two polls above which a metric counts as moving,
+# and below which every metric must stay for the payloads to count as stable.
+VOLATILE_THRESHOLD: Final = 0.05
+STABLE_THRESHOLD: Final = 0.005
+
+FAILURE_BACKOFF: Final = 2.0
+SPEED_UP: Final = 0.5
+SLOW_DOWN: Final = 1.5
+
+
+def relative_change(previous: MinerSnapshot, current: MinerSnapshot) -> float:
+    """Return the largest relative change of the volatility metrics.
+
+    Args:
+        previous: Snapshot of the previous poll
+        current: Snapshot of the latest poll
+
+    Returns:
+        float: Largest ``|current - previous| / |previous|`` across the
+        metrics reported in both snapshots, ``0.0`` if none is
+
+    """
+    largest = 0.0
+    for name in VOLATILITY_FIELDS:
+        before = getattr(previous, name)
+        after = getattr(current, name)
+        if before is None or after is None or before == after:
+            continue
+        # A metric leaving zero (fan spinning up, hashing starting) counts
+        # as fully moving.
+        largest = max(largest, abs(after - before) / abs(before) if before else 1.0)
+    return largest
+
+
+class AdaptivePollInterval:
+    """Compute the next poll interval from the outcome of each poll."""
+
+    def __init__(self, base: float) -> None:
+        """Initialize the interval at its configured value.
+
+        Args:
+            base: Configured scan interval in seconds
+
+        """
+        self.base = base
+        self.interval = base
+        self.failures = 0
+
+    def _bounded(self, interval: float) -> float:
+        return min(max(interval, MIN_SCAN_INTERVAL), MAX_SCAN_INTERVAL)
+
+    def on_failure(self) -> float:
+        """Back off exponentially after a failed poll.
+
+        Returns:
+            float: The next interval in seconds
+
+        """
+        self.failures += 1
+        self.interval = self._bounded(self.base * FAILURE_BACKOFF**self.failures)
+        return self.interval
+
+    def on_success(
+        self, previous: MinerSnapshot | None, current: MinerSnapshot
+    ) -> float:
+        """Adjust the interval to how much the payload moved since last poll.
+
+        Args:
+            previous: Snapshot of the previous successful poll, if any
+            current: Snapshot of this poll
+
+        Returns:
+            float: The next interval in seconds
+
+        """
+        if self.failures or previous is None:
+            # Back online: resume at the configured pace
+            self.failures = 0
+            self.interval = self.base
+            return self.interval
+
+        change = relative_change(previous, current)
+        if change >= VOLATILE_THRESHOLD:
+            self.interval = self._bounded(self.interval * SPEED_UP)
+        elif change <= STABLE_THRESHOLD:
+            self.interval = self._bounded(self.interval * SLOW_DOWN)
+        return self.interval
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the adaptive state for diagnostics."""
+        return {
+            "base_interval": self.base,
+            "interval": round(self.interval, 1),
+            "consecutive_failures": self.failures,
+        }
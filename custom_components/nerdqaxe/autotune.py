@@ -0,0 +1,492 @@
+"""Closed-loop frequency/voltage auto-tuner for the NerdQAxe+ miners.
+
+An auto-tune run sweeps ASIC frequency/core voltage pairs through the
+settings write queue (see ``settings.py``), so every step is confirmed by a
+poll before it is measured. Each step is held until the one-minute hashrate
+and the power draw settle, then scored.
+
+The sweep climbs a staircase instead of walking the whole grid. It starts at
+the lowest frequency and voltage and raises the frequency while the miner
+keeps up. When the hashrate per MHz falls clearly below the best measured so
+far, the chips are starved of voltage (errors eat the hashrate), so the same
+frequency is retried one voltage step higher. The sweep ends at the top of
+the range, or as soon as the ASIC/VR temperature or the power cap is
+exceeded. Out of the stable points, the one best matching the target (max
+hashrate, best efficiency in J/TH, or max hashrate under a power cap) is
+applied.
+
+An aborted or failed run restores the settings the miner had before. The
+last run, with every measured point, is persisted per miner.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from enum import StrEnum
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Final, Self
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import ATTR_CORE_VOLTAGE, ATTR_FREQUENCY, DOMAIN
+from .exceptions import NerdQAxeError
+
+if TYPE_CHECKING:
+    from .coordinator import NerdQAxeDataUpdateCoordinator
+    from .snapshot import MinerSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+TARGET_HASHRATE: Final = "hashrate"
+TARGET_EFFICIENCY: Final = "efficiency"
+TARGET_POWER_CAP: Final = "power_cap"
+AUTOTUNE_TARGETS: Final = (TARGET_EFFICIENCY, TARGET_HASHRATE, TARGET_POWER_CAP)
+
+FREQUENCY_STEP: Final = 25  # MHz
+CORE_VOLTAGE_STEP: Final = 10  # mV
+
+# Default sweep range around the settings the miner runs when tuning starts
+DEFAULT_FREQUENCY_SPAN: Final = 100  # MHz
+DEFAULT_CORE_VOLTAGE_SPAN: Final = 50  # mV
+
+DEFAULT_MAX_TEMP: Final = 70.0  # °C
+DEFAULT_MAX_VR_TEMP: Final = 90.0  # °C
+
+# A step is held at least this long, the one-minute hashrate average needing
+# a full minute of the new setting, and then until two consecutive polls
+# agree within SETTLE_TOLERANCE; past SETTLE_TIMEOUT the last reading is
+# taken as is. All in seconds.
+SETTLE_MIN_TIME: Final = 90
+SETTLE_TIMEOUT: Final = 600
+SETTLE_TOLERANCE: Final = 0.02
+
+# A point producing this much less hashrate per MHz than the best point so
+# far is starved of voltage
+STABILITY_TOLERANCE: Final = 0.1
+
+STORAGE_VERSION: Final = 1
+SAVE_DELAY: Final = 1
+
+
+class AutoTuneState(StrEnum):
+    """State of the auto-tuner of a miner."""
+
+    IDLE = "idle"
+    RUNNING = "running"
+    DONE = "done"
+    ABORTED = "aborted"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AutoTuneRequest:
+    """Target and limits of an auto-tune run."""
+
+    target: str = TARGET_EFFICIENCY
+    min_frequency: int
+    max_frequency: int
+    min_core_voltage: int
+    max_core_voltage: int
+    power_cap: float | None = None
+    max_temp: float = DEFAULT_MAX_TEMP
+    max_vr_temp: float = DEFAULT_MAX_VR_TEMP
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TunePoint:
+    """Settled measurement of one frequency/voltage pair."""
+
+    frequency: int
+    core_voltage: int
+    hashrate: float  # GH/s, one-minute average
+    power: float  # W
+    temp: float | None = None
+    vr_temp: float | None = None
+    stable: bool = True
+
+    @property
+    def efficiency(self) -> float | None:
+        """Return the energy per terahash in J/TH, None without hashrate."""
+        if self.hashrate <= 0:
+            return None
+        return self.power / (self.hashrate / 1000)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the point as stored and shown in diagnostics."""
+        efficiency = self.efficiency
+        return {
+            **asdict(self),
+            "efficiency": round(efficiency, 2) if efficiency is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """Rebuild a point from its stored form."""
+        return cls(**{key: value for key, value in data.items() if key != "efficiency"})
+
+
+def sweep_bounds(
+    current: float, span: int, minimum: int, maximum: int
+) -> tuple[int, int]:
+    """Return a sweep range of ``span`` either side of a setting.
+
+    Args:
+        current: Setting the miner runs
+        span: Distance to sweep below and above it
+        minimum: Lowest value the firmware accepts
+        maximum: Highest value the firmware accepts
+
+    Returns:
+        tuple: Lowest and highest setting to sweep
+
+    """
+    return max(minimum, int(current) - span), min(maximum, int(current) + span)
+
+
+def _settled(previous: MinerSnapshot, current: MinerSnapshot) -> bool:
+    """Return True if the hashrate and power agree between two polls."""
+    for name in ("hashrate_1m", "power"):
+        before = getattr(previous, name)
+        after = getattr(current, name)
+        if not before or after is None:
+            return False
+        if abs(after - before) / abs(before) > SETTLE_TOLERANCE:
+            return False
+    return True
+
+
+def _temperature_limit(point: TunePoint, request: AutoTuneRequest) -> str | None:
+    """Return why the point is too hot, or None."""
+    if point.temp is not None and point.temp > request.max_temp:
+        return f"ASIC temperature {point.temp} °C above {request.max_temp} °C"
+    if point.vr_temp is not None and point.vr_temp > request.max_vr_temp:
+        return f"VR temperature {point.vr_temp} °C above {request.max_vr_temp} °C"
+    return None
+
+
+def _limit(point: TunePoint, request: AutoTuneRequest) -> str | None:
+    """Return why the point exceeds a limit of the run, or None."""
+    if reason := _temperature_limit(point, request):
+        return reason
+    if request.power_cap is not None and point.power > request.power_cap:
+        return f"power {point.power} W above the {request.power_cap} W cap"
+    return None
+
+
+def best_point(points: list[TunePoint], target: str) -> TunePoint | None:
+    """Return the stable point best matching a target.
+
+    Args:
+        points: Measured points
+        target: One of ``AUTOTUNE_TARGETS``
+
+    Returns:
+        TunePoint: Lowest J/TH for the efficiency target, highest hashrate
+        otherwise (points above the power cap are never stable), or None
+
+    """
+    stable = [point for point in points if point.stable and point.hashrate > 0]
+    if not stable:
+        return None
+    if target == TARGET_EFFICIENCY:
+        return min(stable, key=lambda point: point.power / point.hashrate)
+    return max(stable, key=lambda point: point.hashrate)
+
+
+def _store_key(unique_id_base: str) -> str:
+    return f"{DOMAIN}.autotune.{slugify(unique_id_base)}"
+
+
+async def async_remove_autotune_results(
+    hass: HomeAssistant, unique_id_base: str
+) -> None:
+    """Delete the persisted auto-tune results of a removed miner."""
+    await Store[dict[str, Any]](
+        hass, STORAGE_VERSION, _store_key(unique_id_base)
+    ).async_remove()
+
+
+class AutoTuner:
+    """Run the auto-tune sweep of one miner and keep its last result."""
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: NerdQAxeDataUpdateCoordinator
+    ) -> None:
+        """Initialize an idle tuner.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Coordinator of the miner to tune
+
+        """
+        self.hass = hass
+        self.coordinator = coordinator
+        self.store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, _store_key(coordinator.unique_id_base)
+        )
+        self.state = AutoTuneState.IDLE
+        self.request: AutoTuneRequest | None = None
+        self.points: list[TunePoint] = []
+        self.best: TunePoint | None = None
+        # Frequency/voltage pair being measured
+        self.step: tuple[int, int] | None = None
+        self.error: str | None = None
+        self.finished: datetime | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._listeners: set[CALLBACK_TYPE] = set()
+
+    @property
+    def running(self) -> bool:
+        """Return True while a run is in progress."""
+        return self._task is not None and not self._task.done()
+
+    async def async_load(self) -> None:
+        """Restore the last run of the miner."""
+        if (stored := await self.store.async_load()) is None:
+            return
+        self.state = AutoTuneState(stored["state"])
+        if self.state is AutoTuneState.RUNNING:
+            # Home Assistant stopped during the run
+            self.state = AutoTuneState.ABORTED
+        self.request = AutoTuneRequest(**stored["request"])
+        self.points = [TunePoint.from_dict(point) for point in stored["points"]]
+        self.best = TunePoint.from_dict(stored["best"]) if stored["best"] else None
+        self.error = stored["error"]
+        self.finished = dt_util.parse_datetime(stored["finished"] or "")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the tuner state, as persisted and for diagnostics."""
+        return {
+            "state": self.state.value,
+            "request": asdict(self.request) if self.request else None,
+            "step": list(self.step) if self.step else None,
+            "best": self.best.as_dict() if self.best else None,
+            "points": [point.as_dict() for point in self.points],
+            "error": self.error,
+            "finished": self.finished.isoformat() if self.finished else None,
+        }
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call back on every progress update until the returned callback."""
+        self._listeners.add(update_callback)
+        return lambda: self._listeners.discard(update_callback)
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_start(self, request: AutoTuneRequest) -> None:
+        """Start a run in the background.
+
+        Args:
+            request: Target and limits of the run
+
+        Raises:
+            NerdQAxeError: If a run is already in progress or the current
+                settings of the miner are unknown
+
+        """
+        host = self.coordinator.host
+        if self.running:
+            raise NerdQAxeError(f"Auto-tune is already running on {host}")
+        data = self.coordinator.data
+        if data is None or data.frequency is None or data.core_voltage is None:
+            raise NerdQAxeError(f"Current settings of {host} are unknown")
+
+        original = {
+            ATTR_FREQUENCY: int(data.frequency),
+            ATTR_CORE_VOLTAGE: int(data.core_voltage),
+        }
+        self.state = AutoTuneState.RUNNING
+        self.request = request
+        self.points = []
+        self.best = None
+        self.error = None
+        self.finished = None
+        _LOGGER.info("Starting auto-tune of %s: %s", host, request)
+        self._task = self.coordinator.async_create_background_task(
+            self._async_run(request, original), f"{DOMAIN} {host} auto-tune"
+        )
+        self._async_notify()
+
+    async def async_stop(self) -> None:
+        """Abort the run in progress, restoring the previous settings."""
+        if (task := self._task) is None or task.done():
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    async def _async_run(
+        self, request: AutoTuneRequest, original: dict[str, int]
+    ) -> None:
+        """Sweep, then apply the best point or restore the original settings."""
+        try:
+            await self._async_sweep(request)
+        except asyncio.CancelledError:
+            self._async_finish(AutoTuneState.ABORTED, original)
+            raise
+        except NerdQAxeError as err:
+            self._async_finish(AutoTuneState.FAILED, original, str(err))
+            return
+        except TimeoutError:
+            self._async_finish(
+                AutoTuneState.FAILED, original, "The miner stopped reporting data"
+            )
+            return
+
+        if self.best is None:
+            self._async_finish(
+                AutoTuneState.FAILED, original, "No setting stayed within the limits"
+            )
+            return
+        self._async_finish(
+            AutoTuneState.DONE,
+            {
+                ATTR_FREQUENCY: self.best.frequency,
+                ATTR_CORE_VOLTAGE: self.best.core_voltage,
+            },
+        )
+
+    @callback
+    def _async_finish(
+        self, state: AutoTuneState, settings: dict[str, int], error: str | None = None
+    ) -> None:
+        """Leave the miner on ``settings`` and record the outcome of the run."""
+        self.coordinator.settings.async_queue(settings)
+        self.state = state
+        self.error = error
+        self.step = None
+        self.finished = dt_util.utcnow()
+        self.store.async_delay_save(self.as_dict, SAVE_DELAY)
+        _LOGGER.info(
+            "Auto-tune of %s %s%s, leaving it at %d MHz / %d mV",
+            self.coordinator.host,
+            state.value,
+            f" ({error})" if error else "",
+            settings[ATTR_FREQUENCY],
+            settings[ATTR_CORE_VOLTAGE],
+        )
+        self._async_notify()
+
+    async def _async_sweep(self, request: AutoTuneRequest) -> None:
+        """Climb the frequency/voltage staircase, recording every point."""
+        frequency, core_voltage = request.min_frequency, request.min_core_voltage
+        # Best hashrate per MHz measured so far
+        reference: float | None = None
+
+        while (
+            frequency <= request.max_frequency
+            and core_voltage <= request.max_core_voltage
+        ):
+            point = await self._async_measure(frequency, core_voltage, request)
+
+            if reason := _limit(point, request):
+                _LOGGER.info(
+                    "Auto-tune of %s stops at %d MHz / %d mV: %s",
+                    self.coordinator.host,
+                    frequency,
+                    core_voltage,
+                    reason,
+                )
+                self._async_record(replace(point, stable=False))
+                return
+
+            ratio = point.hashrate / frequency
+            if reference is not None and ratio < reference * (1 - STABILITY_TOLERANCE):
+                self._async_record(replace(point, stable=False))
+                core_voltage += CORE_VOLTAGE_STEP
+                continue
+
+            reference = max(reference or 0.0, ratio)
+            self._async_record(point)
+            frequency += FREQUENCY_STEP
+
+    @callback
+    def _async_record(self, point: TunePoint) -> None:
+        assert self.request is not None
+        self.points.append(point)
+        self.best = best_point(self.points, self.request.target)
+        self._async_notify()
+
+    async def _async_measure(
+        self, frequency: int, core_voltage: int, request: AutoTuneRequest
+    ) -> TunePoint:
+        """Apply a frequency/voltage pair and measure it once settled.
+
+        Raises:
+            NerdQAxeApiError: If the miner does not accept the settings
+            TimeoutError: If the miner stops reporting data
+
+        """
+        self.step = (frequency, core_voltage)
+        self._async_notify()
+        await self.coordinator.settings.async_queue(
+            {ATTR_FREQUENCY: frequency, ATTR_CORE_VOLTAGE: core_voltage}
+        )
+
+        started = monotonic()
+        previous: MinerSnapshot | None = None
+        while True:
+            snapshot = await self._async_next_poll()
+            point = TunePoint(
+                frequency=frequency,
+                core_voltage=core_voltage,
+                hashrate=snapshot.hashrate_1m or 0.0,
+                power=snapshot.power or 0.0,
+                temp=snapshot.temp,
+                vr_temp=snapshot.vr_temp,
+            )
+            elapsed = monotonic() - started
+            # Never hold an overheating setting until it settles
+            if _temperature_limit(point, request) or elapsed >= SETTLE_TIMEOUT:
+                return point
+            if (
+                previous is not None
+                and elapsed >= SETTLE_MIN_TIME
+                and _settled(previous, snapshot)
+            ):
+                return point
+            previous = snapshot
+
+    async def _async_next_poll(self) -> MinerSnapshot:
+        """Wait for the next successful poll of the coordinator.
+
+        Push frames and optimistic settings writes update the coordinator
+        too, but only seconds apart: a slow metric like ``hashRate_1m``
+        would look settled between two of them.
+
+        Raises:
+            TimeoutError: If none arrives within ``SETTLE_TIMEOUT``
+
+        """
+        future: asyncio.Future[MinerSnapshot] = self.hass.loop.create_future()
+        polls = self.coordinator.poll_count
+
+        @callback
+        def _updated() -> None:
+            coordinator = self.coordinator
+            data = coordinator.data
+            if (
+                coordinator.poll_count != polls
+                and coordinator.last_update_success
+                and data
+                and not future.done()
+            ):
+                future.set_result(data)
+
+        remove_listener = self.coordinator.async_add_listener(_updated)
+        try:
+            async with asyncio.timeout(SETTLE_TIMEOUT):
+                return await future
+        finally:
+            remove_listener()
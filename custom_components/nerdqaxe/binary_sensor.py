@@ -5,7 +5,6 @@ from __future__ import annotations
 from collections.abc import Callable
 from dataclasses import dataclass
 import logging
-from typing import Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -13,18 +12,14 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import NerdQAxeConfigEntry, NerdQAxeDataUpdateCoordinator
-from .const import (
-    ATTR_POOL_CONNECTED,
-    ATTR_STRATUM,
-    ATTR_STRATUM_CONNECTED,
-    ATTR_STRATUM_POOLS,
-)
-from .pool import is_using_fallback
+from .const import ATTR_STRATUM
+from .pool import CONNECTION_STATE_KEYS, POOL_STATE_KEYS
+from .snapshot import MinerSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,46 +27,33 @@ _LOGGER = logging.getLogger(__name__)
 PARALLEL_UPDATES = 0
 
 
-def _is_stratum_connected(data: dict[str, Any]) -> bool:
-    """Return True if the miner is connected to a stratum pool.
-
-    Modern firmware exposes the connection state inside the nested
-    ``stratum.pools[].connected`` structure (one entry per pool in
-    fallback/dual-pool mode). The miner is considered connected as soon as any
-    configured pool reports ``connected``. A legacy flat ``isStratumConnected``
-    field is used as a fallback for older firmware.
-    """
-    stratum = data.get(ATTR_STRATUM) or {}
-    pools = stratum.get(ATTR_STRATUM_POOLS) or []
-    if pools:
-        return any(pool.get(ATTR_POOL_CONNECTED, False) for pool in pools)
-
-    # Legacy fallback for firmware exposing a flat boolean field
-    return bool(data.get(ATTR_STRATUM_CONNECTED, False))
-
-
 @dataclass(frozen=True, kw_only=True)
 class NerdQAxeBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Describes a NerdQAxe+ binary sensor entity.
 
-    ``value_fn`` derives the on/off state from the coordinator data dict, which
-    keeps all per-sensor logic declarative and in one place.
+    ``value_fn`` derives the on/off state from the coordinator snapshot, which
+    keeps all per-sensor logic declarative and in one place. ``source_keys``
+    lists the payload keys of the fields it reads, so the entity is only
+    notified when one of them changed.
     """
 
-    value_fn: Callable[[dict[str, Any]], bool]
+    value_fn: Callable[[MinerSnapshot], bool]
+    source_keys: frozenset[str]
 
 
 BINARY_SENSORS: tuple[NerdQAxeBinarySensorEntityDescription, ...] = (
     NerdQAxeBinarySensorEntityDescription(
         key="stratum_connected",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
-        value_fn=_is_stratum_connected,
+        value_fn=lambda data: data.pool.connected,
+        source_keys=CONNECTION_STATE_KEYS,
     ),
     NerdQAxeBinarySensorEntityDescription(
         key="using_fallback_pool",
         icon="mdi:swap-horizontal",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=is_using_fallback,
+        value_fn=lambda data: data.pool.using_fallback,
+        source_keys=POOL_STATE_KEYS,
     ),
 )
 
@@ -84,7 +66,9 @@ async def async_setup_entry(
     """Set up NerdQAxe+ Miner binary sensors from a config entry.
 
     Creates binary sensors for the Stratum pool connection status and for the
-    failover state (whether the fallback pool is currently in use).
+    failover state (whether the fallback pool is currently in use). Miners
+    reporting several pools also get a connection sensor per pool, added as
+    soon as a refresh reports the pool.
 
     Args:
         hass: Home Assistant instance
@@ -96,11 +80,43 @@ async def async_setup_entry(
 
     _LOGGER.debug("Setting up binary sensor entities for %s", coordinator.host)
 
-    entities = [
+    pools_added = 0
+
+    @callback
+    def _pool_entities() -> list[BinarySensorEntity]:
+        """Return the connection sensors of the pools not covered yet."""
+        nonlocal pools_added
+        pool_count = _pool_count(coordinator.data)
+        if pool_count <= pools_added:
+            return []
+        entities: list[BinarySensorEntity] = [
+            NerdQAxePoolConnectedBinarySensor(coordinator, index)
+            for index in range(pools_added, pool_count)
+        ]
+        pools_added = pool_count
+        return entities
+
+    entities: list[BinarySensorEntity] = [
         NerdQAxeBinarySensor(coordinator, description) for description in BINARY_SENSORS
     ]
-
+    entities.extend(_pool_entities())
     async_add_entities(entities)
+
+    @callback
+    def _async_discover_pools() -> None:
+        """Add the connection sensors of pools reported after setup."""
+        if new_entities := _pool_entities():
+            _LOGGER.info(
+                "Adding %d pool binary sensor entities for %s",
+                len(new_entities),
+                coordinator.host,
+            )
+            async_add_entities(new_entities)
+
+    entry.async_on_unload(
+        coordinator.async_add_listener(_async_discover_pools, frozenset({ATTR_STRATUM}))
+    )
+
     _LOGGER.info(
         "Successfully set up %d binary sensor entities for %s",
         len(entities),
@@ -108,6 +124,16 @@ async def async_setup_entry(
     )
 
 
+def _pool_count(data: MinerSnapshot | None) -> int:
+    """Return the number of pools worth a sensor each, 0 below two pools.
+
+    With a single pool its state is already the Stratum Connected sensor.
+    """
+    if data is None or len(data.stratum.pools) < 2:
+        return 0
+    return len(data.stratum.pools)
+
+
 class NerdQAxeBinarySensor(
     CoordinatorEntity[NerdQAxeDataUpdateCoordinator], BinarySensorEntity
 ):
@@ -134,7 +160,7 @@ class NerdQAxeBinarySensor(
             description: Binary sensor description (key, device class, value_fn)
 
         """
-        super().__init__(coordinator)
+        super().__init__(coordinator, description.source_keys)
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.unique_id_base}_{description.key}"
         self._attr_translation_key = description.key
@@ -151,3 +177,47 @@ class NerdQAxeBinarySensor(
         if not self.coordinator.data:
             return False
         return self.entity_description.value_fn(self.coordinator.data)
+
+
+class NerdQAxePoolConnectedBinarySensor(
+    CoordinatorEntity[NerdQAxeDataUpdateCoordinator], BinarySensorEntity
+):
+    """Connection state of one entry of ``stratum.pools[]``.
+
+    The name is resolved from ``translation_key`` with an ``index``
+    placeholder so it stays localized.
+    """
+
+    __slots__ = ("_index",)
+
+    _attr_has_entity_name = True
+    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator: NerdQAxeDataUpdateCoordinator, index: int) -> None:
+        """Initialize the per-pool connection sensor.
+
+        Args:
+            coordinator: Data update coordinator instance
+            index: Zero-based index into ``stratum.pools``
+
+        """
+        super().__init__(coordinator, frozenset({ATTR_STRATUM}))
+        self._index = index
+        self._attr_unique_id = f"{coordinator.unique_id_base}_pool_{index}_connected"
+        self._attr_translation_key = "pool_connected"
+        self._attr_translation_placeholders = {"index": str(index + 1)}
+        self._attr_device_info = coordinator.get_device_info()
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if the miner is connected to this pool.
+
+        Returns:
+            bool: Connection state, False if the pool is no longer reported
+
+        """
+        data = self.coordinator.data
+        if not data or self._index >= len(data.stratum.pools):
+            return False
+        return data.stratum.pools[self._index].connected
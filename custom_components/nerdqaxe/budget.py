@@ -0,0 +1,455 @@
+"""Fleet power budget shared by every NerdQAxe+ config entry.
+
+With a budget set (``nerdqaxe.set_power_budget``), the allocator follows a
+sensor giving the watts available to the miners (solar surplus, breaker
+limit) and distributes frequency/voltage settings across every loaded miner
+so the fleet stays under it while mining as much as it can.
+
+Each miner gets a ladder of operating points, from the eco floor (see the
+README: the ESP32, regulator and fan keep drawing a few watts) up to the
+settings it ran when it joined the budget, its nominal settings. The power
+of a point is estimated as ``IDLE_POWER + k * f * V²`` and its hashrate as
+``h * f``, with ``k`` and ``h`` calibrated per miner from its own readings.
+Every miner starts on its floor, and the step with the most hashrate per
+extra watt across the fleet is taken until the next one no longer fits:
+efficient miners are raised first and the power curve being convex, no
+miner is pushed far up its ladder while another has cheaper hashrate left.
+
+Settings are written through each miner's settings write queue, and only
+when the measured fleet power leaves a hysteresis band: above the budget
+the fleet is cut at once, below it by more than twice the margin it is
+raised again, at most every ``RAISE_INTERVAL``. Miners being auto-tuned
+are left alone, their power counted against the budget. Clearing the
+budget restores the nominal settings.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import heapq
+import logging
+from math import inf
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Final
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN, UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    EventStateChangedData,
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
+
+from .const import ATTR_CORE_VOLTAGE, ATTR_FREQUENCY, DATA_POWER_BUDGET, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import NerdQAxeDataUpdateCoordinator
+    from .snapshot import MinerSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lowest operating point, drawing about a third of full power
+ECO_FREQUENCY: Final = 100  # MHz
+ECO_CORE_VOLTAGE: Final = 1000  # mV
+# Draw of the ESP32, regulator and fan, whatever the ASIC settings, in W
+IDLE_POWER: Final = 4.5
+
+LEVEL_STEP: Final = 25  # MHz
+CORE_VOLTAGE_STEP: Final = 5  # mV
+
+DEFAULT_BUDGET_MARGIN: Final = 10.0  # W
+
+EVALUATION_INTERVAL: Final = timedelta(seconds=30)
+# Time after a settings change before the power reading, and the 10-minute
+# hashrate average, reflect the new settings, in s
+POWER_SETTLE_TIME: Final = 30
+HASHRATE_SETTLE_TIME: Final = 600
+# Shortest time between a change and the next raise or cut, in s. A cut
+# waits for the power readings of the previous change.
+RAISE_INTERVAL: Final = 120
+CUT_INTERVAL: Final = POWER_SETTLE_TIME
+
+STORAGE_KEY: Final = f"{DOMAIN}.power_budget"
+STORAGE_VERSION: Final = 1
+
+
+@dataclass(frozen=True, slots=True)
+class OperatingPoint:
+    """Frequency/voltage pair with its estimated power and hashrate."""
+
+    frequency: int
+    core_voltage: int
+    power: float  # W
+    hashrate: float  # GH/s
+
+
+@dataclass(slots=True, kw_only=True)
+class BudgetUnit:
+    """Power and hashrate model of one miner under the budget."""
+
+    nominal_frequency: int
+    nominal_core_voltage: int
+    # Dynamic power per MHz·V² above IDLE_POWER, and hashrate per MHz
+    power_factor: float = 0.0
+    hashrate_per_mhz: float = 0.0
+    # Ladder index of the settings written last, the top one by default
+    level: int | None = None
+    # Monotonic time of the last settings change
+    changed: float = -inf
+
+    def levels(self) -> list[OperatingPoint]:
+        """Return the operating points from the eco floor to the nominal one.
+
+        The voltage of the points in between is interpolated between the
+        floor and the nominal voltage.
+        """
+        top_frequency, top_voltage = self.nominal_frequency, self.nominal_core_voltage
+        if top_frequency <= ECO_FREQUENCY:
+            frequencies = [top_frequency]
+        else:
+            frequencies = [
+                *range(ECO_FREQUENCY, top_frequency, LEVEL_STEP),
+                top_frequency,
+            ]
+        points = []
+        for frequency in frequencies:
+            if frequency == top_frequency:
+                voltage = top_voltage
+            else:
+                ratio = (frequency - ECO_FREQUENCY) / (top_frequency - ECO_FREQUENCY)
+                interpolated = (
+                    ECO_CORE_VOLTAGE + (top_voltage - ECO_CORE_VOLTAGE) * ratio
+                )
+                voltage = min(
+                    round(interpolated / CORE_VOLTAGE_STEP) * CORE_VOLTAGE_STEP,
+                    top_voltage,
+                )
+            points.append(
+                OperatingPoint(
+                    frequency=frequency,
+                    core_voltage=voltage,
+                    power=IDLE_POWER
+                    + self.power_factor * frequency * (voltage / 1000) ** 2,
+                    hashrate=self.hashrate_per_mhz * frequency,
+                )
+            )
+        return points
+
+    def calibrate(self, snapshot: MinerSnapshot, now: float) -> None:
+        """Fit the model to the readings of the settings the miner runs.
+
+        Readings taken too soon after a settings change still reflect the
+        previous settings and are skipped.
+
+        Args:
+            snapshot: Latest snapshot of the miner
+            now: Current monotonic time
+
+        """
+        frequency, voltage = snapshot.frequency, snapshot.core_voltage
+        if not frequency or not voltage:
+            return
+        if snapshot.power and now - self.changed >= POWER_SETTLE_TIME:
+            self.power_factor = max(snapshot.power - IDLE_POWER, 0.1) / (
+                frequency * (voltage / 1000) ** 2
+            )
+        hashrate = snapshot.hashrate_10m or snapshot.hashrate
+        if hashrate and (
+            now - self.changed >= HASHRATE_SETTLE_TIME or not self.hashrate_per_mhz
+        ):
+            self.hashrate_per_mhz = hashrate / frequency
+
+
+def allocate(ladders: Sequence[Sequence[OperatingPoint]], budget: float) -> list[int]:
+    """Pick an operating point per miner maximizing hashrate within a budget.
+
+    Every miner starts on its lowest point; the step with the most extra
+    hashrate per extra watt across the fleet is taken until none fits.
+
+    Args:
+        ladders: Operating points of every miner, lowest first
+        budget: Power available to the miners, in W
+
+    Returns:
+        list: Index of the point picked for every miner. Miners stay on their
+        lowest point when even the floors do not fit.
+
+    """
+    picked = [0] * len(ladders)
+    total = sum(ladder[0].power for ladder in ladders)
+    candidates: list[tuple[float, int]] = []
+
+    def _push(index: int) -> None:
+        ladder, level = ladders[index], picked[index]
+        if level + 1 >= len(ladder):
+            return
+        extra_power = ladder[level + 1].power - ladder[level].power
+        extra_hashrate = ladder[level + 1].hashrate - ladder[level].hashrate
+        ratio = extra_hashrate / extra_power if extra_power > 0 else inf
+        heapq.heappush(candidates, (-ratio, index))
+
+    for index in range(len(ladders)):
+        _push(index)
+    while candidates:
+        _, index = heapq.heappop(candidates)
+        ladder, level = ladders[index], picked[index]
+        extra_power = ladder[level + 1].power - ladder[level].power
+        if total + extra_power > budget:
+            # The next steps of this miner only cost more
+            continue
+        total += extra_power
+        picked[index] = level + 1
+        _push(index)
+    return picked
+
+
+class NerdQAxePowerBudget:
+    """Keep the fleet power under the value of a budget sensor."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an allocator without budget.
+
+        Args:
+            hass: Home Assistant instance
+
+        """
+        self.hass = hass
+        self.store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.entity_id: str | None = None
+        self.margin = DEFAULT_BUDGET_MARGIN
+        # Keyed by the coordinator unique id base (the miner MAC)
+        self.units: dict[str, BudgetUnit] = {}
+        self.last_change = -inf
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    async def async_load(self) -> None:
+        """Restore the budget and the nominal settings of its miners."""
+        if (stored := await self.store.async_load()) is None:
+            return
+        self.margin = stored["margin"]
+        self.units = {
+            unique_id: BudgetUnit(
+                nominal_frequency=frequency, nominal_core_voltage=voltage
+            )
+            for unique_id, (frequency, voltage) in stored["nominal"].items()
+        }
+        if stored["entity_id"]:
+            self.entity_id = stored["entity_id"]
+            self._async_start()
+
+    @callback
+    def _async_save(self) -> None:
+        self.store.async_delay_save(
+            lambda: {
+                "entity_id": self.entity_id,
+                "margin": self.margin,
+                "nominal": {
+                    unique_id: [unit.nominal_frequency, unit.nominal_core_voltage]
+                    for unique_id, unit in self.units.items()
+                },
+            },
+            1,
+        )
+
+    @callback
+    def async_set(self, entity_id: str, margin: float) -> None:
+        """Follow a budget sensor.
+
+        Args:
+            entity_id: Sensor giving the power available to the miners
+            margin: Headroom kept under the budget, in W; also the width of
+                the hysteresis band
+
+        """
+        self._async_stop()
+        self.entity_id = entity_id
+        self.margin = margin
+        self.last_change = -inf
+        self._async_save()
+        self._async_start()
+        _LOGGER.info("Following power budget %s (margin %s W)", entity_id, margin)
+        self.async_evaluate()
+
+    @callback
+    def async_clear(self) -> None:
+        """Stop following the budget and restore the nominal settings."""
+        self._async_stop()
+        self.entity_id = None
+        for coordinator in self._async_coordinators():
+            if (unit := self.units.get(coordinator.unique_id_base)) is not None:
+                coordinator.settings.async_queue(
+                    {
+                        ATTR_FREQUENCY: unit.nominal_frequency,
+                        ATTR_CORE_VOLTAGE: unit.nominal_core_voltage,
+                    }
+                )
+        self.units = {}
+        self._async_save()
+        _LOGGER.info("Power budget cleared, nominal settings restored")
+
+    @callback
+    def _async_start(self) -> None:
+        assert self.entity_id is not None
+
+        @callback
+        def _async_budget_changed(_event: Event[EventStateChangedData]) -> None:
+            self.async_evaluate()
+
+        @callback
+        def _async_tick(_now: datetime) -> None:
+            self.async_evaluate()
+
+        self._unsubs = [
+            async_track_state_change_event(
+                self.hass, self.entity_id, _async_budget_changed
+            ),
+            async_track_time_interval(self.hass, _async_tick, EVALUATION_INTERVAL),
+        ]
+
+    @callback
+    def _async_stop(self) -> None:
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @property
+    def budget(self) -> float | None:
+        """Return the power available to the miners in W, None if unknown."""
+        if self.entity_id is None:
+            return None
+        state = self.hass.states.get(self.entity_id)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            value = float(state.state)
+        except ValueError:
+            return None
+        unit = state.attributes.get("unit_of_measurement")
+        if unit == UnitOfPower.KILO_WATT:
+            value *= 1000
+        return value
+
+    @callback
+    def _async_coordinators(self) -> list[NerdQAxeDataUpdateCoordinator]:
+        """Return the coordinators of the loaded miners."""
+        return [
+            entry.runtime_data.coordinator
+            for entry in self.hass.config_entries.async_loaded_entries(DOMAIN)
+        ]
+
+    @callback
+    def async_evaluate(self) -> None:
+        """Reallocate the budget if the fleet power left the hysteresis band."""
+        if (budget := self.budget) is None:
+            return
+        now = monotonic()
+
+        managed: list[tuple[NerdQAxeDataUpdateCoordinator, BudgetUnit]] = []
+        fixed = measured = 0.0
+        for entry in self.hass.config_entries.async_loaded_entries(DOMAIN):
+            coordinator = entry.runtime_data.coordinator
+            data = coordinator.data
+            if data is None or not coordinator.last_update_success:
+                continue
+            measured += data.power or 0.0
+            if entry.runtime_data.autotune.running:
+                fixed += data.power or 0.0
+                continue
+            if (unit := self._async_unit(coordinator)) is not None:
+                managed.append((coordinator, unit))
+
+        since_change = now - self.last_change
+        if measured > budget:
+            if since_change < CUT_INTERVAL:
+                return
+        elif measured < budget - 2 * self.margin:
+            if since_change < RAISE_INTERVAL:
+                return
+        else:
+            return
+
+        for coordinator, unit in managed:
+            unit.calibrate(coordinator.data, now)
+        ladders = [unit.levels() for _, unit in managed]
+        picked = allocate(ladders, budget - self.margin - fixed)
+
+        changes = 0
+        for (coordinator, unit), ladder, level in zip(
+            managed, ladders, picked, strict=True
+        ):
+            if level == unit.level:
+                continue
+            point = ladder[level]
+            coordinator.settings.async_queue(
+                {
+                    ATTR_FREQUENCY: point.frequency,
+                    ATTR_CORE_VOLTAGE: point.core_voltage,
+                }
+            )
+            unit.level = level
+            unit.changed = now
+            changes += 1
+        if changes:
+            self.last_change = now
+            _LOGGER.info(
+                "Fleet drawing %.1f W for a %.1f W budget, moved %d miners to an "
+                "estimated %.1f W",
+                measured,
+                budget,
+                changes,
+                fixed
+                + sum(
+                    ladder[level].power
+                    for ladder, level in zip(ladders, picked, strict=True)
+                ),
+            )
+
+    @callback
+    def _async_unit(
+        self, coordinator: NerdQAxeDataUpdateCoordinator
+    ) -> BudgetUnit | None:
+        """Return the model of a miner, registering it on first sight.
+
+        A miner joins with the settings it runs as its nominal ones.
+        """
+        unique_id = coordinator.unique_id_base
+        if (unit := self.units.get(unique_id)) is not None:
+            return unit
+        data = coordinator.data
+        if data is None or not data.frequency or not data.core_voltage:
+            return None
+        unit = self.units[unique_id] = BudgetUnit(
+            nominal_frequency=int(data.frequency),
+            nominal_core_voltage=int(data.core_voltage),
+        )
+        unit.level = len(unit.levels()) - 1
+        self._async_save()
+        return unit
+
+    def as_dict(self, coordinator: NerdQAxeDataUpdateCoordinator) -> dict[str, Any]:
+        """Return the budget and the model of one miner, for diagnostics."""
+        unit = self.units.get(coordinator.unique_id_base)
+        point = None
+        if unit is not None and unit.level is not None:
+            point = unit.levels()[unit.level]
+        return {
+            "entity_id": self.entity_id,
+            "budget": self.budget,
+            "margin": self.margin,
+            "nominal": [unit.nominal_frequency, unit.nominal_core_voltage]
+            if unit
+            else None,
+            "power_factor": unit.power_factor if unit else None,
+            "hashrate_per_mhz": unit.hashrate_per_mhz if unit else None,
+            "allocated": [point.frequency, point.core_voltage] if point else None,
+        }
+
+
+@callback
+def async_get_power_budget(hass: HomeAssistant) -> NerdQAxePowerBudget:
+    """Return the hass-wide power budget, creating it on first use."""
+    if (budget := hass.data.get(DATA_POWER_BUDGET)) is None:
+        budget = hass.data[DATA_POWER_BUDGET] = NerdQAxePowerBudget(hass)
+    return budget
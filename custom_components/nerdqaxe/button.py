@@ -73,7 +73,8 @@ class NerdQAxeRestartButton(
             coordinator: Data update coordinator instance
 
         """
-        super().__init__(coordinator)
+        # Stateless: only availability changes need to reach the button.
+        super().__init__(coordinator, frozenset())
         self._attr_unique_id = f"{coordinator.unique_id_base}_restart"
         self._attr_translation_key = "restart"
         self._attr_device_info = coordinator.get_device_info()
@@ -14,21 +14,37 @@ from homeassistant.config_entries import (
     OptionsFlow,
 )
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
 import voluptuous as vol
 
 from .const import (
     API_SYSTEM_INFO,
+    CONF_ADAPTIVE_POLLING,
+    CONF_COMPACT_ASIC_TEMPS,
     CONF_HOST,
+    CONF_IMPORT_STATISTICS,
+    CONF_MAX_CONCURRENT_POLLS,
+    CONF_PUSH_UPDATES,
     CONF_SCAN_INTERVAL,
+    CONF_STATISTICS_WINDOW,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_COMPACT_ASIC_TEMPS,
+    DEFAULT_IMPORT_STATISTICS,
+    DEFAULT_MAX_CONCURRENT_POLLS,
     DEFAULT_NAME,
+    DEFAULT_PUSH_UPDATES,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATISTICS_WINDOW,
     DOMAIN,
+    MAX_MAX_CONCURRENT_POLLS,
     MAX_SCAN_INTERVAL,
+    MAX_STATISTICS_WINDOW,
+    MIN_MAX_CONCURRENT_POLLS,
     MIN_SCAN_INTERVAL,
+    MIN_STATISTICS_WINDOW,
 )
 from .exceptions import NerdQAxeConnectionError
+from .session import async_get_miner_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -51,7 +67,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 
     """
     host = data[CONF_HOST]
-    session = async_get_clientsession(hass)
+    session = async_get_miner_session(hass)
 
     _LOGGER.debug("Validating connection to NerdQAxe+ miner at %s", host)
 
@@ -270,7 +286,10 @@ class NerdQAxeConfigFlow(ConfigFlow, domain=DOMAIN):
 class NerdQAxeOptionsFlow(OptionsFlow):
     """Handle options flow for NerdQAxe+ integration.
 
-    Allows users to configure scan interval after initial setup.
+    Allows users to configure the scan interval, the fleet-wide poll
+    concurrency limit, the optional push transport, adaptive polling, the
+    rolling statistics window, the hourly statistics import and the compact
+    per-ASIC temperatures after initial setup.
     """
 
     async def async_step_init(
@@ -301,6 +320,50 @@ class NerdQAxeOptionsFlow(OptionsFlow):
                         vol.Coerce(int),
                         vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
                     ),
+                    vol.Optional(
+                        CONF_MAX_CONCURRENT_POLLS,
+                        default=self.config_entry.options.get(
+                            CONF_MAX_CONCURRENT_POLLS, DEFAULT_MAX_CONCURRENT_POLLS
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(
+                            min=MIN_MAX_CONCURRENT_POLLS, max=MAX_MAX_CONCURRENT_POLLS
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_PUSH_UPDATES,
+                        default=self.config_entry.options.get(
+                            CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=self.config_entry.options.get(
+                            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_STATISTICS_WINDOW,
+                        default=self.config_entry.options.get(
+                            CONF_STATISTICS_WINDOW, DEFAULT_STATISTICS_WINDOW
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_STATISTICS_WINDOW, max=MAX_STATISTICS_WINDOW),
+                    ),
+                    vol.Optional(
+                        CONF_IMPORT_STATISTICS,
+                        default=self.config_entry.options.get(
+                            CONF_IMPORT_STATISTICS, DEFAULT_IMPORT_STATISTICS
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_COMPACT_ASIC_TEMPS,
+                        default=self.config_entry.options.get(
+                            CONF_COMPACT_ASIC_TEMPS, DEFAULT_COMPACT_ASIC_TEMPS
+                        ),
+                    ): bool,
                 }
             ),
         )
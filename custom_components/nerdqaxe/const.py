@@ -2,16 +2,35 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Final
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Final
+
+from homeassistant.util.hass_dict import HassKey
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
 
+    from .autotune import AutoTuner
+    from .budget import NerdQAxePowerBudget
     from .coordinator import NerdQAxeDataUpdateCoordinator
+    from .releases import NerdQAxeReleaseIndex
+    from .rollout import NerdQAxeFirmwareRollout
+    from .scheduler import NerdQAxeFleetScheduler
+    from .session import NerdQAxeMinerPool
 
 DOMAIN: Final = "nerdqaxe"
 
+# Hass-wide state shared by every config entry of the integration
+DATA_FLEET_SCHEDULER: HassKey[NerdQAxeFleetScheduler] = HassKey(
+    f"{DOMAIN}_fleet_scheduler"
+)
+DATA_MINER_POOL: HassKey[NerdQAxeMinerPool] = HassKey(f"{DOMAIN}_miner_pool")
+DATA_POWER_BUDGET: HassKey[NerdQAxePowerBudget] = HassKey(f"{DOMAIN}_power_budget")
+DATA_RELEASE_INDEX: HassKey[NerdQAxeReleaseIndex] = HassKey(f"{DOMAIN}_release_index")
+DATA_FIRMWARE_ROLLOUT: HassKey[NerdQAxeFirmwareRollout] = HassKey(
+    f"{DOMAIN}_firmware_rollout"
+)
+
 # ConfigEntry typé (Platinum)
 type NerdQAxeConfigEntry = ConfigEntry[NerdQAxeRuntimeData]
 
@@ -21,17 +40,45 @@ class NerdQAxeRuntimeData:
     """Runtime data stored on the config entry."""
 
     coordinator: NerdQAxeDataUpdateCoordinator
+    autotune: AutoTuner
+    # Options the entry was set up with or last updated to
+    options: dict[str, Any] = field(default_factory=dict)
 
 
 # Config
 CONF_HOST: Final = "host"
 CONF_SCAN_INTERVAL: Final = "scan_interval"
+CONF_MAX_CONCURRENT_POLLS: Final = "max_concurrent_polls"
+CONF_PUSH_UPDATES: Final = "push_updates"
+CONF_ADAPTIVE_POLLING: Final = "adaptive_polling"
+CONF_STATISTICS_WINDOW: Final = "statistics_window"
+CONF_IMPORT_STATISTICS: Final = "import_statistics"
+CONF_COMPACT_ASIC_TEMPS: Final = "compact_asic_temps"
 
 # Defaults
 DEFAULT_SCAN_INTERVAL: Final = 30
 DEFAULT_NAME: Final = "NerdQAxe+ Miner"
 MIN_SCAN_INTERVAL: Final = 5
 MAX_SCAN_INTERVAL: Final = 300
+# Polls allowed in flight at once across every configured miner. The lowest
+# value among the loaded entries applies to the whole fleet.
+DEFAULT_MAX_CONCURRENT_POLLS: Final = 4
+MIN_MAX_CONCURRENT_POLLS: Final = 1
+MAX_MAX_CONCURRENT_POLLS: Final = 32
+DEFAULT_PUSH_UPDATES: Final = False
+DEFAULT_ADAPTIVE_POLLING: Final = False
+# Rolling statistics window, in minutes
+DEFAULT_STATISTICS_WINDOW: Final = 60
+MIN_STATISTICS_WINDOW: Final = 5
+MAX_STATISTICS_WINDOW: Final = 240
+DEFAULT_IMPORT_STATISTICS: Final = False
+DEFAULT_COMPACT_ASIC_TEMPS: Final = False
+
+# Ranges the firmware accepts for the ASIC settings
+FREQUENCY_MIN: Final = 1
+FREQUENCY_MAX: Final = 1000
+CORE_VOLTAGE_MIN: Final = 900
+CORE_VOLTAGE_MAX: Final = 1350
 
 # API Endpoints
 API_SYSTEM_INFO: Final = "/api/system/info"
@@ -40,6 +87,9 @@ API_SYSTEM_INFO: Final = "/api/system/info"
 API_SYSTEM: Final = "/api/system"
 API_SYSTEM_RESTART: Final = "/api/system/restart"
 API_OTA_GITHUB: Final = "/api/system/OTA/github"  # Combined factory OTA (fw + www)
+# Live stream. Besides log lines, frames that are JSON objects carry a partial
+# ``/api/system/info`` payload with the fields that changed.
+API_WEBSOCKET: Final = "/api/ws"
 
 # Attributes
 ATTR_HASHRATE: Final = "hashRate"
@@ -110,6 +160,25 @@ ATTR_FREQUENCY: Final = "frequency"
 ATTR_VERSION: Final = "version"
 ATTR_UPTIME: Final = "uptimeSeconds"
 
+# Near-static configuration and identity fields. They arrive in every
+# ``/api/system/info`` payload but only change through a settings PATCH, a
+# reboot or an OTA, so the coordinator decodes them at a slow tier and carries
+# them over unparsed between telemetry polls.
+CONFIG_KEYS: Final = frozenset(
+    {
+        ATTR_STRATUM_URL,
+        ATTR_STRATUM_PORT,
+        ATTR_STRATUM_USER,
+        ATTR_FALLBACK_STRATUM_URL,
+        ATTR_FALLBACK_STRATUM_PORT,
+        ATTR_FALLBACK_STRATUM_USER,
+        ATTR_HOSTNAME,
+        ATTR_DEVICE_MODEL,
+        ATTR_VERSION,
+        ATTR_FAN_COUNT,
+    }
+)
+
 # GitHub
 GITHUB_REPO: Final = "shufps/ESP-Miner-NerdQAxePlus"
 GITHUB_API_URL: Final = f"https://api.github.com/repos/{GITHUB_REPO}/releases"
@@ -2,51 +2,130 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable, Coroutine
+from contextlib import suppress
+from dataclasses import replace
 from datetime import timedelta
 import logging
-from typing import TYPE_CHECKING, Any, cast
+from time import monotonic
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util.json import json_loads
 
+from .adaptive import AdaptivePollInterval
 from .const import (
     API_SYSTEM_INFO,
+    API_WEBSOCKET,
     ATTR_DEVICE_MODEL,
+    ATTR_UPTIME,
     ATTR_VERSION,
+    CONFIG_KEYS,
+    DEFAULT_STATISTICS_WINDOW,
     DOMAIN,
 )
+from .efficiency import PowerAverager
 from .exceptions import (
     NerdQAxeApiError,
     NerdQAxeConnectionError,
     NerdQAxeTimeoutError,
 )
+from .ota import OTA_PROBE_INTERVAL, OtaPhase, OtaProgress
+from .session import TIMEOUT_TOTAL, async_get_miner_session
+from .settings import SettingsWriteQueue
+from .snapshot import SNAPSHOT_KEYS, MinerSnapshot
+from .telemetry import TelemetryBuffer
 
 if TYPE_CHECKING:
     from aiohttp import ClientSession
 
     from .const import NerdQAxeConfigEntry
+    from .scheduler import NerdQAxeFleetScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 # Debounce requests by 1 second to avoid hammering the device
 REQUEST_REFRESH_DEBOUNCE = 1.0
 
-# Timeout configuration (seconds). The miner is a LAN device, so keep the
-# timeouts short: a long connect timeout delays Home Assistant startup
-# (the first refresh is awaited during config entry setup).
-TIMEOUT_CONNECT = 5  # Time to establish connection
-TIMEOUT_TOTAL = 15  # Total request time including response
+# Push mode. Lost sockets are retried with an exponential backoff, and while
+# the stream is live a full poll still runs every so often to pick up fields
+# the stream does not carry.
+PUSH_HEARTBEAT = 30
+PUSH_RECONNECT_MIN = 5
+PUSH_RECONNECT_MAX = 300
+PUSH_FULL_REFRESH_INTERVAL = 300
 
+# Slow tier: how long the configuration fields (``CONFIG_KEYS``) are carried
+# over from the last full decode before being decoded again. A settings
+# write, a tracked OTA or a reboot brings the full decode forward.
+CONFIG_REFRESH_INTERVAL = 600
 
-class NerdQAxeDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+# Fields decoded from every poll between two slow-tier refreshes
+TELEMETRY_KEYS = SNAPSHOT_KEYS - CONFIG_KEYS
+
+
+def decode_payload(body: bytes, keys: frozenset[str] = SNAPSHOT_KEYS) -> dict[str, Any]:
+    """Decode a raw ``/api/system/info`` body, keeping only ``keys``.
+
+    The body is parsed in one pass by Home Assistant's JSON loader (orjson)
+    straight from the bytes, with no intermediate ``str``. Fields no entity
+    reads are dropped so they are neither diffed nor kept in memory.
+
+    Args:
+        body: Raw response body
+        keys: Payload keys to keep, ``SNAPSHOT_KEYS`` by default
+
+    Returns:
+        dict: The projected payload
+
+    Raises:
+        NerdQAxeApiError: If the body is not a JSON object
+
+    """
+    try:
+        payload = json_loads(body)
+    except ValueError as err:
+        raise NerdQAxeApiError(f"Invalid JSON payload: {err}") from err
+    if not isinstance(payload, dict):
+        raise NerdQAxeApiError(f"Expected a JSON object, got {type(payload).__name__}")
+    return {key: payload[key] for key in keys if key in payload}
+
+
+class NerdQAxeDataUpdateCoordinator(DataUpdateCoordinator[MinerSnapshot]):
     """Class to manage fetching NerdQAxe+ Miner data from API.
 
     Handles periodic polling of the miner's REST API endpoint and distributes
-    data to all platform entities via the coordinator pattern.
+    data to all platform entities via the coordinator pattern. When a fleet
+    scheduler is given, it decides when each scheduled poll runs and bounds
+    how many miners are polled at once. An optional push transport feeds
+    incremental updates from the miner's WebSocket stream in between polls.
+    In adaptive mode the update interval is recomputed after every poll (see
+    ``adaptive.py``), and while a firmware update runs the miner is probed
+    at a short interval until it is back on the new version (see
+    ``ota.py``).
+
+    Every snapshot is also recorded into a fixed-size telemetry buffer
+    holding rolling statistics of the key metrics (see ``telemetry.py``) and
+    into the power history its efficiency is resolved from (see
+    ``efficiency.py``), and settings changes go through a queue merging them
+    into batched PATCH requests (see ``settings.py``).
+
+    Polls are decoded in two tiers. Telemetry is decoded from every poll,
+    while configuration and identity fields (``CONFIG_KEYS``) are only
+    decoded at a slow tier, after a settings write, while an OTA is tracked
+    or after a reboot; in between, they are carried over from the previous
+    snapshot without being projected or parsed.
+
+    Listeners registered with a ``frozenset`` of payload keys as context are
+    indexed by those keys, and after a refresh only the listeners whose keys
+    changed are called back. Listeners without keys are always notified, and
+    everyone is notified when availability changes.
     """
 
     config_entry: NerdQAxeConfigEntry
@@ -56,6 +135,10 @@ class NerdQAxeDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         hass: HomeAssistant,
         host: str,
         scan_interval: int,
+        scheduler: NerdQAxeFleetScheduler | None = None,
+        adaptive: bool = False,
+        statistics_window: int = DEFAULT_STATISTICS_WINDOW,
+        import_statistics: bool = False,
     ) -> None:
         """Initialize the data update coordinator.
 
@@ -63,11 +146,42 @@ class NerdQAxeDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             hass: Home Assistant instance
             host: Miner hostname or IP address
             scan_interval: Update interval in seconds
+            scheduler: Fleet scheduler owning the poll timing, if any
+            adaptive: Adapt the interval to failures and metric volatility
+            statistics_window: Rolling statistics window in minutes
+            import_statistics: Import hourly statistics of the measurement
+                sensors and throttle their state writes (see ``longterm.py``)
 
         """
         self.host = host
-        self.session: ClientSession = async_get_clientsession(hass)
+        self.scheduler = scheduler
+        self.scan_interval = scan_interval
+        self.adaptive = AdaptivePollInterval(scan_interval) if adaptive else None
+        # Samples at least half a scan interval apart: every regular poll is
+        # recorded, bursts of push updates or fast adaptive polls are thinned.
+        self.telemetry = TelemetryBuffer(statistics_window * 60, scan_interval / 2)
+        # Power history the windowed efficiency is computed from
+        self.power = PowerAverager()
+        self.import_statistics = import_statistics
+        self.push_connected = False
+        # Completed polls, telling their updates apart from push frames and
+        # optimistic settings writes
+        self.poll_count = 0
+        # Firmware update being followed, polled at the probe interval
+        self.ota: OtaProgress | None = None
+        self._ota_changed = False
+        self._push_task: asyncio.Task[None] | None = None
+        self._last_full_refresh = monotonic()
+        self._key_listeners: dict[str, set[CALLBACK_TYPE]] = {}
+        self._keyless_listeners: set[CALLBACK_TYPE] = set()
+        self._dispatched_data: MinerSnapshot | None = None
+        self._dispatched_success = True
+        self._schema_errors_reported: frozenset[str] = frozenset()
+        # Monotonic time of the last full decode, None to force the next one
+        self._config_refreshed: float | None = None
+        self.session: ClientSession = async_get_miner_session(hass)
         self.base_url = f"http://{host}"
+        self.settings = SettingsWriteQueue(self)
 
         super().__init__(
             hass,
@@ -116,10 +230,9 @@ class NerdQAxeDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         sw_version: str | None = None
         model = "Unknown"
         if self.data:
-            model = self.data.get(ATTR_DEVICE_MODEL, "Unknown")
-            version = self.data.get(ATTR_VERSION)
-            if isinstance(version, str):
-                sw_version = version.lstrip("v")
+            model = self.data.device_model or "Unknown"
+            if self.data.version is not None:
+                sw_version = self.data.version.lstrip("v")
 
         return DeviceInfo(
             identifiers={(DOMAIN, self.unique_id_base)},
@@ -131,31 +244,466 @@ class NerdQAxeDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             configuration_url=f"http://{self.host}",
         )
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    @callback
+    def async_start_device_updates(self) -> CALLBACK_TYPE:
+        """Keep the device registry entry in sync with the reported identity.
+
+        Entities only pass the device info when they are first added, so a
+        new firmware version (after an OTA update) or model would otherwise
+        only show up after a reload.
+
+        Returns:
+            CALLBACK_TYPE: Callback stopping the updates
+
+        """
+        return self.async_add_listener(
+            self._async_update_device, frozenset({ATTR_VERSION, ATTR_DEVICE_MODEL})
+        )
+
+    @callback
+    def _async_update_device(self) -> None:
+        """Write the current firmware version and model to the device registry."""
+        if not self.data:
+            return
+        device_registry = dr.async_get(self.hass)
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, self.unique_id_base)}
+        )
+        if device is None:
+            return
+        info = self.get_device_info()
+        if (device.sw_version, device.model) == (info["sw_version"], info["model"]):
+            return
+        _LOGGER.info(
+            "Updating device info of %s: firmware %s, model %s",
+            self.host,
+            info["sw_version"],
+            info["model"],
+        )
+        device_registry.async_update_device(
+            device.id, sw_version=info["sw_version"], model=info["model"]
+        )
+
+    @callback
+    def async_invalidate_config(self) -> None:
+        """Decode the configuration fields again on the next poll.
+
+        Called after writing settings to the miner, so the change shows up
+        without waiting for the slow tier.
+        """
+        self._config_refreshed = None
+
+    def _decode_tiers(self, body: bytes) -> MinerSnapshot:
+        """Decode a polled body, leaving out the configuration tier if not due.
+
+        Args:
+            body: Raw ``/api/system/info`` response body
+
+        Returns:
+            MinerSnapshot: The polled snapshot, carrying over the previous
+            configuration fields between slow-tier refreshes
+
+        """
+        now = monotonic()
+        previous = self.data
+        if (
+            previous is not None
+            and self.ota is None
+            and self._config_refreshed is not None
+            and now - self._config_refreshed < CONFIG_REFRESH_INTERVAL
+        ):
+            data = decode_payload(body, TELEMETRY_KEYS)
+            uptime = data.get(ATTR_UPTIME)
+            # A reboot (e.g. an OTA started from the miner's web UI) may
+            # have changed the firmware version: decode everything again.
+            if not (
+                isinstance(uptime, int)
+                and previous.uptime is not None
+                and uptime < previous.uptime
+            ):
+                _LOGGER.debug("Received telemetry from %s: %s", self.host, data)
+                return previous.merge(data)
+
+        data = decode_payload(body)
+        _LOGGER.debug("Received data from %s: %s", self.host, data)
+        self._config_refreshed = now
+        return MinerSnapshot.from_payload(data)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, indexing the listener by its source keys.
+
+        Args:
+            update_callback: Callback invoked when the listener must update
+            context: ``frozenset`` of payload keys the listener reads, if any
+
+        Returns:
+            Callback removing the listener
+
+        """
+        remove_listener = super().async_add_listener(update_callback, context)
+        keys: frozenset[str] | None = (
+            context if isinstance(context, frozenset) else None
+        )
+
+        if keys is None:
+            self._keyless_listeners.add(update_callback)
+        for key in keys or ():
+            self._key_listeners.setdefault(key, set()).add(update_callback)
+
+        @callback
+        def _remove_listener() -> None:
+            remove_listener()
+            self._keyless_listeners.discard(update_callback)
+            for key in keys or ():
+                if listeners := self._key_listeners.get(key):
+                    listeners.discard(update_callback)
+                    if not listeners:
+                        del self._key_listeners[key]
+
+        return _remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners affected by the latest update.
+
+        The new snapshot is diffed against the one last dispatched, and only
+        listeners indexed under a changed key (plus keyless ones) are called.
+        """
+        previous, self._dispatched_data = self._dispatched_data, self.data
+        availability_changed = self._dispatched_success != self.last_update_success
+        self._dispatched_success = self.last_update_success
+
+        if (
+            previous is None
+            or self.data is None
+            or availability_changed
+            or not self.last_update_success
+        ):
+            super().async_update_listeners()
+            return
+
+        to_notify = set(self._keyless_listeners)
+        for key in self.data.changed_keys(previous):
+            to_notify.update(self._key_listeners.get(key, ()))
+        # The progress of a firmware update is reported with the version
+        if self._ota_changed:
+            self._ota_changed = False
+            to_notify.update(self._key_listeners.get(ATTR_VERSION, ()))
+
+        for update_callback in to_notify:
+            update_callback()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll on the fleet scheduler's phase grid.
+
+        Without a scheduler, the base coordinator's own timer is used.
+        """
+        if self.scheduler is None:
+            super()._schedule_refresh()
+            return
+
+        if self.update_interval is None:
+            return
+
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+
+        self._async_unsub_refresh()
+        self._unsub_refresh = self.hass.loop.call_at(
+            self.scheduler.next_poll_time(self), self._handle_scheduled_poll
+        ).cancel
+
+    @callback
+    def _handle_scheduled_poll(self) -> None:
+        """Run a poll placed by the fleet scheduler."""
+        self.async_create_background_task(
+            self._handle_refresh_interval(), f"{DOMAIN} {self.host} scheduled refresh"
+        )
+
+    @callback
+    def async_create_background_task(
+        self, target: Coroutine[Any, Any, None], name: str
+    ) -> asyncio.Task[None]:
+        """Run a task tied to the config entry (cancelled on unload)."""
+        if self.config_entry:
+            return self.config_entry.async_create_background_task(
+                self.hass, target, name, eager_start=True
+            )
+        return self.hass.async_create_background_task(target, name, eager_start=True)
+
+    @callback
+    def async_start_push(self) -> None:
+        """Start listening to the miner's live stream in the background.
+
+        The task lives as long as the config entry. Polling keeps running
+        underneath: every pushed update postpones the next scheduled poll, so
+        polls only happen once the stream goes quiet or drops.
+        """
+        self._push_task = self.async_create_background_task(
+            self._async_push_loop(), f"{DOMAIN} {self.host} push updates"
+        )
+
+    async def async_stop_push(self) -> None:
+        """Stop listening to the miner's live stream, leaving polling only.
+
+        The push task is awaited so its socket is closed before the miner
+        connection pool it belongs to may be closed.
+        """
+        if (task := self._push_task) is not None:
+            self._push_task = None
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+            self.push_connected = False
+
+    async def async_shutdown(self) -> None:
+        """Send queued settings, then stop the push stream and scheduled polls."""
+        await self.settings.async_flush()
+        self.settings.async_cancel()
+        await self.async_stop_push()
+        await super().async_shutdown()
+
+    @callback
+    def async_configure(
+        self, scan_interval: int, adaptive: bool, statistics_window: int
+    ) -> None:
+        """Apply new polling options to the running coordinator.
+
+        The pending poll is rescheduled at the new interval, and the telemetry
+        buffer is resized, keeping the samples that still fit. An adaptive
+        interval in effect is kept if the configured interval did not change.
+
+        Args:
+            scan_interval: Update interval in seconds
+            adaptive: Adapt the interval to failures and metric volatility
+            statistics_window: Rolling statistics window in minutes
+
+        """
+        self.scan_interval = scan_interval
+        if not adaptive:
+            self.adaptive = None
+        elif self.adaptive is None or self.adaptive.base != scan_interval:
+            self.adaptive = AdaptivePollInterval(scan_interval)
+
+        window, spacing = statistics_window * 60, scan_interval / 2
+        if (window, spacing) != (self.telemetry.window, self.telemetry.spacing):
+            self.telemetry = self.telemetry.resized(window, spacing)
+
+        # A firmware update keeps probing until it is over
+        if self.ota is None:
+            self._async_restore_interval()
+
+    @callback
+    def async_track_ota(self, version: str) -> None:
+        """Follow a firmware update the miner accepted (see ``ota.py``).
+
+        The miner is probed every ``OTA_PROBE_INTERVAL`` until it runs
+        ``version`` or the update fails, then the configured schedule resumes.
+
+        Args:
+            version: Version the miner is updated to
+
+        """
+        self.ota = OtaProgress(version, monotonic())
+        self._ota_changed = True
+        self._async_set_interval(OTA_PROBE_INTERVAL)
+        if self._unsub_refresh is not None:
+            self._schedule_refresh()
+
+    @callback
+    def _async_update_ota(self, phase: OtaPhase) -> None:
+        """Apply the phase of the tracked update after a poll."""
+        assert self.ota is not None
+        self._ota_changed = True
+        if not self.ota.finished:
+            return
+
+        if phase is OtaPhase.DONE:
+            _LOGGER.info("%s now runs firmware %s", self.host, self.ota.version)
+        else:
+            _LOGGER.warning(
+                "Firmware update of %s to %s did not complete",
+                self.host,
+                self.ota.version,
+            )
+        self.ota = None
+        self._async_restore_interval()
+
+    @callback
+    def _async_restore_interval(self) -> None:
+        """Return to the configured, or adapted, poll interval."""
+        seconds = self.adaptive.interval if self.adaptive else self.scan_interval
+        if timedelta(seconds=seconds) != self.update_interval:
+            self._async_set_interval(seconds)
+            if self._unsub_refresh is not None:
+                self._schedule_refresh()
+
+    async def _async_push_loop(self) -> None:
+        """Keep the push socket connected, backing off while it fails."""
+        delay = PUSH_RECONNECT_MIN
+        while True:
+            try:
+                await self._async_consume_push()
+            except (aiohttp.ClientError, TimeoutError) as err:
+                _LOGGER.debug(
+                    "Push stream from %s unavailable: %s", self.host, type(err).__name__
+                )
+
+            if self.push_connected:
+                self.push_connected = False
+                delay = PUSH_RECONNECT_MIN
+                _LOGGER.info(
+                    "Push stream from %s dropped, falling back to polling", self.host
+                )
+                await self.async_request_refresh()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, PUSH_RECONNECT_MAX)
+
+    async def _async_consume_push(self) -> None:
+        """Connect to the live stream and apply updates until it closes.
+
+        Raises:
+            aiohttp.ClientError: If the socket cannot be opened or fails
+            TimeoutError: If the connection cannot be established in time
+
+        """
+        async with asyncio.timeout(TIMEOUT_TOTAL):
+            ws = await self.session.ws_connect(
+                f"ws://{self.host}{API_WEBSOCKET}", heartbeat=PUSH_HEARTBEAT
+            )
+        try:
+            self.push_connected = True
+            _LOGGER.debug("Push stream from %s connected", self.host)
+            async for message in ws:
+                if message.type is not aiohttp.WSMsgType.TEXT:
+                    continue
+                # Log lines share the socket; only JSON objects carry data.
+                if not message.data.startswith("{"):
+                    continue
+                try:
+                    update = json_loads(message.data)
+                except ValueError:
+                    continue
+                if isinstance(update, dict) and update:
+                    self._async_handle_push_update(update)
+        finally:
+            await ws.close()
+
+    @callback
+    def _async_handle_push_update(self, update: dict[str, Any]) -> None:
+        """Merge a partial payload pushed by the miner into the current data."""
+        update = {key: value for key, value in update.items() if key in SNAPSHOT_KEYS}
+        if not update:
+            return
+        snapshot = (
+            self.data.merge(update)
+            if self.data is not None
+            else MinerSnapshot.from_payload(update)
+        )
+        self._async_check_schema(snapshot)
+        self.async_set_updated_data(self._async_record(snapshot))
+
+        if monotonic() - self._last_full_refresh > PUSH_FULL_REFRESH_INTERVAL:
+            self._last_full_refresh = monotonic()
+            self.hass.async_create_task(self.async_request_refresh())
+
+    async def _async_update_data(self) -> MinerSnapshot:
+        """Fetch latest data from miner API.
+
+        Holds a fleet poll slot for the duration of the request when the
+        coordinator is driven by the fleet scheduler.
+
+        Returns:
+            MinerSnapshot: Parsed miner data
+
+        Raises:
+            UpdateFailed: If API communication fails or times out
+
+        """
+        started = monotonic()
+        try:
+            if self.scheduler is None:
+                data = await self._async_fetch_system_info()
+            else:
+                async with self.scheduler.async_poll_slot(self):
+                    data = await self._async_fetch_system_info()
+        except UpdateFailed:
+            if self.ota is not None:
+                self._async_update_ota(self.ota.on_failure(monotonic()))
+            elif self.adaptive is not None:
+                self._async_set_interval(self.adaptive.on_failure())
+            raise
+
+        if self.ota is not None:
+            self._async_update_ota(self.ota.on_success(data, monotonic()))
+        elif self.adaptive is not None:
+            previous = self.data if self.last_update_success else None
+            self._async_set_interval(self.adaptive.on_success(previous, data))
+        data = self.settings.async_verify(data, started)
+        self.poll_count += 1
+        return self._async_record(data)
+
+    @callback
+    def _async_record(self, snapshot: MinerSnapshot) -> MinerSnapshot:
+        """Record a new snapshot and resolve its efficiency.
+
+        Returns:
+            MinerSnapshot: The snapshot carrying its efficiency
+
+        """
+        now = monotonic()
+        self.telemetry.append(now, snapshot)
+        return replace(snapshot, efficiency=self.power.efficiency(now, snapshot))
+
+    @callback
+    def _async_set_interval(self, seconds: float) -> None:
+        """Apply an adapted interval to the next scheduled poll."""
+        interval = timedelta(seconds=seconds)
+        if interval != self.update_interval:
+            _LOGGER.debug("Poll interval for %s set to %.1fs", self.host, seconds)
+            self.update_interval = interval
+
+    @callback
+    def _async_check_schema(self, snapshot: MinerSnapshot) -> None:
+        """Warn once about each payload field holding an unexpected type."""
+        if new_errors := snapshot.schema_errors - self._schema_errors_reported:
+            self._schema_errors_reported |= new_errors
+            _LOGGER.warning(
+                "Miner at %s reported unexpected types for %s; these fields are "
+                "ignored (firmware API change?)",
+                self.host,
+                ", ".join(sorted(new_errors)),
+            )
+
+    async def _async_fetch_system_info(self) -> MinerSnapshot:
         """Fetch latest data from miner API.
 
         Polls the /api/system/info endpoint to retrieve current miner status,
         including hashrate, temperature, power metrics, and mining statistics.
 
         Returns:
-            dict: Miner data with all sensor values
+            MinerSnapshot: Parsed miner data
 
         Raises:
             UpdateFailed: If API communication fails or times out
 
         """
         url = f"{self.base_url}{API_SYSTEM_INFO}"
-        timeout = aiohttp.ClientTimeout(
-            total=TIMEOUT_TOTAL,
-            connect=TIMEOUT_CONNECT,
-        )
 
         try:
-            async with self.session.get(url, timeout=timeout) as response:
+            # Timeouts are the session defaults (see ``session.py``)
+            async with self.session.get(url) as response:
                 response.raise_for_status()
-                data = await response.json()
-                _LOGGER.debug("Received data from %s: %s", self.host, data)
-                return cast(dict[str, Any], data)
+                body = await response.read()
+            snapshot = self._decode_tiers(body)
+            self._last_full_refresh = monotonic()
+            self._async_check_schema(snapshot)
+            return snapshot
         except aiohttp.ServerTimeoutError as err:
             # Server timeout - must come before TimeoutError (it inherits from it)
             error_msg = f"Timeout connecting to miner at {self.host}"
@@ -187,6 +735,10 @@ class NerdQAxeDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 type(err).__name__,
             )
             raise UpdateFailed(error_msg) from NerdQAxeApiError(error_msg)
+        except NerdQAxeApiError as err:
+            # Truncated or non-JSON body (e.g. the miner rebooting mid-reply)
+            _LOGGER.warning("Invalid payload from miner at %s: %s", self.host, err)
+            raise UpdateFailed(f"Invalid payload from miner API: {err}") from err
         except Exception as err:
             # Truly unexpected errors - log as error with full traceback
             error_msg = f"Unexpected error: {type(err).__name__}: {err!s}"
@@ -4,10 +4,14 @@ from __future__ import annotations
 
 from typing import Any
 
-from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
 from homeassistant.core import HomeAssistant
 
 from . import NerdQAxeConfigEntry
+from .budget import async_get_power_budget
+from .const import DATA_MINER_POOL, DOMAIN
+from .releases import async_get_release_index
+from .rollout import async_get_firmware_rollout
 
 # Keys to redact from diagnostics output
 TO_REDACT = {
@@ -45,6 +49,7 @@ async def async_get_config_entry_diagnostics(
 
     """
     coordinator = entry.runtime_data.coordinator
+    pool = hass.data.get(DATA_MINER_POOL)
 
     return {
         "entry": {
@@ -58,8 +63,62 @@ async def async_get_config_entry_diagnostics(
         "coordinator": {
             "last_update_success": coordinator.last_update_success,
             "update_interval": str(coordinator.update_interval),
+            "push_connected": coordinator.push_connected,
+            "adaptive": coordinator.adaptive.as_dict()
+            if coordinator.adaptive
+            else None,
+            "ota": coordinator.ota.phase if coordinator.ota else None,
+            "telemetry": coordinator.telemetry.as_dict(),
         },
-        "data": async_redact_data(coordinator.data, TO_REDACT)
+        "autotune": entry.runtime_data.autotune.as_dict(),
+        "power_budget": async_get_power_budget(hass).as_dict(coordinator),
+        "releases": async_get_release_index(hass).as_dict(),
+        "firmware_rollout": _redact_rollout(hass),
+        "fleet": coordinator.scheduler.as_dict() if coordinator.scheduler else None,
+        "connection_pool": pool.as_dict() if pool else None,
+        "data": async_redact_data(coordinator.data.as_payload(), TO_REDACT)
         if coordinator.data
         else None,
+        "schema_errors": sorted(coordinator.data.schema_errors)
+        if coordinator.data
+        else [],
     }
+
+
+def _redact_rollout(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the firmware rollout without the addresses of the miners.
+
+    The rollout covers the whole fleet: its miners are keyed by MAC address,
+    carry their host, and both show up in the error messages. Miners are
+    listed by config entry instead, and the addresses are scrubbed from the
+    error text.
+    """
+    rollout = async_get_firmware_rollout(hass).as_dict()
+    entry_ids = {
+        entry.runtime_data.coordinator.unique_id_base: entry.entry_id
+        for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+    }
+    addresses = {
+        address
+        for unique_id, miner in rollout["miners"].items()
+        for address in (unique_id, miner["host"])
+    }
+
+    def scrub(text: str | None) -> str | None:
+        if text is None:
+            return None
+        for address in addresses:
+            text = text.replace(address, REDACTED)
+        return text
+
+    rollout["error"] = scrub(rollout["error"])
+    rollout["miners"] = [
+        {
+            # None once the miner's entry is no longer loaded
+            "entry_id": entry_ids.get(unique_id),
+            **async_redact_data(miner, TO_REDACT),
+            "error": scrub(miner["error"]),
+        }
+        for unique_id, miner in rollout["miners"].items()
+    ]
+    return rollout
@@ -0,0 +1,197 @@
+"""Mining efficiency derived from the hashrate and power readings.
+
+The firmware reports the power draw and the hashrate over several windows,
+but no efficiency. The coordinator resolves it once per update into an
+:class:`Efficiency` carried by the snapshot:
+
+- the instantaneous energy per terahash (J/TH) and hashrate per watt
+  (GH/W), from the current hashrate and power readings;
+- the efficiency over the last 10 minutes and the last hour, dividing the
+  miner's ``hashRate_10m``/``hashRate_1h`` averages by the average power over
+  the same window. The miner only reports the current power, so the
+  coordinator integrates it into energy itself (:class:`PowerAverager`).
+
+A zero or missing hashrate or power yields no efficiency rather than a
+division error or an infinite J/TH.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from .snapshot import MinerSnapshot
+
+# Windows of the miner's hashrate averages, in seconds
+WINDOW_10M: Final = 600
+WINDOW_1H: Final = 3600
+
+# Minimum time between two retained energy checkpoints, in seconds. Readings
+# closer together (push updates) still count towards the energy.
+CHECKPOINT_SPACING: Final = 10
+
+# Longest power reading carried forward over a gap between two updates, in
+# seconds; past it the gap is left out of the averages.
+MAX_HOLD: Final = 300
+
+
+def joules_per_terahash(power: float | None, hashrate: float | None) -> float | None:
+    """Return the energy per terahash in J/TH.
+
+    Args:
+        power: Power draw in W
+        hashrate: Hashrate in GH/s
+
+    Returns:
+        float: J/TH, or None without a positive power and hashrate
+
+    """
+    if not power or not hashrate or power < 0 or hashrate < 0:
+        return None
+    return round(power / (hashrate / 1000), 2)
+
+
+def gigahash_per_watt(power: float | None, hashrate: float | None) -> float | None:
+    """Return the hashrate per watt in GH/W.
+
+    Args:
+        power: Power draw in W
+        hashrate: Hashrate in GH/s
+
+    Returns:
+        float: GH/W, or None without a positive power and hashrate
+
+    """
+    if not power or not hashrate or power < 0 or hashrate < 0:
+        return None
+    return round(hashrate / power, 2)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Efficiency:
+    """Efficiency of the miner at one update."""
+
+    jth: float | None = None
+    ghw: float | None = None
+    jth_10m: float | None = None
+    jth_1h: float | None = None
+    # Average power over the 10-minute and 1-hour windows, in W
+    power_10m: float | None = None
+    power_1h: float | None = None
+
+
+class PowerAverager:
+    """Time-weighted average of the power draw over trailing windows.
+
+    Each reading is held until the next one and integrated into a running
+    energy total, with the time it covers. Checkpoints of both totals are
+    kept for the longest window, so the average over any window is the
+    energy difference over the covered-time difference, interpolated at the
+    window start. A reading is held at most ``MAX_HOLD``, so the time the
+    miner was unreachable does not dilute the average.
+    """
+
+    def __init__(self, horizon: float = WINDOW_1H) -> None:
+        """Initialize an empty history.
+
+        Args:
+            horizon: Longest window averaged over, in seconds
+
+        """
+        self.horizon = horizon
+        # (monotonic time, energy in J, covered seconds), oldest first
+        self._checkpoints: deque[tuple[float, float, float]] = deque()
+        self._time: float | None = None
+        self._power: float | None = None
+        self._energy = 0.0
+        self._covered = 0.0
+
+    def _totals(self, now: float) -> tuple[float, float]:
+        """Return the energy and covered time up to ``now``."""
+        if self._time is None or self._power is None:
+            return self._energy, self._covered
+        held = min(now - self._time, MAX_HOLD)
+        return self._energy + self._power * held, self._covered + held
+
+    def add(self, now: float, power: float | None) -> None:
+        """Account for a power reading taken at ``now``.
+
+        Args:
+            now: Monotonic timestamp of the reading
+            power: Power draw in W, None if the update did not carry it
+
+        """
+        if power is None and self._time is not None:
+            # A partial update without power: the last reading still holds
+            return
+        self._energy, self._covered = self._totals(now)
+        self._time, self._power = now, power
+
+        if (
+            not self._checkpoints
+            or now - self._checkpoints[-1][0] >= CHECKPOINT_SPACING
+        ):
+            self._checkpoints.append((now, self._energy, self._covered))
+        # Keep one checkpoint at or before the start of the longest window
+        while (
+            len(self._checkpoints) > 1 and self._checkpoints[1][0] <= now - self.horizon
+        ):
+            self._checkpoints.popleft()
+
+    def mean(self, now: float, window: float) -> float | None:
+        """Return the average power over the trailing window.
+
+        Before the history spans the whole window, the average covers the
+        history there is; with a single reading, it is that reading.
+
+        Args:
+            now: Current monotonic time
+            window: Window length in seconds
+
+        Returns:
+            float: Average power in W, or None before any power reading
+
+        """
+        energy, covered = self._totals(now)
+        start = now - window
+        # The totals at the window start, interpolated between the
+        # checkpoints around it; the current totals close the history.
+        previous: tuple[float, float, float] | None = None
+        for checkpoint in (*self._checkpoints, (now, energy, covered)):
+            if checkpoint[0] >= start:
+                break
+            previous = checkpoint
+        if previous is None:
+            start_energy, start_covered = checkpoint[1], checkpoint[2]
+        else:
+            ratio = (start - previous[0]) / (checkpoint[0] - previous[0])
+            start_energy = previous[1] + (checkpoint[1] - previous[1]) * ratio
+            start_covered = previous[2] + (checkpoint[2] - previous[2]) * ratio
+        if covered - start_covered <= 0:
+            return self._power
+        return (energy - start_energy) / (covered - start_covered)
+
+    def efficiency(self, now: float, snapshot: MinerSnapshot) -> Efficiency:
+        """Record the power of a snapshot and return its efficiency.
+
+        Args:
+            now: Monotonic timestamp of the snapshot
+            snapshot: Snapshot of the update
+
+        Returns:
+            Efficiency: Instantaneous and windowed efficiency
+
+        """
+        self.add(now, snapshot.power)
+        power_10m = self.mean(now, WINDOW_10M)
+        power_1h = self.mean(now, WINDOW_1H)
+        return Efficiency(
+            jth=joules_per_terahash(snapshot.power, snapshot.hashrate),
+            ghw=gigahash_per_watt(snapshot.power, snapshot.hashrate),
+            jth_10m=joules_per_terahash(power_10m, snapshot.hashrate_10m),
+            jth_1h=joules_per_terahash(power_1h, snapshot.hashrate_1h),
+            power_10m=round(power_10m, 2) if power_10m is not None else None,
+            power_1h=round(power_1h, 2) if power_1h is not None else None,
+        )
@@ -0,0 +1,255 @@
+"""Hourly long-term statistics import for the NerdQAxe+ integration.
+
+At a short scan interval every measurement sensor writes a state row per
+poll, and across a fleet those rows dominate the recorder database. With the
+statistics import enabled, the integration aggregates every sample into
+hourly mean/min/max buckets itself and hands each completed hour to the
+recorder as external statistics (``nerdqaxe:<device>_<sensor>``), while the
+measurement sensors write their state at most every ``STATE_WRITE_INTERVAL``.
+
+The recorder only accepts imported statistics starting at the top of an
+hour, so buckets are hourly; its own 5-minute statistics keep being compiled
+from the throttled states.
+
+Importing an hour replaces any statistic already imported for it, so the
+bucket of the hour in progress is persisted with a ``Store`` (when the entry
+unloads or Home Assistant stops, or after ``SAVE_DELAY`` without samples) and
+restored when the miner is set up again: an hour spanning a restart or a
+reload is imported once, with the samples from both sides.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine, Iterable
+from datetime import datetime
+import logging
+from typing import TYPE_CHECKING, Any, Final
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import NerdQAxeDataUpdateCoordinator
+    from .sensor import NerdQAxeSensorEntityDescription
+
+_LOGGER = logging.getLogger(__name__)
+
+# Shortest time between two state writes of a measurement sensor while the
+# statistics import is enabled, in seconds
+STATE_WRITE_INTERVAL: Final = 300
+
+STORAGE_VERSION: Final = 1
+# The bucket in progress is saved once sampling pauses this long, in seconds,
+# and in any case when Home Assistant stops
+SAVE_DELAY: Final = STATE_WRITE_INTERVAL
+
+
+class _Bucket:
+    """Running mean/min/max of one metric over the current hour."""
+
+    __slots__ = ("count", "maximum", "minimum", "total")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def as_list(self) -> list[float]:
+        return [self.count, self.total, self.minimum, self.maximum]
+
+    @classmethod
+    def from_list(cls, stored: list[float]) -> _Bucket:
+        bucket = cls()
+        count, bucket.total, bucket.minimum, bucket.maximum = stored
+        bucket.count = int(count)
+        return bucket
+
+
+def _store_key(unique_id_base: str) -> str:
+    return f"{DOMAIN}.statistics.{slugify(unique_id_base)}"
+
+
+async def async_remove_statistics_bucket(
+    hass: HomeAssistant, unique_id_base: str
+) -> None:
+    """Delete the persisted hour in progress of a removed miner."""
+    await Store[dict[str, Any]](
+        hass, STORAGE_VERSION, _store_key(unique_id_base)
+    ).async_remove()
+
+
+class HourlyStatistics:
+    """Aggregate measurement sensors into hourly external statistics."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: NerdQAxeDataUpdateCoordinator,
+        descriptions: Iterable[NerdQAxeSensorEntityDescription],
+    ) -> None:
+        """Initialize the aggregator.
+
+        Args:
+            hass: Home Assistant instance
+            coordinator: Coordinator whose snapshots are sampled
+            descriptions: Sensors whose values are aggregated, if they are
+                measurement sensors
+
+        """
+        self.hass = hass
+        self.coordinator = coordinator
+        self.descriptions: list[NerdQAxeSensorEntityDescription] = []
+        self.async_track(descriptions)
+        self._hour: datetime | None = None
+        self._buckets: dict[str, _Bucket] = {}
+        self._device = slugify(coordinator.unique_id_base)
+        self.store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, _store_key(coordinator.unique_id_base)
+        )
+
+    @callback
+    def async_track(
+        self, descriptions: Iterable[NerdQAxeSensorEntityDescription]
+    ) -> None:
+        """Aggregate more sensors, keeping only the measurement ones.
+
+        Args:
+            descriptions: Sensors added to the platform
+
+        """
+        self.descriptions.extend(
+            description
+            for description in descriptions
+            if description.state_class is SensorStateClass.MEASUREMENT
+        )
+
+    async def async_load(self) -> None:
+        """Restore the bucket persisted before a restart or reload.
+
+        A bucket of the current hour carries on; one of an hour already over
+        is imported by the next sample, once the sensors are tracked.
+        """
+        if (stored := await self.store.async_load()) is None:
+            return
+        if (hour := dt_util.parse_datetime(stored["hour"] or "")) is None:
+            return
+        self._hour = hour
+        self._buckets = {
+            key: _Bucket.from_list(bucket) for key, bucket in stored["buckets"].items()
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the bucket in progress, as persisted."""
+        return {
+            "hour": self._hour.isoformat() if self._hour else None,
+            "buckets": {key: bucket.as_list() for key, bucket in self._buckets.items()},
+        }
+
+    @callback
+    def _async_save(self) -> None:
+        self.store.async_delay_save(self.as_dict, SAVE_DELAY)
+
+    def statistic_id(self, key: str) -> str:
+        """Return the external statistic id of a sensor key."""
+        return f"{DOMAIN}:{self._device}_{key}"
+
+    @callback
+    def async_start(self) -> Callable[[], Coroutine[Any, Any, None]]:
+        """Sample every coordinator update until the returned function is awaited.
+
+        Stopping also imports the last bucket if its hour is over, and
+        persists it otherwise, before the miner is set up again.
+        """
+        remove_listener = self.coordinator.async_add_listener(self.async_add_sample)
+
+        async def _async_stop() -> None:
+            remove_listener()
+            if self._hour is not None and self._hour < _hour_start(dt_util.utcnow()):
+                self._async_import()
+                self._hour = None
+            await self.store.async_save(self.as_dict())
+
+        return _async_stop
+
+    @callback
+    def async_add_sample(self, now: datetime | None = None) -> None:
+        """Add the latest snapshot to the bucket of the current hour.
+
+        Args:
+            now: Sample time, defaults to the current time
+
+        """
+        data = self.coordinator.data
+        if data is None or not self.coordinator.last_update_success:
+            return
+
+        hour = _hour_start(now or dt_util.utcnow())
+        if self._hour != hour:
+            if self._hour is not None:
+                self._async_import()
+            self._hour = hour
+
+        for description in self.descriptions:
+            value = description.value_fn(data)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self._buckets.setdefault(description.key, _Bucket()).add(value)
+        self._async_save()
+
+    @callback
+    def _async_import(self) -> None:
+        """Hand the completed hour to the recorder and start an empty bucket."""
+        hour, buckets = self._hour, self._buckets
+        self._buckets = {}
+        if hour is None or not buckets:
+            return
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug("Recorder not loaded, dropping statistics of %s", hour)
+            return
+
+        name = self.coordinator.get_device_info().get("name")
+        for description in self.descriptions:
+            if (bucket := buckets.get(description.key)) is None:
+                continue
+            metadata = StatisticMetaData(
+                mean_type=StatisticMeanType.ARITHMETIC,
+                has_sum=False,
+                name=f"{name} {description.key.replace('_', ' ')}",
+                source=DOMAIN,
+                statistic_id=self.statistic_id(description.key),
+                unit_of_measurement=description.native_unit_of_measurement,
+            )
+            statistic = StatisticData(
+                start=hour,
+                mean=bucket.total / bucket.count,
+                min=bucket.minimum,
+                max=bucket.maximum,
+            )
+            async_add_external_statistics(self.hass, metadata, [statistic])
+        _LOGGER.debug(
+            "Imported %d hourly statistics of %s for %s",
+            len(buckets),
+            self.coordinator.host,
+            hour,
+        )
+
+
+def _hour_start(moment: datetime) -> datetime:
+    """Return the top of the hour containing ``moment``."""
+    return moment.replace(minute=0, second=0, microsecond=0)
@@ -2,10 +2,8 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 
-import aiohttp
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -13,11 +11,13 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import NerdQAxeConfigEntry, NerdQAxeDataUpdateCoordinator
 from .const import (
-    API_SYSTEM,
     ATTR_CORE_VOLTAGE,
     ATTR_FREQUENCY,
+    CORE_VOLTAGE_MAX,
+    CORE_VOLTAGE_MIN,
+    FREQUENCY_MAX,
+    FREQUENCY_MIN,
 )
-from .exceptions import NerdQAxeApiError
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,15 +65,16 @@ class NerdQAxeFrequencyNumber(
     Number entity for adjusting the mining ASIC frequency between 1-1000 MHz
     in 1 MHz steps. The wide range lets you underclock for power/heat
     management or overclock (e.g. NerdQX reaches 1000); the miner firmware
-    keeps its own per-ASIC limits. Changes are applied via ``PATCH /api/system``.
+    keeps its own per-ASIC limits. Changes are queued on the miner's settings
+    write queue and applied via ``PATCH /api/system``.
     """
 
     __slots__ = ()
 
     _attr_icon = "mdi:sine-wave"
     _attr_mode = NumberMode.BOX
-    _attr_native_min_value = 1
-    _attr_native_max_value = 1000
+    _attr_native_min_value = FREQUENCY_MIN
+    _attr_native_max_value = FREQUENCY_MAX
     _attr_native_step = 1
     _attr_native_unit_of_measurement = "MHz"
     _attr_has_entity_name = True
@@ -85,7 +86,7 @@ class NerdQAxeFrequencyNumber(
             coordinator: Data update coordinator instance
 
         """
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({ATTR_FREQUENCY}))
         self._attr_unique_id = f"{coordinator.unique_id_base}_frequency"
         self._attr_translation_key = "frequency"
         self._attr_device_info = coordinator.get_device_info()
@@ -100,41 +101,25 @@ class NerdQAxeFrequencyNumber(
         """
         if not self.coordinator.data:
             return None
-        value: float | None = self.coordinator.data.get(ATTR_FREQUENCY)
-        return value
+        return self.coordinator.data.frequency
 
     async def async_set_native_value(self, value: float) -> None:
         """Set new ASIC frequency value.
 
+        The value is queued on the settings write queue, and written with
+        the changes queued within its coalescing window.
+
         Args:
             value: New frequency in MHz (1-1000, step 1)
 
         Raises:
-            NerdQAxeApiError: If the API command fails
+            NerdQAxeApiError: If the miner could not be written
 
         """
         _LOGGER.debug(
-            "Setting frequency to %d MHz on %s", int(value), self.coordinator.host
+            "Queueing frequency %d MHz for %s", int(value), self.coordinator.host
         )
-        try:
-            async with (
-                asyncio.timeout(10),
-                self.coordinator.session.patch(
-                    f"{self.coordinator.base_url}{API_SYSTEM}",
-                    json={"frequency": int(value)},
-                ) as response,
-            ):
-                response.raise_for_status()
-                _LOGGER.info(
-                    "Frequency set to %d MHz on %s",
-                    int(value),
-                    self.coordinator.host,
-                )
-                await self.coordinator.async_request_refresh()
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise NerdQAxeApiError(
-                f"Failed to set frequency on {self.coordinator.host}"
-            ) from err
+        await self.coordinator.settings.async_write({ATTR_FREQUENCY: int(value)})
 
 
 class NerdQAxeCoreVoltageNumber(
@@ -143,15 +128,16 @@ class NerdQAxeCoreVoltageNumber(
     """Representation of NerdQAxe+ core voltage control.
 
     Number entity for adjusting the ASIC core voltage between 1000-1350 mV
-    in 5 mV steps. Changes are applied via ``PATCH /api/system``.
+    in 5 mV steps. Changes are queued on the miner's settings write queue, so
+    a frequency set right before or after lands in the same PATCH.
     """
 
     __slots__ = ()
 
     _attr_icon = "mdi:flash"
     _attr_mode = NumberMode.BOX
-    _attr_native_min_value = 900
-    _attr_native_max_value = 1350
+    _attr_native_min_value = CORE_VOLTAGE_MIN
+    _attr_native_max_value = CORE_VOLTAGE_MAX
     _attr_native_step = 5
     _attr_native_unit_of_measurement = "mV"
     _attr_has_entity_name = True
@@ -163,7 +149,7 @@ class NerdQAxeCoreVoltageNumber(
             coordinator: Data update coordinator instance
 
         """
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({ATTR_CORE_VOLTAGE}))
         self._attr_unique_id = f"{coordinator.unique_id_base}_core_voltage"
         self._attr_translation_key = "core_voltage"
         self._attr_device_info = coordinator.get_device_info()
@@ -178,38 +164,22 @@ class NerdQAxeCoreVoltageNumber(
         """
         if not self.coordinator.data:
             return None
-        value: float | None = self.coordinator.data.get(ATTR_CORE_VOLTAGE)
-        return value
+        return self.coordinator.data.core_voltage
 
     async def async_set_native_value(self, value: float) -> None:
         """Set new core voltage value.
 
+        The value is queued on the settings write queue, and written with
+        the changes queued within its coalescing window.
+
         Args:
             value: New voltage in mV (900-1350, step 5)
 
         Raises:
-            NerdQAxeApiError: If the API command fails
+            NerdQAxeApiError: If the miner could not be written
 
         """
         _LOGGER.debug(
-            "Setting core voltage to %d mV on %s", int(value), self.coordinator.host
+            "Queueing core voltage %d mV for %s", int(value), self.coordinator.host
         )
-        try:
-            async with (
-                asyncio.timeout(10),
-                self.coordinator.session.patch(
-                    f"{self.coordinator.base_url}{API_SYSTEM}",
-                    json={"coreVoltage": int(value)},
-                ) as response,
-            ):
-                response.raise_for_status()
-                _LOGGER.info(
-                    "Core voltage set to %d mV on %s",
-                    int(value),
-                    self.coordinator.host,
-                )
-                await self.coordinator.async_request_refresh()
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise NerdQAxeApiError(
-                f"Failed to set core voltage on {self.coordinator.host}"
-            ) from err
+        await self.coordinator.settings.async_write({ATTR_CORE_VOLTAGE: int(value)})
@@ -0,0 +1,111 @@
+"""Progress of a firmware update on the NerdQAxe+ miner.
+
+The OTA endpoint answers ``202 Accepted`` and the miner carries on by
+itself: it downloads and flashes the factory image while still answering
+polls, then reboots, and comes back on the new firmware. The API reports
+none of this, so the coordinator follows it from its polls:
+
+- ``flashing``: the OTA was accepted and the miner still answers;
+- ``rebooting``: the miner stopped answering;
+- ``done``: it answers with the new ``version``;
+- ``failed``: it rebooted (its uptime restarted after the OTA began) but
+  still runs the old version, or it is not back on the new version within
+  ``OTA_TIMEOUT``.
+
+While an OTA is tracked, the coordinator polls every ``OTA_PROBE_INTERVAL``
+instead of its scan interval, so the new firmware shows up seconds after
+the reboot, then returns to its normal schedule.
+"""
+
+from __future__ import annotations
+
+from enum import StrEnum
+from typing import TYPE_CHECKING, Final
+
+from .const import MIN_SCAN_INTERVAL
+
+if TYPE_CHECKING:
+    from .snapshot import MinerSnapshot
+
+OTA_PROBE_INTERVAL: Final = MIN_SCAN_INTERVAL  # s
+OTA_TIMEOUT: Final = 900  # s
+
+
+class OtaPhase(StrEnum):
+    """Phase of a firmware update."""
+
+    FLASHING = "flashing"
+    REBOOTING = "rebooting"
+    DONE = "done"
+    FAILED = "failed"
+
+
+# Progress shown for each phase while the update runs, in percent
+PHASE_PROGRESS: Final = {OtaPhase.FLASHING: 10, OtaPhase.REBOOTING: 60}
+
+
+class OtaProgress:
+    """Follow a firmware update from the outcome of each poll."""
+
+    def __init__(self, version: str, started: float) -> None:
+        """Start tracking an accepted OTA.
+
+        Args:
+            version: Version the miner is updated to
+            started: Monotonic time the OTA was accepted
+
+        """
+        self.version = version.lstrip("v")
+        self.started = started
+        self.phase = OtaPhase.FLASHING
+
+    @property
+    def finished(self) -> bool:
+        """Return True once the update is over, either way."""
+        return self.phase in (OtaPhase.DONE, OtaPhase.FAILED)
+
+    @property
+    def percentage(self) -> int | None:
+        """Return the progress in percent, None once finished."""
+        return PHASE_PROGRESS.get(self.phase)
+
+    def on_failure(self, now: float) -> OtaPhase:
+        """Account for a failed poll: the miner is rebooting.
+
+        Args:
+            now: Current monotonic time
+
+        Returns:
+            OtaPhase: The phase after the poll
+
+        """
+        if now - self.started >= OTA_TIMEOUT:
+            self.phase = OtaPhase.FAILED
+        elif self.phase is OtaPhase.FLASHING:
+            self.phase = OtaPhase.REBOOTING
+        return self.phase
+
+    def on_success(self, snapshot: MinerSnapshot, now: float) -> OtaPhase:
+        """Account for a successful poll.
+
+        A poll answered with the old version after a missed one is only a
+        failure if the miner did reboot: it may also have been too busy
+        flashing to answer.
+
+        Args:
+            snapshot: Snapshot of the poll
+            now: Current monotonic time
+
+        Returns:
+            OtaPhase: The phase after the poll
+
+        """
+        if (snapshot.version or "").lstrip("v") == self.version:
+            self.phase = OtaPhase.DONE
+        elif (
+            snapshot.uptime is not None and snapshot.uptime < now - self.started
+        ) or now - self.started >= OTA_TIMEOUT:
+            self.phase = OtaPhase.FAILED
+        else:
+            self.phase = OtaPhase.FLASHING
+        return self.phase
@@ -0,0 +1,431 @@
+"""Firmware release index shared by every NerdQAxe+ update entity.
+
+The update entities of all the miners need the same thing from GitHub: the
+latest stable release of the firmware and its factory images. A single
+hass-wide :class:`NerdQAxeReleaseIndex` fetches the releases list for all of
+them, every ``REFRESH_INTERVAL`` while any update entity exists:
+
+- the request is conditional (``If-None-Match`` on the last ETag), so an
+  unchanged list costs a ``304`` without body, which GitHub does not count
+  against the unauthenticated rate limit;
+- the latest stable release and its ETag are persisted with a ``Store``, so
+  Home Assistant starts with the known release and no request, unless the
+  last check is older than ``REFRESH_INTERVAL``;
+- the ``X-RateLimit-*`` and ``Retry-After`` headers are honoured: once the
+  limit is exhausted, no request is made until it resets.
+
+Each fetched release carries a table of its factory images by normalized
+model name, built once, so each miner finds its image with a lookup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http import HTTPStatus
+import logging
+from typing import Any, Final
+
+import aiohttp
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_RELEASE_INDEX, DOMAIN, GITHUB_API_URL
+
+_LOGGER = logging.getLogger(__name__)
+
+REFRESH_INTERVAL: Final = timedelta(hours=6)
+REQUEST_TIMEOUT: Final = 10  # s
+
+# Wait before retrying a rate-limited request that gives no reset time
+DEFAULT_RETRY_AFTER: Final = timedelta(hours=1)
+
+STORAGE_KEY: Final = f"{DOMAIN}.releases"
+STORAGE_VERSION: Final = 1
+SAVE_DELAY: Final = 1
+
+
+# Greek letter gamma for device model normalization
+GREEK_GAMMA: Final = "\u03b3"
+
+# Device model to factory filename mapping
+# Format: esp-miner-factory-{model}-v{version}.bin
+# Note: Some models use Greek gamma in their names
+DEVICE_MODEL_MAP: Final = {
+    "NerdAxe": "NerdAxe",
+    "NerdAxeγ": "NerdAxeGamma",  # noqa: RUF001
+    "NerdAxe γ": "NerdAxeGamma",  # noqa: RUF001
+    "NerdAxeGamma": "NerdAxeGamma",
+    "NerdEKO": "NerdEKO",
+    "NerdHaxe-Gamma": "NerdHaxe-Gamma",
+    "NerdHaxeGamma": "NerdHaxe-Gamma",
+    "NerdHaxe γ": "NerdHaxe-Gamma",  # noqa: RUF001
+    "NerdOCTAXE+": "NerdOCTAXE+",
+    "NerdOCTAXE-Gamma": "NerdOCTAXE-Gamma",
+    "NerdOCTAXEγ": "NerdOCTAXE-Gamma",  # noqa: RUF001
+    "NerdOCTAXE γ": "NerdOCTAXE-Gamma",  # noqa: RUF001
+    "NerdQAxe+": "NerdQAxe+",
+    "NerdQAxe++": "NerdQAxe++",
+    "NerdQX": "NerdQX",
+}
+
+
+def _normalize(device_model: str) -> str:
+    """Replace the greek gamma and remove the spaces of a model name."""
+    return device_model.replace(GREEK_GAMMA, "Gamma").replace(" ", "")
+
+
+# DEVICE_MODEL_MAP keyed by the normalized spelling of every model
+_NORMALIZED_MODEL_MAP: Final = {
+    _normalize(key): value for key, value in DEVICE_MODEL_MAP.items()
+}
+
+
+def normalize_device_model(device_model: str) -> str:
+    """Normalize device model name for factory filename matching.
+
+    Args:
+        device_model: Raw device model from API
+
+    Returns:
+        Normalized model name for factory image filename
+
+    """
+    # Try direct mapping first
+    if device_model in DEVICE_MODEL_MAP:
+        return DEVICE_MODEL_MAP[device_model]
+
+    normalized = _normalize(device_model)
+
+    # Fallback: the normalized version, mapped if a known spelling
+    return _NORMALIZED_MODEL_MAP.get(normalized, normalized)
+
+
+FACTORY_IMAGE_PREFIX: Final = "esp-miner-factory-"
+
+
+@dataclass(frozen=True, slots=True)
+class FirmwareAsset:
+    """Factory image of a release, firmware and web interface combined."""
+
+    name: str
+    url: str
+    size: int | None = None
+    # Checksum published by GitHub, e.g. ``sha256:<hex>``
+    digest: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the asset as stored."""
+        return {
+            "name": self.name,
+            "url": self.url,
+            "size": self.size,
+            "digest": self.digest,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class FirmwareRelease:
+    """Stable firmware release published on GitHub."""
+
+    tag_name: str
+    body: str = ""
+    # Factory image of every model, by normalized model name
+    factory_images: Mapping[str, FirmwareAsset] = field(default_factory=dict)
+
+    @property
+    def version(self) -> str:
+        """Return the version without its ``v`` prefix."""
+        return self.tag_name.lstrip("v")
+
+    @classmethod
+    def from_github(cls, release: Mapping[str, Any]) -> FirmwareRelease:
+        """Build a release from an entry of the GitHub releases list.
+
+        The factory images are named ``esp-miner-factory-{model}-{tag}.bin``;
+        other assets are left out.
+        """
+        tag_name = release.get("tag_name", "")
+        suffix = f"-{tag_name}.bin"
+        factory_images = {}
+        for asset in release.get("assets", []):
+            name = asset.get("name") or ""
+            url = asset.get("browser_download_url")
+            if (
+                not url
+                or not name.startswith(FACTORY_IMAGE_PREFIX)
+                or not name.endswith(suffix)
+            ):
+                continue
+            model = name[len(FACTORY_IMAGE_PREFIX) : -len(suffix)]
+            factory_images[model] = FirmwareAsset(
+                name=name,
+                url=url,
+                size=asset.get("size"),
+                digest=asset.get("digest"),
+            )
+        return cls(
+            tag_name=tag_name,
+            body=release.get("body") or "",
+            factory_images=factory_images,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the release as stored."""
+        return {
+            "tag_name": self.tag_name,
+            "body": self.body,
+            "factory_images": {
+                model: asset.as_dict() for model, asset in self.factory_images.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> FirmwareRelease:
+        """Restore a stored release."""
+        return cls(
+            tag_name=data["tag_name"],
+            body=data["body"],
+            factory_images={
+                model: FirmwareAsset(**asset)
+                for model, asset in data["factory_images"].items()
+            },
+        )
+
+
+def latest_stable_release(
+    releases: list[Mapping[str, Any]],
+) -> FirmwareRelease | None:
+    """Return the newest release that is neither a pre-release nor an RC.
+
+    Args:
+        releases: GitHub releases list, newest first
+
+    Returns:
+        FirmwareRelease: Latest stable release, or None if there is none
+
+    """
+    for release in releases:
+        if not release.get("prerelease", False) and "-rc" not in release.get(
+            "tag_name", ""
+        ):
+            return FirmwareRelease.from_github(release)
+    return None
+
+
+def _retry_at(headers: Mapping[str, str], now: datetime) -> datetime | None:
+    """Return when a request may be made again, None if it may be made now.
+
+    Args:
+        headers: Response headers
+        now: Current time
+
+    """
+    if (retry_after := headers.get("Retry-After")) is not None:
+        try:
+            return now + timedelta(seconds=int(retry_after))
+        except ValueError:
+            pass
+    if headers.get("X-RateLimit-Remaining") == "0":
+        reset = headers.get("X-RateLimit-Reset", "")
+        if reset.isdigit():
+            return dt_util.utc_from_timestamp(int(reset))
+        return now + DEFAULT_RETRY_AFTER
+    return None
+
+
+class NerdQAxeReleaseIndex:
+    """Latest firmware release, fetched once for every miner."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty index.
+
+        Args:
+            hass: Home Assistant instance
+
+        """
+        self.hass = hass
+        self.store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.latest: FirmwareRelease | None = None
+        self.etag: str | None = None
+        self.checked: datetime | None = None
+        self.retry_at: datetime | None = None
+        self._loaded = False
+        # Device models already reported without a factory image in the
+        # latest release
+        self._missing: set[str] = set()
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> None:
+        """Restore the last release fetched, once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if (stored := await self.store.async_load()) is None:
+            return
+        self.etag = stored["etag"]
+        self.checked = dt_util.parse_datetime(stored["checked"] or "")
+        if stored["release"] is not None:
+            self.latest = FirmwareRelease.from_dict(stored["release"])
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for a new latest release.
+
+        The first listener starts the periodic refresh, refreshing at once if
+        the stored release is stale; the last one to go stops it.
+
+        Returns:
+            Callable: Function removing the listener
+
+        """
+        self._listeners.append(update_callback)
+        if self._unsub_refresh is None:
+            self._unsub_refresh = async_track_time_interval(
+                self.hass, self._async_scheduled_refresh, REFRESH_INTERVAL
+            )
+            if (
+                self.checked is None
+                or dt_util.utcnow() - self.checked >= REFRESH_INTERVAL
+            ):
+                self.async_request_refresh()
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(update_callback)
+            if not self._listeners and self._unsub_refresh is not None:
+                self._unsub_refresh()
+                self._unsub_refresh = None
+
+        return _remove
+
+    @callback
+    def _async_scheduled_refresh(self, _now: datetime) -> None:
+        self.async_request_refresh()
+
+    @callback
+    def async_request_refresh(self) -> None:
+        """Refresh in the background, unless a refresh is already running."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = self.hass.async_create_background_task(
+                self.async_refresh(), name=f"{DOMAIN} release index refresh"
+            )
+
+    async def async_refresh(self) -> None:
+        """Fetch the releases list if it changed since the last check."""
+        now = dt_util.utcnow()
+        if self.retry_at is not None and now < self.retry_at:
+            _LOGGER.debug("GitHub rate limit reached, next check at %s", self.retry_at)
+            return
+
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        # GitHub is an internet service: use Home Assistant's shared session,
+        # not the miner connection pool.
+        session = async_get_clientsession(self.hass)
+        try:
+            async with (
+                asyncio.timeout(REQUEST_TIMEOUT),
+                session.get(GITHUB_API_URL, headers=headers) as response,
+            ):
+                self.retry_at = _retry_at(response.headers, now)
+                if response.status == HTTPStatus.NOT_MODIFIED:
+                    _LOGGER.debug("Firmware releases unchanged")
+                    self.checked = now
+                    self._async_save()
+                    return
+                if (
+                    response.status
+                    in (HTTPStatus.FORBIDDEN, HTTPStatus.TOO_MANY_REQUESTS)
+                    and self.retry_at is not None
+                ):
+                    _LOGGER.warning(
+                        "GitHub rate limit reached, next firmware check at %s",
+                        self.retry_at,
+                    )
+                    return
+                response.raise_for_status()
+                releases = await response.json()
+                etag = response.headers.get("ETag")
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.warning("Failed to check for firmware updates: %s", err)
+            return
+        except Exception as err:
+            _LOGGER.error("Unexpected error checking for firmware updates: %s", err)
+            return
+
+        latest = latest_stable_release(releases)
+        changed = latest != self.latest
+        self.etag, self.checked, self.latest = etag, now, latest
+        if changed:
+            self._missing.clear()
+        self._async_save()
+        _LOGGER.debug("Latest firmware version: %s", latest.version if latest else None)
+        if changed:
+            for update_callback in list(self._listeners):
+                update_callback()
+
+    @callback
+    def async_factory_image(self, device_model: str) -> FirmwareAsset | None:
+        """Return the factory image of a device model in the latest release.
+
+        A model without an image is reported once per release.
+
+        Args:
+            device_model: Raw device model from the API
+
+        """
+        if self.latest is None:
+            return None
+        model = normalize_device_model(device_model)
+        if (asset := self.latest.factory_images.get(model)) is None and (
+            model not in self._missing
+        ):
+            self._missing.add(model)
+            _LOGGER.warning(
+                "No factory firmware for model '%s' in %s (expected: %s%s-%s.bin). "
+                "Available: %s",
+                device_model,
+                self.latest.tag_name,
+                FACTORY_IMAGE_PREFIX,
+                model,
+                self.latest.tag_name,
+                sorted(self.latest.factory_images),
+            )
+        return asset
+
+    @callback
+    def _async_save(self) -> None:
+        self.store.async_delay_save(
+            lambda: {
+                "etag": self.etag,
+                "checked": self.checked.isoformat() if self.checked else None,
+                "release": self.latest.as_dict() if self.latest else None,
+            },
+            SAVE_DELAY,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the index, for diagnostics."""
+        return {
+            "latest": self.latest.tag_name if self.latest else None,
+            "etag": self.etag,
+            "checked": self.checked.isoformat() if self.checked else None,
+            "retry_at": self.retry_at.isoformat() if self.retry_at else None,
+        }
+
+
+@callback
+def async_get_release_index(hass: HomeAssistant) -> NerdQAxeReleaseIndex:
+    """Return the hass-wide release index, creating it on first use."""
+    if (index := hass.data.get(DATA_RELEASE_INDEX)) is None:
+        index = hass.data[DATA_RELEASE_INDEX] = NerdQAxeReleaseIndex(hass)
+    return index
@@ -0,0 +1,432 @@
+"""Staggered firmware rollout across the NerdQAxe+ fleet.
+
+``nerdqaxe.start_firmware_rollout`` updates the miners that do not run the
+latest release in waves of ``concurrency`` miners, so the fleet never goes
+offline all at once. Each miner of a wave gets the factory OTA of its model
+(the same request as its update entity) and the wave is over when every one
+of them is back:
+
+- reporting the version of the release, and
+- hashing again: a one-minute hashrate of at least ``RECOVERY_RATIO`` of the
+  one it had before the update.
+
+A miner that rejects the OTA or does not recover within
+``RECOVERY_TIMEOUT`` fails the rollout: the wave in progress finishes, and
+the miners of the next waves are skipped. The progress and duration of every
+miner are kept for the diagnostics and the ``get_firmware_rollout`` service,
+and the update entity of a miner shows it in progress while it updates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from http import HTTPStatus
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Final
+
+import aiohttp
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import API_OTA_GITHUB, DATA_FIRMWARE_ROLLOUT, DOMAIN
+from .exceptions import NerdQAxeApiError, NerdQAxeError
+from .releases import async_get_release_index
+
+if TYPE_CHECKING:
+    from .const import NerdQAxeConfigEntry
+    from .coordinator import NerdQAxeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY: Final = 1
+MAX_CONCURRENCY: Final = 10
+# Time for a miner to flash, reboot and hash again, in s
+RECOVERY_TIMEOUT: Final = 900
+# Share of its previous one-minute hashrate a miner must get back to
+RECOVERY_RATIO: Final = 0.9
+
+
+async def async_start_ota(
+    coordinator: NerdQAxeDataUpdateCoordinator, url: str, version: str
+) -> None:
+    """Start the combined factory OTA of a miner.
+
+    The miner runs the OTA asynchronously: the POST returns
+    ``202 Accepted`` (``{"status": "started"}``) and a background task
+    flashes both firmware and web interface before rebooting. The reboot
+    tears down the HTTP connection, so a connection error *after* the
+    request has been accepted is expected and must not be reported as a
+    failed install. Only a response the miner actively rejects (e.g. a
+    busy ``409`` or a ``4xx``/``5xx`` status) is a real failure. Once the
+    OTA runs, the coordinator follows it until the miner reports
+    ``version`` (see ``ota.py``).
+
+    Args:
+        coordinator: Coordinator of the miner
+        url: Download URL of the factory image
+        version: Version of the factory image
+
+    Raises:
+        NerdQAxeError: If the miner already runs an OTA
+        NerdQAxeApiError: If the miner rejects the update
+
+    """
+    _LOGGER.info(
+        "Starting combined firmware update from %s on %s", url, coordinator.host
+    )
+
+    try:
+        # The miner answers 202 before downloading anything, so the
+        # session's default timeouts apply (see ``session.py``).
+        async with coordinator.session.post(
+            f"{coordinator.base_url}{API_OTA_GITHUB}",
+            json={"url": url},
+            headers={"Content-Type": "application/json"},
+        ) as response:
+            # The miner already runs an OTA; nothing to do.
+            if response.status == HTTPStatus.CONFLICT:
+                raise NerdQAxeError(
+                    "A firmware update is already in progress on the miner"
+                )
+            # Real rejection (bad/unsafe URL, auth, server error, ...).
+            response.raise_for_status()
+            result = await response.text()
+            _LOGGER.info(
+                "Firmware update accepted by %s (HTTP %s): %s",
+                coordinator.host,
+                response.status,
+                result,
+            )
+    except aiohttp.ClientResponseError as err:
+        # The miner answered with an error status: genuine failure.
+        raise NerdQAxeApiError(
+            f"Miner rejected the firmware update (HTTP {err.status})"
+        ) from err
+    except (aiohttp.ClientError, TimeoutError) as err:
+        # Connection dropped/timed out while the miner was flashing and
+        # rebooting. The OTA runs on the device itself, so this is the
+        # expected outcome — the new version shows up once it is back.
+        _LOGGER.info(
+            "Connection to %s closed during OTA (expected while the miner reboots): %s",
+            coordinator.host,
+            err,
+        )
+    coordinator.async_track_ota(version)
+
+
+class RolloutState(StrEnum):
+    """State of the fleet rollout."""
+
+    IDLE = "idle"
+    RUNNING = "running"
+    DONE = "done"
+    ABORTED = "aborted"
+    FAILED = "failed"
+
+
+class MinerRolloutState(StrEnum):
+    """Progress of one miner in the rollout."""
+
+    PENDING = "pending"
+    INSTALLING = "installing"
+    RECOVERING = "recovering"
+    DONE = "done"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+@dataclass(slots=True, kw_only=True)
+class MinerRollout:
+    """Progress of one miner in the rollout."""
+
+    host: str
+    wave: int
+    from_version: str | None
+    url: str
+    # One-minute hashrate before the update, in GH/s
+    baseline: float | None = None
+    state: MinerRolloutState = MinerRolloutState.PENDING
+    started: datetime | None = None
+    duration: float | None = None  # s
+    error: str | None = None
+
+    @property
+    def updating(self) -> bool:
+        """Return True while the miner flashes, reboots or recovers."""
+        return self.state in (
+            MinerRolloutState.INSTALLING,
+            MinerRolloutState.RECOVERING,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress of the miner."""
+        return {
+            "host": self.host,
+            "wave": self.wave,
+            "from_version": self.from_version,
+            "state": self.state.value,
+            "started": self.started.isoformat() if self.started else None,
+            "duration": round(self.duration) if self.duration is not None else None,
+            "error": self.error,
+        }
+
+
+class NerdQAxeFirmwareRollout:
+    """Update the miners of the fleet in waves."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an idle rollout.
+
+        Args:
+            hass: Home Assistant instance
+
+        """
+        self.hass = hass
+        self.state = RolloutState.IDLE
+        self.version: str | None = None
+        self.concurrency = DEFAULT_CONCURRENCY
+        # Keyed by the coordinator unique id base (the miner MAC)
+        self.miners: dict[str, MinerRollout] = {}
+        self.error: str | None = None
+        self.finished: datetime | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._listeners: set[CALLBACK_TYPE] = set()
+
+    @property
+    def running(self) -> bool:
+        """Return True while a rollout is in progress."""
+        return self._task is not None and not self._task.done()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the rollout and the progress of every miner."""
+        return {
+            "state": self.state.value,
+            "version": self.version,
+            "concurrency": self.concurrency,
+            "error": self.error,
+            "finished": self.finished.isoformat() if self.finished else None,
+            "miners": {
+                unique_id: miner.as_dict() for unique_id, miner in self.miners.items()
+            },
+        }
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call back on every progress update until the returned callback."""
+        self._listeners.add(update_callback)
+        return lambda: self._listeners.discard(update_callback)
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_start(self, entries: list[NerdQAxeConfigEntry], concurrency: int) -> None:
+        """Start a rollout in the background.
+
+        Miners already on the latest release are left out.
+
+        Args:
+            entries: Loaded config entries of the miners to update
+            concurrency: Number of miners updated at once
+
+        Raises:
+            NerdQAxeError: If a rollout is already in progress, no release is
+                known, or no miner needs or can take the update
+
+        """
+        if self.running:
+            raise NerdQAxeError("A firmware rollout is already running")
+        index = async_get_release_index(self.hass)
+        if (release := index.latest) is None:
+            raise NerdQAxeError("The latest firmware release is not known yet")
+
+        targets: list[tuple[NerdQAxeDataUpdateCoordinator, MinerRollout]] = []
+        for entry in entries:
+            coordinator = entry.runtime_data.coordinator
+            data = coordinator.data
+            if data is None or not coordinator.last_update_success:
+                raise NerdQAxeError(f"{coordinator.host} is unavailable")
+            if (data.version or "").lstrip("v") == release.version:
+                continue
+            if entry.runtime_data.autotune.running:
+                raise NerdQAxeError(f"Auto-tune is running on {coordinator.host}")
+            asset = index.async_factory_image(data.device_model or "")
+            if asset is None:
+                raise NerdQAxeError(
+                    f"No factory firmware for {coordinator.host} "
+                    f"({data.device_model}) in {release.tag_name}"
+                )
+            targets.append(
+                (
+                    coordinator,
+                    MinerRollout(
+                        host=coordinator.host,
+                        wave=len(targets) // concurrency + 1,
+                        from_version=data.version,
+                        url=asset.url,
+                    ),
+                )
+            )
+        if not targets:
+            raise NerdQAxeError(f"Every miner already runs {release.tag_name}")
+
+        self.state = RolloutState.RUNNING
+        self.version = release.version
+        self.concurrency = concurrency
+        self.miners = {
+            coordinator.unique_id_base: miner for coordinator, miner in targets
+        }
+        self.error = None
+        self.finished = None
+        _LOGGER.info(
+            "Starting firmware rollout of %s to %d miners, %d at a time",
+            release.tag_name,
+            len(targets),
+            concurrency,
+        )
+        self._task = self.hass.async_create_background_task(
+            self._async_run(targets), f"{DOMAIN} firmware rollout"
+        )
+        self._async_notify()
+
+    async def async_stop(self) -> None:
+        """Abort the rollout after the OTAs already started."""
+        if (task := self._task) is None or task.done():
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    async def _async_run(
+        self, targets: list[tuple[NerdQAxeDataUpdateCoordinator, MinerRollout]]
+    ) -> None:
+        """Update the miners wave by wave, stopping at the first failure."""
+        try:
+            for start in range(0, len(targets), self.concurrency):
+                wave = targets[start : start + self.concurrency]
+                await asyncio.gather(
+                    *(
+                        self._async_update(coordinator, miner)
+                        for coordinator, miner in wave
+                    )
+                )
+                if failed := [
+                    miner
+                    for _, miner in wave
+                    if miner.state is MinerRolloutState.FAILED
+                ]:
+                    self._async_finish(
+                        RolloutState.FAILED,
+                        f"{failed[0].host}: {failed[0].error}",
+                    )
+                    return
+        except asyncio.CancelledError:
+            self._async_finish(RolloutState.ABORTED)
+            raise
+        self._async_finish(RolloutState.DONE)
+
+    @callback
+    def _async_finish(self, state: RolloutState, error: str | None = None) -> None:
+        """Record the outcome of the rollout, skipping the miners left."""
+        for miner in self.miners.values():
+            if miner.state is MinerRolloutState.PENDING:
+                miner.state = MinerRolloutState.SKIPPED
+            elif miner.updating:
+                miner.state = MinerRolloutState.FAILED
+                miner.error = "Rollout stopped"
+        self.state = state
+        self.error = error
+        self.finished = dt_util.utcnow()
+        _LOGGER.info(
+            "Firmware rollout of %s %s%s",
+            self.version,
+            state.value,
+            f" ({error})" if error else "",
+        )
+        self._async_notify()
+
+    async def _async_update(
+        self, coordinator: NerdQAxeDataUpdateCoordinator, miner: MinerRollout
+    ) -> None:
+        """Update one miner and wait for it to hash again."""
+        assert self.version is not None
+        data = coordinator.data
+        miner.baseline = data.hashrate_1m if data else None
+        miner.state = MinerRolloutState.INSTALLING
+        miner.started = dt_util.utcnow()
+        started = monotonic()
+        self._async_notify()
+        try:
+            await async_start_ota(coordinator, miner.url, self.version)
+            miner.state = MinerRolloutState.RECOVERING
+            self._async_notify()
+            await self._async_recovered(coordinator, self.version, miner.baseline)
+        except NerdQAxeError as err:
+            miner.state = MinerRolloutState.FAILED
+            miner.error = str(err)
+        except TimeoutError:
+            miner.state = MinerRolloutState.FAILED
+            miner.error = (
+                f"Not back on {self.version} and hashing within {RECOVERY_TIMEOUT} s"
+            )
+        else:
+            miner.state = MinerRolloutState.DONE
+        miner.duration = monotonic() - started
+        _LOGGER.info(
+            "Firmware update of %s %s after %.0f s%s",
+            miner.host,
+            miner.state.value,
+            miner.duration,
+            f" ({miner.error})" if miner.error else "",
+        )
+        self._async_notify()
+
+    async def _async_recovered(
+        self,
+        coordinator: NerdQAxeDataUpdateCoordinator,
+        version: str,
+        baseline: float | None,
+    ) -> None:
+        """Wait for the miner to report the version and its hashrate again.
+
+        Raises:
+            TimeoutError: If it does not within ``RECOVERY_TIMEOUT``
+
+        """
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        target = baseline * RECOVERY_RATIO if baseline else 0.0
+
+        @callback
+        def _updated() -> None:
+            data = coordinator.data
+            if (
+                coordinator.last_update_success
+                and data is not None
+                and (data.version or "").lstrip("v") == version
+                and (data.hashrate_1m or 0.0) > 0
+                and (data.hashrate_1m or 0.0) >= target
+                and not future.done()
+            ):
+                future.set_result(None)
+
+        remove_listener = coordinator.async_add_listener(_updated)
+        try:
+            async with asyncio.timeout(RECOVERY_TIMEOUT):
+                await future
+        finally:
+            remove_listener()
+
+
+@callback
+def async_get_firmware_rollout(hass: HomeAssistant) -> NerdQAxeFirmwareRollout:
+    """Return the hass-wide firmware rollout, creating it on first use."""
+    if (rollout := hass.data.get(DATA_FIRMWARE_ROLLOUT)) is None:
+        rollout = hass.data[DATA_FIRMWARE_ROLLOUT] = NerdQAxeFirmwareRollout(hass)
+    return rollout
@@ -0,0 +1,290 @@
+"""Fleet-wide polling scheduler shared by every NerdQAxe+ config entry.
+
+Each config entry owns a coordinator, and left alone every coordinator runs
+its own ``update_interval`` timer. Miners set up together (Home Assistant
+startup, a bulk reload) then poll together, so a large farm produces periodic
+bursts on the event loop and on the Wi-Fi access point. The scheduler owns
+the timing of every scheduled poll instead: coordinators sharing a scan
+interval are given evenly spread phases within it, and a fleet-wide limit
+caps how many polls may be in flight at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import logging
+import math
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_FLEET_SCHEDULER, DEFAULT_MAX_CONCURRENT_POLLS
+
+if TYPE_CHECKING:
+    from .coordinator import NerdQAxeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Never poll a miner twice within this fraction of its interval. A manual
+# refresh landing just before the miner's slot would otherwise be followed by
+# a scheduled poll a moment later.
+MIN_POLL_SPACING = 0.5
+
+
+@dataclass(slots=True)
+class FleetCycleStats:
+    """Latency of the polls made during one sweep of the fleet."""
+
+    started: float
+    polls: int = 0
+    failures: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    def as_dict(self, finished: float) -> dict[str, Any]:
+        """Return the cycle as a JSON-serializable summary."""
+        return {
+            "polls": self.polls,
+            "failures": self.failures,
+            "duration": round(finished - self.started, 3),
+            "mean_latency": round(self.total_latency / self.polls, 3)
+            if self.polls
+            else None,
+            "max_latency": round(self.max_latency, 3),
+        }
+
+
+class NerdQAxeFleetScheduler:
+    """Phase-spread, concurrency-limited poll scheduler for all miners.
+
+    Coordinators register on setup. Their scheduled refreshes are placed on a
+    grid anchored at the scheduler's creation time: with ``n`` coordinators
+    sharing an interval ``T``, the k-th one polls at ``k * T / n`` into each
+    cycle. A coordinator whose interval changes (adaptive polling, backoff,
+    an OTA) moves to a slot of its new interval, and both the interval it
+    left and the one it joined are spread again, keeping their order. Every
+    poll then goes through :meth:`async_poll_slot`, which enforces the
+    fleet-wide concurrency limit and records per-cycle latency.
+
+    A cycle lasts until every miner due within the shortest interval of the
+    fleet has polled; a miner scheduled further out, such as one backed off
+    while offline, does not hold it open.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            hass: Home Assistant instance
+
+        """
+        self.hass = hass
+        self._epoch = hass.loop.time()
+        self._coordinators: dict[NerdQAxeDataUpdateCoordinator, int] = {}
+        # Interval and phase (s) of the slot of each coordinator
+        self._slots: dict[NerdQAxeDataUpdateCoordinator, tuple[float, float]] = {}
+        # Loop time of each coordinator's next scheduled poll, -inf until its
+        # first refresh and dropped once it polled until rescheduled
+        self._next_poll: dict[NerdQAxeDataUpdateCoordinator, float] = {}
+        self._max_concurrent = DEFAULT_MAX_CONCURRENT_POLLS
+        self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        self._in_flight = 0
+        self._cycle = FleetCycleStats(started=self._epoch)
+        self._polled: set[NerdQAxeDataUpdateCoordinator] = set()
+        self.last_cycle: dict[str, Any] | None = None
+
+    @property
+    def max_concurrent(self) -> int:
+        """Return the number of polls allowed in flight at once."""
+        return self._max_concurrent
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of polls currently in flight."""
+        return self._in_flight
+
+    @callback
+    def async_register(
+        self, coordinator: NerdQAxeDataUpdateCoordinator, max_concurrent: int
+    ) -> CALLBACK_TYPE:
+        """Register a coordinator and return the callback unregistering it.
+
+        Args:
+            coordinator: Coordinator whose polls the scheduler now owns
+            max_concurrent: Concurrency limit requested by its config entry
+
+        Returns:
+            Callback removing the coordinator from the fleet
+
+        """
+        self._coordinators[coordinator] = max_concurrent
+        self._next_poll[coordinator] = -math.inf
+        self._async_assign_slot(coordinator)
+        self._async_update_limit()
+
+        @callback
+        def _unregister() -> None:
+            self._coordinators.pop(coordinator, None)
+            self._next_poll.pop(coordinator, None)
+            self._polled.discard(coordinator)
+            if (slot := self._slots.pop(coordinator, None)) is not None:
+                self._async_spread(slot[0])
+            self._async_update_limit()
+
+        return _unregister
+
+    @callback
+    def async_set_max_concurrent(
+        self, coordinator: NerdQAxeDataUpdateCoordinator, max_concurrent: int
+    ) -> None:
+        """Change the concurrency limit requested by a registered coordinator.
+
+        Args:
+            coordinator: Registered coordinator
+            max_concurrent: New limit requested by its config entry
+
+        """
+        if coordinator in self._coordinators:
+            self._coordinators[coordinator] = max_concurrent
+            self._async_update_limit()
+
+    @callback
+    def _async_update_limit(self) -> None:
+        """Apply the most conservative limit requested by a loaded entry."""
+        limit = min(self._coordinators.values(), default=DEFAULT_MAX_CONCURRENT_POLLS)
+        if limit == self._max_concurrent:
+            return
+        # Polls in flight keep and release the previous semaphore; only new
+        # polls are held to the new limit.
+        self._max_concurrent = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        _LOGGER.debug("Fleet poll concurrency limit set to %d", limit)
+
+    @callback
+    def _async_assign_slot(self, coordinator: NerdQAxeDataUpdateCoordinator) -> None:
+        """Give a registered coordinator a slot of its current interval."""
+        if coordinator.update_interval is None:
+            return
+        interval = coordinator.update_interval.total_seconds()
+        previous = self._slots.get(coordinator)
+        if previous is not None and previous[0] == interval:
+            return
+
+        # Join the new interval last, then close the gap left in the old one
+        self._slots[coordinator] = (interval, math.inf)
+        self._async_spread(interval)
+        if previous is not None:
+            self._async_spread(previous[0])
+
+    @callback
+    def _async_spread(self, interval: float) -> None:
+        """Spread the phases of the coordinators sharing an interval evenly."""
+        peers = sorted(
+            (peer for peer, slot in self._slots.items() if slot[0] == interval),
+            key=lambda peer: self._slots[peer][1],
+        )
+        for index, peer in enumerate(peers):
+            self._slots[peer] = (interval, interval * index / len(peers))
+
+    def next_poll_time(self, coordinator: NerdQAxeDataUpdateCoordinator) -> float:
+        """Return the event loop time of the coordinator's next scheduled poll.
+
+        A coordinator whose interval changed since its last poll is first
+        moved to a slot of its new interval.
+
+        Args:
+            coordinator: Registered coordinator with an update interval
+
+        Returns:
+            Loop time (as in ``loop.time()``) of the next phase-aligned slot
+
+        """
+        assert coordinator.update_interval is not None
+        interval = coordinator.update_interval.total_seconds()
+        if coordinator not in self._coordinators:
+            phase = 0.0
+        else:
+            self._async_assign_slot(coordinator)
+            phase = self._slots[coordinator][1]
+
+        earliest = self.hass.loop.time() + interval * MIN_POLL_SPACING
+        cycles = math.ceil((earliest - self._epoch - phase) / interval)
+        next_poll = self._epoch + phase + cycles * interval
+        if coordinator in self._coordinators:
+            self._next_poll[coordinator] = next_poll
+        return next_poll
+
+    @asynccontextmanager
+    async def async_poll_slot(
+        self, coordinator: NerdQAxeDataUpdateCoordinator
+    ) -> AsyncIterator[None]:
+        """Hold one of the fleet's concurrent poll slots for a request.
+
+        Args:
+            coordinator: Coordinator performing the poll
+
+        """
+        async with self._semaphore:
+            self._in_flight += 1
+            start = monotonic()
+            failed = True
+            try:
+                yield
+                failed = False
+            finally:
+                self._in_flight -= 1
+                self._async_record_poll(coordinator, monotonic() - start, failed)
+
+    @callback
+    def _async_record_poll(
+        self,
+        coordinator: NerdQAxeDataUpdateCoordinator,
+        latency: float,
+        failed: bool,
+    ) -> None:
+        """Account a poll to the current cycle, closing it once all due polled."""
+        cycle = self._cycle
+        cycle.polls += 1
+        cycle.failures += int(failed)
+        cycle.total_latency += latency
+        cycle.max_latency = max(cycle.max_latency, latency)
+        self._polled.add(coordinator)
+        self._next_poll.pop(coordinator, None)
+
+        # Miners due within the cycle: scheduled before it spans the shortest
+        # interval of the fleet, or still waiting for their first refresh
+        sweep = min((slot[0] for slot in self._slots.values()), default=0.0)
+        deadline = cycle.started + sweep
+        if any(
+            self._next_poll.get(peer, math.inf) < deadline
+            for peer in self._coordinators
+            if peer not in self._polled
+        ):
+            return
+
+        now = self.hass.loop.time()
+        self.last_cycle = cycle.as_dict(now)
+        _LOGGER.debug("Fleet poll cycle finished: %s", self.last_cycle)
+        self._cycle = FleetCycleStats(started=now)
+        self._polled.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler state for diagnostics."""
+        return {
+            "miners": len(self._coordinators),
+            "max_concurrent_polls": self._max_concurrent,
+            "in_flight": self._in_flight,
+            "last_cycle": self.last_cycle,
+        }
+
+
+@callback
+def async_get_fleet_scheduler(hass: HomeAssistant) -> NerdQAxeFleetScheduler:
+    """Return the hass-wide scheduler, creating it on first use."""
+    if (scheduler := hass.data.get(DATA_FLEET_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_FLEET_SCHEDULER] = NerdQAxeFleetScheduler(hass)
+    return scheduler
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Mapping
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from datetime import datetime
 import logging
+from time import monotonic
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -21,12 +23,15 @@ from homeassistant.const import (
     UnitOfPower,
     UnitOfTemperature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import NerdQAxeConfigEntry, NerdQAxeDataUpdateCoordinator
+from .autotune import AutoTuner, AutoTuneState
 from .const import (
     ATTR_ASIC_TEMPS,
     ATTR_BEST_DIFF,
@@ -64,14 +69,13 @@ from .const import (
     ATTR_VOLTAGE,
     ATTR_VR_TEMP,
     ATTR_WIFI_RSSI,
-    POOL_MODE_DUAL,
-)
-from .pool import (
-    active_pool_field,
-    clean_value,
-    pool_mode,
-    pool_mode_name,
+    CONF_COMPACT_ASIC_TEMPS,
+    DEFAULT_COMPACT_ASIC_TEMPS,
 )
+from .longterm import STATE_WRITE_INTERVAL, HourlyStatistics
+from .pool import POOL_STATE_KEYS
+from .snapshot import MinerSnapshot
+from .telemetry import STATISTICS_ATTRIBUTES
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -83,42 +87,63 @@ UNIT_GIGAHASH_PER_SECOND = "GH/s"
 UNIT_REVOLUTIONS_PER_MINUTE = "RPM"
 UNIT_MEGAHERTZ = "MHz"
 UNIT_DECIBEL_MILLIWATT = "dBm"
+UNIT_JOULE_PER_TERAHASH = "J/TH"
+UNIT_GIGAHASH_PER_WATT = "GH/W"
 
 
-def _clean_version(data: dict[str, Any]) -> StateType:
+def _clean_version(data: MinerSnapshot) -> StateType:
     """Return the firmware version without its leading ``v`` prefix."""
-    version = data.get(ATTR_VERSION)
-    if isinstance(version, str):
-        return version.lstrip("v")
-    return version
+    return data.version.lstrip("v") if data.version is not None else None
 
 
-def _pool_url_attributes(data: dict[str, Any]) -> dict[str, Any]:
+def _pool_url_attributes(data: MinerSnapshot) -> dict[str, Any]:
     """Return the pool mode and, in dual-pool mode, the second pool mined.
 
     In dual-pool mode both pools mine simultaneously; the state reports the
     primary one, so the second endpoint is only reachable as an attribute.
     """
-    attributes: dict[str, Any] = {"pool_mode": pool_mode_name(data)}
+    attributes: dict[str, Any] = {"pool_mode": data.pool.mode_name}
 
-    if pool_mode(data) == POOL_MODE_DUAL:
-        attributes["secondary_url"] = clean_value(data.get(ATTR_FALLBACK_STRATUM_URL))
-        attributes["secondary_port"] = clean_value(data.get(ATTR_FALLBACK_STRATUM_PORT))
+    if data.pool.secondary is not None:
+        attributes["secondary_url"] = data.pool.secondary.url
+        attributes["secondary_port"] = data.pool.secondary.port
 
     return attributes
 
 
+def _average_power_attributes(window: str) -> Callable[[MinerSnapshot], dict[str, Any]]:
+    """Return the attributes function exposing the average power of a window.
+
+    Args:
+        window: ``10m`` or ``1h``, naming the ``Efficiency`` field
+
+    """
+
+    def _attributes(data: MinerSnapshot) -> dict[str, Any]:
+        if data.efficiency is None:
+            return {}
+        return {"average_power": getattr(data.efficiency, f"power_{window}")}
+
+    return _attributes
+
+
 @dataclass(frozen=True, kw_only=True)
 class NerdQAxeSensorEntityDescription(SensorEntityDescription):
     """Describes a NerdQAxe+ sensor entity.
 
-    ``value_fn`` extracts the native value from the coordinator data dict, which
-    keeps all per-sensor logic declarative and in one place. ``attributes_fn``
-    is optional and only set by sensors that carry extra state attributes.
+    ``value_fn`` extracts the native value from the coordinator snapshot, which
+    keeps all per-sensor logic declarative and in one place. ``source_keys``
+    lists the payload keys of every field ``value_fn`` and ``attributes_fn``
+    read: the coordinator only notifies the entity when one of them changed.
+    ``attributes_fn`` is optional and only set by sensors that carry extra
+    state attributes. ``statistics_field`` names the snapshot field whose
+    rolling statistics (see ``telemetry.py``) are added as attributes.
     """
 
-    value_fn: Callable[[dict[str, Any]], StateType]
-    attributes_fn: Callable[[dict[str, Any]], Mapping[str, Any]] | None = None
+    value_fn: Callable[[MinerSnapshot], StateType]
+    source_keys: frozenset[str]
+    attributes_fn: Callable[[MinerSnapshot], Mapping[str, Any]] | None = None
+    statistics_field: str | None = None
 
 
 SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
@@ -129,7 +154,9 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UNIT_GIGAHASH_PER_SECOND,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
-        value_fn=lambda data: data.get(ATTR_HASHRATE),
+        value_fn=lambda data: data.hashrate,
+        source_keys=frozenset({ATTR_HASHRATE}),
+        statistics_field="hashrate",
     ),
     NerdQAxeSensorEntityDescription(
         key="hashrate_1m",
@@ -137,7 +164,8 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UNIT_GIGAHASH_PER_SECOND,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
-        value_fn=lambda data: data.get(ATTR_HASHRATE_1M),
+        value_fn=lambda data: data.hashrate_1m,
+        source_keys=frozenset({ATTR_HASHRATE_1M}),
     ),
     NerdQAxeSensorEntityDescription(
         key="hashrate_10m",
@@ -145,7 +173,8 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UNIT_GIGAHASH_PER_SECOND,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
-        value_fn=lambda data: data.get(ATTR_HASHRATE_10M),
+        value_fn=lambda data: data.hashrate_10m,
+        source_keys=frozenset({ATTR_HASHRATE_10M}),
     ),
     NerdQAxeSensorEntityDescription(
         key="hashrate_1h",
@@ -153,7 +182,8 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UNIT_GIGAHASH_PER_SECOND,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
-        value_fn=lambda data: data.get(ATTR_HASHRATE_1H),
+        value_fn=lambda data: data.hashrate_1h,
+        source_keys=frozenset({ATTR_HASHRATE_1H}),
     ),
     NerdQAxeSensorEntityDescription(
         key="hashrate_1d",
@@ -161,7 +191,8 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         native_unit_of_measurement=UNIT_GIGAHASH_PER_SECOND,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
-        value_fn=lambda data: data.get(ATTR_HASHRATE_1D),
+        value_fn=lambda data: data.hashrate_1d,
+        source_keys=frozenset({ATTR_HASHRATE_1D}),
     ),
     # Temperature
     NerdQAxeSensorEntityDescription(
@@ -170,7 +201,9 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=1,
-        value_fn=lambda data: data.get(ATTR_TEMP),
+        value_fn=lambda data: data.temp,
+        source_keys=frozenset({ATTR_TEMP}),
+        statistics_field="temp",
     ),
     NerdQAxeSensorEntityDescription(
         key="vr_temperature",
@@ -178,7 +211,9 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=1,
-        value_fn=lambda data: data.get(ATTR_VR_TEMP),
+        value_fn=lambda data: data.vr_temp,
+        source_keys=frozenset({ATTR_VR_TEMP}),
+        statistics_field="vr_temp",
     ),
     # Power
     NerdQAxeSensorEntityDescription(
@@ -187,7 +222,49 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.POWER,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
-        value_fn=lambda data: data.get(ATTR_POWER),
+        value_fn=lambda data: data.power,
+        source_keys=frozenset({ATTR_POWER}),
+        statistics_field="power",
+    ),
+    # Efficiency, resolved by the coordinator once per update (see
+    # ``efficiency.py``)
+    NerdQAxeSensorEntityDescription(
+        key="efficiency",
+        icon="mdi:lightning-bolt-circle",
+        native_unit_of_measurement=UNIT_JOULE_PER_TERAHASH,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda data: data.efficiency.jth if data.efficiency else None,
+        source_keys=frozenset({ATTR_HASHRATE, ATTR_POWER}),
+    ),
+    NerdQAxeSensorEntityDescription(
+        key="hashrate_per_watt",
+        icon="mdi:leaf",
+        native_unit_of_measurement=UNIT_GIGAHASH_PER_WATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda data: data.efficiency.ghw if data.efficiency else None,
+        source_keys=frozenset({ATTR_HASHRATE, ATTR_POWER}),
+    ),
+    NerdQAxeSensorEntityDescription(
+        key="efficiency_10m",
+        icon="mdi:lightning-bolt-circle",
+        native_unit_of_measurement=UNIT_JOULE_PER_TERAHASH,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda data: data.efficiency.jth_10m if data.efficiency else None,
+        source_keys=frozenset({ATTR_HASHRATE_10M, ATTR_POWER}),
+        attributes_fn=_average_power_attributes("10m"),
+    ),
+    NerdQAxeSensorEntityDescription(
+        key="efficiency_1h",
+        icon="mdi:lightning-bolt-circle",
+        native_unit_of_measurement=UNIT_JOULE_PER_TERAHASH,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda data: data.efficiency.jth_1h if data.efficiency else None,
+        source_keys=frozenset({ATTR_HASHRATE_1H, ATTR_POWER}),
+        attributes_fn=_average_power_attributes("1h"),
     ),
     NerdQAxeSensorEntityDescription(
         key="voltage",
@@ -195,7 +272,8 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
-        value_fn=lambda data: data.get(ATTR_VOLTAGE),
+        value_fn=lambda data: data.voltage,
+        source_keys=frozenset({ATTR_VOLTAGE}),
     ),
     NerdQAxeSensorEntityDescription(
         key="current",
@@ -203,7 +281,8 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.CURRENT,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
-        value_fn=lambda data: data.get(ATTR_CURRENT),
+        value_fn=lambda data: data.current,
+        source_keys=frozenset({ATTR_CURRENT}),
     ),
     NerdQAxeSensorEntityDescription(
         key="core_voltage",
@@ -211,7 +290,8 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=0,
-        value_fn=lambda data: data.get(ATTR_CORE_VOLTAGE),
+        value_fn=lambda data: data.core_voltage,
+        source_keys=frozenset({ATTR_CORE_VOLTAGE}),
     ),
     NerdQAxeSensorEntityDescription(
         key="core_voltage_actual",
@@ -220,7 +300,8 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         suggested_display_precision=0,
-        value_fn=lambda data: data.get(ATTR_CORE_VOLTAGE_ACTUAL),
+        value_fn=lambda data: data.core_voltage_actual,
+        source_keys=frozenset({ATTR_CORE_VOLTAGE_ACTUAL}),
     ),
     # Fan
     NerdQAxeSensorEntityDescription(
@@ -228,66 +309,74 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         icon="mdi:fan",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(ATTR_FAN_SPEED),
+        value_fn=lambda data: data.fan_speed,
+        source_keys=frozenset({ATTR_FAN_SPEED}),
     ),
     NerdQAxeSensorEntityDescription(
         key="fan_rpm",
         icon="mdi:fan",
         native_unit_of_measurement=UNIT_REVOLUTIONS_PER_MINUTE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(ATTR_FAN_RPM),
+        value_fn=lambda data: data.fan_rpm,
+        source_keys=frozenset({ATTR_FAN_RPM}),
+        statistics_field="fan_rpm",
     ),
     # Mining statistics
     NerdQAxeSensorEntityDescription(
         key="shares_accepted",
         icon="mdi:check-circle",
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(ATTR_SHARES_ACCEPTED),
+        value_fn=lambda data: data.shares_accepted,
+        source_keys=frozenset({ATTR_SHARES_ACCEPTED}),
     ),
     NerdQAxeSensorEntityDescription(
         key="shares_rejected",
         icon="mdi:close-circle",
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(ATTR_SHARES_REJECTED),
+        value_fn=lambda data: data.shares_rejected,
+        source_keys=frozenset({ATTR_SHARES_REJECTED}),
     ),
     NerdQAxeSensorEntityDescription(
         key="best_difficulty",
         icon="mdi:trophy",
-        value_fn=lambda data: data.get(ATTR_BEST_DIFF),
+        value_fn=lambda data: data.best_diff,
+        source_keys=frozenset({ATTR_BEST_DIFF}),
     ),
     NerdQAxeSensorEntityDescription(
         key="best_session_difficulty",
         icon="mdi:trophy-outline",
-        value_fn=lambda data: data.get(ATTR_BEST_SESSION_DIFF),
+        value_fn=lambda data: data.best_session_diff,
+        source_keys=frozenset({ATTR_BEST_SESSION_DIFF}),
     ),
     NerdQAxeSensorEntityDescription(
         key="found_blocks",
         icon="mdi:cube",
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get(ATTR_FOUND_BLOCKS),
+        value_fn=lambda data: data.found_blocks,
+        source_keys=frozenset({ATTR_FOUND_BLOCKS}),
     ),
     NerdQAxeSensorEntityDescription(
         key="total_found_blocks",
         icon="mdi:cube-outline",
         state_class=SensorStateClass.TOTAL,
-        value_fn=lambda data: data.get(ATTR_TOTAL_FOUND_BLOCKS),
+        value_fn=lambda data: data.total_found_blocks,
+        source_keys=frozenset({ATTR_TOTAL_FOUND_BLOCKS}),
     ),
     # Mining pool (endpoint of the pool currently being mined)
     NerdQAxeSensorEntityDescription(
         key="pool_url",
         icon="mdi:pickaxe",
-        value_fn=lambda data: active_pool_field(
-            data, ATTR_STRATUM_URL, ATTR_FALLBACK_STRATUM_URL
-        ),
+        value_fn=lambda data: data.pool.endpoint.url,
+        source_keys=POOL_STATE_KEYS
+        | {ATTR_STRATUM_URL, ATTR_FALLBACK_STRATUM_URL, ATTR_FALLBACK_STRATUM_PORT},
         attributes_fn=_pool_url_attributes,
     ),
     NerdQAxeSensorEntityDescription(
         key="pool_port",
         icon="mdi:ethernet",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: active_pool_field(
-            data, ATTR_STRATUM_PORT, ATTR_FALLBACK_STRATUM_PORT
-        ),
+        value_fn=lambda data: data.pool.endpoint.port,
+        source_keys=POOL_STATE_KEYS | {ATTR_STRATUM_PORT, ATTR_FALLBACK_STRATUM_PORT},
     ),
     NerdQAxeSensorEntityDescription(
         key="pool_user",
@@ -296,22 +385,23 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         # The pool user embeds the payout address, so keep it opt-in rather
         # than recording it and shipping it in every backup by default.
         entity_registry_enabled_default=False,
-        value_fn=lambda data: active_pool_field(
-            data, ATTR_STRATUM_USER, ATTR_FALLBACK_STRATUM_USER
-        ),
+        value_fn=lambda data: data.pool.endpoint.user,
+        source_keys=POOL_STATE_KEYS | {ATTR_STRATUM_USER, ATTR_FALLBACK_STRATUM_USER},
     ),
     # Device information
     NerdQAxeSensorEntityDescription(
         key="device_model",
         icon="mdi:chip",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(ATTR_DEVICE_MODEL),
+        value_fn=lambda data: data.device_model,
+        source_keys=frozenset({ATTR_DEVICE_MODEL}),
     ),
     NerdQAxeSensorEntityDescription(
         key="hostname",
         icon="mdi:server",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(ATTR_HOSTNAME),
+        value_fn=lambda data: data.hostname,
+        source_keys=frozenset({ATTR_HOSTNAME}),
     ),
     NerdQAxeSensorEntityDescription(
         key="wifi_rssi",
@@ -320,20 +410,23 @@ SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.SIGNAL_STRENGTH,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get(ATTR_WIFI_RSSI),
+        value_fn=lambda data: data.wifi_rssi,
+        source_keys=frozenset({ATTR_WIFI_RSSI}),
     ),
     NerdQAxeSensorEntityDescription(
         key="frequency",
         icon="mdi:sine-wave",
         native_unit_of_measurement=UNIT_MEGAHERTZ,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(ATTR_FREQUENCY),
+        value_fn=lambda data: data.frequency,
+        source_keys=frozenset({ATTR_FREQUENCY}),
     ),
     NerdQAxeSensorEntityDescription(
         key="version",
         icon="mdi:information-outline",
         entity_category=EntityCategory.DIAGNOSTIC,
         value_fn=_clean_version,
+        source_keys=frozenset({ATTR_VERSION}),
     ),
 )
 
@@ -345,36 +438,86 @@ SECONDARY_FAN_SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
         icon="mdi:fan",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(ATTR_FAN_SPEED_2),
+        value_fn=lambda data: data.fan_speed_2,
+        source_keys=frozenset({ATTR_FAN_SPEED_2}),
     ),
     NerdQAxeSensorEntityDescription(
         key="fan_rpm_2",
         icon="mdi:fan",
         native_unit_of_measurement=UNIT_REVOLUTIONS_PER_MINUTE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get(ATTR_FAN_RPM_2),
+        value_fn=lambda data: data.fan_rpm_2,
+        source_keys=frozenset({ATTR_FAN_RPM_2}),
+    ),
+)
+
+
+# Aggregates of the per-ASIC temperatures, created alongside the per-ASIC
+# sensors on boards that sense them. Resolved once per snapshot.
+ASIC_TEMP_SENSORS: tuple[NerdQAxeSensorEntityDescription, ...] = (
+    NerdQAxeSensorEntityDescription(
+        key="asic_temperature_max",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda data: data.asic.maximum if data.asic else None,
+        source_keys=frozenset({ATTR_ASIC_TEMPS}),
     ),
+    NerdQAxeSensorEntityDescription(
+        key="asic_temperature_mean",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda data: data.asic.mean if data.asic else None,
+        source_keys=frozenset({ATTR_ASIC_TEMPS}),
+    ),
+    NerdQAxeSensorEntityDescription(
+        key="asic_temperature_spread",
+        icon="mdi:thermometer-lines",
+        # A temperature difference: no device class, so it is never converted
+        # as an absolute temperature would be.
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda data: data.asic.spread if data.asic else None,
+        source_keys=frozenset({ATTR_ASIC_TEMPS}),
+    ),
+    NerdQAxeSensorEntityDescription(
+        key="hottest_asic",
+        icon="mdi:chip",
+        value_fn=lambda data: data.asic.hottest if data.asic else None,
+        source_keys=frozenset({ATTR_ASIC_TEMPS}),
+    ),
+)
+
+
+# Sensor carrying the per-ASIC readings as an attribute in compact mode
+COMPACT_ASIC_TEMPS_KEY: str = "asic_temperature_max"
+
+
+# Payload keys revealing optional hardware (second fan, per-ASIC sensing)
+HARDWARE_KEYS: frozenset[str] = frozenset(
+    {ATTR_FAN_COUNT, ATTR_FAN_RPM_2, ATTR_FAN_SPEED_2, ATTR_ASIC_TEMPS}
 )
 
 
-def _has_second_fan(data: dict[str, Any] | None) -> bool:
+def _asic_temps_attributes(data: MinerSnapshot) -> dict[str, Any]:
+    """Return the per-ASIC temperatures, for compact mode."""
+    return {"asic_temperatures": list(data.asic_temps)}
+
+
+def _has_second_fan(data: MinerSnapshot | None) -> bool:
     """Return True if the miner reports a second fan.
 
-    ``fanCount`` is the authoritative signal and is present on current
-    firmware (single-fan boards report ``fanCount: 1`` while still sending
-    ``fanspeed2``/``fanrpm2`` as ``0``, so those fields cannot be used as a
-    presence check). Only when ``fanCount`` is absent (older firmware) do we
-    fall back to a *non-zero* second-fan reading.
+    Resolved by the snapshot from ``fanCount``, or on older firmware without
+    it from a *non-zero* second-fan reading.
     """
-    if not data:
-        return False
-    fan_count = data.get(ATTR_FAN_COUNT)
-    if fan_count is not None:
-        return bool(fan_count >= 2)
-    return bool(data.get(ATTR_FAN_RPM_2) or data.get(ATTR_FAN_SPEED_2))
+    return data.has_second_fan if data else False
 
 
-def _asic_temp_count(data: dict[str, Any] | None) -> int:
+def _asic_temp_count(data: MinerSnapshot | None) -> int:
     """Return how many per-ASIC temperature sensors to create.
 
     Multi-ASIC boards (e.g. NerdQX) report a temperature per chip in the
@@ -382,12 +525,9 @@ def _asic_temp_count(data: dict[str, Any] | None) -> int:
     omit the field), so only create sensors when at least one reading is
     non-zero.
     """
-    if not data:
+    if not data or data.asic is None:
         return 0
-    temps = data.get(ATTR_ASIC_TEMPS)
-    if not isinstance(temps, list) or not any(temps):
-        return 0
-    return len(temps)
+    return len(data.asic_temps)
 
 
 async def async_setup_entry(
@@ -398,7 +538,9 @@ async def async_setup_entry(
     """Set up NerdQAxe+ Miner sensors from a config entry.
 
     Creates all sensor entities including hashrate, temperature, power,
-    fan, mining statistics, and device information sensors.
+    fan, mining statistics, and device information sensors. The sensors of
+    optional hardware (second fan, per-ASIC temperatures) are created as soon
+    as a refresh reports it, at setup or later on.
 
     Args:
         hass: Home Assistant instance
@@ -407,27 +549,89 @@ async def async_setup_entry(
 
     """
     coordinator = entry.runtime_data.coordinator
+    compact_asic_temps = entry.options.get(
+        CONF_COMPACT_ASIC_TEMPS, DEFAULT_COMPACT_ASIC_TEMPS
+    )
+    statistics = (
+        HourlyStatistics(hass, coordinator, ())
+        if coordinator.import_statistics
+        else None
+    )
+    if statistics is not None:
+        await statistics.async_load()
+    if compact_asic_temps:
+        _async_remove_asic_temp_entities(hass, entry, coordinator)
+
+    second_fan_added = False
+    asic_temps_added = 0
+
+    @callback
+    def _hardware_entities() -> list[SensorEntity]:
+        """Return the sensors of optional hardware not created yet."""
+        nonlocal second_fan_added, asic_temps_added
+        descriptions: list[NerdQAxeSensorEntityDescription] = []
+        entities: list[SensorEntity] = []
+
+        # Dual-fan boards expose a second fan
+        if not second_fan_added and _has_second_fan(coordinator.data):
+            second_fan_added = True
+            descriptions.extend(SECONDARY_FAN_SENSORS)
+
+        # Multi-ASIC boards (e.g. NerdQX) report a temperature per chip, when
+        # they actually measure them. In compact mode the readings are an
+        # attribute of the hottest ASIC temperature sensor
+        # (``asic_temperature_max``) instead; the ``hottest_asic`` sensor only
+        # reports which chip that is.
+        asic_count = _asic_temp_count(coordinator.data)
+        if asic_count > asic_temps_added:
+            if not asic_temps_added:
+                descriptions.extend(
+                    replace(description, attributes_fn=_asic_temps_attributes)
+                    if compact_asic_temps and description.key == COMPACT_ASIC_TEMPS_KEY
+                    else description
+                    for description in ASIC_TEMP_SENSORS
+                )
+            if not compact_asic_temps:
+                entities.extend(
+                    NerdQAxeAsicTempSensor(coordinator, index)
+                    for index in range(asic_temps_added, asic_count)
+                )
+            asic_temps_added = asic_count
+
+        if statistics is not None:
+            statistics.async_track(descriptions)
+        return [
+            *(NerdQAxeSensor(coordinator, description) for description in descriptions),
+            *entities,
+        ]
 
     entities: list[SensorEntity] = [
         NerdQAxeSensor(coordinator, description) for description in SENSORS
     ]
     entities.append(NerdQAxeUptimeSensor(coordinator))
+    entities.append(NerdQAxeAutoTuneSensor(coordinator, entry.runtime_data.autotune))
+    if statistics is not None:
+        statistics.async_track(SENSORS)
+    entities.extend(_hardware_entities())
+    async_add_entities(entities)
 
-    # Dual-fan boards expose a second fan; only add those sensors when present.
-    if _has_second_fan(coordinator.data):
-        entities.extend(
-            NerdQAxeSensor(coordinator, description)
-            for description in SECONDARY_FAN_SENSORS
-        )
+    @callback
+    def _async_discover_hardware() -> None:
+        """Add the sensors of hardware reported after setup."""
+        if new_entities := _hardware_entities():
+            _LOGGER.info(
+                "Adding %d sensor entities for new hardware on %s",
+                len(new_entities),
+                coordinator.host,
+            )
+            async_add_entities(new_entities)
 
-    # Multi-ASIC boards (e.g. NerdQX) report a temperature per chip; add those
-    # sensors only when the board actually measures them.
-    entities.extend(
-        NerdQAxeAsicTempSensor(coordinator, index)
-        for index in range(_asic_temp_count(coordinator.data))
+    entry.async_on_unload(
+        coordinator.async_add_listener(_async_discover_hardware, HARDWARE_KEYS)
     )
+    if statistics is not None:
+        entry.async_on_unload(statistics.async_start())
 
-    async_add_entities(entities)
     _LOGGER.info(
         "Successfully set up %d sensor entities for %s",
         len(entities),
@@ -435,16 +639,113 @@ async def async_setup_entry(
     )
 
 
-class NerdQAxeSensor(CoordinatorEntity[NerdQAxeDataUpdateCoordinator], SensorEntity):
+def _async_remove_asic_temp_entities(
+    hass: HomeAssistant,
+    entry: NerdQAxeConfigEntry,
+    coordinator: NerdQAxeDataUpdateCoordinator,
+) -> None:
+    """Remove the per-ASIC sensors left over from before compact mode."""
+    entity_registry = er.async_get(hass)
+    prefix = f"{coordinator.unique_id_base}_asic_temp_"
+    for registry_entry in er.async_entries_for_config_entry(
+        entity_registry, entry.entry_id
+    ):
+        if registry_entry.domain == "sensor" and registry_entry.unique_id.startswith(
+            prefix
+        ):
+            entity_registry.async_remove(registry_entry.entity_id)
+
+
+class NerdQAxeThrottledSensor(
+    CoordinatorEntity[NerdQAxeDataUpdateCoordinator], SensorEntity
+):
+    """Coordinator sensor whose state writes can be throttled.
+
+    With the hourly statistics import enabled, measurement sensors write their
+    state at most every ``STATE_WRITE_INTERVAL``; the latest value is written
+    when the interval ends. Availability changes are always written right
+    away.
+    """
+
+    def __init__(
+        self,
+        coordinator: NerdQAxeDataUpdateCoordinator,
+        source_keys: frozenset[str],
+        measurement: bool,
+    ) -> None:
+        """Initialize the sensor.
+
+        Args:
+            coordinator: Data update coordinator instance
+            source_keys: Payload keys the sensor reads
+            measurement: Whether the sensor is a measurement, throttled while
+                the statistics import is enabled
+
+        """
+        super().__init__(coordinator, source_keys)
+        self._throttled = coordinator.import_statistics and measurement
+        self._last_write = 0.0
+        self._written_available = True
+        self._unsub_pending_write: CALLBACK_TYPE | None = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending throttled state write."""
+        if self._unsub_pending_write is not None:
+            self._unsub_pending_write()
+            self._unsub_pending_write = None
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state, at most once per interval when throttled.
+
+        Availability changes are always written right away.
+        """
+        if self._unsub_pending_write is not None:
+            # The pending write will pick up the latest value
+            if self.available == self._written_available:
+                return
+            self._unsub_pending_write()
+            self._unsub_pending_write = None
+
+        delay = self._last_write + STATE_WRITE_INTERVAL - monotonic()
+        if (
+            not self._throttled
+            or delay <= 0
+            or self.available != self._written_available
+        ):
+            self._async_write_state()
+            return
+        self._unsub_pending_write = async_call_later(
+            self.hass, delay, self._async_write_pending_state
+        )
+
+    @callback
+    def _async_write_pending_state(self, _now: datetime) -> None:
+        self._unsub_pending_write = None
+        self._async_write_state()
+
+    @callback
+    def _async_write_state(self) -> None:
+        self._last_write = monotonic()
+        self._written_available = self.available
+        self.async_write_ha_state()
+
+
+class NerdQAxeSensor(NerdQAxeThrottledSensor):
     """Representation of a NerdQAxe+ Miner sensor.
 
     Generic sensor entity driven by a :class:`NerdQAxeSensorEntityDescription`
     that reads its value from the coordinator data via ``value_fn``.
+    Measurement sensors are throttled (see :class:`NerdQAxeThrottledSensor`).
     """
 
     entity_description: NerdQAxeSensorEntityDescription
 
     _attr_has_entity_name = True
+    # The rolling statistics move with every sample; the recorder already
+    # keeps the history they are derived from.
+    _unrecorded_attributes = STATISTICS_ATTRIBUTES
 
     def __init__(
         self,
@@ -458,7 +759,11 @@ class NerdQAxeSensor(CoordinatorEntity[NerdQAxeDataUpdateCoordinator], SensorEnt
             description: Sensor description (key, units, value_fn, ...)
 
         """
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            description.source_keys,
+            description.state_class is SensorStateClass.MEASUREMENT,
+        )
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.unique_id_base}_{description.key}"
         self._attr_translation_key = description.key
@@ -478,16 +783,26 @@ class NerdQAxeSensor(CoordinatorEntity[NerdQAxeDataUpdateCoordinator], SensorEnt
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
-        """Return extra attributes for sensors declaring an ``attributes_fn``.
+        """Return the ``attributes_fn`` and rolling statistics attributes.
 
         Returns:
             Extra state attributes, or None if the sensor has none
 
         """
-        attributes_fn = self.entity_description.attributes_fn
-        if attributes_fn is None or not self.coordinator.data:
+        description = self.entity_description
+        if not self.coordinator.data:
             return None
-        return attributes_fn(self.coordinator.data)
+
+        attributes: dict[str, Any] = {}
+        if description.attributes_fn is not None:
+            attributes.update(description.attributes_fn(self.coordinator.data))
+        if description.statistics_field is not None and (
+            statistics := self.coordinator.telemetry.stats(
+                description.statistics_field, monotonic()
+            )
+        ):
+            attributes.update(statistics)
+        return attributes or None
 
 
 class NerdQAxeUptimeSensor(
@@ -511,7 +826,7 @@ class NerdQAxeUptimeSensor(
             coordinator: Data update coordinator instance
 
         """
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({ATTR_UPTIME}))
         self._attr_unique_id = f"{coordinator.unique_id_base}_uptime"
         self._attr_translation_key = "uptime"
         self._attr_icon = "mdi:clock-outline"
@@ -553,7 +868,7 @@ class NerdQAxeUptimeSensor(
         if not self.coordinator.data:
             return None
 
-        uptime_seconds = self.coordinator.data.get(ATTR_UPTIME)
+        uptime_seconds = self.coordinator.data.uptime
         if uptime_seconds is None:
             return None
 
@@ -577,15 +892,15 @@ class NerdQAxeUptimeSensor(
             return f"{minutes}{units['minute']}"
 
 
-class NerdQAxeAsicTempSensor(
-    CoordinatorEntity[NerdQAxeDataUpdateCoordinator], SensorEntity
-):
+class NerdQAxeAsicTempSensor(NerdQAxeThrottledSensor):
     """Per-ASIC temperature sensor.
 
     Multi-ASIC boards (e.g. NerdQX) report a temperature per chip in the
     ``asicTemps`` array; one sensor is created per entry. The name is resolved
     from ``translation_key`` with an ``index`` placeholder so it stays
-    localized.
+    localized. Like every measurement sensor its state writes are throttled
+    while the statistics import is enabled; the per-chip readings are not
+    imported themselves, their maximum and mean are.
     """
 
     __slots__ = ("_index",)
@@ -604,7 +919,7 @@ class NerdQAxeAsicTempSensor(
             index: Zero-based ASIC index into ``asicTemps``
 
         """
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({ATTR_ASIC_TEMPS}), measurement=True)
         self._index = index
         self._attr_unique_id = f"{coordinator.unique_id_base}_asic_temp_{index}"
         self._attr_translation_key = "asic_temperature"
@@ -620,10 +935,70 @@ class NerdQAxeAsicTempSensor(
 
         """
         data = self.coordinator.data
-        if not data:
-            return None
-        temps = data.get(ATTR_ASIC_TEMPS)
-        if not isinstance(temps, list) or self._index >= len(temps):
+        if not data or self._index >= len(data.asic_temps):
             return None
-        value = temps[self._index]
-        return value if isinstance(value, (int, float)) else None
+        return data.asic_temps[self._index]
+
+
+class NerdQAxeAutoTuneSensor(SensorEntity):
+    """State of the auto-tuner of the miner.
+
+    Shows whether a run is in progress and how the last one ended, with the
+    best frequency/voltage pair found so far as attributes. Follows the tuner
+    rather than the coordinator, so the last result stays readable while the
+    miner is offline.
+    """
+
+    __slots__ = ("_tuner",)
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_translation_key = "autotune"
+    _attr_icon = "mdi:tune-vertical"
+    # Progress attributes change with every step of a run
+    _unrecorded_attributes = frozenset({"step_frequency", "step_core_voltage", "steps"})
+
+    def __init__(
+        self, coordinator: NerdQAxeDataUpdateCoordinator, tuner: AutoTuner
+    ) -> None:
+        """Initialize the auto-tune sensor.
+
+        Args:
+            coordinator: Data update coordinator instance
+            tuner: Auto-tuner of the miner
+
+        """
+        self._tuner = tuner
+        self._attr_options = [state.value for state in AutoTuneState]
+        self._attr_unique_id = f"{coordinator.unique_id_base}_autotune"
+        self._attr_device_info = coordinator.get_device_info()
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the progress of the tuner."""
+        self.async_on_remove(self._tuner.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> str:
+        """Return the tuner state."""
+        return self._tuner.state.value
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return the run target, progress and best point."""
+        tuner = self._tuner
+        step, best = tuner.step, tuner.best
+        efficiency = best.efficiency if best else None
+        return {
+            "target": tuner.request.target if tuner.request else None,
+            "step_frequency": step[0] if step else None,
+            "step_core_voltage": step[1] if step else None,
+            "steps": len(tuner.points),
+            "best_frequency": best.frequency if best else None,
+            "best_core_voltage": best.core_voltage if best else None,
+            "best_hashrate": best.hashrate if best else None,
+            "best_power": best.power if best else None,
+            "best_efficiency": round(efficiency, 2) if efficiency else None,
+            "error": tuner.error,
+        }
@@ -0,0 +1,284 @@
+"""Services of the NerdQAxe+ Miner integration."""
+
+from __future__ import annotations
+
+from typing import Final
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+import voluptuous as vol
+
+from .autotune import (
+    AUTOTUNE_TARGETS,
+    DEFAULT_CORE_VOLTAGE_SPAN,
+    DEFAULT_FREQUENCY_SPAN,
+    DEFAULT_MAX_TEMP,
+    DEFAULT_MAX_VR_TEMP,
+    TARGET_EFFICIENCY,
+    TARGET_POWER_CAP,
+    AutoTuneRequest,
+    sweep_bounds,
+)
+from .budget import DEFAULT_BUDGET_MARGIN, async_get_power_budget
+from .const import (
+    ATTR_CORE_VOLTAGE,
+    ATTR_FREQUENCY,
+    CORE_VOLTAGE_MAX,
+    CORE_VOLTAGE_MIN,
+    DOMAIN,
+    FREQUENCY_MAX,
+    FREQUENCY_MIN,
+    NerdQAxeConfigEntry,
+)
+from .rollout import DEFAULT_CONCURRENCY, MAX_CONCURRENCY, async_get_firmware_rollout
+
+SERVICE_START_AUTOTUNE: Final = "start_autotune"
+SERVICE_STOP_AUTOTUNE: Final = "stop_autotune"
+SERVICE_SET_SETTINGS: Final = "set_settings"
+SERVICE_SET_POWER_BUDGET: Final = "set_power_budget"
+SERVICE_CLEAR_POWER_BUDGET: Final = "clear_power_budget"
+SERVICE_START_FIRMWARE_ROLLOUT: Final = "start_firmware_rollout"
+SERVICE_STOP_FIRMWARE_ROLLOUT: Final = "stop_firmware_rollout"
+SERVICE_GET_FIRMWARE_ROLLOUT: Final = "get_firmware_rollout"
+
+ATTR_DEVICE_ID: Final = "device_id"
+ATTR_TARGET: Final = "target"
+ATTR_POWER_CAP: Final = "power_cap"
+ATTR_MIN_FREQUENCY: Final = "min_frequency"
+ATTR_MAX_FREQUENCY: Final = "max_frequency"
+ATTR_MIN_CORE_VOLTAGE: Final = "min_core_voltage"
+ATTR_MAX_CORE_VOLTAGE: Final = "max_core_voltage"
+ATTR_MAX_TEMP: Final = "max_temp"
+ATTR_MAX_VR_TEMP: Final = "max_vr_temp"
+ATTR_MARGIN: Final = "margin"
+ATTR_CONCURRENCY: Final = "concurrency"
+ATTR_FREQUENCY_SETTING: Final = "frequency"
+ATTR_CORE_VOLTAGE_SETTING: Final = "core_voltage"
+
+# Service field -> ``PATCH /api/system`` field written by set_settings
+SETTINGS_FIELDS: Final = {
+    ATTR_FREQUENCY_SETTING: ATTR_FREQUENCY,
+    ATTR_CORE_VOLTAGE_SETTING: ATTR_CORE_VOLTAGE,
+}
+
+_FREQUENCY = vol.All(vol.Coerce(int), vol.Range(min=FREQUENCY_MIN, max=FREQUENCY_MAX))
+_CORE_VOLTAGE = vol.All(
+    vol.Coerce(int), vol.Range(min=CORE_VOLTAGE_MIN, max=CORE_VOLTAGE_MAX)
+)
+
+START_AUTOTUNE_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_TARGET, default=TARGET_EFFICIENCY): vol.In(AUTOTUNE_TARGETS),
+        vol.Optional(ATTR_POWER_CAP): vol.All(vol.Coerce(float), vol.Range(min=1)),
+        vol.Optional(ATTR_MIN_FREQUENCY): _FREQUENCY,
+        vol.Optional(ATTR_MAX_FREQUENCY): _FREQUENCY,
+        vol.Optional(ATTR_MIN_CORE_VOLTAGE): _CORE_VOLTAGE,
+        vol.Optional(ATTR_MAX_CORE_VOLTAGE): _CORE_VOLTAGE,
+        vol.Optional(ATTR_MAX_TEMP, default=DEFAULT_MAX_TEMP): vol.All(
+            vol.Coerce(float), vol.Range(min=30, max=100)
+        ),
+        vol.Optional(ATTR_MAX_VR_TEMP, default=DEFAULT_MAX_VR_TEMP): vol.All(
+            vol.Coerce(float), vol.Range(min=30, max=120)
+        ),
+    }
+)
+
+STOP_AUTOTUNE_SCHEMA: Final = vol.Schema({vol.Required(ATTR_DEVICE_ID): cv.string})
+
+SET_SETTINGS_SCHEMA: Final = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_DEVICE_ID): cv.string,
+            vol.Optional(ATTR_FREQUENCY_SETTING): _FREQUENCY,
+            vol.Optional(ATTR_CORE_VOLTAGE_SETTING): _CORE_VOLTAGE,
+        }
+    ),
+    cv.has_at_least_one_key(*SETTINGS_FIELDS),
+)
+
+SET_POWER_BUDGET_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_domain(
+            ["sensor", "input_number", "number"]
+        ),
+        vol.Optional(ATTR_MARGIN, default=DEFAULT_BUDGET_MARGIN): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+START_FIRMWARE_ROLLOUT_SCHEMA: Final = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_CONCURRENCY, default=DEFAULT_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_CONCURRENCY)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services.
+
+    Args:
+        hass: Home Assistant instance
+
+    """
+
+    async def _async_start_autotune(call: ServiceCall) -> None:
+        entry = _async_get_entry(hass, call.data[ATTR_DEVICE_ID])
+        entry.runtime_data.autotune.async_start(_build_request(entry, call))
+
+    async def _async_stop_autotune(call: ServiceCall) -> None:
+        entry = _async_get_entry(hass, call.data[ATTR_DEVICE_ID])
+        await entry.runtime_data.autotune.async_stop()
+
+    async def _async_set_settings(call: ServiceCall) -> None:
+        entry = _async_get_entry(hass, call.data[ATTR_DEVICE_ID])
+        # One PATCH: the miner never runs the new frequency at the old
+        # voltage, or the other way round
+        await entry.runtime_data.coordinator.settings.async_write(
+            {
+                key: call.data[name]
+                for name, key in SETTINGS_FIELDS.items()
+                if name in call.data
+            }
+        )
+
+    @callback
+    def _async_set_power_budget(call: ServiceCall) -> None:
+        async_get_power_budget(hass).async_set(
+            call.data[ATTR_ENTITY_ID], call.data[ATTR_MARGIN]
+        )
+
+    @callback
+    def _async_clear_power_budget(call: ServiceCall) -> None:
+        async_get_power_budget(hass).async_clear()
+
+    @callback
+    def _async_start_firmware_rollout(call: ServiceCall) -> None:
+        if ATTR_DEVICE_ID in call.data:
+            entries = [
+                _async_get_entry(hass, device_id)
+                for device_id in call.data[ATTR_DEVICE_ID]
+            ]
+        else:
+            entries = hass.config_entries.async_loaded_entries(DOMAIN)
+        async_get_firmware_rollout(hass).async_start(
+            entries, call.data[ATTR_CONCURRENCY]
+        )
+
+    async def _async_stop_firmware_rollout(call: ServiceCall) -> None:
+        await async_get_firmware_rollout(hass).async_stop()
+
+    @callback
+    def _async_get_firmware_rollout(call: ServiceCall) -> ServiceResponse:
+        return async_get_firmware_rollout(hass).as_dict()
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_AUTOTUNE, _async_start_autotune, START_AUTOTUNE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_AUTOTUNE, _async_stop_autotune, STOP_AUTOTUNE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_SETTINGS, _async_set_settings, SET_SETTINGS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_POWER_BUDGET,
+        _async_set_power_budget,
+        SET_POWER_BUDGET_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_CLEAR_POWER_BUDGET, _async_clear_power_budget
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_FIRMWARE_ROLLOUT,
+        _async_start_firmware_rollout,
+        START_FIRMWARE_ROLLOUT_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_FIRMWARE_ROLLOUT, _async_stop_firmware_rollout
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FIRMWARE_ROLLOUT,
+        _async_get_firmware_rollout,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+@callback
+def _async_get_entry(hass: HomeAssistant, device_id: str) -> NerdQAxeConfigEntry:
+    """Return the loaded config entry of a miner device.
+
+    Raises:
+        ServiceValidationError: If the device is not a loaded NerdQAxe+ miner
+
+    """
+    if device := dr.async_get(hass).async_get(device_id):
+        for entry_id in device.config_entries:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if (
+                entry is not None
+                and entry.domain == DOMAIN
+                and entry.state is ConfigEntryState.LOADED
+            ):
+                return entry
+    raise ServiceValidationError(f"Device {device_id} is not a loaded NerdQAxe+ miner")
+
+
+def _build_request(entry: NerdQAxeConfigEntry, call: ServiceCall) -> AutoTuneRequest:
+    """Build the auto-tune request of a service call.
+
+    Sweep bounds left out default to a span around the current settings.
+
+    Raises:
+        ServiceValidationError: If the target, cap and bounds do not agree
+
+    """
+    data = call.data
+    target = data[ATTR_TARGET]
+    if target == TARGET_POWER_CAP and ATTR_POWER_CAP not in data:
+        raise ServiceValidationError("The power_cap target requires a power_cap")
+
+    snapshot = entry.runtime_data.coordinator.data
+    if snapshot is None or snapshot.frequency is None or snapshot.core_voltage is None:
+        raise ServiceValidationError(f"Current settings of {entry.title} are unknown")
+    min_frequency, max_frequency = sweep_bounds(
+        snapshot.frequency, DEFAULT_FREQUENCY_SPAN, FREQUENCY_MIN, FREQUENCY_MAX
+    )
+    min_core_voltage, max_core_voltage = sweep_bounds(
+        snapshot.core_voltage,
+        DEFAULT_CORE_VOLTAGE_SPAN,
+        CORE_VOLTAGE_MIN,
+        CORE_VOLTAGE_MAX,
+    )
+    request = AutoTuneRequest(
+        target=target,
+        min_frequency=data.get(ATTR_MIN_FREQUENCY, min_frequency),
+        max_frequency=data.get(ATTR_MAX_FREQUENCY, max_frequency),
+        min_core_voltage=data.get(ATTR_MIN_CORE_VOLTAGE, min_core_voltage),
+        max_core_voltage=data.get(ATTR_MAX_CORE_VOLTAGE, max_core_voltage),
+        power_cap=data.get(ATTR_POWER_CAP),
+        max_temp=data[ATTR_MAX_TEMP],
+        max_vr_temp=data[ATTR_MAX_VR_TEMP],
+    )
+    if request.min_frequency > request.max_frequency:
+        raise ServiceValidationError("min_frequency is above max_frequency")
+    if request.min_core_voltage > request.max_core_voltage:
+        raise ServiceValidationError("min_core_voltage is above max_core_voltage")
+    return request
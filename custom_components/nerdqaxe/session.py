@@ -0,0 +1,130 @@
+"""Integration-owned HTTP connection pool for miner traffic.
+
+Home Assistant's shared client session is tuned for internet services, not
+for the ESP32 web server running on the miner, which only has a handful of
+sockets. Every request to a miner (polls, settings, restart, OTA, config
+flow validation) goes through a dedicated session instead: a small per-host
+connection limit, keep-alive reuse across polls, a DNS cache for hostname
+based setups and the integration's default timeouts. The pool also counts
+how many requests reuse a kept-alive connection versus open a new socket.
+"""
+
+from __future__ import annotations
+
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.json import json_dumps
+
+from .const import DATA_MINER_POOL
+
+_LOGGER = logging.getLogger(__name__)
+
+# Timeout configuration (seconds). The miner is a LAN device, so keep the
+# timeouts short: a long connect timeout delays Home Assistant startup
+# (the first refresh is awaited during config entry setup).
+TIMEOUT_CONNECT = 5  # Time to establish connection
+TIMEOUT_TOTAL = 15  # Total request time including response
+
+# The ESP32 web server only has a handful of sockets, shared with the
+# miner's own web UI and live stream; never hold more than this per miner.
+CONNECTIONS_PER_HOST = 2
+CONNECTIONS_TOTAL = 100
+# Idle connections are kept long enough to be reused by the next poll at the
+# default scan interval, but released well before a slow poll comes around.
+KEEPALIVE_TIMEOUT = 90
+DNS_CACHE_TTL = 300
+
+
+class NerdQAxeMinerPool:
+    """Dedicated aiohttp session and connector for miner requests."""
+
+    def __init__(self) -> None:
+        """Create the connector, the session and the reuse counters."""
+        # aiohttp's Signal annotations do not match its own callback protocol
+        # with recent aiosignal releases, hence the ignores.
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_reuseconn.append(
+            self._on_connection_reused  # type: ignore[arg-type]
+        )
+        trace_config.on_connection_create_end.append(
+            self._on_connection_created  # type: ignore[arg-type]
+        )
+
+        self.connections_reused = 0
+        self.connections_opened = 0
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=CONNECTIONS_TOTAL,
+                limit_per_host=CONNECTIONS_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                use_dns_cache=True,
+                ttl_dns_cache=DNS_CACHE_TTL,
+            ),
+            timeout=aiohttp.ClientTimeout(total=TIMEOUT_TOTAL, connect=TIMEOUT_CONNECT),
+            json_serialize=json_dumps,
+            trace_configs=[trace_config],
+        )
+
+    async def _on_connection_reused(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionReuseconnParams,
+    ) -> None:
+        """Count a request served over a kept-alive connection."""
+        self.connections_reused += 1
+
+    async def _on_connection_created(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionCreateEndParams,
+    ) -> None:
+        """Count a request that had to open a new TCP connection."""
+        self.connections_opened += 1
+
+    async def async_close(self) -> None:
+        """Close the session and every pooled connection."""
+        await self.session.close()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the connection reuse counters for diagnostics."""
+        total = self.connections_reused + self.connections_opened
+        return {
+            "connections_reused": self.connections_reused,
+            "connections_opened": self.connections_opened,
+            "reuse_ratio": round(self.connections_reused / total, 3) if total else None,
+        }
+
+
+@callback
+def async_get_miner_pool(hass: HomeAssistant) -> NerdQAxeMinerPool:
+    """Return the hass-wide miner connection pool, creating it on first use."""
+    if (pool := hass.data.get(DATA_MINER_POOL)) is not None:
+        return pool
+
+    pool = hass.data[DATA_MINER_POOL] = NerdQAxeMinerPool()
+
+    async def _async_close_on_stop(event: Event) -> None:
+        await async_close_miner_pool(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_on_stop)
+    return pool
+
+
+@callback
+def async_get_miner_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the session every request to a miner should go through."""
+    return async_get_miner_pool(hass).session
+
+
+async def async_close_miner_pool(hass: HomeAssistant) -> None:
+    """Close the miner connection pool if it was created."""
+    if (pool := hass.data.pop(DATA_MINER_POOL, None)) is not None:
+        _LOGGER.debug("Closing the miner connection pool: %s", pool.as_dict())
+        await pool.async_close()
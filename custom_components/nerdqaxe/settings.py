@@ -0,0 +1,283 @@
+"""Coalesced settings writes for the NerdQAxe+ miners.
+
+Settings are changed with ``PATCH /api/system``, one field or several at a
+time. Written one by one, an automation setting the frequency and then the
+core voltage costs two writes and two polls, and the miner briefly runs the
+new frequency at the old voltage. Every writer queues its changes on the
+miner's :class:`SettingsWriteQueue` instead: changes arriving within
+``SETTINGS_WRITE_DELAY`` of the first one are merged (the latest value of a
+field wins) and sent as one PATCH body.
+
+Once the miner accepts a PATCH, the written fields are applied to the
+coordinator data right away rather than after a forced poll, and confirmed
+against the next regular poll started after the write. A field the miner
+reports with another value is rejected: that poll's data replaces the
+optimistic value and the batch fails. Fields already holding the written
+value are not sent at all. A refresh is only requested for fields the
+snapshot does not carry, which cannot be applied locally.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from datetime import datetime
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Final
+
+import aiohttp
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import API_SYSTEM, DOMAIN
+from .exceptions import NerdQAxeApiError
+from .snapshot import SNAPSHOT_KEYS
+
+if TYPE_CHECKING:
+    from .coordinator import NerdQAxeDataUpdateCoordinator
+    from .snapshot import MinerSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long the first queued change waits for others to join its PATCH, in
+# seconds
+SETTINGS_WRITE_DELAY: Final = 0.5
+
+SETTINGS_WRITE_TIMEOUT: Final = 10
+
+
+class SettingsWriteQueue:
+    """Merge the settings changes of one miner into batched PATCH requests."""
+
+    def __init__(self, coordinator: NerdQAxeDataUpdateCoordinator) -> None:
+        """Initialize an empty queue.
+
+        Args:
+            coordinator: Coordinator of the miner the settings are written to
+
+        """
+        self.coordinator = coordinator
+        self._pending: dict[str, Any] = {}
+        self._batch: asyncio.Future[None] | None = None
+        # Resolved once the pending batch is written, before its confirmation
+        self._written: asyncio.Future[None] | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        # Written batches awaiting confirmation by a poll: written fields,
+        # monotonic time of the write and the batch future
+        self._unconfirmed: list[tuple[dict[str, Any], float, asyncio.Future[None]]] = []
+        # Batches are sent one at a time, in order, so a later value of a
+        # field always lands last.
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> dict[str, Any]:
+        """Return the changes waiting for the next PATCH."""
+        return dict(self._pending)
+
+    @property
+    def unconfirmed(self) -> dict[str, Any]:
+        """Return the written changes not confirmed by a poll yet."""
+        return {
+            key: value
+            for settings, _, _ in self._unconfirmed
+            for key, value in settings.items()
+        }
+
+    @callback
+    def async_queue(self, settings: Mapping[str, Any]) -> asyncio.Future[None]:
+        """Queue settings changes for the next PATCH.
+
+        Args:
+            settings: Payload fields to change, as ``PATCH /api/system``
+                expects them
+
+        Returns:
+            asyncio.Future: Resolved once the batch holding the changes is
+            confirmed by a poll, or failed with ``NerdQAxeApiError`` if it
+            could not be written or was not accepted. Callers that do not
+            await it still get failures logged.
+
+        """
+        self._pending.update(settings)
+        if self._batch is None:
+            loop = self.coordinator.hass.loop
+            self._batch, self._written = loop.create_future(), loop.create_future()
+            self._batch.add_done_callback(_consume_exception)
+            self._written.add_done_callback(_consume_exception)
+            self._unsub_flush = async_call_later(
+                self.coordinator.hass, SETTINGS_WRITE_DELAY, self._async_flush_later
+            )
+        return self._batch
+
+    async def async_write(self, settings: Mapping[str, Any]) -> None:
+        """Queue settings changes and wait until the miner accepts them.
+
+        Changes queued by others within the coalescing window still share
+        the PATCH.
+
+        Args:
+            settings: Payload fields to change, as ``PATCH /api/system``
+                expects them
+
+        Raises:
+            NerdQAxeApiError: If the PATCH holding the changes fails
+
+        """
+        self.async_queue(settings)
+        assert self._written is not None
+        # Shielded: the batch is shared with the other writers
+        await asyncio.shield(self._written)
+
+    @callback
+    def _async_flush_later(self, _now: datetime) -> None:
+        """Send the batch once the coalescing window is over."""
+        self._unsub_flush = None
+        self.coordinator.hass.async_create_background_task(
+            self.async_flush(), f"{DOMAIN} {self.coordinator.host} settings write"
+        )
+
+    async def async_flush(self) -> None:
+        """Send the queued changes now, in a single PATCH.
+
+        The batch outcome is reported through the future returned by
+        :meth:`async_queue`; this method does not raise.
+        """
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        batch, written, settings = self._batch, self._written, self._pending
+        self._batch, self._written, self._pending = None, None, {}
+        if batch is None or written is None:
+            return
+
+        async with self._lock:
+            if data := self.coordinator.data:
+                current = data.as_payload()
+                settings = {
+                    key: value
+                    for key, value in settings.items()
+                    if key not in current or current[key] != value
+                }
+            if not settings:
+                _LOGGER.debug("Settings already current on %s", self.coordinator.host)
+                _resolve(written)
+                _resolve(batch)
+                return
+            try:
+                await self._async_patch(settings)
+            except NerdQAxeApiError as err:
+                _LOGGER.error("%s", err)
+                _resolve(written, err)
+                _resolve(batch, err)
+                return
+            _resolve(written)
+            self._async_apply(settings, batch)
+
+        if not SNAPSHOT_KEYS.issuperset(settings):
+            await self.coordinator.async_request_refresh()
+
+    @callback
+    def _async_apply(
+        self, settings: dict[str, Any], batch: asyncio.Future[None]
+    ) -> None:
+        """Show written fields at once and wait for a poll to confirm them."""
+        coordinator = self.coordinator
+        # Written fields may belong to the slow configuration tier
+        coordinator.async_invalidate_config()
+        mirrored = {key: settings[key] for key in SNAPSHOT_KEYS.intersection(settings)}
+        if not mirrored or coordinator.data is None:
+            _resolve(batch)
+            return
+        coordinator.async_set_updated_data(coordinator.data.merge(mirrored))
+        self._unconfirmed.append((mirrored, monotonic(), batch))
+
+    @callback
+    def async_verify(self, snapshot: MinerSnapshot, started: float) -> MinerSnapshot:
+        """Confirm the written fields against a polled snapshot.
+
+        Only batches written before the poll started are checked. A poll
+        already in flight during the write may still report the old values,
+        so the fields of the batches still waiting stay applied over it.
+
+        Args:
+            snapshot: Snapshot of a successful poll
+            started: Monotonic time the poll started at
+
+        Returns:
+            MinerSnapshot: The snapshot to expose
+
+        """
+        if not self._unconfirmed:
+            return snapshot
+        polled = snapshot.as_payload()
+        waiting = []
+        for settings, written, batch in self._unconfirmed:
+            if written > started:
+                waiting.append((settings, written, batch))
+                continue
+            rejected = {
+                key: polled.get(key)
+                for key, value in settings.items()
+                if polled.get(key) != value
+            }
+            if not rejected:
+                _resolve(batch)
+                continue
+            err = NerdQAxeApiError(
+                f"{self.coordinator.host} did not accept "
+                + ", ".join(
+                    f"{key}={settings[key]} (reports {value})"
+                    for key, value in rejected.items()
+                )
+            )
+            _LOGGER.error("%s", err)
+            _resolve(batch, err)
+        self._unconfirmed = waiting
+        return snapshot.merge(self.unconfirmed) if waiting else snapshot
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop waiting for the confirmation of written batches."""
+        for _, _, batch in self._unconfirmed:
+            batch.cancel()
+        self._unconfirmed.clear()
+
+    async def _async_patch(self, settings: dict[str, Any]) -> None:
+        """Write one PATCH body to the miner.
+
+        Raises:
+            NerdQAxeApiError: If the request fails or is refused
+
+        """
+        coordinator = self.coordinator
+        _LOGGER.debug("Writing settings %s to %s", settings, coordinator.host)
+        try:
+            async with (
+                asyncio.timeout(SETTINGS_WRITE_TIMEOUT),
+                coordinator.session.patch(
+                    f"{coordinator.base_url}{API_SYSTEM}", json=settings
+                ) as response,
+            ):
+                response.raise_for_status()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise NerdQAxeApiError(
+                f"Failed to write {', '.join(settings)} on {coordinator.host}"
+            ) from err
+        _LOGGER.info("Settings %s written to %s", settings, coordinator.host)
+
+
+def _resolve(batch: asyncio.Future[None], err: NerdQAxeApiError | None = None) -> None:
+    """Complete a batch future unless its waiters gave up on it."""
+    if batch.done():
+        return
+    if err is None:
+        batch.set_result(None)
+    else:
+        batch.set_exception(err)
+
+
+def _consume_exception(batch: asyncio.Future[None]) -> None:
+    """Mark a failed batch as handled; the failure is logged on flush."""
+    if not batch.cancelled():
+        batch.exception()
@@ -0,0 +1,439 @@
+"""Typed, immutable view of the miner's ``/api/system/info`` payload.
+
+Each payload is parsed once into a :class:`MinerSnapshot` when it reaches the
+coordinator; entities then read plain attributes instead of repeating
+``dict.get`` lookups, type checks and legacy-field fallbacks on every state
+write. The nested ``stratum`` object is parsed into a :class:`StratumView`,
+and the values derived from several fields (the pool state, see ``pool.py``,
+the second fan and the per-ASIC temperature aggregates) are resolved once per
+snapshot.
+
+Every field is bound to the payload key it is parsed from. Listeners are
+still indexed by payload keys, so :meth:`MinerSnapshot.changed_keys` reports
+changes in those terms. A field holding an unexpected type is left unset and
+its key is recorded in ``schema_errors``, which surfaces firmware schema
+drift at parse time instead of as an exception in an entity.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field, fields
+from typing import Any, Final, Self
+
+from .const import (
+    ATTR_ACTIVE_POOL_MODE,
+    ATTR_ASIC_TEMPS,
+    ATTR_BEST_DIFF,
+    ATTR_BEST_SESSION_DIFF,
+    ATTR_CORE_VOLTAGE,
+    ATTR_CORE_VOLTAGE_ACTUAL,
+    ATTR_CURRENT,
+    ATTR_DEVICE_MODEL,
+    ATTR_FALLBACK_STRATUM_PORT,
+    ATTR_FALLBACK_STRATUM_URL,
+    ATTR_FALLBACK_STRATUM_USER,
+    ATTR_FAN_COUNT,
+    ATTR_FAN_RPM,
+    ATTR_FAN_RPM_2,
+    ATTR_FAN_SPEED,
+    ATTR_FAN_SPEED_2,
+    ATTR_FOUND_BLOCKS,
+    ATTR_FREQUENCY,
+    ATTR_HASHRATE,
+    ATTR_HASHRATE_1D,
+    ATTR_HASHRATE_1H,
+    ATTR_HASHRATE_1M,
+    ATTR_HASHRATE_10M,
+    ATTR_HOSTNAME,
+    ATTR_POOL_ACTIVE,
+    ATTR_POOL_CONNECTED,
+    ATTR_POWER,
+    ATTR_SHARES_ACCEPTED,
+    ATTR_SHARES_REJECTED,
+    ATTR_STRATUM,
+    ATTR_STRATUM_CONNECTED,
+    ATTR_STRATUM_POOLS,
+    ATTR_STRATUM_PORT,
+    ATTR_STRATUM_URL,
+    ATTR_STRATUM_USER,
+    ATTR_TEMP,
+    ATTR_TOTAL_FOUND_BLOCKS,
+    ATTR_UPTIME,
+    ATTR_USING_FALLBACK,
+    ATTR_USING_FALLBACK_LEGACY,
+    ATTR_VERSION,
+    ATTR_VOLTAGE,
+    ATTR_VR_TEMP,
+    ATTR_WIFI_RSSI,
+    POOL_MODE_FAILOVER,
+    POOL_MODE_NAMES,
+)
+from .efficiency import Efficiency
+from .pool import PoolState
+
+
+def _number(value: Any) -> float:
+    """Parse a numeric reading, keeping ints as ints."""
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        raise TypeError(f"expected a number, got {type(value).__name__}")
+    return value
+
+
+def _integer(value: Any) -> int:
+    """Parse a count, accepting integral floats."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError(f"expected an integer, got {type(value).__name__}")
+    return value
+
+
+def _text(value: Any) -> str | None:
+    """Parse a string field; an unset one is reported as an empty string."""
+    if not isinstance(value, str):
+        raise TypeError(f"expected a string, got {type(value).__name__}")
+    return value if value.strip() else None
+
+
+def _difficulty(value: Any) -> str | float:
+    """Parse a difficulty, reported as a formatted string or as a number."""
+    if isinstance(value, str):
+        return value
+    return _number(value)
+
+
+def _flag(value: Any) -> bool:
+    """Parse a boolean field, which older firmware reports as 0/1."""
+    if not isinstance(value, bool | int):
+        raise TypeError(f"expected a boolean, got {type(value).__name__}")
+    return bool(value)
+
+
+def _temperatures(value: Any) -> tuple[float, ...]:
+    """Parse the per-ASIC temperature array."""
+    if not isinstance(value, list):
+        raise TypeError(f"expected a list, got {type(value).__name__}")
+    return tuple(_number(temp) for temp in value)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AsicTemperatures:
+    """Aggregates of the per-ASIC temperatures of one snapshot."""
+
+    maximum: float
+    mean: float
+    # Hottest minus coolest chip
+    spread: float
+    # 1-based, matching the per-ASIC sensor names
+    hottest: int
+
+    @classmethod
+    def from_readings(cls, temps: tuple[float, ...]) -> Self | None:
+        """Aggregate the readings in one pass.
+
+        Zero readings come from chips (or whole boards) without a sensor and
+        are left out.
+
+        Returns:
+            AsicTemperatures: The aggregates, or None if no chip is sensed
+
+        """
+        count = 0
+        total = 0.0
+        maximum = minimum = 0.0
+        hottest = 0
+        for index, temp in enumerate(temps, start=1):
+            if not temp:
+                continue
+            if not count or temp > maximum:
+                maximum, hottest = temp, index
+            if not count or temp < minimum:
+                minimum = temp
+            count += 1
+            total += temp
+        if not count:
+            return None
+        return cls(
+            maximum=maximum,
+            mean=round(total / count, 2),
+            spread=round(maximum - minimum, 2),
+            hottest=hottest,
+        )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PoolRuntime:
+    """Runtime state of one entry of ``stratum.pools[]``."""
+
+    connected: bool = False
+    active: bool = False
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class StratumView:
+    """Parsed ``stratum`` object: pool mode and per-pool runtime state."""
+
+    mode: int = POOL_MODE_FAILOVER
+    pools: tuple[PoolRuntime, ...] = ()
+    # Set by the failover manager only; None in dual-pool mode and on
+    # firmware predating the nested object.
+    using_fallback: bool | None = None
+
+    @classmethod
+    def from_payload(cls, value: Any) -> Self:
+        """Parse the nested ``stratum`` object.
+
+        Raises:
+            TypeError: If the object or one of its pools is not a JSON object
+
+        """
+        if not isinstance(value, dict):
+            raise TypeError(f"expected an object, got {type(value).__name__}")
+
+        pools = []
+        for pool in value.get(ATTR_STRATUM_POOLS) or ():
+            if not isinstance(pool, dict):
+                raise TypeError(f"expected a pool object, got {type(pool).__name__}")
+            pools.append(
+                PoolRuntime(
+                    connected=bool(pool.get(ATTR_POOL_CONNECTED)),
+                    active=bool(pool.get(ATTR_POOL_ACTIVE)),
+                )
+            )
+
+        mode = value.get(ATTR_ACTIVE_POOL_MODE)
+        using_fallback = value.get(ATTR_USING_FALLBACK)
+        return cls(
+            # Failover is the firmware default and the only mode older
+            # firmware knows about.
+            mode=mode if mode in POOL_MODE_NAMES else POOL_MODE_FAILOVER,
+            pools=tuple(pools),
+            using_fallback=None if using_fallback is None else bool(using_fallback),
+        )
+
+    def as_payload(self) -> dict[str, Any]:
+        """Return the parsed object keyed as the firmware reports it."""
+        payload: dict[str, Any] = {
+            ATTR_ACTIVE_POOL_MODE: self.mode,
+            ATTR_STRATUM_POOLS: [
+                {ATTR_POOL_CONNECTED: pool.connected, ATTR_POOL_ACTIVE: pool.active}
+                for pool in self.pools
+            ],
+        }
+        if self.using_fallback is not None:
+            payload[ATTR_USING_FALLBACK] = self.using_fallback
+        return payload
+
+
+def _key(key: str, parse: Callable[[Any], Any], default: Any = None) -> Any:
+    """Declare a snapshot field parsed from a payload key."""
+    return field(default=default, metadata={"key": key, "parse": parse})
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class MinerSnapshot:
+    """One parsed ``/api/system/info`` payload."""
+
+    hashrate: float | None = _key(ATTR_HASHRATE, _number)
+    hashrate_1m: float | None = _key(ATTR_HASHRATE_1M, _number)
+    hashrate_10m: float | None = _key(ATTR_HASHRATE_10M, _number)
+    hashrate_1h: float | None = _key(ATTR_HASHRATE_1H, _number)
+    hashrate_1d: float | None = _key(ATTR_HASHRATE_1D, _number)
+    temp: float | None = _key(ATTR_TEMP, _number)
+    vr_temp: float | None = _key(ATTR_VR_TEMP, _number)
+    asic_temps: tuple[float, ...] = _key(ATTR_ASIC_TEMPS, _temperatures, ())
+    power: float | None = _key(ATTR_POWER, _number)
+    voltage: float | None = _key(ATTR_VOLTAGE, _number)
+    current: float | None = _key(ATTR_CURRENT, _number)
+    fan_speed: float | None = _key(ATTR_FAN_SPEED, _number)
+    fan_rpm: float | None = _key(ATTR_FAN_RPM, _number)
+    fan_speed_2: float | None = _key(ATTR_FAN_SPEED_2, _number)
+    fan_rpm_2: float | None = _key(ATTR_FAN_RPM_2, _number)
+    fan_count: int | None = _key(ATTR_FAN_COUNT, _integer)
+    shares_accepted: int | None = _key(ATTR_SHARES_ACCEPTED, _integer)
+    shares_rejected: int | None = _key(ATTR_SHARES_REJECTED, _integer)
+    best_diff: str | float | None = _key(ATTR_BEST_DIFF, _difficulty)
+    best_session_diff: str | float | None = _key(ATTR_BEST_SESSION_DIFF, _difficulty)
+    found_blocks: int | None = _key(ATTR_FOUND_BLOCKS, _integer)
+    total_found_blocks: int | None = _key(ATTR_TOTAL_FOUND_BLOCKS, _integer)
+    core_voltage: float | None = _key(ATTR_CORE_VOLTAGE, _number)
+    core_voltage_actual: float | None = _key(ATTR_CORE_VOLTAGE_ACTUAL, _number)
+    frequency: float | None = _key(ATTR_FREQUENCY, _number)
+    wifi_rssi: float | None = _key(ATTR_WIFI_RSSI, _number)
+    uptime: int | None = _key(ATTR_UPTIME, _integer)
+    hostname: str | None = _key(ATTR_HOSTNAME, _text)
+    device_model: str | None = _key(ATTR_DEVICE_MODEL, _text)
+    version: str | None = _key(ATTR_VERSION, _text)
+    stratum_url: str | None = _key(ATTR_STRATUM_URL, _text)
+    stratum_port: int | None = _key(ATTR_STRATUM_PORT, _integer)
+    stratum_user: str | None = _key(ATTR_STRATUM_USER, _text)
+    fallback_stratum_url: str | None = _key(ATTR_FALLBACK_STRATUM_URL, _text)
+    fallback_stratum_port: int | None = _key(ATTR_FALLBACK_STRATUM_PORT, _integer)
+    fallback_stratum_user: str | None = _key(ATTR_FALLBACK_STRATUM_USER, _text)
+    # StratumView is frozen, so sharing the default instance is safe
+    stratum: StratumView = _key(  # noqa: RUF009
+        ATTR_STRATUM, StratumView.from_payload, StratumView()
+    )
+    # Legacy flat fields, for firmware predating the nested ``stratum`` object
+    stratum_connected_legacy: bool | None = _key(ATTR_STRATUM_CONNECTED, _flag)
+    using_fallback_legacy: bool | None = _key(ATTR_USING_FALLBACK_LEGACY, _flag)
+
+    # Payload keys whose value had an unexpected type and was left unset
+    schema_errors: frozenset[str] = field(default=frozenset(), compare=False)
+    # Resolved by the coordinator once per update, from this snapshot and the
+    # power history (see ``efficiency.py``)
+    efficiency: Efficiency | None = field(default=None, compare=False, repr=False)
+
+    # Resolved once per snapshot from the fields above
+    pool: PoolState = field(init=False, compare=False, repr=False)
+    has_second_fan: bool = field(init=False, compare=False, repr=False)
+    asic: AsicTemperatures | None = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Resolve the values derived from several fields."""
+        object.__setattr__(self, "pool", PoolState.from_snapshot(self))
+        # ``fanCount`` is authoritative: single-fan boards still send
+        # ``fanspeed2``/``fanrpm2`` as 0. Older firmware without it is
+        # resolved from a non-zero second-fan reading.
+        object.__setattr__(
+            self,
+            "has_second_fan",
+            self.fan_count >= 2
+            if self.fan_count is not None
+            else bool(self.fan_rpm_2 or self.fan_speed_2),
+        )
+        object.__setattr__(
+            self, "asic", AsicTemperatures.from_readings(self.asic_temps)
+        )
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> Self:
+        """Parse a full payload.
+
+        Args:
+            payload: ``/api/system/info`` payload, projected or not
+
+        Returns:
+            MinerSnapshot: The parsed snapshot
+
+        """
+        values, errors = _parse(payload)
+        return cls._create({**_DEFAULTS, **values, "schema_errors": errors})
+
+    def merge(self, update: Mapping[str, Any]) -> Self:
+        """Return a copy updated with a partial payload.
+
+        Args:
+            update: Partial payload, such as a frame pushed by the miner
+
+        Returns:
+            MinerSnapshot: The snapshot with the fields present in ``update``
+            replaced
+
+        """
+        values, errors = _parse(update)
+        # Keys parsed again are judged on their new value
+        previous_errors = self.schema_errors.difference(update)
+        return self._create(
+            {
+                **{name: getattr(self, name) for name in _DEFAULTS},
+                **values,
+                "schema_errors": previous_errors | errors,
+            }
+        )
+
+    @classmethod
+    def _create(cls, values: Mapping[str, Any]) -> Self:
+        """Build a snapshot from a value for every init field.
+
+        Parsing already validated the values, so the slots are set through
+        their descriptors instead of the frozen ``__init__``, which goes
+        through ``object.__setattr__`` once per field and dominated the cost
+        of a refresh.
+        """
+        snapshot = object.__new__(cls)
+        for name, set_value in _SETTERS:
+            set_value(snapshot, values[name])
+        snapshot.__post_init__()
+        return snapshot
+
+    def changed_keys(self, other: MinerSnapshot) -> set[str]:
+        """Return the payload keys whose parsed value differs from ``other``."""
+        return {
+            key
+            for name, key, _, _ in _FIELDS
+            if getattr(self, name) != getattr(other, name)
+        }
+
+    def as_payload(self) -> dict[str, Any]:
+        """Return the snapshot keyed by payload keys, for diagnostics."""
+        return {
+            key: value.as_payload() if isinstance(value, StratumView) else value
+            for name, key, _, _ in _FIELDS
+            if (value := getattr(self, name)) is not None
+        }
+
+
+# (field name, payload key, parser, default) of every field parsed from the
+# payload
+_FIELDS: Final = tuple(
+    (spec.name, spec.metadata["key"], spec.metadata["parse"], spec.default)
+    for spec in fields(MinerSnapshot)
+    if "key" in spec.metadata
+)
+
+# Every payload key a snapshot field is parsed from
+SNAPSHOT_KEYS: Final = frozenset(key for _, key, _, _ in _FIELDS)
+
+# Default of every init field, keyed by field name
+_DEFAULTS: Final[dict[str, Any]] = {
+    spec.name: spec.default for spec in fields(MinerSnapshot) if spec.init
+}
+
+# (field name, slot setter) of every init field
+_SETTERS: Final = tuple(
+    (name, getattr(MinerSnapshot, name).__set__) for name in _DEFAULTS
+)
+
+# Types a parser returns unchanged: values of exactly these types are bound
+# without calling it, which covers nearly every field of a well-formed
+# payload. ``bool`` is deliberately absent from the numeric parsers, which
+# reject it.
+_VERBATIM: Final[dict[Callable[[Any], Any], tuple[type, ...]]] = {
+    _number: (int, float),
+    _integer: (int,),
+    _difficulty: (str, int, float),
+    _flag: (bool,),
+}
+
+# Payload key -> (field name, parser, default, types bound verbatim)
+_SPECS: Final = {
+    key: (name, parse, default, _VERBATIM.get(parse, ()))
+    for name, key, parse, default in _FIELDS
+}
+
+
+def _parse(payload: Mapping[str, Any]) -> tuple[dict[str, Any], frozenset[str]]:
+    """Parse the keys present in a payload into snapshot field values.
+
+    Binds every known key in one pass over the payload, so a partial update
+    only costs the keys it carries.
+    """
+    values: dict[str, Any] = {}
+    errors: set[str] = set()
+    for key, value in payload.items():
+        if (spec := _SPECS.get(key)) is None:
+            continue
+        name, parse, default, verbatim = spec
+        if type(value) in verbatim:
+            values[name] = value
+        elif value is None:
+            values[name] = default
+        else:
+            try:
+                values[name] = parse(value)
+            except TypeError:
+                values[name] = default
+                errors.add(key)
+    return values, frozenset(errors)
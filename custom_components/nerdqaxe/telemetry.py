@@ -0,0 +1,240 @@
+"""Rolling telemetry statistics for the NerdQAxe+ coordinator.
+
+The coordinator only keeps the latest snapshot, so anything like "the
+temperature swing over the last hour" would otherwise have to be read back
+from the recorder. Instead each coordinator records the key metrics into a
+:class:`TelemetryBuffer`: one fixed-size ring of ``array('d')`` slots per
+metric, sharing a ring of timestamps. Its memory cost is set once from the
+window and the sample spacing, whatever the uptime.
+
+Min, max, mean and standard deviation over the window are maintained
+incrementally as samples enter and leave it: the mean and variance with a
+sliding Welford update, the extremes with monotonic queues of sample numbers.
+Each sample costs O(1) (amortized for the extremes), and reading the
+statistics costs O(1) too.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from math import ceil, isnan, nan, sqrt
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from .snapshot import MinerSnapshot
+
+# Snapshot fields recorded into the buffer
+TELEMETRY_FIELDS: Final = ("hashrate", "temp", "vr_temp", "power", "fan_rpm")
+
+# Keys of the statistics returned by ``TelemetryBuffer.stats``
+STATISTICS_ATTRIBUTES: Final = frozenset({"min", "max", "mean", "stddev", "samples"})
+
+
+class _RollingStats:
+    """Running statistics of one metric over the samples of the window.
+
+    Samples are identified by their sequence number; their values live in the
+    ring owned by the buffer. Missing readings are stored as NaN and skipped.
+    """
+
+    __slots__ = ("count", "m2", "maxima", "mean", "minima", "values")
+
+    def __init__(self, values: array[float], capacity: int) -> None:
+        self.values = values
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        # Sequence numbers of the candidate extremes, oldest first; their
+        # values are increasing (minima) or decreasing (maxima).
+        self.minima: deque[int] = deque(maxlen=capacity)
+        self.maxima: deque[int] = deque(maxlen=capacity)
+
+    def _value(self, seq: int) -> float:
+        return self.values[seq % len(self.values)]
+
+    def add(self, seq: int) -> None:
+        """Account for the sample just written at ``seq``."""
+        value = self._value(seq)
+        if isnan(value):
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        while self.minima and self._value(self.minima[-1]) >= value:
+            self.minima.pop()
+        self.minima.append(seq)
+        while self.maxima and self._value(self.maxima[-1]) <= value:
+            self.maxima.pop()
+        self.maxima.append(seq)
+
+    def remove(self, seq: int) -> None:
+        """Drop the oldest sample of the window, before its slot is reused."""
+        value = self._value(seq)
+        if isnan(value):
+            return
+        self.count -= 1
+        if not self.count:
+            self.mean = self.m2 = 0.0
+        else:
+            delta = value - self.mean
+            self.mean -= delta / self.count
+            self.m2 -= delta * (value - self.mean)
+
+        if self.minima and self.minima[0] == seq:
+            self.minima.popleft()
+        if self.maxima and self.maxima[0] == seq:
+            self.maxima.popleft()
+
+    def as_dict(self) -> dict[str, Any] | None:
+        """Return the statistics, or None while the window holds no reading."""
+        if not self.count:
+            return None
+        # Rounding drift can leave m2 a hair below zero on a flat series
+        variance = max(self.m2, 0.0) / (self.count - 1) if self.count > 1 else None
+        return {
+            "min": self._value(self.minima[0]),
+            "max": self._value(self.maxima[0]),
+            "mean": round(self.mean, 2),
+            "stddev": round(sqrt(variance), 2) if variance is not None else None,
+            "samples": self.count,
+        }
+
+
+class TelemetryBuffer:
+    """Fixed-size rings of recent telemetry with rolling window statistics."""
+
+    def __init__(self, window: float, spacing: float) -> None:
+        """Allocate the rings for a window.
+
+        Args:
+            window: Length of the statistics window in seconds
+            spacing: Minimum time between two recorded samples in seconds;
+                anything closer to the previous sample (push updates, fast
+                adaptive polls) is not recorded
+
+        """
+        self.window = window
+        self.spacing = spacing
+        self.capacity = ceil(window / spacing) + 1
+        self._times = array("d", [0.0]) * self.capacity
+        self._stats = {
+            name: _RollingStats(array("d", [nan]) * self.capacity, self.capacity)
+            for name in TELEMETRY_FIELDS
+        }
+        # Sequence number of the next sample, and of the oldest one still in
+        # the window
+        self._next = 0
+        self._first = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return self._next - self._first
+
+    def _evict(self) -> None:
+        for stats in self._stats.values():
+            stats.remove(self._first)
+        self._first += 1
+
+    def _expire(self, now: float) -> None:
+        """Evict the samples that left the window."""
+        horizon = now - self.window
+        while len(self) and self._times[self._first % self.capacity] < horizon:
+            self._evict()
+
+    def append(self, now: float, snapshot: MinerSnapshot) -> bool:
+        """Record the metrics of a snapshot taken at ``now``.
+
+        Samples that left the window, or whose slot is about to be reused,
+        are evicted first.
+
+        Args:
+            now: Monotonic timestamp of the snapshot
+            snapshot: Snapshot to record
+
+        Returns:
+            bool: False if the sample was skipped for being too close to the
+            previous one
+
+        """
+        return self._append(
+            now,
+            {
+                name: nan if (value := getattr(snapshot, name)) is None else value
+                for name in TELEMETRY_FIELDS
+            },
+        )
+
+    def _append(self, now: float, values: dict[str, float]) -> bool:
+        """Record one sample given as a value (NaN if missing) per metric."""
+        if len(self) and now - self._times[(self._next - 1) % self.capacity] < (
+            self.spacing
+        ):
+            return False
+
+        self._expire(now)
+        if len(self) == self.capacity:
+            self._evict()
+
+        slot = self._next % self.capacity
+        self._times[slot] = now
+        for name, stats in self._stats.items():
+            stats.values[slot] = float(values[name])
+            stats.add(self._next)
+        self._next += 1
+        return True
+
+    def resized(self, window: float, spacing: float) -> TelemetryBuffer:
+        """Return a buffer for a new window, holding the samples that fit.
+
+        Samples are replayed oldest first, so those closer together than the
+        new spacing are thinned and the newest ones are kept when the new
+        buffer is smaller.
+
+        Args:
+            window: Length of the new statistics window in seconds
+            spacing: New minimum time between two samples in seconds
+
+        Returns:
+            TelemetryBuffer: The new buffer
+
+        """
+        buffer = TelemetryBuffer(window, spacing)
+        for seq in range(self._first, self._next):
+            slot = seq % self.capacity
+            buffer._append(
+                self._times[slot],
+                {name: stats.values[slot] for name, stats in self._stats.items()},
+            )
+        return buffer
+
+    def stats(self, name: str, now: float) -> dict[str, Any] | None:
+        """Return the rolling statistics of one metric.
+
+        Args:
+            name: Snapshot field, one of ``TELEMETRY_FIELDS``
+            now: Current monotonic time; samples older than the window are
+                evicted first, so a stale window is never reported
+
+        Returns:
+            dict: ``min``, ``max``, ``mean``, ``stddev`` (None below two
+            samples) and ``samples``, or None without any reading
+
+        """
+        self._expire(now)
+        return self._stats[name].as_dict()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the buffer layout for diagnostics."""
+        return {
+            "window": self.window,
+            "spacing": self.spacing,
+            "capacity": self.capacity,
+            "samples": len(self),
+            # One float per slot for the timestamps and for every metric
+            "memory_bytes": self._times.itemsize
+            * self.capacity
+            * (1 + len(self._stats)),
+        }
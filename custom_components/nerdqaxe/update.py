@@ -2,90 +2,29 @@
 
 from __future__ import annotations
 
-import asyncio
-from datetime import timedelta
-from http import HTTPStatus
 import logging
 from typing import Any
 
-import aiohttp
 from homeassistant.components.update import (
     UpdateDeviceClass,
     UpdateEntity,
     UpdateEntityFeature,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import NerdQAxeConfigEntry, NerdQAxeDataUpdateCoordinator
-from .const import (
-    API_OTA_GITHUB,
-    ATTR_DEVICE_MODEL,
-    ATTR_VERSION,
-    GITHUB_API_URL,
-)
-from .exceptions import NerdQAxeApiError, NerdQAxeError
+from .const import ATTR_DEVICE_MODEL, ATTR_VERSION
+from .exceptions import NerdQAxeError
+from .releases import FirmwareRelease, async_get_release_index
+from .rollout import async_get_firmware_rollout, async_start_ota
 
 _LOGGER = logging.getLogger(__name__)
 
 # Only one firmware update entity, and the OTA endpoint must not be hammered.
 PARALLEL_UPDATES = 1
 
-# Greek letter gamma for device model normalization
-GREEK_GAMMA = "\u03b3"
-
-# Factory OTA timeout (firmware + www combined, can be slow)
-OTA_TIMEOUT_SECONDS = 600  # 10 minutes
-
-# Device model to factory filename mapping
-# Format: esp-miner-factory-{model}-v{version}.bin
-# Note: Some models use Greek gamma in their names
-DEVICE_MODEL_MAP = {
-    "NerdAxe": "NerdAxe",
-    "NerdAxeγ": "NerdAxeGamma",  # noqa: RUF001
-    "NerdAxe γ": "NerdAxeGamma",  # noqa: RUF001
-    "NerdAxeGamma": "NerdAxeGamma",
-    "NerdEKO": "NerdEKO",
-    "NerdHaxe-Gamma": "NerdHaxe-Gamma",
-    "NerdHaxeGamma": "NerdHaxe-Gamma",
-    "NerdHaxe γ": "NerdHaxe-Gamma",  # noqa: RUF001
-    "NerdOCTAXE+": "NerdOCTAXE+",
-    "NerdOCTAXE-Gamma": "NerdOCTAXE-Gamma",
-    "NerdOCTAXEγ": "NerdOCTAXE-Gamma",  # noqa: RUF001
-    "NerdOCTAXE γ": "NerdOCTAXE-Gamma",  # noqa: RUF001
-    "NerdQAxe+": "NerdQAxe+",
-    "NerdQAxe++": "NerdQAxe++",
-    "NerdQX": "NerdQX",
-}
-
-
-def normalize_device_model(device_model: str) -> str:
-    """Normalize device model name for factory filename matching.
-
-    Args:
-        device_model: Raw device model from API
-
-    Returns:
-        Normalized model name for factory image filename
-
-    """
-    # Try direct mapping first
-    if device_model in DEVICE_MODEL_MAP:
-        return DEVICE_MODEL_MAP[device_model]
-
-    # Normalize: replace greek gamma, remove spaces
-    normalized = device_model.replace(GREEK_GAMMA, "Gamma").replace(" ", "")
-
-    # Check if normalized version is in map
-    for key, value in DEVICE_MODEL_MAP.items():
-        if key.replace(GREEK_GAMMA, "Gamma").replace(" ", "") == normalized:
-            return value
-
-    # Fallback: return normalized version
-    return normalized
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -94,6 +33,9 @@ async def async_setup_entry(
 ) -> None:
     """Set up NerdQAxe+ Miner update entity."""
     coordinator = entry.runtime_data.coordinator
+    # The release index is shared by every miner; restoring it is a no-op
+    # past the first entry.
+    await async_get_release_index(hass).async_load()
 
     entities = [
         NerdQAxeUpdateEntity(coordinator),
@@ -109,24 +51,26 @@ class NerdQAxeUpdateEntity(
 
     Uses factory images that include both firmware and web interface (www).
     Update is performed via /api/system/OTA/github endpoint which downloads
-    and flashes both partitions in a single operation.
+    and flashes both partitions in a single operation. The latest release
+    comes from the hass-wide release index, shared by every miner.
     """
 
-    __slots__ = ("_download_url", "_latest_version", "_release_notes")
+    __slots__ = ("_download_url", "_release")
 
     _attr_device_class = UpdateDeviceClass.FIRMWARE
     _attr_supported_features = (
-        UpdateEntityFeature.INSTALL | UpdateEntityFeature.RELEASE_NOTES
+        UpdateEntityFeature.INSTALL
+        | UpdateEntityFeature.PROGRESS
+        | UpdateEntityFeature.RELEASE_NOTES
     )
     _attr_has_entity_name = True
 
     def __init__(self, coordinator: NerdQAxeDataUpdateCoordinator) -> None:
         """Initialize the update entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({ATTR_VERSION, ATTR_DEVICE_MODEL}))
         self._attr_unique_id = f"{coordinator.unique_id_base}_update"
         self._attr_translation_key = "update"
-        self._latest_version: str | None = None
-        self._release_notes: str | None = None
+        self._release: FirmwareRelease | None = None
         self._download_url: str | None = None
 
         self._attr_device_info = coordinator.get_device_info()
@@ -135,132 +79,94 @@ class NerdQAxeUpdateEntity(
         """When entity is added to hass."""
         await super().async_added_to_hass()
 
-        # Schedule periodic checks every 6 hours
+        # The index refreshes in the background, so a slow or unreachable
+        # GitHub API does not block Home Assistant startup.
         self.async_on_remove(
-            async_track_time_interval(
-                self.hass, self._async_periodic_update, timedelta(hours=6)
+            async_get_release_index(self.hass).async_add_listener(
+                self._async_release_updated
             )
         )
-
-        # Check for latest release in the background so a slow or unreachable
-        # GitHub API does not block Home Assistant startup.
-        self.hass.async_create_background_task(
-            self._async_check_latest_release(),
-            name=f"{self.entity_id} initial release check",
-            eager_start=True,
+        self._async_resolve_release()
+        # Show the miner as updating while a fleet rollout flashes it
+        self.async_on_remove(
+            async_get_firmware_rollout(self.hass).async_add_listener(
+                self.async_write_ha_state
+            )
         )
 
-    async def _async_periodic_update(self, now: Any) -> None:
-        """Periodic update to check for new releases."""
-        await self._async_check_latest_release()
+    @callback
+    def _async_release_updated(self) -> None:
+        """Handle a new latest release in the index."""
+        self._async_resolve_release()
         self.async_write_ha_state()
 
-    async def _async_check_latest_release(self) -> None:
-        """Check GitHub for the latest release."""
-        try:
-            async with asyncio.timeout(10):
-                async with self.coordinator.session.get(GITHUB_API_URL) as response:
-                    response.raise_for_status()
-                    releases = await response.json()
-
-                    # Filter out pre-releases and rc versions
-                    stable_releases = [
-                        r
-                        for r in releases
-                        if not r.get("prerelease", False)
-                        and "-rc" not in r.get("tag_name", "")
-                    ]
-
-                    if stable_releases:
-                        latest = stable_releases[0]
-                        tag_name = latest.get("tag_name", "")
-                        self._latest_version = tag_name.lstrip("v")
-                        self._release_notes = latest.get("body", "")
-
-                        # Find the correct factory firmware file for this device
-                        if self.coordinator.data:
-                            device_model = self.coordinator.data.get(
-                                ATTR_DEVICE_MODEL, ""
-                            )
-                            normalized_model = normalize_device_model(device_model)
-
-                            # Factory image: esp-miner-factory-{model}-{tag}.bin
-                            expected_filename = (
-                                f"esp-miner-factory-{normalized_model}-{tag_name}.bin"
-                            )
-
-                            for asset in latest.get("assets", []):
-                                if asset.get("name") == expected_filename:
-                                    self._download_url = asset.get(
-                                        "browser_download_url"
-                                    )
-                                    break
-                            else:
-                                # No matching firmware found
-                                available = [
-                                    a.get("name")
-                                    for a in latest.get("assets", [])
-                                    if a.get("name", "").startswith("esp-miner-factory")
-                                ]
-                                _LOGGER.warning(
-                                    "No factory firmware for model '%s' "
-                                    "(expected: %s). Available: %s",
-                                    device_model,
-                                    expected_filename,
-                                    available,
-                                )
-
-                        _LOGGER.debug(
-                            "Latest firmware version: %s, URL: %s",
-                            self._latest_version,
-                            self._download_url,
-                        )
-
-        except aiohttp.ClientError as err:
-            _LOGGER.warning("Failed to check for firmware updates: %s", err)
-        except Exception as err:
-            _LOGGER.error("Unexpected error checking for firmware updates: %s", err)
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Resolve the factory image again if the device model changed."""
+        self._async_resolve_release()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_resolve_release(self) -> None:
+        """Look up the latest release and the factory image of this model."""
+        index = async_get_release_index(self.hass)
+        self._release = index.latest
+        device_model = (
+            self.coordinator.data.device_model if self.coordinator.data else None
+        )
+        asset = index.async_factory_image(device_model) if device_model else None
+        self._download_url = asset.url if asset else None
 
     @property
     def installed_version(self) -> str | None:
         """Return the installed version."""
         if not self.coordinator.data:
             return None
-        version: str = self.coordinator.data.get(ATTR_VERSION, "")
+        version = self.coordinator.data.version or ""
         # Remove 'v' prefix if present
         return version.lstrip("v")
 
+    @property
+    def in_progress(self) -> bool:
+        """Return True while the miner updates, alone or in a fleet rollout."""
+        if self.coordinator.ota is not None:
+            return True
+        miner = async_get_firmware_rollout(self.hass).miners.get(
+            self.coordinator.unique_id_base
+        )
+        return miner is not None and miner.updating
+
+    @property
+    def update_percentage(self) -> int | None:
+        """Return the progress of the update, from its phase."""
+        ota = self.coordinator.ota
+        return ota.percentage if ota else None
+
     @property
     def latest_version(self) -> str | None:
         """Return the latest version."""
-        return self._latest_version
+        return self._release.version if self._release else None
 
     @property
     def release_url(self) -> str | None:
         """Return the URL for release notes."""
-        if self._latest_version:
+        if self._release:
             return (
                 "https://github.com/shufps/ESP-Miner-NerdQAxePlus/"
-                f"releases/tag/v{self._latest_version}"
+                f"releases/tag/v{self._release.version}"
             )
         return None
 
     async def async_release_notes(self) -> str | None:
         """Return the release notes."""
-        return self._release_notes
+        return self._release.body if self._release else None
 
     async def async_install(
         self, version: str | None, backup: bool, **kwargs: Any
     ) -> None:
         """Install a firmware update via the combined factory OTA endpoint.
 
-        The miner runs the OTA asynchronously: the POST returns
-        ``202 Accepted`` (``{"status": "started"}``) and a background task
-        flashes both firmware and web interface before rebooting. The reboot
-        tears down the HTTP connection, so a connection error *after* the
-        request has been accepted is expected and must not be reported as a
-        failed install. Only a response the miner actively rejects (e.g. a
-        busy ``409`` or a ``4xx``/``5xx`` status) is a real failure.
+        Returns once the miner accepts the OTA (see ``async_start_ota``).
         """
         if not self._download_url:
             raise NerdQAxeError(
@@ -268,48 +174,7 @@ class NerdQAxeUpdateEntity(
                 "cannot start the update"
             )
 
-        _LOGGER.info(
-            "Starting combined firmware update from %s on %s",
-            self._download_url,
-            self.coordinator.host,
+        assert self._release is not None
+        await async_start_ota(
+            self.coordinator, self._download_url, self._release.version
         )
-
-        url = f"{self.coordinator.base_url}{API_OTA_GITHUB}"
-        try:
-            async with (
-                asyncio.timeout(OTA_TIMEOUT_SECONDS),
-                self.coordinator.session.post(
-                    url,
-                    json={"url": self._download_url},
-                    headers={"Content-Type": "application/json"},
-                ) as response,
-            ):
-                # The miner already runs an OTA; nothing to do.
-                if response.status == HTTPStatus.CONFLICT:
-                    raise NerdQAxeError(
-                        "A firmware update is already in progress on the miner"
-                    )
-                # Real rejection (bad/unsafe URL, auth, server error, ...).
-                response.raise_for_status()
-                result = await response.text()
-                _LOGGER.info(
-                    "Firmware update accepted by %s (HTTP %s): %s",
-                    self.coordinator.host,
-                    response.status,
-                    result,
-                )
-        except aiohttp.ClientResponseError as err:
-            # The miner answered with an error status: genuine failure.
-            raise NerdQAxeApiError(
-                f"Miner rejected the firmware update (HTTP {err.status})"
-            ) from err
-        except (aiohttp.ClientError, TimeoutError) as err:
-            # Connection dropped/timed out while the miner was flashing and
-            # rebooting. The OTA runs on the device itself, so this is the
-            # expected outcome — the new version shows up once it is back.
-            _LOGGER.info(
-                "Connection to %s closed during OTA (expected while the miner "
-                "reboots): %s",
-                self.coordinator.host,
-                err,
-            )
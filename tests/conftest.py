@@ -5,6 +5,7 @@ from typing import Any
 from unittest.mock import MagicMock, patch
 
 from homeassistant.const import CONF_HOST
+from homeassistant.helpers.json import json_dumps
 import pytest
 
 # Test data
@@ -89,6 +90,10 @@ class MockAiohttpResponse:
         """Return mock JSON data."""
         return self._json_data
 
+    async def read(self) -> bytes:
+        """Return mock JSON data as the raw body."""
+        return json_dumps(self._json_data).encode()
+
     def raise_for_status(self) -> None:
         """Raise if error configured."""
         if self._raise_error:
@@ -180,7 +185,7 @@ def mock_aiohttp_session() -> Generator[MagicMock]:
         json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
     )
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         yield mock_session
@@ -194,7 +199,7 @@ def mock_config_flow_session() -> Generator[MagicMock]:
         json_data=MOCK_SYSTEM_INFO,
     )
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         yield mock_session
@@ -0,0 +1,74 @@
+"""Test the NerdQAxe+ adaptive poll interval."""
+
+import pytest
+
+from custom_components.nerdqaxe.adaptive import AdaptivePollInterval, relative_change
+from custom_components.nerdqaxe.const import MAX_SCAN_INTERVAL, MIN_SCAN_INTERVAL
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+
+from .conftest import MOCK_ASIC_DATA, MOCK_SYSTEM_INFO
+
+PAYLOAD = MinerSnapshot.from_payload({**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA})
+
+
+def test_failures_back_off_exponentially() -> None:
+    """Each failure doubles the interval, up to the maximum."""
+    adaptive = AdaptivePollInterval(30)
+
+    assert [adaptive.on_failure() for _ in range(4)] == [60, 120, 240, 300]
+    assert adaptive.failures == 4
+
+
+def test_recovery_snaps_back_to_base() -> None:
+    """The first successful poll after failures restores the base interval."""
+    adaptive = AdaptivePollInterval(30)
+    adaptive.on_failure()
+    adaptive.on_failure()
+
+    assert adaptive.on_success(PAYLOAD, PAYLOAD) == 30
+    assert adaptive.failures == 0
+
+
+def test_moving_metrics_speed_up() -> None:
+    """A large change in a key metric halves the interval."""
+    adaptive = AdaptivePollInterval(30)
+    retuned = PAYLOAD.merge({"frequency": MOCK_ASIC_DATA["frequency"] + 100})
+
+    assert adaptive.on_success(PAYLOAD, retuned) == 15
+    assert adaptive.on_success(retuned, PAYLOAD) == 7.5
+    assert adaptive.on_success(PAYLOAD, retuned) == MIN_SCAN_INTERVAL
+
+
+def test_identical_payloads_slow_down() -> None:
+    """Consecutive identical payloads lengthen the interval, up to the max."""
+    adaptive = AdaptivePollInterval(30)
+
+    assert adaptive.on_success(PAYLOAD, PAYLOAD) == 45
+    for _ in range(10):
+        adaptive.on_success(PAYLOAD, PAYLOAD)
+    assert adaptive.interval == MAX_SCAN_INTERVAL
+
+
+def test_moderate_change_keeps_interval() -> None:
+    """Changes between the stable and volatile thresholds keep the pace."""
+    adaptive = AdaptivePollInterval(30)
+    drifted = PAYLOAD.merge({"temp": MOCK_ASIC_DATA["temp"] * 1.02})
+
+    assert adaptive.on_success(PAYLOAD, drifted) == 30
+
+
+@pytest.mark.parametrize(
+    ("previous", "current", "expected"),
+    [
+        ({"temp": 50}, {"temp": 55}, 0.1),
+        ({"fanrpm": 0}, {"fanrpm": 3000}, 1.0),
+        ({"temp": 50}, {}, 0.0),
+        ({"temp": "50"}, {"temp": 60}, 0.0),
+        ({"hostname": "a"}, {"hostname": "b"}, 0.0),
+    ],
+)
+def test_relative_change(previous: dict, current: dict, expected: float) -> None:
+    """Only numeric volatility metrics present on both sides are compared."""
+    assert relative_change(
+        MinerSnapshot.from_payload(previous), MinerSnapshot.from_payload(current)
+    ) == pytest.approx(expected)
@@ -0,0 +1,272 @@
+"""Test the NerdQAxe+ auto-tuner."""
+
+import asyncio
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nerdqaxe import NerdQAxeDataUpdateCoordinator
+from custom_components.nerdqaxe.autotune import (
+    TARGET_EFFICIENCY,
+    TARGET_HASHRATE,
+    AutoTuner,
+    AutoTuneRequest,
+    AutoTuneState,
+)
+from custom_components.nerdqaxe.const import DOMAIN
+from custom_components.nerdqaxe.exceptions import NerdQAxeError
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+
+from .conftest import MOCK_ASIC_DATA, MOCK_HOST, MOCK_SYSTEM_INFO, create_mock_session
+
+MOCK_PAYLOAD = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+SWEEP = {
+    "min_frequency": 450,
+    "max_frequency": 550,
+    "min_core_voltage": 1100,
+    "max_core_voltage": 1150,
+}
+
+
+class MinerModel:
+    """Miner whose hashrate collapses below the voltage a frequency needs."""
+
+    def __init__(self, coordinator: NerdQAxeDataUpdateCoordinator) -> None:
+        self.coordinator = coordinator
+        self.frequency = 500
+        self.core_voltage = 1200
+        self.written: list[dict[str, Any]] = []
+
+    def queue(self, settings: dict[str, Any]) -> asyncio.Future[None]:
+        self.written.append(dict(settings))
+        self.frequency = settings["frequency"]
+        self.core_voltage = settings["coreVoltage"]
+        future = self.coordinator.hass.loop.create_future()
+        future.set_result(None)
+        return future
+
+    def payload(self) -> dict[str, Any]:
+        # 8 GH/s per MHz once the voltage keeps up: 1100 mV up to 475 MHz,
+        # 2 mV more per MHz above
+        stable = self.core_voltage >= 1100 + 2 * (self.frequency - 475)
+        power = 5 + self.frequency * (self.core_voltage / 1000) ** 2 * 0.06
+        return {
+            **MOCK_PAYLOAD,
+            "frequency": self.frequency,
+            "coreVoltage": self.core_voltage,
+            "hashRate_1m": self.frequency * 8 * (1 if stable else 0.7),
+            "power": power,
+            "temp": 30 + power / 2,
+            "vrTemp": 50.0,
+        }
+
+    def snapshot(self) -> MinerSnapshot:
+        return MinerSnapshot.from_payload(self.payload())
+
+    async def async_poll(self) -> None:
+        self.coordinator.session = create_mock_session(json_data=self.payload())
+        await self.coordinator.async_refresh()
+
+
+@pytest.fixture(autouse=True)
+def no_settle_time() -> Generator[None]:
+    """Measure a step as soon as two polls agree."""
+    with patch("custom_components.nerdqaxe.autotune.SETTLE_MIN_TIME", 0):
+        yield
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant,
+) -> AsyncGenerator[NerdQAxeDataUpdateCoordinator]:
+    """Create a coordinator with data."""
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(json_data=MOCK_PAYLOAD),
+    ):
+        coordinator = NerdQAxeDataUpdateCoordinator(
+            hass, host=MOCK_HOST, scan_interval=30
+        )
+    coordinator.data = MinerSnapshot.from_payload(MOCK_PAYLOAD)
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+@pytest.fixture
+def model(coordinator: NerdQAxeDataUpdateCoordinator) -> MinerModel:
+    """Route the settings writes of the coordinator to a miner model."""
+    model = MinerModel(coordinator)
+    coordinator.data = model.snapshot()
+    coordinator.settings.async_queue = model.queue
+    return model
+
+
+async def _async_run(tuner: AutoTuner, model: MinerModel, **request: Any) -> None:
+    """Start a run and poll the model until it ends."""
+    tuner.async_start(AutoTuneRequest(**{**SWEEP, **request}))
+    for _ in range(100):
+        if not tuner.running:
+            return
+        await asyncio.sleep(0)
+        await model.async_poll()
+    pytest.fail("Auto-tune did not finish")
+
+
+@pytest.mark.parametrize(
+    ("target", "best"),
+    [(TARGET_EFFICIENCY, (475, 1100)), (TARGET_HASHRATE, (500, 1150))],
+)
+async def test_sweep_finds_and_applies_best_point(
+    hass: HomeAssistant,
+    coordinator: NerdQAxeDataUpdateCoordinator,
+    model: MinerModel,
+    target: str,
+    best: tuple[int, int],
+) -> None:
+    """The staircase raises the voltage when the hashrate collapses."""
+    tuner = AutoTuner(hass, coordinator)
+
+    await _async_run(tuner, model, target=target)
+
+    assert tuner.state is AutoTuneState.DONE
+    assert [
+        (point.frequency, point.core_voltage, point.stable) for point in tuner.points
+    ] == [
+        (450, 1100, True),
+        (475, 1100, True),
+        *((500, voltage, False) for voltage in range(1100, 1150, 10)),
+        (500, 1150, True),
+        (525, 1150, False),
+    ]
+    assert tuner.best is not None
+    assert (tuner.best.frequency, tuner.best.core_voltage) == best
+    assert model.written[-1] == {"frequency": best[0], "coreVoltage": best[1]}
+
+
+async def test_temperature_limit_ends_sweep(
+    hass: HomeAssistant, coordinator: NerdQAxeDataUpdateCoordinator, model: MinerModel
+) -> None:
+    """A point above the temperature limit is never applied."""
+    tuner = AutoTuner(hass, coordinator)
+
+    # 450 MHz runs at 48.3 °C, 475 MHz at 49.5 °C
+    await _async_run(tuner, model, max_temp=49)
+
+    assert tuner.state is AutoTuneState.DONE
+    assert [(point.frequency, point.stable) for point in tuner.points] == [
+        (450, True),
+        (475, False),
+    ]
+    assert model.written[-1] == {"frequency": 450, "coreVoltage": 1100}
+
+
+async def test_push_frames_are_not_polls(
+    hass: HomeAssistant, coordinator: NerdQAxeDataUpdateCoordinator, model: MinerModel
+) -> None:
+    """Only polls are compared to tell whether a step settled."""
+    tuner = AutoTuner(hass, coordinator)
+    tuner.async_start(AutoTuneRequest(**SWEEP))
+    await asyncio.sleep(0)
+    assert tuner.step == (450, 1100)
+
+    # Push frames a second apart agree with each other
+    for _ in range(5):
+        coordinator.async_set_updated_data(model.snapshot())
+        await asyncio.sleep(0)
+    assert tuner.points == []
+
+    await model.async_poll()
+    await asyncio.sleep(0)
+    coordinator.async_set_updated_data(model.snapshot())
+    await asyncio.sleep(0)
+    assert tuner.points == []
+
+    await model.async_poll()
+    await asyncio.sleep(0)
+    assert [(point.frequency, point.core_voltage) for point in tuner.points] == [
+        (450, 1100)
+    ]
+
+    await tuner.async_stop()
+
+
+async def test_stop_restores_settings_and_result_persists(
+    hass: HomeAssistant, coordinator: NerdQAxeDataUpdateCoordinator, model: MinerModel
+) -> None:
+    """Stopping a run goes back to the settings the miner had before."""
+    tuner = AutoTuner(hass, coordinator)
+    tuner.async_start(AutoTuneRequest(**SWEEP))
+    await asyncio.sleep(0)
+    assert tuner.step == (450, 1100)
+
+    await tuner.async_stop()
+
+    assert tuner.state is AutoTuneState.ABORTED
+    assert model.written[-1] == {"frequency": 500, "coreVoltage": 1200}
+    await tuner.store.async_save(tuner.as_dict())
+    restored = AutoTuner(hass, coordinator)
+    await restored.async_load()
+    assert restored.state is AutoTuneState.ABORTED
+    assert restored.request == tuner.request
+
+
+async def test_start_service_validation(hass: HomeAssistant) -> None:
+    """The power cap target needs a cap, and only one run goes at a time."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="NerdQAxe+ Miner",
+        data={CONF_HOST: MOCK_HOST},
+        unique_id="AA:BB:CC:DD:EE:FF",
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(json_data=MOCK_PAYLOAD),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, "AA:BB:CC:DD:EE:FF")}
+    )
+    assert device is not None
+
+    with pytest.raises(ServiceValidationError, match="requires a power_cap"):
+        await hass.services.async_call(
+            DOMAIN,
+            "start_autotune",
+            {"device_id": device.id, "target": "power_cap"},
+            blocking=True,
+        )
+    with pytest.raises(ServiceValidationError, match="not a loaded"):
+        await hass.services.async_call(
+            DOMAIN, "stop_autotune", {"device_id": "unknown"}, blocking=True
+        )
+
+    await hass.services.async_call(
+        DOMAIN, "start_autotune", {"device_id": device.id}, blocking=True
+    )
+    tuner = entry.runtime_data.autotune
+    assert tuner.running
+    # Default sweep: 100 MHz and 50 mV either side of the current settings
+    assert tuner.request == AutoTuneRequest(
+        min_frequency=400,
+        max_frequency=600,
+        min_core_voltage=1150,
+        max_core_voltage=1250,
+    )
+    state = hass.states.get("sensor.nerdqaxe_miner_192_168_1_100_auto_tune")
+    assert state.state == "running"
+    with pytest.raises(NerdQAxeError, match="already running"):
+        await hass.services.async_call(
+            DOMAIN, "start_autotune", {"device_id": device.id}, blocking=True
+        )
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    assert tuner.state is AutoTuneState.ABORTED
@@ -0,0 +1,27 @@
+"""Smoke test the benchmark scripts."""
+
+import subprocess
+import sys
+
+import pytest
+
+SINGLE_MINER = ["--miners", "1", "--repeat", "1"]
+
+
+@pytest.mark.parametrize("transport", [[], ["--emulator"]])
+def test_fleet_benchmark_runs(transport: list[str]) -> None:
+    """The fleet benchmark runs against one miner without logging errors."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-m", "benchmarks.fleet", *SINGLE_MINER, *transport],
+        capture_output=True,
+        check=False,
+        text=True,
+        timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "ERROR" not in result.stderr
+    # One line per benchmark, after the header
+    rows = [line.split() for line in result.stdout.splitlines()[1:]]
+    assert [row[1] for row in rows] == ["1"] * len(rows)
+    assert {row[0] for row in rows} == {"decode", "refresh", "entities", "setup"}
@@ -12,6 +12,7 @@ from custom_components.nerdqaxe.binary_sensor import (
     NerdQAxeBinarySensor,
 )
 from custom_components.nerdqaxe.const import DOMAIN
+from custom_components.nerdqaxe.snapshot import SNAPSHOT_KEYS, MinerSnapshot
 
 from .conftest import (
     MOCK_ASIC_DATA,
@@ -40,12 +41,26 @@ def _make_sensor(
     """Build a binary sensor backed by a mock coordinator."""
     coordinator = MagicMock()
     coordinator.host = MOCK_HOST
-    coordinator.data = data
+    coordinator.data = MinerSnapshot.from_payload(data) if data is not None else None
     coordinator.get_device_info.return_value = {"identifiers": {(DOMAIN, MOCK_HOST)}}
     description = next(d for d in BINARY_SENSORS if d.key == key)
     return NerdQAxeBinarySensor(coordinator, description)
 
 
+@pytest.mark.parametrize("description", BINARY_SENSORS, ids=lambda d: d.key)
+def test_binary_sensor_reads_only_its_source_keys(description) -> None:
+    """Each binary sensor's state depends on its declared keys only."""
+    data = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+    payload = {k: v for k, v in data.items() if k in description.source_keys}
+
+    # Keys no snapshot field is parsed from would never be notified
+    assert description.source_keys <= SNAPSHOT_KEYS
+    full = MinerSnapshot.from_payload(data)
+    projected = MinerSnapshot.from_payload(payload)
+
+    assert description.value_fn(projected) == description.value_fn(full)
+
+
 def test_is_on_with_connected_pool() -> None:
     """Modern firmware: any connected pool in stratum.pools marks it on."""
     sensor = _make_sensor(
@@ -137,7 +152,7 @@ async def test_binary_sensor_state_connected(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -153,3 +168,43 @@ async def test_binary_sensor_state_connected(
 
     assert state is not None
     assert state.state == "on"
+
+
+async def test_pool_connected_sensors(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Each reported pool gets a sensor, including pools reported later."""
+    single_pool = {
+        **MOCK_SYSTEM_INFO,
+        **MOCK_ASIC_DATA,
+        "stratum": {"pools": [{"active": True, "connected": True}]},
+    }
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(status=200, json_data=single_pool),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data.coordinator
+    pool_1 = "binary_sensor.nerdqaxe_miner_192_168_1_100_pool_1_connected"
+    pool_2 = "binary_sensor.nerdqaxe_miner_192_168_1_100_pool_2_connected"
+
+    # A single pool is already covered by Stratum Connected
+    assert hass.states.get(pool_1) is None
+
+    coordinator.async_set_updated_data(
+        coordinator.data.merge(
+            {
+                "stratum": {
+                    "pools": [
+                        {"active": True, "connected": True},
+                        {"active": True, "connected": False},
+                    ]
+                }
+            }
+        )
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(pool_1).state == "on"
+    assert hass.states.get(pool_2).state == "off"
@@ -0,0 +1,149 @@
+"""Test the NerdQAxe+ fleet power budget."""
+
+from collections.abc import Generator
+from unittest.mock import MagicMock, patch
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nerdqaxe.budget import (
+    ECO_CORE_VOLTAGE,
+    ECO_FREQUENCY,
+    IDLE_POWER,
+    RAISE_INTERVAL,
+    BudgetUnit,
+    allocate,
+    async_get_power_budget,
+)
+from custom_components.nerdqaxe.const import DOMAIN
+
+from .conftest import MOCK_ASIC_DATA, MOCK_SYSTEM_INFO, create_mock_session
+
+MOCK_PAYLOAD = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+BUDGET_SENSOR = "sensor.solar_surplus"
+
+
+def _unit(power_factor: float, hashrate_per_mhz: float) -> BudgetUnit:
+    return BudgetUnit(
+        nominal_frequency=500,
+        nominal_core_voltage=1200,
+        power_factor=power_factor,
+        hashrate_per_mhz=hashrate_per_mhz,
+    )
+
+
+def test_levels_ladder() -> None:
+    """The ladder climbs from the eco floor to the nominal settings."""
+    levels = _unit(0.02, 2.0).levels()
+
+    assert [point.frequency for point in levels] == list(range(100, 525, 25))
+    assert (levels[0].frequency, levels[0].core_voltage) == (
+        ECO_FREQUENCY,
+        ECO_CORE_VOLTAGE,
+    )
+    assert (levels[-1].frequency, levels[-1].core_voltage) == (500, 1200)
+    # Halfway up the frequencies, halfway up the voltages
+    assert (levels[8].frequency, levels[8].core_voltage) == (300, 1100)
+    assert levels[0].power == pytest.approx(IDLE_POWER + 0.02 * 100)
+    assert levels[-1].power == pytest.approx(IDLE_POWER + 0.02 * 500 * 1.44)
+    assert levels[-1].hashrate == 1000.0
+
+
+def test_allocate_favours_efficient_miners() -> None:
+    """The efficient miner climbs first and the total stays in the budget."""
+    efficient, hungry = _unit(0.01, 2.0).levels(), _unit(0.03, 2.0).levels()
+
+    picked = allocate([hungry, efficient], 25.0)
+
+    assert picked[1] == len(efficient) - 1
+    assert 0 < picked[0] < len(hungry) - 1
+    assert hungry[picked[0]].power + efficient[picked[1]].power <= 25.0
+    # One more step of the hungry miner would not fit
+    assert hungry[picked[0] + 1].power + efficient[-1].power > 25.0
+
+    # Both reach their nominal settings when the budget allows it
+    assert allocate([hungry, efficient], 100.0) == [
+        len(hungry) - 1,
+        len(efficient) - 1,
+    ]
+    # Floors are kept even when they do not fit
+    assert allocate([hungry, efficient], 5.0) == [0, 0]
+
+
+@pytest.fixture
+def clock() -> Generator[list[float]]:
+    """Control the monotonic time seen by the allocator."""
+    now = [1000.0]
+    with patch("custom_components.nerdqaxe.budget.monotonic", lambda: now[0]):
+        yield now
+
+
+async def test_budget_follows_sensor_with_hysteresis(
+    hass: HomeAssistant, clock: list[float]
+) -> None:
+    """Cuts apply at once, raises wait for the band and the rate limit."""
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Miner {index}",
+            data={CONF_HOST: f"192.168.1.{100 + index}"},
+            unique_id=f"AA:BB:CC:DD:EE:0{index}",
+        )
+        for index in range(2)
+    ]
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(json_data=MOCK_PAYLOAD),
+    ):
+        for entry in entries:
+            entry.add_to_hass(hass)
+            await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    queues = []
+    for entry in entries:
+        queue = MagicMock()
+        entry.runtime_data.coordinator.settings.async_queue = queue
+        queues.append(queue)
+
+    # Both miners draw 15 W
+    hass.states.async_set(BUDGET_SENSOR, "20", {"unit_of_measurement": "W"})
+    await hass.services.async_call(
+        DOMAIN,
+        "set_power_budget",
+        {"entity_id": BUDGET_SENSOR, "margin": 2},
+        blocking=True,
+    )
+    budget = async_get_power_budget(hass)
+    for queue in queues:
+        queue.assert_called_once()
+    estimated = sum(unit.levels()[unit.level].power for unit in budget.units.values())
+    assert estimated <= 18.0
+
+    # Still over budget, but the previous cut has not settled yet
+    clock[0] += 10
+    hass.states.async_set(BUDGET_SENSOR, "25", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    # Plenty of room, but raises are rate limited
+    clock[0] += 50
+    hass.states.async_set(BUDGET_SENSOR, "0.1", {"unit_of_measurement": "kW"})
+    await hass.async_block_till_done()
+    for queue in queues:
+        queue.assert_called_once()
+
+    clock[0] += RAISE_INTERVAL
+    budget.async_evaluate()
+    for queue in queues:
+        queue.assert_called_with({"frequency": 500, "coreVoltage": 1200})
+        queue.reset_mock()
+
+    await hass.services.async_call(DOMAIN, "clear_power_budget", blocking=True)
+    assert budget.entity_id is None
+    for queue in queues:
+        queue.assert_called_once_with({"frequency": 500, "coreVoltage": 1200})
+    # The budget sensor is no longer followed
+    hass.states.async_set(BUDGET_SENSOR, "5", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    for queue in queues:
+        queue.assert_called_once()
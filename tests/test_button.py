@@ -50,7 +50,7 @@ async def test_button_press_success(
     mock_session.post = MagicMock(return_value=post_ctx)
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -88,7 +88,7 @@ async def test_button_press_failure(
     mock_session.post = MagicMock(side_effect=aiohttp.ClientError("Connection failed"))
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
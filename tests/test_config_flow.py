@@ -44,7 +44,7 @@ async def test_form_user_success(hass: HomeAssistant) -> None:
 
     with (
         patch(
-            "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+            "custom_components.nerdqaxe.config_flow.async_get_miner_session",
             return_value=mock_session,
         ),
         patch(
@@ -74,7 +74,7 @@ async def test_form_cannot_connect(hass: HomeAssistant) -> None:
     )
 
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result2 = await hass.config_entries.flow.async_configure(
@@ -97,7 +97,7 @@ async def test_form_timeout(hass: HomeAssistant) -> None:
     )
 
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result2 = await hass.config_entries.flow.async_configure(
@@ -130,7 +130,7 @@ async def test_form_already_configured(hass: HomeAssistant) -> None:
     )
 
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result2 = await hass.config_entries.flow.async_configure(
@@ -153,7 +153,7 @@ async def test_form_unknown_error(hass: HomeAssistant) -> None:
     )
 
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result2 = await hass.config_entries.flow.async_configure(
@@ -184,7 +184,7 @@ async def test_reconfigure_success(hass: HomeAssistant) -> None:
     mock_session = create_mock_session(status=200, json_data=MOCK_SYSTEM_INFO)
     with (
         patch(
-            "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+            "custom_components.nerdqaxe.config_flow.async_get_miner_session",
             return_value=mock_session,
         ),
         patch("custom_components.nerdqaxe.async_setup_entry", return_value=True),
@@ -215,7 +215,7 @@ async def test_reconfigure_cannot_connect(hass: HomeAssistant) -> None:
 
     mock_session = create_mock_session(raise_error=aiohttp.ClientError())
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result2 = await hass.config_entries.flow.async_configure(
@@ -242,7 +242,7 @@ async def test_reconfigure_unknown_error(hass: HomeAssistant) -> None:
 
     mock_session = create_mock_session(raise_error=Exception("Unknown error"))
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result2 = await hass.config_entries.flow.async_configure(
@@ -288,7 +288,7 @@ async def test_reconfigure_different_device_aborts(hass: HomeAssistant) -> None:
         json_data={**MOCK_SYSTEM_INFO, "macAddr": other_mac},
     )
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result2 = await hass.config_entries.flow.async_configure(
@@ -304,7 +304,7 @@ async def test_dhcp_discovery_success(hass: HomeAssistant) -> None:
     """Test a miner discovered via DHCP can be set up after confirmation."""
     mock_session = create_mock_session(status=200, json_data=MOCK_SYSTEM_INFO)
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result = await hass.config_entries.flow.async_init(
@@ -345,7 +345,7 @@ async def test_dhcp_discovery_already_configured_updates_host(
 
     mock_session = create_mock_session(status=200, json_data=MOCK_SYSTEM_INFO)
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result = await hass.config_entries.flow.async_init(
@@ -364,7 +364,7 @@ async def test_dhcp_discovery_cannot_connect(hass: HomeAssistant) -> None:
     """Test DHCP discovery aborts when the miner cannot be reached."""
     mock_session = create_mock_session(raise_error=aiohttp.ClientError())
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result = await hass.config_entries.flow.async_init(
@@ -381,7 +381,7 @@ async def test_dhcp_discovery_unknown_error(hass: HomeAssistant) -> None:
     """Test DHCP discovery aborts on an unexpected error."""
     mock_session = create_mock_session(raise_error=Exception("boom"))
     with patch(
-        "custom_components.nerdqaxe.config_flow.async_get_clientsession",
+        "custom_components.nerdqaxe.config_flow.async_get_miner_session",
         return_value=mock_session,
     ):
         result = await hass.config_entries.flow.async_init(
@@ -417,7 +417,15 @@ async def test_options_flow(hass: HomeAssistant) -> None:
     )
 
     assert result2["type"] == FlowResultType.CREATE_ENTRY
-    assert result2["data"] == {"scan_interval": 60}
+    assert result2["data"] == {
+        "scan_interval": 60,
+        "max_concurrent_polls": 4,
+        "push_updates": False,
+        "adaptive_polling": False,
+        "statistics_window": 60,
+        "import_statistics": False,
+        "compact_asic_temps": False,
+    }
 
 
 async def test_options_flow_default_values(hass: HomeAssistant) -> None:
@@ -1,6 +1,10 @@
 """Test the NerdQAxe+ Miner coordinator."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from datetime import timedelta
+from time import monotonic
+from typing import Self
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
 from homeassistant.core import HomeAssistant
@@ -9,16 +13,22 @@ from homeassistant.helpers.update_coordinator import UpdateFailed
 import pytest
 
 from custom_components.nerdqaxe import NerdQAxeDataUpdateCoordinator
-from custom_components.nerdqaxe.const import DOMAIN
+from custom_components.nerdqaxe.const import ATTR_VERSION, DOMAIN
+from custom_components.nerdqaxe.coordinator import CONFIG_REFRESH_INTERVAL
+from custom_components.nerdqaxe.ota import OTA_PROBE_INTERVAL, OtaPhase
+from custom_components.nerdqaxe.snapshot import SNAPSHOT_KEYS, MinerSnapshot
 
 from .conftest import (
     MOCK_ASIC_DATA,
     MOCK_HOST,
     MOCK_SYSTEM_INFO,
+    MockAiohttpContextManager,
+    MockAiohttpResponse,
     create_mock_session,
 )
 
 MOCK_MAC = "AA:BB:CC:DD:EE:FF"
+MOCK_SNAPSHOT = MinerSnapshot.from_payload({**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA})
 
 
 @pytest.fixture
@@ -30,7 +40,7 @@ def mock_coordinator(hass: HomeAssistant) -> NerdQAxeDataUpdateCoordinator:
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         coordinator = NerdQAxeDataUpdateCoordinator(
@@ -56,8 +66,8 @@ async def test_coordinator_update_success(
     data = await mock_coordinator._async_update_data()
 
     assert data is not None
-    assert data["hostname"] == MOCK_SYSTEM_INFO["hostname"]
-    assert data["hashRate"] == MOCK_ASIC_DATA["hashRate"]
+    assert data.hostname == MOCK_SYSTEM_INFO["hostname"]
+    assert data.hashrate == MOCK_ASIC_DATA["hashRate"]
 
 
 async def test_coordinator_update_connection_error(
@@ -137,11 +147,48 @@ async def test_coordinator_update_unexpected_error(
     assert "Unexpected error" in str(exc_info.value)
 
 
+async def test_coordinator_update_projects_payload(
+    hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """Fields no entity reads are dropped from the coordinator data."""
+    mock_coordinator.session = create_mock_session(
+        status=200,
+        json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA, "overheat_mode": 0},
+    )
+
+    data = await mock_coordinator._async_update_data()
+
+    payload = data.as_payload()
+    assert payload.keys() <= SNAPSHOT_KEYS
+    assert "macAddr" not in payload
+    assert "overheat_mode" not in payload
+    assert data.stratum.mode == MOCK_ASIC_DATA["stratum"]["activePoolMode"]
+    assert data.schema_errors == frozenset()
+
+
+@pytest.mark.parametrize("body", [b'{"hashRate": 4', b"[1, 2]"])
+async def test_coordinator_update_invalid_payload(
+    hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator, body: bytes
+) -> None:
+    """A truncated or non-object body fails the update cleanly."""
+    response = MockAiohttpResponse()
+    response.read = AsyncMock(return_value=body)
+    mock_coordinator.session = MagicMock()
+    mock_coordinator.session.get = MagicMock(
+        return_value=MockAiohttpContextManager(response)
+    )
+
+    with pytest.raises(UpdateFailed) as exc_info:
+        await mock_coordinator._async_update_data()
+
+    assert "Invalid payload" in str(exc_info.value)
+
+
 async def test_coordinator_get_device_info(
     hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
 ) -> None:
     """Test coordinator device info."""
-    mock_coordinator.data = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+    mock_coordinator.data = MOCK_SNAPSHOT
 
     device_info = mock_coordinator.get_device_info()
 
@@ -166,7 +213,7 @@ async def test_coordinator_get_device_info_missing_model(
     hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
 ) -> None:
     """Test coordinator device info with missing model field."""
-    mock_coordinator.data = {"hostname": "test"}
+    mock_coordinator.data = MinerSnapshot.from_payload({"hostname": "test"})
 
     device_info = mock_coordinator.get_device_info()
 
@@ -197,7 +244,7 @@ async def test_coordinator_device_info_mac_based(
 ) -> None:
     """Device info is keyed on the MAC and exposes rich metadata."""
     mock_coordinator.config_entry = MagicMock(unique_id=MOCK_MAC)
-    mock_coordinator.data = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+    mock_coordinator.data = MOCK_SNAPSHOT
 
     device_info = mock_coordinator.get_device_info()
 
@@ -205,3 +252,323 @@ async def test_coordinator_device_info_mac_based(
     assert (CONNECTION_NETWORK_MAC, MOCK_MAC) in device_info["connections"]
     assert device_info["sw_version"] == MOCK_SYSTEM_INFO["version"].lstrip("v")
     assert device_info["configuration_url"] == f"http://{MOCK_HOST}"
+
+
+class _MockWebSocket:
+    """Minimal stand-in for an aiohttp client WebSocket."""
+
+    def __init__(self, messages: list[aiohttp.WSMessage]) -> None:
+        self._messages = messages
+        self.close = AsyncMock()
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> aiohttp.WSMessage:
+        if not self._messages:
+            raise StopAsyncIteration
+        return self._messages.pop(0)
+
+
+def _text_frame(data: str) -> aiohttp.WSMessage:
+    return aiohttp.WSMessage(aiohttp.WSMsgType.TEXT, data, None)
+
+
+async def test_coordinator_push_merges_json_frames(
+    hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """JSON objects on the stream update the data; log lines are ignored."""
+    mock_coordinator.data = MOCK_SNAPSHOT
+    ws = _MockWebSocket(
+        [
+            _text_frame("I (1234) stratum: new job"),
+            _text_frame('{"hashRate": 510000000000, "temp": 47.0}'),
+            _text_frame("{not json"),
+        ]
+    )
+    mock_coordinator.session.ws_connect = AsyncMock(return_value=ws)
+
+    await mock_coordinator._async_consume_push()
+
+    assert mock_coordinator.push_connected is True
+    assert mock_coordinator.data.hashrate == 510000000000
+    assert mock_coordinator.data.temp == 47.0
+    # Fields absent from the frame are kept from the last poll
+    assert mock_coordinator.data.hostname == MOCK_SYSTEM_INFO["hostname"]
+    ws.close.assert_awaited_once()
+    assert mock_coordinator.session.ws_connect.call_args.args[0] == (
+        f"ws://{MOCK_HOST}/api/ws"
+    )
+
+
+async def test_coordinator_push_connect_error_propagates(
+    hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """A socket that cannot be opened leaves push mode disconnected."""
+    mock_coordinator.session.ws_connect = AsyncMock(
+        side_effect=aiohttp.ClientConnectionError()
+    )
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await mock_coordinator._async_consume_push()
+
+    assert mock_coordinator.push_connected is False
+
+
+async def test_coordinator_push_drop_falls_back_to_polling(
+    hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """Losing the stream requests a poll and marks push disconnected."""
+
+    async def _consume() -> None:
+        mock_coordinator.push_connected = True
+
+    mock_coordinator.async_request_refresh = AsyncMock()
+    with (
+        patch.object(mock_coordinator, "_async_consume_push", side_effect=_consume),
+        patch(
+            "custom_components.nerdqaxe.coordinator.asyncio.sleep",
+            side_effect=asyncio.CancelledError,
+        ),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        await mock_coordinator._async_push_loop()
+
+    assert mock_coordinator.push_connected is False
+    mock_coordinator.async_request_refresh.assert_awaited_once()
+
+
+async def test_coordinator_notifies_only_listeners_of_changed_keys(
+    hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """Only listeners whose source keys changed are called back."""
+    hashrate_listener = MagicMock()
+    hostname_listener = MagicMock()
+    keyless_listener = MagicMock()
+    mock_coordinator.async_add_listener(hashrate_listener, frozenset({"hashRate"}))
+    mock_coordinator.async_add_listener(hostname_listener, frozenset({"hostname"}))
+    mock_coordinator.async_add_listener(keyless_listener)
+
+    mock_coordinator.async_set_updated_data(MOCK_SNAPSHOT)
+    # The first dispatch has nothing to diff against: everyone is notified.
+    assert hashrate_listener.call_count == 1
+    assert hostname_listener.call_count == 1
+
+    mock_coordinator.async_set_updated_data(MOCK_SNAPSHOT.merge({"hashRate": 1}))
+
+    assert hashrate_listener.call_count == 2
+    assert hostname_listener.call_count == 1
+    assert keyless_listener.call_count == 2
+
+    await mock_coordinator.async_shutdown()
+
+
+async def test_coordinator_notifies_all_on_availability_change(
+    hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """Availability changes reach every listener regardless of keys."""
+    listener = MagicMock()
+    mock_coordinator.async_add_listener(listener, frozenset({"hostname"}))
+    mock_coordinator.async_set_updated_data(MOCK_SNAPSHOT)
+
+    mock_coordinator.async_set_update_error(UpdateFailed("offline"))
+    assert listener.call_count == 2
+
+    # Recovering with an identical payload still flips availability back.
+    mock_coordinator.async_set_updated_data(MOCK_SNAPSHOT)
+    assert listener.call_count == 3
+
+    await mock_coordinator.async_shutdown()
+
+
+async def test_coordinator_removed_listener_leaves_index(
+    hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """Removing a listener drops it from the key index."""
+    listener = MagicMock()
+    remove = mock_coordinator.async_add_listener(listener, frozenset({"hashRate"}))
+    remove()
+
+    assert mock_coordinator._key_listeners == {}
+    mock_coordinator.async_set_updated_data(MOCK_SNAPSHOT)
+    listener.assert_not_called()
+
+
+async def test_coordinator_decodes_config_at_slow_tier(
+    hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """Configuration fields are carried over between slow-tier refreshes."""
+    payload = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+    mock_coordinator.data = await mock_coordinator._async_update_data()
+
+    mock_coordinator.session = create_mock_session(
+        json_data={
+            **payload,
+            "hostname": "renamed",
+            "hashRate": 1,
+            "uptimeSeconds": payload["uptimeSeconds"] + 30,
+        }
+    )
+    with patch.object(MinerSnapshot, "from_payload") as from_payload:
+        data = await mock_coordinator._async_update_data()
+
+    # Telemetry is decoded, the configuration fields are not
+    from_payload.assert_not_called()
+    assert data.hashrate == 1
+    assert data.hostname == MOCK_SYSTEM_INFO["hostname"]
+
+
+async def test_coordinator_config_tier_refreshes(
+    hass: HomeAssistant, mock_coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """The slow tier refreshes on schedule, on demand and after a reboot."""
+    payload = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+    mock_coordinator.data = await mock_coordinator._async_update_data()
+    mock_coordinator.session = create_mock_session(
+        json_data={**payload, "hostname": "renamed", "uptimeSeconds": 90000}
+    )
+
+    # On demand, e.g. after a settings write
+    mock_coordinator.async_invalidate_config()
+    assert (await mock_coordinator._async_update_data()).hostname == "renamed"
+
+    # After the slow-tier interval
+    mock_coordinator.data = await mock_coordinator._async_update_data()
+    mock_coordinator.session = create_mock_session(
+        json_data={**payload, "version": "2.1.0", "uptimeSeconds": 90030}
+    )
+    assert mock_coordinator._config_refreshed is not None
+    with patch(
+        "custom_components.nerdqaxe.coordinator.monotonic",
+        return_value=mock_coordinator._config_refreshed + CONFIG_REFRESH_INTERVAL,
+    ):
+        assert (await mock_coordinator._async_update_data()).version == "2.1.0"
+
+    # After a reboot (uptime going backwards), e.g. an OTA from the web UI
+    mock_coordinator.data = MOCK_SNAPSHOT.merge({"uptimeSeconds": 90030})
+    mock_coordinator.session = create_mock_session(
+        json_data={**payload, "version": "2.2.0", "uptimeSeconds": 12}
+    )
+    assert (await mock_coordinator._async_update_data()).version == "2.2.0"
+
+
+async def test_coordinator_adaptive_interval(hass: HomeAssistant) -> None:
+    """In adaptive mode failures back off and recovery restores the interval."""
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(
+            raise_error=aiohttp.ClientConnectorError(None, OSError("refused"))
+        ),
+    ):
+        coordinator = NerdQAxeDataUpdateCoordinator(
+            hass, host=MOCK_HOST, scan_interval=30, adaptive=True
+        )
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=120)
+
+    coordinator.session = create_mock_session(
+        json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+    )
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=30)
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_configure(hass: HomeAssistant) -> None:
+    """New options keep an adaptive interval unless its base changes."""
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(
+            raise_error=aiohttp.ClientConnectorError(None, OSError("refused"))
+        ),
+    ):
+        coordinator = NerdQAxeDataUpdateCoordinator(
+            hass, host=MOCK_HOST, scan_interval=30, adaptive=True
+        )
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    coordinator.async_configure(scan_interval=30, adaptive=True, statistics_window=60)
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    coordinator.async_configure(scan_interval=20, adaptive=True, statistics_window=60)
+    assert coordinator.update_interval == timedelta(seconds=20)
+    assert coordinator.telemetry.spacing == 10
+
+    coordinator.async_configure(scan_interval=45, adaptive=False, statistics_window=60)
+    assert coordinator.adaptive is None
+    assert coordinator.update_interval == timedelta(seconds=45)
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_probes_during_ota(hass: HomeAssistant) -> None:
+    """An OTA is probed quickly until the miner runs the new version."""
+    payload = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(json_data=payload),
+    ):
+        coordinator = NerdQAxeDataUpdateCoordinator(
+            hass, host=MOCK_HOST, scan_interval=30, adaptive=True
+        )
+    await coordinator.async_refresh()
+    notified: list[bool] = []
+    remove = coordinator.async_add_listener(
+        lambda: notified.append(True), frozenset({ATTR_VERSION})
+    )
+
+    coordinator.async_track_ota("v2.1.0")
+    assert coordinator.update_interval == timedelta(seconds=OTA_PROBE_INTERVAL)
+
+    # Flashing on the old version: the probe interval holds
+    await coordinator.async_refresh()
+    assert coordinator.ota is not None
+    assert coordinator.ota.phase is OtaPhase.FLASHING
+    assert notified == [True]
+    # Options applied meanwhile do not end the probing
+    coordinator.async_configure(scan_interval=60, adaptive=True, statistics_window=60)
+    assert coordinator.update_interval == timedelta(seconds=OTA_PROBE_INTERVAL)
+
+    coordinator.session = create_mock_session(
+        raise_error=aiohttp.ClientConnectorError(None, OSError("refused"))
+    )
+    await coordinator.async_refresh()
+    assert coordinator.ota.phase is OtaPhase.REBOOTING
+    # No adaptive backoff while the miner reboots
+    assert coordinator.update_interval == timedelta(seconds=OTA_PROBE_INTERVAL)
+
+    # Back with the new version
+    coordinator.session = create_mock_session(
+        json_data={**payload, "version": "2.1.0", "uptimeSeconds": 5}
+    )
+    await coordinator.async_refresh()
+    assert coordinator.data.version == "2.1.0"
+    assert coordinator.ota is None
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    remove()
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_records_telemetry(
+    mock_coordinator: NerdQAxeDataUpdateCoordinator,
+) -> None:
+    """Every poll is recorded into the telemetry buffer, failures are not."""
+    await mock_coordinator._async_update_data()
+
+    assert len(mock_coordinator.telemetry) == 1
+    assert mock_coordinator.telemetry.capacity == 241
+    stats = mock_coordinator.telemetry.stats("hashrate", monotonic())
+    assert stats is not None
+    assert stats["mean"] == MOCK_ASIC_DATA["hashRate"]
+
+    mock_coordinator.session = create_mock_session(
+        raise_error=aiohttp.ClientConnectorError(None, OSError("refused"))
+    )
+    with pytest.raises(UpdateFailed):
+        await mock_coordinator._async_update_data()
+    assert len(mock_coordinator.telemetry) == 1
@@ -1,5 +1,6 @@
 """Test the NerdQAxe+ Miner diagnostics."""
 
+import json
 from unittest.mock import patch
 
 from homeassistant.const import CONF_HOST
@@ -9,6 +10,11 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.nerdqaxe.const import DOMAIN
 from custom_components.nerdqaxe.diagnostics import async_get_config_entry_diagnostics
+from custom_components.nerdqaxe.rollout import (
+    MinerRollout,
+    MinerRolloutState,
+    async_get_firmware_rollout,
+)
 
 from .conftest import (
     MOCK_ASIC_DATA,
@@ -42,7 +48,7 @@ async def test_diagnostics(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -62,6 +68,10 @@ async def test_diagnostics(
     assert "last_update_success" in diagnostics["coordinator"]
     assert "update_interval" in diagnostics["coordinator"]
 
+    # Fleet scheduler state is included
+    assert diagnostics["fleet"]["miners"] == 1
+    assert "connection_pool" in diagnostics
+
 
 async def test_diagnostics_redaction(
     hass: HomeAssistant,
@@ -74,7 +84,7 @@ async def test_diagnostics_redaction(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -84,9 +94,11 @@ async def test_diagnostics_redaction(
 
     # Verify redacted fields in data
     if diagnostics["data"]:
-        assert diagnostics["data"].get("macAddr") == "**REDACTED**"
         assert diagnostics["data"].get("hostname") == "**REDACTED**"
-        assert diagnostics["data"].get("hostip") == "**REDACTED**"
+        assert diagnostics["data"].get("stratumUser") == "**REDACTED**"
+        # Fields no entity reads are dropped before reaching the coordinator
+        assert "macAddr" not in diagnostics["data"]
+        assert "hostip" not in diagnostics["data"]
 
 
 async def test_diagnostics_no_data(
@@ -100,7 +112,7 @@ async def test_diagnostics_no_data(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -126,7 +138,7 @@ async def test_diagnostics_entry_info(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -138,3 +150,57 @@ async def test_diagnostics_entry_info(
     assert "entry_id" in diagnostics["entry"]
     assert "domain" in diagnostics["entry"]
     assert diagnostics["entry"]["domain"] == DOMAIN
+
+
+async def test_diagnostics_redact_firmware_rollout(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """The fleet rollout does not leak the address of any miner."""
+    mock_session = create_mock_session(
+        status=200,
+        json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
+    )
+
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=mock_session,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        rollout = async_get_firmware_rollout(hass)
+        unique_id = mock_config_entry.runtime_data.coordinator.unique_id_base
+        rollout.miners = {
+            unique_id: MinerRollout(
+                host=MOCK_HOST,
+                wave=1,
+                from_version="1.0.0",
+                url="https://example.com/factory.bin",
+                state=MinerRolloutState.FAILED,
+                error=f"Failed to start the update on {MOCK_HOST}",
+            ),
+            # A miner unloaded since
+            "11:22:33:44:55:66": MinerRollout(
+                host="192.168.1.101",
+                wave=2,
+                from_version="1.0.0",
+                url="https://example.com/factory.bin",
+                state=MinerRolloutState.SKIPPED,
+            ),
+        }
+        rollout.error = f"{MOCK_HOST}: Failed to start the update on {MOCK_HOST}"
+
+        diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    dumped = json.dumps(diagnostics["firmware_rollout"])
+    for address in (MOCK_HOST, unique_id, "192.168.1.101", "11:22:33:44:55:66"):
+        assert address not in dumped
+    miners = diagnostics["firmware_rollout"]["miners"]
+    assert [miner["entry_id"] for miner in miners] == [
+        mock_config_entry.entry_id,
+        None,
+    ]
+    assert miners[0]["host"] == "**REDACTED**"
+    assert miners[0]["error"] == "Failed to start the update on **REDACTED**"
+    assert miners[0]["state"] == "failed"
@@ -0,0 +1,115 @@
+"""Test the NerdQAxe+ efficiency computation."""
+
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.nerdqaxe import NerdQAxeDataUpdateCoordinator
+from custom_components.nerdqaxe.efficiency import (
+    MAX_HOLD,
+    PowerAverager,
+    gigahash_per_watt,
+    joules_per_terahash,
+)
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+
+from .conftest import MOCK_ASIC_DATA, MOCK_HOST, MOCK_SYSTEM_INFO, create_mock_session
+
+
+@pytest.mark.parametrize(
+    ("power", "hashrate", "jth", "ghw"),
+    [
+        (20.0, 1000.0, 20.0, 50.0),
+        (15.0, 1200.5, 12.49, 80.03),
+        (20.0, 0.0, None, None),
+        (0.0, 1000.0, None, None),
+        (None, 1000.0, None, None),
+        (20.0, None, None, None),
+    ],
+)
+def test_efficiency_guards(
+    power: float | None, hashrate: float | None, jth: float | None, ghw: float | None
+) -> None:
+    """A zero or missing reading yields no efficiency."""
+    assert joules_per_terahash(power, hashrate) == jth
+    assert gigahash_per_watt(power, hashrate) == ghw
+
+
+def test_power_average_is_time_weighted() -> None:
+    """Each reading weighs by how long it held, within the window only."""
+    averager = PowerAverager()
+    assert averager.mean(0.0, 600) is None
+
+    averager.add(0.0, 10.0)
+    # A single reading is its own average
+    assert averager.mean(0.0, 600) == 10.0
+
+    averager.add(250.0, 40.0)
+    averager.add(300.0, 40.0)
+    # 250 s at 10 W, then 50 s at 40 W
+    assert averager.mean(300.0, 600) == pytest.approx(15.0)
+    # The last 100 s: half at 10 W, half at 40 W
+    assert averager.mean(300.0, 100) == pytest.approx(25.0)
+    # Ten minutes later the window only holds the 40 W reading
+    averager.add(600.0, 40.0)
+    averager.add(900.0, 40.0)
+    assert averager.mean(900.0, 600) == pytest.approx(40.0)
+
+
+def test_power_average_skips_gaps() -> None:
+    """A reading is held no longer than MAX_HOLD over an outage."""
+    averager = PowerAverager()
+    averager.add(0.0, 20.0)
+    averager.add(100.0, 20.0)
+    # Unreachable for an hour, then back at 30 W
+    averager.add(100.0 + 3600, 30.0)
+    averager.add(200.0 + 3600, 30.0)
+
+    # Since the second reading: the 20 W reading counts for MAX_HOLD past it,
+    # not for the whole hour
+    assert averager.mean(200.0 + 3600, 3700) == pytest.approx(
+        (20 * MAX_HOLD + 30 * 100) / (MAX_HOLD + 100)
+    )
+
+
+def test_power_history_is_bounded() -> None:
+    """Checkpoints older than the longest window are dropped."""
+    averager = PowerAverager(horizon=3600)
+    for second in range(0, 7200, 5):
+        averager.add(float(second), 20.0)
+
+    assert len(averager._checkpoints) <= 3600 / 10 + 2
+    assert averager.mean(7195.0, 3600) == pytest.approx(20.0)
+
+
+async def test_coordinator_resolves_efficiency(hass: HomeAssistant) -> None:
+    """Every refresh carries its efficiency, windowed on the average power."""
+    payload = {
+        **MOCK_SYSTEM_INFO,
+        **MOCK_ASIC_DATA,
+        "hashRate": 1000.0,
+        "hashRate_10m": 980.0,
+        "hashRate_1h": 990.0,
+        "power": 20.0,
+    }
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(json_data=payload),
+    ):
+        coordinator = NerdQAxeDataUpdateCoordinator(
+            hass, host=MOCK_HOST, scan_interval=30
+        )
+    await coordinator.async_refresh()
+
+    efficiency = coordinator.data.efficiency
+    assert efficiency is not None
+    assert (efficiency.jth, efficiency.ghw) == (20.0, 50.0)
+    assert (efficiency.power_10m, efficiency.jth_10m) == (20.0, 20.41)
+    assert (efficiency.power_1h, efficiency.jth_1h) == (20.0, 20.2)
+
+    # Pushed frames are resolved as well
+    coordinator._async_handle_push_update({"hashRate": 800.0})
+    assert coordinator.data.efficiency.jth == 25.0
+    # Parsing alone does not resolve it
+    assert MinerSnapshot.from_payload(payload).efficiency is None
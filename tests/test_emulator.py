@@ -0,0 +1,107 @@
+"""Test the integration against the emulated NerdQAxe firmware."""
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+import pytest
+
+from benchmarks.emulator import MODELS, EmulatedFleet, EmulatorConfig
+from custom_components.nerdqaxe import NerdQAxeDataUpdateCoordinator
+from custom_components.nerdqaxe.const import API_OTA_GITHUB, API_SYSTEM
+from custom_components.nerdqaxe.session import async_close_miner_pool
+
+FAST_REBOOT = EmulatorConfig(reboot_seconds=0.2, ota_seconds=0.1)
+
+
+def _coordinator(hass: HomeAssistant, host: str) -> NerdQAxeDataUpdateCoordinator:
+    return NerdQAxeDataUpdateCoordinator(hass, host=host, scan_interval=30)
+
+
+async def test_poll_emulated_fleet(hass: HomeAssistant, socket_enabled: None) -> None:
+    """Every emulated model is polled over a real socket."""
+    async with EmulatedFleet(len(MODELS)) as fleet:
+        coordinators = [_coordinator(hass, host) for host in fleet.addresses]
+        snapshots = await asyncio.gather(
+            *(c._async_update_data() for c in coordinators)
+        )
+    await async_close_miner_pool(hass)
+
+    for snapshot, model in zip(snapshots, MODELS.values(), strict=True):
+        assert snapshot.device_model == model.name
+        assert len(snapshot.asic_temps) == model.asic_count
+        assert snapshot.has_second_fan is (model.fan_count > 1)
+        assert snapshot.schema_errors == frozenset()
+
+
+async def test_settings_patch_applies(
+    hass: HomeAssistant, socket_enabled: None
+) -> None:
+    """A settings PATCH shows up in the next poll."""
+    async with EmulatedFleet(1) as fleet:
+        coordinator = _coordinator(hass, fleet.addresses[0])
+        async with coordinator.session.patch(
+            f"{coordinator.base_url}{API_SYSTEM}", json={"frequency": 525}
+        ) as response:
+            assert response.status == 200
+        snapshot = await coordinator._async_update_data()
+    await async_close_miner_pool(hass)
+
+    assert snapshot.frequency == 525
+
+
+async def test_reboot_window_fails_polls(
+    hass: HomeAssistant, socket_enabled: None
+) -> None:
+    """The miner cannot be reached while it reboots, then comes back."""
+    async with EmulatedFleet(1, FAST_REBOOT) as fleet:
+        miner = fleet.miners[0]
+        coordinator = _coordinator(hass, miner.address)
+        await coordinator._async_update_data()
+
+        miner.reboot()
+        await asyncio.sleep(0.1)
+        with pytest.raises(UpdateFailed, match="Cannot connect"):
+            await coordinator._async_update_data()
+
+        while miner.rebooting:
+            await asyncio.sleep(0.05)
+        snapshot = await coordinator._async_update_data()
+    await async_close_miner_pool(hass)
+
+    assert snapshot.uptime == 0
+
+
+async def test_ota_flow(hass: HomeAssistant, socket_enabled: None) -> None:
+    """OTA is accepted with 202, refused while busy, then boots the new version."""
+    url = "https://example.com/esp-miner-factory-NerdQAxe++-v9.9.9.bin"
+    async with EmulatedFleet(1, FAST_REBOOT) as fleet:
+        miner = fleet.miners[0]
+        coordinator = _coordinator(hass, miner.address)
+        ota_url = f"{coordinator.base_url}{API_OTA_GITHUB}"
+
+        async with coordinator.session.post(ota_url, json={"url": url}) as response:
+            assert response.status == 202
+            assert await response.json() == {"status": "started"}
+        async with coordinator.session.post(ota_url, json={"url": url}) as response:
+            assert response.status == 409
+
+        while miner.ota_running or miner.rebooting:
+            await asyncio.sleep(0.05)
+        snapshot = await coordinator._async_update_data()
+    await async_close_miner_pool(hass)
+
+    assert snapshot.version == "v9.9.9"
+
+
+async def test_dropped_connections_fail_polls(
+    hass: HomeAssistant, socket_enabled: None
+) -> None:
+    """A dropped connection surfaces as a failed poll."""
+    async with EmulatedFleet(1, EmulatorConfig(drop_rate=1.0)) as fleet:
+        coordinator = _coordinator(hass, fleet.addresses[0])
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        # aiohttp retries an idempotent request once on a fresh connection
+        assert fleet.miners[0].dropped == 2
+    await async_close_miner_pool(hass)
@@ -1,5 +1,6 @@
 """Test the NerdQAxe+ Miner integration initialization."""
 
+from datetime import timedelta
 from unittest.mock import patch
 
 from homeassistant.config_entries import ConfigEntryState
@@ -43,7 +44,7 @@ async def test_setup_entry_success(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -66,7 +67,7 @@ async def test_setup_entry_connection_error(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -87,7 +88,7 @@ async def test_unload_entry(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -101,34 +102,152 @@ async def test_unload_entry(
     assert mock_config_entry.state == ConfigEntryState.NOT_LOADED
 
 
+async def test_device_info_follows_firmware_update(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """A new firmware version reaches the device registry without a reload."""
+    mock_session = create_mock_session(
+        status=200,
+        json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
+    )
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=mock_session,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data.coordinator
+    dev_reg = dr.async_get(hass)
+
+    def device() -> dr.DeviceEntry:
+        entry = dev_reg.async_get_device(
+            identifiers={(DOMAIN, coordinator.unique_id_base)}
+        )
+        assert entry is not None
+        return entry
+
+    assert device().sw_version == "2.0.0"
+
+    coordinator.async_set_updated_data(
+        coordinator.data.merge({"version": "v2.1.0", "deviceModel": "NerdQX"})
+    )
+    assert (device().sw_version, device().model) == ("2.1.0", "NerdQX")
+
+
+async def test_polling_options_apply_without_reload(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Polling options are applied to the running coordinator."""
+    mock_session = create_mock_session(
+        status=200,
+        json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
+    )
+
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=mock_session,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data.coordinator
+
+    with (
+        patch.object(hass.config_entries, "async_reload") as mock_reload,
+        patch.object(coordinator, "async_start_push") as mock_start_push,
+    ):
+        hass.config_entries.async_update_entry(
+            mock_config_entry,
+            options={
+                "scan_interval": 15,
+                "max_concurrent_polls": 2,
+                "push_updates": True,
+                "statistics_window": 30,
+            },
+        )
+        await hass.async_block_till_done()
+
+    mock_reload.assert_not_called()
+    mock_start_push.assert_called_once()
+    assert mock_config_entry.runtime_data.coordinator is coordinator
+    assert coordinator.update_interval == timedelta(seconds=15)
+    assert coordinator.scheduler.max_concurrent == 2
+    assert (coordinator.telemetry.window, coordinator.telemetry.spacing) == (
+        1800,
+        7.5,
+    )
+    # The sample taken at setup is kept
+    assert len(coordinator.telemetry) == 1
+
+
 async def test_reload_entry_on_options_update(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
 ) -> None:
-    """Test that entry reloads when options change."""
+    """Options changing the entities reload the entry."""
     mock_session = create_mock_session(
         status=200,
         json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
         await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data.coordinator
 
-        assert mock_config_entry.state == ConfigEntryState.LOADED
+        # Setting an option to its default value changes nothing
+        with patch.object(hass.config_entries, "async_reload") as mock_reload:
+            hass.config_entries.async_update_entry(
+                mock_config_entry, options={"compact_asic_temps": False}
+            )
+            await hass.async_block_till_done()
+        mock_reload.assert_not_called()
 
-        # Update options
         hass.config_entries.async_update_entry(
-            mock_config_entry,
-            options={"scan_interval": 60},
+            mock_config_entry, options={"compact_asic_temps": True}
         )
         await hass.async_block_till_done()
 
-    # Entry should still be loaded after reload
     assert mock_config_entry.state == ConfigEntryState.LOADED
+    assert mock_config_entry.runtime_data.coordinator is not coordinator
+
+
+async def test_setup_entry_starts_push_when_enabled(
+    hass: HomeAssistant,
+) -> None:
+    """The push transport is only started when the option is enabled."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="NerdQAxe+ Miner",
+        data={CONF_HOST: MOCK_HOST},
+        unique_id="AA:BB:CC:DD:EE:FF",
+        options={"push_updates": True},
+    )
+    entry.add_to_hass(hass)
+    mock_session = create_mock_session(
+        status=200,
+        json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
+    )
+
+    with (
+        patch(
+            "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+            return_value=mock_session,
+        ),
+        patch(
+            "custom_components.nerdqaxe.coordinator."
+            "NerdQAxeDataUpdateCoordinator.async_start_push"
+        ) as mock_start_push,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state == ConfigEntryState.LOADED
+    mock_start_push.assert_called_once()
 
 
 async def test_migrate_entry_current_version(
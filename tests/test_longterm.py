@@ -0,0 +1,226 @@
+"""Test the NerdQAxe+ hourly statistics import."""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+from pytest_homeassistant_custom_component.typing import RecorderInstanceContextManager
+
+from custom_components.nerdqaxe import NerdQAxeDataUpdateCoordinator
+from custom_components.nerdqaxe.const import CONF_IMPORT_STATISTICS, DOMAIN
+from custom_components.nerdqaxe.longterm import STATE_WRITE_INTERVAL, HourlyStatistics
+from custom_components.nerdqaxe.sensor import SENSORS
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+
+from .conftest import MOCK_ASIC_DATA, MOCK_HOST, MOCK_SYSTEM_INFO, create_mock_session
+
+MOCK_SNAPSHOT = MinerSnapshot.from_payload({**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA})
+TEMPERATURE = next(d for d in SENSORS if d.key == "temperature")
+HOUR = datetime(2026, 1, 1, 10, tzinfo=dt_util.UTC)
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceContextManager,
+) -> None:
+    """Prepare the recorder database before Home Assistant starts."""
+
+
+@pytest.fixture
+def mock_config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Create a config entry with the statistics import enabled."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="NerdQAxe+ Miner",
+        data={CONF_HOST: MOCK_HOST},
+        options={CONF_IMPORT_STATISTICS: True},
+        unique_id="AA:BB:CC:DD:EE:FF",
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def test_completed_hours_are_imported(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Samples are folded into hourly mean/min/max external statistics."""
+    coordinator = NerdQAxeDataUpdateCoordinator(hass, host=MOCK_HOST, scan_interval=5)
+    statistics = HourlyStatistics(hass, coordinator, [TEMPERATURE])
+
+    for minute, temp in ((5, 50.0), (20, 56.0), (55, 53.0), (61, 70.0)):
+        coordinator.async_set_updated_data(MOCK_SNAPSHOT.merge({"temp": temp}))
+        statistics.async_add_sample(HOUR + timedelta(minutes=minute))
+    await async_wait_recording_done(hass)
+
+    statistic_id = statistics.statistic_id("temperature")
+    assert statistic_id == "nerdqaxe:192_168_1_100_temperature"
+    rows = await recorder_mock.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        HOUR,
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        {"mean", "min", "max"},
+    )
+    # The hour in progress is not imported yet
+    assert [
+        (row["start"], row["mean"], row["min"], row["max"])
+        for row in rows[statistic_id]
+    ] == [(HOUR.timestamp(), 53.0, 50.0, 56.0)]
+
+
+async def _async_hourly_rows(
+    recorder_mock: Recorder, hass: HomeAssistant, statistic_id: str
+) -> list[tuple[float, float, float, float]]:
+    """Return the imported (start, mean, min, max) rows of a statistic."""
+    await async_wait_recording_done(hass)
+    rows = await recorder_mock.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        HOUR - timedelta(hours=1),
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        {"mean", "min", "max"},
+    )
+    return [
+        (row["start"], row["mean"], row["min"], row["max"])
+        for row in rows.get(statistic_id, [])
+    ]
+
+
+async def test_hour_in_progress_survives_reload(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """The samples taken before a reload count towards the same hour."""
+    coordinator = NerdQAxeDataUpdateCoordinator(hass, host=MOCK_HOST, scan_interval=5)
+    statistics = HourlyStatistics(hass, coordinator, [TEMPERATURE])
+    stop = statistics.async_start()
+    for minute, temp in ((5, 50.0), (20, 56.0)):
+        freezer.move_to(HOUR + timedelta(minutes=minute))
+        coordinator.async_set_updated_data(MOCK_SNAPSHOT.merge({"temp": temp}))
+    await stop()
+
+    reloaded = HourlyStatistics(hass, coordinator, [TEMPERATURE])
+    await reloaded.async_load()
+    stop = reloaded.async_start()
+    for minute, temp in ((55, 53.0), (61, 70.0)):
+        freezer.move_to(HOUR + timedelta(minutes=minute))
+        coordinator.async_set_updated_data(MOCK_SNAPSHOT.merge({"temp": temp}))
+
+    await stop()
+
+    # Imported once, merging both sides of the reload
+    assert await _async_hourly_rows(
+        recorder_mock, hass, statistics.statistic_id("temperature")
+    ) == [(HOUR.timestamp(), 53.0, 50.0, 56.0)]
+
+
+async def test_stored_hour_over_is_imported_by_next_sample(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """An hour that ended while Home Assistant was stopped is imported."""
+    coordinator = NerdQAxeDataUpdateCoordinator(hass, host=MOCK_HOST, scan_interval=5)
+    freezer.move_to(HOUR + timedelta(minutes=30))
+    statistics = HourlyStatistics(hass, coordinator, [TEMPERATURE])
+    coordinator.async_set_updated_data(MOCK_SNAPSHOT.merge({"temp": 50.0}))
+    statistics.async_add_sample()
+    await statistics.store.async_save(statistics.as_dict())
+
+    freezer.move_to(HOUR + timedelta(hours=2))
+    restarted = HourlyStatistics(hass, coordinator, ())
+    await restarted.async_load()
+    # Sensors are tracked as the platform adds them, after the bucket loads
+    restarted.async_track([TEMPERATURE])
+    restarted.async_add_sample()
+
+    assert await _async_hourly_rows(
+        recorder_mock, hass, statistics.statistic_id("temperature")
+    ) == [(HOUR.timestamp(), 50.0, 50.0, 50.0)]
+    assert restarted.as_dict() == {
+        "hour": (HOUR + timedelta(hours=2)).isoformat(),
+        "buckets": {"temperature": [1, 50.0, 50.0, 50.0]},
+    }
+
+
+async def test_unavailable_miner_adds_no_sample(hass: HomeAssistant) -> None:
+    """Failed polls do not count towards the hourly bucket."""
+    coordinator = NerdQAxeDataUpdateCoordinator(hass, host=MOCK_HOST, scan_interval=5)
+    statistics = HourlyStatistics(hass, coordinator, [TEMPERATURE])
+    coordinator.async_set_updated_data(MOCK_SNAPSHOT)
+    coordinator.async_set_update_error(UpdateFailed("offline"))
+
+    statistics.async_add_sample(HOUR)
+
+    assert statistics._buckets == {}
+
+
+async def test_measurement_state_writes_are_throttled(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Measurement sensors write at most once per interval, others at once."""
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(
+            json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA, "asicTemps": [58.0, 60.0]}
+        ),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data.coordinator
+    snapshot = MOCK_SNAPSHOT.merge({"asicTemps": [58.0, 62.0]})
+    temperature = "sensor.nerdqaxe_miner_192_168_1_100_asic_temperature"
+    shares = "sensor.nerdqaxe_miner_192_168_1_100_shares_accepted"
+    chip = "sensor.nerdqaxe_miner_192_168_1_100_asic_2_temperature"
+
+    coordinator.async_set_updated_data(snapshot.merge({"temp": 60.0}))
+    coordinator.async_set_updated_data(
+        snapshot.merge(
+            {"temp": 70.0, "sharesAccepted": 1001, "asicTemps": [58.0, 64.0]}
+        )
+    )
+    assert hass.states.get(temperature).state == "60.0"
+    assert hass.states.get(shares).state == "1001"
+    # Per-ASIC sensors are measurements too
+    assert hass.states.get(chip).state == "62.0"
+
+    # The latest value is written once the interval is over (the poll due by
+    # then reads it back as well)
+    coordinator.session = create_mock_session(
+        json_data={
+            **MOCK_SYSTEM_INFO,
+            **MOCK_ASIC_DATA,
+            "temp": 70.0,
+            "asicTemps": [58.0, 64.0],
+        }
+    )
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=STATE_WRITE_INTERVAL + 1)
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(temperature).state == "70.0"
+    assert hass.states.get(chip).state == "64.0"
+
+    # Going unavailable is never delayed
+    coordinator.async_set_updated_data(snapshot.merge({"temp": 65.0}))
+    coordinator.async_set_update_error(UpdateFailed("offline"))
+    assert hass.states.get(temperature).state == "unavailable"
+
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
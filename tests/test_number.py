@@ -1,15 +1,24 @@
 """Test the NerdQAxe+ Miner number entities."""
 
+import asyncio
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 import aiohttp
 from homeassistant.const import CONF_HOST
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
 import pytest
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+import voluptuous as vol
 
 from custom_components.nerdqaxe.const import DOMAIN
 from custom_components.nerdqaxe.exceptions import NerdQAxeApiError
+from custom_components.nerdqaxe.settings import SETTINGS_WRITE_DELAY
 
 from .conftest import (
     MOCK_ASIC_DATA,
@@ -34,6 +43,25 @@ def mock_config_entry(hass: HomeAssistant) -> MockConfigEntry:
     return entry
 
 
+async def _async_set_value(hass: HomeAssistant, entity_id: str, value: float) -> None:
+    """Set a number, letting the settings write queue send it."""
+    call = hass.async_create_task(
+        hass.services.async_call(
+            "number",
+            "set_value",
+            {"entity_id": entity_id, "value": value},
+            blocking=True,
+        )
+    )
+    for _ in range(5):
+        await asyncio.sleep(0)
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SETTINGS_WRITE_DELAY)
+    )
+    await call
+    await hass.async_block_till_done()
+
+
 async def test_number_set_frequency_success(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
@@ -50,7 +78,7 @@ async def test_number_set_frequency_success(
     mock_session.patch = MagicMock(return_value=patch_ctx)
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -61,19 +89,58 @@ async def test_number_set_frequency_success(
         freq_entity = [e for e in number_entities if "frequency" in e.lower()]
 
         assert len(freq_entity) > 0
+        polls = mock_session.get.call_count
 
         # Set new value
-        await hass.services.async_call(
-            "number",
-            "set_value",
-            {"entity_id": freq_entity[0], "value": 450},
-            blocking=True,
-        )
+        await _async_set_value(hass, freq_entity[0], 450)
 
         # Verify PATCH /api/system was called (POST /api/system/asic returns 405)
         mock_session.patch.assert_called()
         assert mock_session.patch.call_args.args[0].endswith("/api/system")
 
+        # Shown right away, without polling the miner again
+        assert float(hass.states.get(freq_entity[0]).state) == 450
+        assert mock_session.get.call_count == polls
+
+
+async def test_number_set_frequency_rejected(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """A value the miner reports back differently is rolled back by the next poll."""
+    mock_session = create_mock_session(
+        status=200,
+        json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
+    )
+    mock_session.patch = MagicMock(
+        return_value=MockAiohttpContextManager(MockAiohttpResponse(status=200))
+    )
+
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=mock_session,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        freq_entity = next(
+            e
+            for e in hass.states.async_entity_ids("number")
+            if "frequency" in e.lower()
+        )
+
+        # The call returns once the PATCH is accepted
+        await _async_set_value(hass, freq_entity, 450)
+        assert float(hass.states.get(freq_entity).state) == 450
+
+        # The next scheduled poll finds the miner still running 500 MHz
+        await mock_config_entry.runtime_data.coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert float(hass.states.get(freq_entity).state) == 500
+        assert "did not accept frequency=450 (reports 500" in caplog.text
+
 
 async def test_number_set_frequency_failure(
     hass: HomeAssistant,
@@ -89,7 +156,7 @@ async def test_number_set_frequency_failure(
     mock_session.patch = MagicMock(side_effect=aiohttp.ClientError("Connection failed"))
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -103,12 +170,7 @@ async def test_number_set_frequency_failure(
 
         # Set new value - should raise error
         with pytest.raises(NerdQAxeApiError):
-            await hass.services.async_call(
-                "number",
-                "set_value",
-                {"entity_id": freq_entity[0], "value": 450},
-                blocking=True,
-            )
+            await _async_set_value(hass, freq_entity[0], 450)
 
 
 async def test_number_set_core_voltage_success(
@@ -127,7 +189,7 @@ async def test_number_set_core_voltage_success(
     mock_session.patch = MagicMock(return_value=patch_ctx)
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -140,12 +202,7 @@ async def test_number_set_core_voltage_success(
         assert len(voltage_entity) > 0
 
         # Set new value
-        await hass.services.async_call(
-            "number",
-            "set_value",
-            {"entity_id": voltage_entity[0], "value": 1150},
-            blocking=True,
-        )
+        await _async_set_value(hass, voltage_entity[0], 1150)
 
         # Verify PATCH /api/system was called (POST /api/system/asic returns 405)
         mock_session.patch.assert_called()
@@ -166,7 +223,7 @@ async def test_number_set_core_voltage_failure(
     mock_session.patch = MagicMock(side_effect=aiohttp.ClientError("Connection failed"))
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -180,12 +237,7 @@ async def test_number_set_core_voltage_failure(
 
         # Set new value - should raise error
         with pytest.raises(NerdQAxeApiError):
-            await hass.services.async_call(
-                "number",
-                "set_value",
-                {"entity_id": voltage_entity[0], "value": 1150},
-                blocking=True,
-            )
+            await _async_set_value(hass, voltage_entity[0], 1150)
 
 
 async def test_frequency_full_range(
@@ -199,7 +251,7 @@ async def test_frequency_full_range(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -227,7 +279,7 @@ async def test_core_voltage_range(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -253,7 +305,7 @@ async def test_number_native_value_no_data(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -271,3 +323,61 @@ async def test_number_native_value_no_data(
         # Entities should handle None gracefully
         number_entities = hass.states.async_entity_ids("number")
         assert len(number_entities) > 0
+
+
+async def test_set_settings_service_writes_once(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Frequency and core voltage set by one service call share one PATCH."""
+    mock_session = create_mock_session(
+        status=200,
+        json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
+    )
+    mock_session.patch = MagicMock(
+        return_value=MockAiohttpContextManager(MockAiohttpResponse(status=200))
+    )
+
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=mock_session,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        device = dr.async_get(hass).async_get_device(
+            identifiers={(DOMAIN, "AA:BB:CC:DD:EE:FF")}
+        )
+        assert device is not None
+
+        with pytest.raises(vol.Invalid):
+            await hass.services.async_call(
+                DOMAIN, "set_settings", {"device_id": device.id}, blocking=True
+            )
+        with pytest.raises(vol.Invalid):
+            await hass.services.async_call(
+                DOMAIN,
+                "set_settings",
+                {"device_id": device.id, "frequency": 2000},
+                blocking=True,
+            )
+
+        call = hass.async_create_task(
+            hass.services.async_call(
+                DOMAIN,
+                "set_settings",
+                {"device_id": device.id, "frequency": 450, "core_voltage": 1150},
+                blocking=True,
+            )
+        )
+        for _ in range(5):
+            await asyncio.sleep(0)
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=SETTINGS_WRITE_DELAY)
+        )
+        await call
+
+        mock_session.patch.assert_called_once()
+        assert mock_session.patch.call_args.kwargs["json"] == {
+            "frequency": 450,
+            "coreVoltage": 1150,
+        }
@@ -0,0 +1,45 @@
+"""Test the NerdQAxe+ firmware update progress."""
+
+from custom_components.nerdqaxe.ota import OTA_TIMEOUT, OtaPhase, OtaProgress
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+
+from .conftest import MOCK_ASIC_DATA, MOCK_SYSTEM_INFO
+
+PAYLOAD = MinerSnapshot.from_payload({**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA})
+STARTED = 1000.0
+
+
+def test_update_phases() -> None:
+    """Flashing, rebooting, then back on the new version."""
+    ota = OtaProgress("v2.1.0", STARTED)
+    assert (ota.phase, ota.percentage) == (OtaPhase.FLASHING, 10)
+
+    # Still answering on the old firmware while flashing
+    assert ota.on_success(PAYLOAD, STARTED + 30) is OtaPhase.FLASHING
+    assert ota.on_failure(STARTED + 60) is OtaPhase.REBOOTING
+    assert ota.percentage == 60
+    assert ota.on_failure(STARTED + 65) is OtaPhase.REBOOTING
+    assert not ota.finished
+
+    rebooted = PAYLOAD.merge({"version": "2.1.0", "uptimeSeconds": 3})
+    assert ota.on_success(rebooted, STARTED + 70) is OtaPhase.DONE
+    assert ota.finished
+    assert ota.percentage is None
+
+
+def test_reboot_on_old_version_fails() -> None:
+    """A miner back on the old firmware after a reboot failed to update."""
+    ota = OtaProgress("2.1.0", STARTED)
+    ota.on_failure(STARTED + 60)
+    # Busy flashing rather than rebooted: the uptime kept counting
+    assert ota.on_success(PAYLOAD, STARTED + 65) is OtaPhase.FLASHING
+
+    rebooted = PAYLOAD.merge({"uptimeSeconds": 3})
+    assert ota.on_success(rebooted, STARTED + 90) is OtaPhase.FAILED
+    assert ota.finished
+
+
+def test_update_times_out() -> None:
+    """A miner that never comes back fails the update."""
+    ota = OtaProgress("2.1.0", STARTED)
+    assert ota.on_failure(STARTED + OTA_TIMEOUT) is OtaPhase.FAILED
@@ -1,22 +1,12 @@
-"""Test the NerdQAxe+ Miner mining pool resolution helpers."""
+"""Test the NerdQAxe+ Miner mining pool resolution."""
 
 from typing import Any
 
 import pytest
 
-from custom_components.nerdqaxe.const import (
-    ATTR_FALLBACK_STRATUM_URL,
-    ATTR_STRATUM_URL,
-    POOL_INDEX_FALLBACK,
-    POOL_INDEX_PRIMARY,
-)
-from custom_components.nerdqaxe.pool import (
-    active_pool_field,
-    active_pool_index,
-    clean_value,
-    is_using_fallback,
-    pool_mode_name,
-)
+from custom_components.nerdqaxe.const import POOL_INDEX_FALLBACK, POOL_INDEX_PRIMARY
+from custom_components.nerdqaxe.pool import PoolEndpoint, PoolState
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
 
 ENDPOINTS: dict[str, Any] = {
     "stratumURL": "public-pool.io",
@@ -27,99 +17,135 @@ ENDPOINTS: dict[str, Any] = {
     "fallbackStratumUser": "bc1qfallback.nerdqaxe",
 }
 
-
-def _failover(active_index: int, **stratum: Any) -> dict[str, Any]:
-    """Build a failover-mode payload with the given pool marked active."""
-    return {
-        **ENDPOINTS,
-        "stratum": {
-            "activePoolMode": 0,
-            "pools": [
-                {"active": index == active_index, "connected": True} for index in (0, 1)
-            ],
-            **stratum,
-        },
-    }
+PRIMARY = PoolEndpoint(url="public-pool.io", port=21496, user="bc1qprimary.nerdqaxe")
+FALLBACK = PoolEndpoint(url="solo.ckpool.org", port=3333, user="bc1qfallback.nerdqaxe")
+
+
+def _pool(payload: dict[str, Any]) -> PoolState:
+    """Return the pool state resolved for a payload."""
+    return MinerSnapshot.from_payload(payload).pool
+
+
+def _failover(active_index: int, **stratum: Any) -> PoolState:
+    """Resolve a failover-mode payload with the given pool marked active."""
+    return _pool(
+        {
+            **ENDPOINTS,
+            "stratum": {
+                "activePoolMode": 0,
+                "pools": [
+                    {"active": index == active_index, "connected": True}
+                    for index in (0, 1)
+                ],
+                **stratum,
+            },
+        }
+    )
 
 
 def test_active_index_primary() -> None:
     """The pool flagged active designates the endpoint to report."""
-    assert active_pool_index(_failover(POOL_INDEX_PRIMARY)) == POOL_INDEX_PRIMARY
+    pool = _failover(POOL_INDEX_PRIMARY)
+
+    assert pool.index == POOL_INDEX_PRIMARY
+    assert pool.endpoint == PRIMARY
+    assert pool.secondary is None
 
 
 def test_active_index_fallback() -> None:
     """A failover switches the reported endpoint to the fallback pool."""
-    assert active_pool_index(_failover(POOL_INDEX_FALLBACK)) == POOL_INDEX_FALLBACK
+    pool = _failover(POOL_INDEX_FALLBACK)
+
+    assert pool.index == POOL_INDEX_FALLBACK
+    assert pool.endpoint == FALLBACK
 
 
 def test_active_index_dual_mode_reports_primary() -> None:
     """Dual-pool mode flags both pools active; the primary is reported."""
-    data = {
-        **ENDPOINTS,
-        "stratum": {
-            "activePoolMode": 1,
-            "pools": [
-                {"active": True, "connected": True},
-                {"active": True, "connected": True},
-            ],
-        },
-    }
-    assert active_pool_index(data) == POOL_INDEX_PRIMARY
-    assert active_pool_field(data, ATTR_STRATUM_URL, ATTR_FALLBACK_STRATUM_URL) == (
-        "public-pool.io"
+    pool = _pool(
+        {
+            **ENDPOINTS,
+            "stratum": {
+                "activePoolMode": 1,
+                "pools": [
+                    {"active": True, "connected": True},
+                    {"active": True, "connected": True},
+                ],
+            },
+        }
     )
 
+    assert pool.index == POOL_INDEX_PRIMARY
+    assert pool.endpoint == PRIMARY
+    # The second pool mined is exposed alongside
+    assert pool.secondary == FALLBACK
+
 
 def test_active_index_without_active_flag_uses_fallback_signal() -> None:
     """Firmware not sending ``active`` is resolved via ``usingFallback``."""
-    data = {
-        **ENDPOINTS,
-        "stratum": {"pools": [{"connected": True}], "usingFallback": True},
-    }
-    assert active_pool_index(data) == POOL_INDEX_FALLBACK
+    pool = _pool(
+        {
+            **ENDPOINTS,
+            "stratum": {"pools": [{"connected": True}], "usingFallback": True},
+        }
+    )
+    assert pool.index == POOL_INDEX_FALLBACK
 
 
 def test_active_index_legacy_flat_payload() -> None:
     """Legacy firmware exposes neither pools[] nor a nested stratum object."""
-    data = {**ENDPOINTS, "isUsingFallbackStratum": True}
-    assert active_pool_index(data) == POOL_INDEX_FALLBACK
-    assert active_pool_field(data, ATTR_STRATUM_URL, ATTR_FALLBACK_STRATUM_URL) == (
-        "solo.ckpool.org"
-    )
+    pool = _pool({**ENDPOINTS, "isUsingFallbackStratum": True})
+
+    assert pool.index == POOL_INDEX_FALLBACK
+    assert pool.endpoint.url == "solo.ckpool.org"
 
 
 def test_active_index_beyond_fallback_clamps() -> None:
     """More than two pools still resolve onto the two flat endpoint sets."""
-    data = {
-        **ENDPOINTS,
-        "stratum": {
-            "pools": [
-                {"active": False},
-                {"active": False},
-                {"active": True},
-            ]
-        },
-    }
-    assert active_pool_index(data) == POOL_INDEX_FALLBACK
+    pool = _pool(
+        {
+            **ENDPOINTS,
+            "stratum": {
+                "pools": [
+                    {"active": False},
+                    {"active": False},
+                    {"active": True},
+                ]
+            },
+        }
+    )
+    assert pool.index == POOL_INDEX_FALLBACK
 
 
-def test_active_index_without_data() -> None:
-    """Missing data resolves to the primary pool rather than raising."""
-    assert active_pool_index(None) == POOL_INDEX_PRIMARY
-    assert active_pool_field(None, ATTR_STRATUM_URL, ATTR_FALLBACK_STRATUM_URL) is None
+def test_empty_payload_resolves_to_defaults() -> None:
+    """A payload without any pool field resolves to the default state."""
+    assert _pool({}) == PoolState()
 
 
 def test_active_field_unconfigured_pool_is_unknown() -> None:
     """An unconfigured pool reports an empty string, surfaced as None."""
-    data = {
-        "stratumURL": "",
-        "stratum": {"pools": [{"active": True}]},
-    }
-    assert active_pool_field(data, ATTR_STRATUM_URL, ATTR_FALLBACK_STRATUM_URL) is None
+    pool = _pool({"stratumURL": "", "stratum": {"pools": [{"active": True}]}})
+    assert pool.endpoint.url is None
+
+
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        ({"stratum": {"pools": [{"connected": False}, {"connected": True}]}}, True),
+        ({"stratum": {"pools": [{"connected": False}]}}, False),
+        # pools[] wins over the legacy flat field when present
+        ({"stratum": {"pools": [{}]}, "isStratumConnected": 1}, False),
+        ({"isStratumConnected": 1}, True),
+        ({}, False),
+    ],
+)
+def test_connected(payload: dict[str, Any], expected: bool) -> None:
+    """Connected as soon as any pool is, with the legacy flag as a fallback."""
+    assert _pool(payload).connected is expected
 
 
 @pytest.mark.parametrize(
-    ("data", "expected"),
+    ("payload", "expected"),
     [
         ({"stratum": {"usingFallback": True}}, True),
         ({"stratum": {"usingFallback": False}}, False),
@@ -128,34 +154,37 @@ def test_active_field_unconfigured_pool_is_unknown() -> None:
         # Dual-pool mode reports neither field: no failover is happening.
         ({"stratum": {"activePoolMode": 1}}, False),
         ({}, False),
-        (None, False),
     ],
 )
-def test_is_using_fallback(data: dict[str, Any] | None, expected: bool) -> None:
+def test_using_fallback(payload: dict[str, Any], expected: bool) -> None:
     """The nested flag wins, with the legacy flat field as a fallback."""
-    assert is_using_fallback(data) is expected
+    assert _pool(payload).using_fallback is expected
 
 
 @pytest.mark.parametrize(
-    ("data", "expected"),
+    ("payload", "expected"),
     [
         ({"stratum": {"activePoolMode": 0}}, "failover"),
         ({"stratum": {"activePoolMode": 1}}, "dual"),
         # Unknown or missing modes fall back to the firmware default.
         ({"stratum": {"activePoolMode": 7}}, "failover"),
         ({}, "failover"),
-        (None, "failover"),
     ],
 )
-def test_pool_mode_name(data: dict[str, Any] | None, expected: str) -> None:
+def test_pool_mode_name(payload: dict[str, Any], expected: str) -> None:
     """The pool mode is exposed as a stable slug for automations."""
-    assert pool_mode_name(data) == expected
+    assert _pool(payload).mode_name == expected
 
 
-@pytest.mark.parametrize(
-    ("value", "expected"),
-    [("pool.example.com", "pool.example.com"), ("", None), ("   ", None), (0, 0)],
-)
-def test_clean_value(value: Any, expected: Any) -> None:
-    """Blank strings become None; other values pass through untouched."""
-    assert clean_value(value) == expected
+def test_pool_state_follows_merged_updates() -> None:
+    """Merging a partial update re-resolves the pool state."""
+    snapshot = MinerSnapshot.from_payload(
+        {**ENDPOINTS, "stratum": {"pools": [{"active": True}, {"active": False}]}}
+    )
+
+    merged = snapshot.merge(
+        {"stratum": {"pools": [{"active": False}, {"active": True}]}}
+    )
+
+    assert snapshot.pool.endpoint == PRIMARY
+    assert merged.pool.endpoint == FALLBACK
@@ -0,0 +1,157 @@
+"""Test the NerdQAxe+ firmware release index."""
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.nerdqaxe.const import GITHUB_API_URL
+from custom_components.nerdqaxe.releases import (
+    FirmwareAsset,
+    FirmwareRelease,
+    NerdQAxeReleaseIndex,
+    async_get_release_index,
+    latest_stable_release,
+)
+
+RELEASES = [
+    {"tag_name": "v1.0.41-rc1", "prerelease": False, "assets": []},
+    {"tag_name": "v1.0.41", "prerelease": True, "assets": []},
+    {
+        "tag_name": "v1.0.40",
+        "prerelease": False,
+        "body": "Notes",
+        "assets": [
+            {
+                "name": "esp-miner-factory-NerdQAxe+-v1.0.40.bin",
+                "browser_download_url": "https://github.com/factory.bin",
+                "size": 4194304,
+                "digest": "sha256:0123",
+            },
+            {
+                "name": "esp-miner-factory-NerdAxeGamma-v1.0.40.bin",
+                "browser_download_url": "https://github.com/gamma.bin",
+            },
+            {
+                "name": "esp-miner-NerdQAxe+-v1.0.40.bin",
+                "browser_download_url": "https://github.com/ota.bin",
+            },
+        ],
+    },
+]
+
+
+def test_latest_stable_release() -> None:
+    """Pre-releases and release candidates are skipped."""
+    release = latest_stable_release(RELEASES)
+    assert release is not None
+    assert (release.tag_name, release.body) == ("v1.0.40", "Notes")
+    assert latest_stable_release(RELEASES[:2]) is None
+
+    # Only the factory images are indexed, by model
+    assert release.factory_images == {
+        "NerdQAxe+": FirmwareAsset(
+            name="esp-miner-factory-NerdQAxe+-v1.0.40.bin",
+            url="https://github.com/factory.bin",
+            size=4194304,
+            digest="sha256:0123",
+        ),
+        "NerdAxeGamma": FirmwareAsset(
+            name="esp-miner-factory-NerdAxeGamma-v1.0.40.bin",
+            url="https://github.com/gamma.bin",
+        ),
+    }
+    assert FirmwareRelease.from_dict(release.as_dict()) == release
+
+
+def test_factory_image_lookup(hass: HomeAssistant) -> None:
+    """Any spelling of a model finds its image."""
+    index = NerdQAxeReleaseIndex(hass)
+    assert index.async_factory_image("NerdQAxe+") is None
+
+    index.latest = latest_stable_release(RELEASES)
+    gamma = index.async_factory_image("NerdAxe γ")  # noqa: RUF001
+    assert gamma is not None
+    assert gamma.url == "https://github.com/gamma.bin"
+    assert index.async_factory_image("NerdQAxe+").size == 4194304
+    assert index.async_factory_image("NerdQX") is None
+
+
+async def test_refresh_is_conditional_and_persisted(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """The ETag is sent back, and the index starts from storage."""
+    aioclient_mock.get(GITHUB_API_URL, json=RELEASES, headers={"ETag": '"abc"'})
+    index = async_get_release_index(hass)
+    await index.async_load()
+    notified: list[str | None] = []
+    remove = index.async_add_listener(
+        lambda: notified.append(index.latest.version if index.latest else None)
+    )
+    # Every other update entity shares the same refresh
+    remove_other = index.async_add_listener(lambda: None)
+    await hass.async_block_till_done()
+
+    assert aioclient_mock.call_count == 1
+    assert notified == ["1.0.40"]
+    assert index.etag == '"abc"'
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(GITHUB_API_URL, status=304)
+    await index.async_refresh()
+    assert aioclient_mock.mock_calls[0][3]["If-None-Match"] == '"abc"'
+    assert notified == ["1.0.40"]
+    assert index.latest is not None
+
+    await index.store.async_save(
+        {
+            "etag": index.etag,
+            "checked": index.checked.isoformat(),
+            "release": index.latest.as_dict(),
+        }
+    )
+    restored = NerdQAxeReleaseIndex(hass)
+    await restored.async_load()
+    assert restored.latest == index.latest
+    assert restored.etag == '"abc"'
+    # Checked recently: no request when the first entity subscribes
+    remove_restored = restored.async_add_listener(lambda: None)
+    await hass.async_block_till_done()
+    assert aioclient_mock.call_count == 1
+
+    for unsub in (remove, remove_other, remove_restored):
+        unsub()
+
+
+async def test_rate_limit_is_honoured(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """No request is made until the rate limit resets."""
+    reset = dt_util.utcnow().replace(microsecond=0) + timedelta(minutes=30)
+    aioclient_mock.get(
+        GITHUB_API_URL,
+        status=403,
+        headers={
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(reset.timestamp())),
+        },
+    )
+    index = NerdQAxeReleaseIndex(hass)
+
+    await index.async_refresh()
+    assert index.retry_at == reset
+    assert index.latest is None
+
+    await index.async_refresh()
+    assert aioclient_mock.call_count == 1
+
+    index.retry_at = dt_util.utcnow() - timedelta(seconds=1)
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(GITHUB_API_URL, json=RELEASES, headers={"Retry-After": "60"})
+    await index.async_refresh()
+    assert aioclient_mock.call_count == 1
+    assert index.latest is not None
+    assert index.retry_at is not None
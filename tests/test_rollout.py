@@ -0,0 +1,187 @@
+"""Test the NerdQAxe+ fleet firmware rollout."""
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nerdqaxe.const import DOMAIN
+from custom_components.nerdqaxe.exceptions import NerdQAxeApiError, NerdQAxeError
+from custom_components.nerdqaxe.releases import (
+    FirmwareAsset,
+    FirmwareRelease,
+    async_get_release_index,
+)
+from custom_components.nerdqaxe.rollout import (
+    MinerRolloutState,
+    RolloutState,
+    async_get_firmware_rollout,
+)
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+
+from .conftest import MOCK_ASIC_DATA, MOCK_SYSTEM_INFO, create_mock_session
+
+MOCK_PAYLOAD = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+FACTORY_URL = "https://github.com/esp-miner-factory-NerdQAxe+Miner-v2.1.0.bin"
+
+
+async def _async_setup_fleet(hass: HomeAssistant, size: int) -> list[MockConfigEntry]:
+    """Set up miners on 2.0.0, with 2.1.0 released."""
+    async_get_release_index(hass).latest = FirmwareRelease(
+        tag_name="v2.1.0",
+        factory_images={
+            "NerdQAxe+Miner": FirmwareAsset(name="factory.bin", url=FACTORY_URL)
+        },
+    )
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Miner {index}",
+            data={CONF_HOST: f"192.168.1.{100 + index}"},
+            unique_id=f"AA:BB:CC:DD:EE:0{index}",
+        )
+        for index in range(size)
+    ]
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(json_data=MOCK_PAYLOAD),
+    ):
+        for entry in entries:
+            entry.add_to_hass(hass)
+            await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entries
+
+
+def _report(entry: MockConfigEntry, **payload: Any) -> None:
+    """Push a poll result to the coordinator of a miner."""
+    entry.runtime_data.coordinator.async_set_updated_data(
+        MinerSnapshot.from_payload({**MOCK_PAYLOAD, **payload})
+    )
+
+
+async def _async_run_loop() -> None:
+    """Let the rollout task react to the last reports."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_rollout_waits_for_each_wave(hass: HomeAssistant) -> None:
+    """A wave starts once the previous one runs the release and hashes."""
+    entries = await _async_setup_fleet(hass, 3)
+    rollout = async_get_firmware_rollout(hass)
+
+    with patch(
+        "custom_components.nerdqaxe.rollout.async_start_ota", AsyncMock()
+    ) as start_ota:
+        await hass.services.async_call(
+            DOMAIN, "start_firmware_rollout", {"concurrency": 2}, blocking=True
+        )
+        await _async_run_loop()
+        assert rollout.state is RolloutState.RUNNING
+        assert start_ota.await_count == 2
+        states = [miner.state for miner in rollout.miners.values()]
+        assert states == [
+            MinerRolloutState.RECOVERING,
+            MinerRolloutState.RECOVERING,
+            MinerRolloutState.PENDING,
+        ]
+        # The update entity of a miner shows the rollout in progress
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "update", DOMAIN, "AA:BB:CC:DD:EE:00_update"
+        )
+        assert hass.states.get(entity_id).attributes["in_progress"] is True
+        with pytest.raises(NerdQAxeError, match="already running"):
+            await hass.services.async_call(
+                DOMAIN, "start_firmware_rollout", {}, blocking=True
+            )
+
+        # Back on the new version, but not hashing yet
+        _report(entries[0], version="2.1.0", hashRate_1m=1000.0)
+        # Still on the old version
+        _report(entries[1])
+        await _async_run_loop()
+        assert start_ota.await_count == 2
+
+        _report(entries[0], version="2.1.0")
+        _report(entries[1], version="v2.1.0")
+        await _async_run_loop()
+        assert start_ota.await_count == 3
+        assert start_ota.await_args.args[1] == FACTORY_URL
+
+        _report(entries[2], version="2.1.0")
+        await _async_run_loop()
+
+    assert rollout.state is RolloutState.DONE
+    response = await hass.services.async_call(
+        DOMAIN, "get_firmware_rollout", {}, blocking=True, return_response=True
+    )
+    assert response["version"] == "2.1.0"
+    assert [miner["wave"] for miner in response["miners"].values()] == [1, 1, 2]
+    assert all(
+        miner["state"] == "done" and miner["duration"] is not None
+        for miner in response["miners"].values()
+    )
+
+    # Every miner now runs the release
+    with pytest.raises(NerdQAxeError, match=r"already runs v2\.1\.0"):
+        await hass.services.async_call(
+            DOMAIN, "start_firmware_rollout", {}, blocking=True
+        )
+
+
+async def test_rollout_stops_on_failure(hass: HomeAssistant) -> None:
+    """A rejected update skips the next waves."""
+    await _async_setup_fleet(hass, 2)
+    rollout = async_get_firmware_rollout(hass)
+
+    with patch(
+        "custom_components.nerdqaxe.rollout.async_start_ota",
+        AsyncMock(side_effect=NerdQAxeApiError("Miner rejected the firmware update")),
+    ) as start_ota:
+        await hass.services.async_call(
+            DOMAIN, "start_firmware_rollout", {}, blocking=True
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert start_ota.await_count == 1
+    assert rollout.state is RolloutState.FAILED
+    assert rollout.error == "192.168.1.100: Miner rejected the firmware update"
+    assert [miner.state for miner in rollout.miners.values()] == [
+        MinerRolloutState.FAILED,
+        MinerRolloutState.SKIPPED,
+    ]
+
+
+async def test_rollout_recovery_timeout(hass: HomeAssistant) -> None:
+    """A miner that does not come back fails the rollout."""
+    entries = await _async_setup_fleet(hass, 2)
+    rollout = async_get_firmware_rollout(hass)
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, "AA:BB:CC:DD:EE:00")}
+    )
+    assert device is not None
+
+    with (
+        patch("custom_components.nerdqaxe.rollout.async_start_ota", AsyncMock()),
+        patch("custom_components.nerdqaxe.rollout.RECOVERY_TIMEOUT", 0),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            "start_firmware_rollout",
+            {"device_id": [device.id]},
+            blocking=True,
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert rollout.state is RolloutState.FAILED
+    # Only the miner asked for is updated
+    assert list(rollout.miners) == [entries[0].unique_id]
+    miner = rollout.miners[entries[0].unique_id]
+    assert miner.state is MinerRolloutState.FAILED
+    assert "Not back on 2.1.0" in (miner.error or "")
@@ -0,0 +1,208 @@
+"""Test the NerdQAxe+ fleet polling scheduler."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nerdqaxe.const import DATA_FLEET_SCHEDULER, DOMAIN
+from custom_components.nerdqaxe.scheduler import (
+    NerdQAxeFleetScheduler,
+    async_get_fleet_scheduler,
+)
+
+from .conftest import (
+    MOCK_ASIC_DATA,
+    MOCK_HOST,
+    MOCK_SYSTEM_INFO,
+    create_mock_session,
+)
+
+
+def _coordinator(interval: int = 30) -> MagicMock:
+    coordinator = MagicMock()
+    coordinator.update_interval = timedelta(seconds=interval)
+    return coordinator
+
+
+async def test_poll_phases_spread_evenly(hass: HomeAssistant) -> None:
+    """Coordinators sharing an interval poll at evenly spread offsets."""
+    scheduler = NerdQAxeFleetScheduler(hass)
+    coordinators = [_coordinator() for _ in range(3)]
+    for coordinator in coordinators:
+        scheduler.async_register(coordinator, 4)
+
+    phases = sorted(
+        (scheduler.next_poll_time(coordinator) - scheduler._epoch) % 30
+        for coordinator in coordinators
+    )
+
+    assert phases == pytest.approx([0, 10, 20])
+
+
+async def test_next_poll_respects_min_spacing(hass: HomeAssistant) -> None:
+    """The next slot is never closer than half an interval away."""
+    scheduler = NerdQAxeFleetScheduler(hass)
+    coordinator = _coordinator()
+    scheduler.async_register(coordinator, 4)
+
+    next_poll = scheduler.next_poll_time(coordinator)
+
+    assert next_poll - hass.loop.time() >= 15
+    assert next_poll - hass.loop.time() <= 45
+
+
+async def test_concurrency_limit_is_most_conservative(hass: HomeAssistant) -> None:
+    """The lowest limit among registered entries applies fleet-wide."""
+    scheduler = NerdQAxeFleetScheduler(hass)
+    unregister = scheduler.async_register(_coordinator(), 2)
+    scheduler.async_register(_coordinator(), 8)
+
+    assert scheduler.max_concurrent == 2
+
+    unregister()
+
+    assert scheduler.max_concurrent == 8
+
+
+async def test_concurrency_limit_follows_options(hass: HomeAssistant) -> None:
+    """A registered coordinator can change the limit it requests."""
+    scheduler = NerdQAxeFleetScheduler(hass)
+    coordinator = _coordinator()
+    scheduler.async_register(coordinator, 4)
+
+    scheduler.async_set_max_concurrent(coordinator, 1)
+
+    assert scheduler.max_concurrent == 1
+
+
+async def test_poll_slot_caps_in_flight_requests(hass: HomeAssistant) -> None:
+    """Polls beyond the limit wait for a slot to free up."""
+    scheduler = NerdQAxeFleetScheduler(hass)
+    first, second = _coordinator(), _coordinator()
+    scheduler.async_register(first, 1)
+    scheduler.async_register(second, 1)
+
+    release = asyncio.Event()
+    entered: list[MagicMock] = []
+
+    async def _poll(coordinator: MagicMock) -> None:
+        async with scheduler.async_poll_slot(coordinator):
+            entered.append(coordinator)
+            await release.wait()
+
+    tasks = [
+        hass.async_create_task(_poll(first)),
+        hass.async_create_task(_poll(second)),
+    ]
+    await asyncio.sleep(0)
+
+    assert entered == [first]
+    assert scheduler.in_flight == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert entered == [first, second]
+    assert scheduler.in_flight == 0
+
+
+async def test_cycle_stats_recorded_once_fleet_swept(hass: HomeAssistant) -> None:
+    """A cycle closes once every miner due in it has been polled."""
+    scheduler = NerdQAxeFleetScheduler(hass)
+    first, second = _coordinator(), _coordinator()
+    scheduler.async_register(first, 4)
+    scheduler.async_register(second, 4)
+
+    async with scheduler.async_poll_slot(first):
+        pass
+    assert scheduler.last_cycle is None
+
+    with pytest.raises(RuntimeError):
+        async with scheduler.async_poll_slot(second):
+            raise RuntimeError
+
+    assert scheduler.last_cycle is not None
+    assert scheduler.last_cycle["polls"] == 2
+    assert scheduler.last_cycle["failures"] == 1
+    assert scheduler.as_dict()["miners"] == 2
+
+
+async def test_interval_change_moves_slot(hass: HomeAssistant) -> None:
+    """A miner changing interval joins the new grid and leaves no gap behind."""
+    scheduler = NerdQAxeFleetScheduler(hass)
+    first, second, third = (_coordinator() for _ in range(3))
+    for coordinator in (first, second, third):
+        scheduler.async_register(coordinator, 4)
+    slow = _coordinator(60)
+    scheduler.async_register(slow, 4)
+
+    # Backed off to the interval of the slow miner
+    second.update_interval = timedelta(seconds=60)
+
+    def _phase(coordinator: MagicMock) -> float:
+        interval = coordinator.update_interval.total_seconds()
+        return (scheduler.next_poll_time(coordinator) - scheduler._epoch) % interval
+
+    assert _phase(second) == pytest.approx(30)
+    assert _phase(slow) == pytest.approx(0)
+    assert [_phase(first), _phase(third)] == pytest.approx([0, 15])
+
+    second.update_interval = timedelta(seconds=30)
+
+    assert _phase(second) == pytest.approx(20)
+    assert [_phase(first), _phase(third)] == pytest.approx([0, 10])
+    assert _phase(slow) == pytest.approx(0)
+
+
+async def test_backed_off_miner_not_due_in_cycle(hass: HomeAssistant) -> None:
+    """A miner scheduled beyond the cycle does not hold it open."""
+    scheduler = NerdQAxeFleetScheduler(hass)
+    first, second = _coordinator(), _coordinator(300)
+    scheduler.async_register(first, 4)
+    scheduler.async_register(second, 4)
+    scheduler.next_poll_time(first)
+    scheduler.next_poll_time(second)
+
+    async with scheduler.async_poll_slot(first):
+        pass
+
+    assert scheduler.last_cycle is not None
+    assert scheduler.last_cycle["polls"] == 1
+
+
+async def test_setup_registers_coordinator(hass: HomeAssistant) -> None:
+    """Config entries share one scheduler and leave it on unload."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="NerdQAxe+ Miner",
+        data={CONF_HOST: MOCK_HOST},
+        unique_id="AA:BB:CC:DD:EE:FF",
+        options={"max_concurrent_polls": 3},
+    )
+    entry.add_to_hass(hass)
+    mock_session = create_mock_session(
+        status=200,
+        json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
+    )
+
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=mock_session,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        scheduler = async_get_fleet_scheduler(hass)
+        assert hass.data[DATA_FLEET_SCHEDULER] is scheduler
+        assert entry.runtime_data.coordinator.scheduler is scheduler
+        assert scheduler.as_dict()["miners"] == 1
+        assert scheduler.max_concurrent == 3
+
+        await hass.config_entries.async_unload(entry.entry_id)
+
+    assert scheduler.as_dict()["miners"] == 0
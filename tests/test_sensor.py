@@ -1,5 +1,6 @@
 """Test the NerdQAxe+ Miner sensor entities."""
 
+from time import monotonic
 from unittest.mock import MagicMock, patch
 
 from homeassistant.const import CONF_HOST
@@ -8,8 +9,14 @@ from homeassistant.helpers import entity_registry as er
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.nerdqaxe.const import DOMAIN
-from custom_components.nerdqaxe.sensor import SENSORS, NerdQAxeSensor
+from custom_components.nerdqaxe.const import CONF_COMPACT_ASIC_TEMPS, DOMAIN
+from custom_components.nerdqaxe.sensor import (
+    ASIC_TEMP_SENSORS,
+    SENSORS,
+    NerdQAxeSensor,
+)
+from custom_components.nerdqaxe.snapshot import SNAPSHOT_KEYS, MinerSnapshot
+from custom_components.nerdqaxe.telemetry import STATISTICS_ATTRIBUTES, TelemetryBuffer
 
 from .conftest import (
     MOCK_ASIC_DATA,
@@ -43,7 +50,7 @@ async def test_sensor_entities_created(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -68,7 +75,7 @@ async def test_sensor_state_values(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -77,8 +84,8 @@ async def test_sensor_state_values(
     # Verify coordinator has data
     coordinator = mock_config_entry.runtime_data.coordinator
     assert coordinator.data is not None
-    assert coordinator.data.get("hashRate") == MOCK_ASIC_DATA["hashRate"]
-    assert coordinator.data.get("temp") == MOCK_ASIC_DATA["temp"]
+    assert coordinator.data.hashrate == MOCK_ASIC_DATA["hashRate"]
+    assert coordinator.data.temp == MOCK_ASIC_DATA["temp"]
 
 
 async def test_core_voltage_actual_sensor(
@@ -92,14 +99,14 @@ async def test_core_voltage_actual_sensor(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
         await hass.async_block_till_done()
 
     coordinator = mock_config_entry.runtime_data.coordinator
-    assert coordinator.data.get("coreVoltageActual") == 1180
+    assert coordinator.data.core_voltage_actual == 1180
 
     # The dedicated sensor entity is created and exposes the measured value
     ids = hass.states.async_entity_ids("sensor")
@@ -119,7 +126,7 @@ async def test_binary_sensor_entities_created(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -144,7 +151,7 @@ async def test_button_entities_created(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -169,7 +176,7 @@ async def test_number_entities_created(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -194,7 +201,7 @@ async def test_update_entities_created(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -219,7 +226,7 @@ async def test_coordinator_data_propagation(
     )
 
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -230,7 +237,7 @@ async def test_coordinator_data_propagation(
     # Verify all expected data keys are present
     expected_keys = ["hostname", "hashRate", "temp", "power", "fanspeed"]
     for key in expected_keys:
-        assert key in coordinator.data, f"Missing key: {key}"
+        assert key in coordinator.data.as_payload(), f"Missing key: {key}"
 
 
 async def test_second_fan_sensors_created_on_dual_fan(
@@ -247,7 +254,7 @@ async def test_second_fan_sensors_created_on_dual_fan(
     }
     mock_session = create_mock_session(status=200, json_data=dual_fan)
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -282,7 +289,7 @@ async def test_second_fan_sensors_absent_on_single_fan(
     }
     mock_session = create_mock_session(status=200, json_data=single_fan)
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -308,7 +315,7 @@ async def test_per_asic_temp_sensors_created(
     }
     mock_session = create_mock_session(status=200, json_data=multi_asic)
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -322,6 +329,55 @@ async def test_per_asic_temp_sensors_created(
     first = next(e for e in entries if e.unique_id.endswith("_asic_temp_0"))
     assert float(hass.states.get(first.entity_id).state) == 58.5
 
+    # Aggregates computed once per snapshot
+    states = {
+        key: hass.states.get(
+            next(e for e in entries if e.unique_id.endswith(f"_{key}")).entity_id
+        )
+        for key in (
+            "asic_temperature_max",
+            "asic_temperature_mean",
+            "asic_temperature_spread",
+            "hottest_asic",
+        )
+    }
+    assert states["asic_temperature_max"].state == "60"
+    assert states["asic_temperature_mean"].state == "59.17"
+    assert states["asic_temperature_spread"].state == "1.5"
+    assert states["hottest_asic"].state == "2"
+    assert "asic_temperatures" not in states["asic_temperature_max"].attributes
+
+
+async def test_compact_asic_temps(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Compact mode replaces the per-ASIC sensors with one attribute."""
+    multi_asic = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA, "asicTemps": [58.5, 60, 59]}
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(status=200, json_data=multi_asic),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        hass.config_entries.async_update_entry(
+            mock_config_entry, options={CONF_COMPACT_ASIC_TEMPS: True}
+        )
+        await hass.async_block_till_done()
+
+    ent_reg = er.async_get(hass)
+    entries = er.async_entries_for_config_entry(ent_reg, mock_config_entry.entry_id)
+    # The per-ASIC sensors created before are removed, not left orphaned
+    assert not any("_asic_temp_" in e.unique_id for e in entries)
+
+    hottest = next(e for e in entries if e.unique_id.endswith("_asic_temperature_max"))
+    state = hass.states.get(hottest.entity_id)
+    assert state.state == "60"
+    assert state.attributes["asic_temperatures"] == [58.5, 60, 59]
+    # Not on the sensor reporting which chip is the hottest
+    index = next(e for e in entries if e.unique_id.endswith("_hottest_asic"))
+    assert "asic_temperatures" not in hass.states.get(index.entity_id).attributes
+
 
 async def test_per_asic_temp_sensors_absent_when_zero(
     hass: HomeAssistant,
@@ -336,7 +392,7 @@ async def test_per_asic_temp_sensors_absent_when_zero(
     }
     mock_session = create_mock_session(status=200, json_data=single)
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -347,16 +403,99 @@ async def test_per_asic_temp_sensors_absent_when_zero(
     assert not any("_asic_temp_" in e.unique_id for e in entries)
 
 
+async def test_hardware_sensors_added_at_runtime(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Hardware reported after setup gets its sensors without a reload."""
+    mock_session = create_mock_session(
+        status=200, json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+    )
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=mock_session,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data.coordinator
+    ent_reg = er.async_get(hass)
+
+    def unique_ids() -> set[str]:
+        return {
+            e.unique_id
+            for e in er.async_entries_for_config_entry(
+                ent_reg, mock_config_entry.entry_id
+            )
+        }
+
+    before = unique_ids()
+    assert not any("fan_rpm_2" in u or "asic_temp" in u for u in before)
+
+    coordinator.async_set_updated_data(
+        coordinator.data.merge(
+            {"fanCount": 2, "fanrpm2": 2474, "asicTemps": [58.5, 60]}
+        )
+    )
+    await hass.async_block_till_done()
+    added = unique_ids() - before
+    assert {u.removeprefix(f"{coordinator.unique_id_base}_") for u in added} == {
+        "fan_speed_2",
+        "fan_rpm_2",
+        "asic_temp_0",
+        "asic_temp_1",
+        "asic_temperature_max",
+        "asic_temperature_mean",
+        "asic_temperature_spread",
+        "hottest_asic",
+    }
+
+    # Only the new chip is added when the array grows
+    coordinator.async_set_updated_data(
+        coordinator.data.merge({"asicTemps": [58.5, 60, 59]})
+    )
+    await hass.async_block_till_done()
+    assert unique_ids() - before - added == {
+        f"{coordinator.unique_id_base}_asic_temp_2"
+    }
+
+
 def _make_sensor(key: str, data: dict | None) -> NerdQAxeSensor:
     """Build a sensor backed by a mock coordinator."""
     coordinator = MagicMock()
     coordinator.host = MOCK_HOST
-    coordinator.data = data
+    coordinator.data = MinerSnapshot.from_payload(data) if data is not None else None
     coordinator.get_device_info.return_value = {"identifiers": {(DOMAIN, MOCK_HOST)}}
     description = next(d for d in SENSORS if d.key == key)
     return NerdQAxeSensor(coordinator, description)
 
 
+_DUAL_POOL_DATA = {
+    **MOCK_SYSTEM_INFO,
+    **MOCK_ASIC_DATA,
+    "stratum": {"activePoolMode": 1, "pools": [{"active": True}, {"active": True}]},
+}
+
+
+@pytest.mark.parametrize(
+    "data", [{**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}, _DUAL_POOL_DATA]
+)
+@pytest.mark.parametrize(
+    "description", [*SENSORS, *ASIC_TEMP_SENSORS], ids=lambda d: d.key
+)
+def test_sensor_reads_only_its_source_keys(description, data: dict) -> None:
+    """Each sensor's value and attributes depend on its declared keys only."""
+    payload = {k: v for k, v in data.items() if k in description.source_keys}
+
+    # Keys no snapshot field is parsed from would never be notified
+    assert description.source_keys <= SNAPSHOT_KEYS
+    full = MinerSnapshot.from_payload(data)
+    projected = MinerSnapshot.from_payload(payload)
+
+    assert description.value_fn(projected) == description.value_fn(full)
+    if description.attributes_fn is not None:
+        assert description.attributes_fn(projected) == description.attributes_fn(full)
+
+
 def test_extra_attributes_without_data() -> None:
     """A sensor with attributes reports none while the miner is unreachable."""
     assert _make_sensor("pool_url", None).extra_state_attributes is None
@@ -364,10 +503,31 @@ def test_extra_attributes_without_data() -> None:
 
 def test_extra_attributes_absent_on_plain_sensors() -> None:
     """Sensors that declare no attributes_fn expose no extra attributes."""
-    sensor = _make_sensor("hashrate", {**MOCK_ASIC_DATA})
+    sensor = _make_sensor("voltage", {**MOCK_ASIC_DATA})
     assert sensor.extra_state_attributes is None
 
 
+def test_statistics_attributes() -> None:
+    """Sensors tracking a metric expose its rolling statistics."""
+    sensor = _make_sensor("temperature", {**MOCK_ASIC_DATA})
+    sensor.coordinator.telemetry = TelemetryBuffer(window=3600, spacing=15)
+    now = monotonic()
+    for offset, temp in enumerate((50.0, 54.0, 52.0)):
+        sensor.coordinator.telemetry.append(
+            now - 60 + offset * 30, MinerSnapshot.from_payload({"temp": temp})
+        )
+
+    assert sensor.extra_state_attributes == {
+        "min": 50.0,
+        "max": 54.0,
+        "mean": 52.0,
+        "stddev": 2.0,
+        "samples": 3,
+    }
+    # The statistics are kept out of the recorder
+    assert STATISTICS_ATTRIBUTES <= sensor._unrecorded_attributes
+
+
 async def test_pool_sensors_report_active_pool(
     hass: HomeAssistant,
     mock_config_entry: MockConfigEntry,
@@ -378,7 +538,7 @@ async def test_pool_sensors_report_active_pool(
         json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
     )
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -408,7 +568,7 @@ async def test_pool_user_sensor_disabled_by_default(
         json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
     )
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -441,7 +601,7 @@ async def test_pool_sensors_follow_failover(
     }
     mock_session = create_mock_session(status=200, json_data=failed_over)
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -474,7 +634,7 @@ async def test_pool_url_exposes_second_pool_in_dual_mode(
     }
     mock_session = create_mock_session(status=200, json_data=dual)
     with patch(
-        "custom_components.nerdqaxe.coordinator.async_get_clientsession",
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
         return_value=mock_session,
     ):
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
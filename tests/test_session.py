@@ -0,0 +1,110 @@
+"""Test the NerdQAxe+ miner connection pool."""
+
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from homeassistant.const import CONF_HOST, EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nerdqaxe.const import DATA_MINER_POOL, DOMAIN
+from custom_components.nerdqaxe.session import (
+    CONNECTIONS_PER_HOST,
+    NerdQAxeMinerPool,
+    async_get_miner_pool,
+    async_get_miner_session,
+)
+
+from .conftest import (
+    MOCK_ASIC_DATA,
+    MOCK_HOST,
+    MOCK_SYSTEM_INFO,
+    create_mock_session,
+)
+
+
+async def test_pool_reuses_keep_alive_connections(
+    hass: HomeAssistant, socket_enabled: None
+) -> None:
+    """Successive polls of a miner share one kept-alive connection."""
+
+    async def _system_info(request: web.Request) -> web.Response:
+        return web.json_response(MOCK_SYSTEM_INFO)
+
+    app = web.Application()
+    app.router.add_get("/api/system/info", _system_info)
+    server = TestServer(app)
+    await server.start_server()
+
+    pool = NerdQAxeMinerPool()
+    try:
+        for _ in range(3):
+            async with pool.session.get(server.make_url("/api/system/info")) as resp:
+                assert (await resp.json())["hostname"] == MOCK_SYSTEM_INFO["hostname"]
+    finally:
+        await pool.async_close()
+        await server.close()
+
+    assert pool.as_dict() == {
+        "connections_reused": 2,
+        "connections_opened": 1,
+        "reuse_ratio": 0.667,
+    }
+    assert pool.session.closed
+
+
+async def test_pool_limits_connections_per_miner(hass: HomeAssistant) -> None:
+    """The connector never opens more sockets than the miner can serve."""
+    pool = NerdQAxeMinerPool()
+    try:
+        assert pool.session.connector is not None
+        assert pool.session.connector.limit_per_host == CONNECTIONS_PER_HOST
+        assert pool.as_dict()["reuse_ratio"] is None
+    finally:
+        await pool.async_close()
+
+
+async def test_pool_is_shared_and_closed_on_stop(hass: HomeAssistant) -> None:
+    """Every caller gets the same session until Home Assistant stops."""
+    pool = async_get_miner_pool(hass)
+
+    assert async_get_miner_session(hass) is pool.session
+    assert hass.data[DATA_MINER_POOL] is pool
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+
+    assert DATA_MINER_POOL not in hass.data
+    assert pool.session.closed
+
+
+async def test_pool_closed_with_last_entry(hass: HomeAssistant) -> None:
+    """Unloading the last miner releases the pooled connections."""
+    pool = async_get_miner_pool(hass)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="NerdQAxe+ Miner",
+        data={CONF_HOST: MOCK_HOST},
+        unique_id="AA:BB:CC:DD:EE:FF",
+    )
+    entry.add_to_hass(hass)
+    mock_session = create_mock_session(
+        status=200,
+        json_data={**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA},
+    )
+
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=mock_session,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert not pool.session.closed
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert DATA_MINER_POOL not in hass.data
+    assert pool.session.closed
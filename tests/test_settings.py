@@ -0,0 +1,166 @@
+"""Test the NerdQAxe+ settings write queue."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.nerdqaxe import NerdQAxeDataUpdateCoordinator
+from custom_components.nerdqaxe.exceptions import NerdQAxeApiError
+from custom_components.nerdqaxe.settings import SETTINGS_WRITE_DELAY
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+
+from .conftest import (
+    MOCK_ASIC_DATA,
+    MOCK_HOST,
+    MOCK_SYSTEM_INFO,
+    MockAiohttpContextManager,
+    MockAiohttpResponse,
+    create_mock_session,
+)
+
+MOCK_PAYLOAD = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant) -> NerdQAxeDataUpdateCoordinator:
+    """Create a coordinator with data, whose settings writes succeed."""
+    with patch(
+        "custom_components.nerdqaxe.coordinator.async_get_miner_session",
+        return_value=create_mock_session(json_data=MOCK_PAYLOAD),
+    ):
+        coordinator = NerdQAxeDataUpdateCoordinator(
+            hass, host=MOCK_HOST, scan_interval=30
+        )
+    coordinator.session.patch = MagicMock(
+        return_value=MockAiohttpContextManager(MockAiohttpResponse(status=200))
+    )
+    coordinator.async_request_refresh = AsyncMock()
+    coordinator.data = MinerSnapshot.from_payload(MOCK_PAYLOAD)
+    return coordinator
+
+
+async def _async_window_over(hass: HomeAssistant) -> None:
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SETTINGS_WRITE_DELAY)
+    )
+    await hass.async_block_till_done()
+
+
+async def _async_poll(
+    coordinator: NerdQAxeDataUpdateCoordinator, **changes: int
+) -> None:
+    get = create_mock_session(json_data={**MOCK_PAYLOAD, **changes}).get
+    coordinator.session.get = get
+    await coordinator.async_refresh()
+
+
+async def test_changes_within_window_share_one_patch(
+    hass: HomeAssistant, coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """Changes queued together are merged into one PATCH, shown at once."""
+    queue = coordinator.settings
+    first = queue.async_queue({"frequency": 500, "coreVoltage": 1150})
+    second = queue.async_queue({"frequency": 525})
+
+    assert first is second
+    assert queue.pending == {"frequency": 525, "coreVoltage": 1150}
+    coordinator.session.patch.assert_not_called()
+
+    await _async_window_over(hass)
+
+    coordinator.session.patch.assert_called_once_with(
+        f"http://{MOCK_HOST}/api/system",
+        json={"frequency": 525, "coreVoltage": 1150},
+    )
+    # Applied optimistically, without a forced poll
+    coordinator.async_request_refresh.assert_not_awaited()
+    coordinator.session.get.assert_not_called()
+    assert (coordinator.data.frequency, coordinator.data.core_voltage) == (525, 1150)
+    assert queue.unconfirmed == {"frequency": 525, "coreVoltage": 1150}
+    assert not first.done()
+
+    # Confirmed by the next regular poll
+    await _async_poll(coordinator, frequency=525, coreVoltage=1150)
+    assert first.done()
+    assert first.exception() is None
+    assert queue.unconfirmed == {}
+
+
+async def test_rejected_write_rolls_back(
+    hass: HomeAssistant,
+    coordinator: NerdQAxeDataUpdateCoordinator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """A value the miner does not report back fails the batch."""
+    batch = coordinator.settings.async_queue({"frequency": 1000})
+    await _async_window_over(hass)
+    assert coordinator.data.frequency == 1000
+
+    await _async_poll(coordinator)
+
+    assert coordinator.data.frequency == 500
+    with pytest.raises(NerdQAxeApiError, match=r"frequency=1000 \(reports 500"):
+        await batch
+    assert "did not accept frequency=1000" in caplog.text
+
+
+async def test_poll_in_flight_keeps_optimistic_value(
+    hass: HomeAssistant, coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """A poll started before the write does not confirm or undo it."""
+    batch = coordinator.settings.async_queue({"frequency": 525})
+    await _async_window_over(hass)
+
+    snapshot = coordinator.settings.async_verify(coordinator.data.merge({}), 0.0)
+
+    assert snapshot.frequency == 525
+    assert not batch.done()
+
+
+async def test_current_values_are_not_written(
+    hass: HomeAssistant, coordinator: NerdQAxeDataUpdateCoordinator
+) -> None:
+    """Changes matching the current data need neither a write nor a poll."""
+    batch = coordinator.settings.async_queue({"frequency": 500})
+
+    await _async_window_over(hass)
+
+    coordinator.session.patch.assert_not_called()
+    assert batch.done()
+
+
+async def test_failed_batch_is_reported(
+    hass: HomeAssistant,
+    coordinator: NerdQAxeDataUpdateCoordinator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """A failed write fails the batch future and is logged, without refresh."""
+    coordinator.session.patch = MagicMock(
+        side_effect=aiohttp.ClientError("Connection failed")
+    )
+    batch = coordinator.settings.async_queue({"frequency": 525})
+
+    await _async_window_over(hass)
+
+    with pytest.raises(NerdQAxeApiError, match="frequency"):
+        await batch
+    assert "Failed to write frequency" in caplog.text
+    assert coordinator.data.frequency == 500
+
+
+async def test_pending_changes_sent_on_shutdown(
+    coordinator: NerdQAxeDataUpdateCoordinator,
+) -> None:
+    """Unloading the entry does not drop the changes still queued."""
+    batch = coordinator.settings.async_queue({"coreVoltage": 1150})
+
+    await coordinator.async_shutdown()
+
+    coordinator.session.patch.assert_called_once()
+    assert coordinator.settings.pending == {}
+    assert batch.cancelled()
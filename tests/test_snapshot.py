@@ -0,0 +1,198 @@
+"""Test the NerdQAxe+ Miner payload snapshot."""
+
+from dataclasses import FrozenInstanceError, fields
+from typing import Any
+
+import pytest
+
+from custom_components.nerdqaxe.const import (
+    POOL_INDEX_FALLBACK,
+    POOL_INDEX_PRIMARY,
+    POOL_MODE_DUAL,
+)
+from custom_components.nerdqaxe.snapshot import (
+    SNAPSHOT_KEYS,
+    AsicTemperatures,
+    MinerSnapshot,
+    StratumView,
+)
+
+from .conftest import MOCK_ASIC_DATA, MOCK_SYSTEM_INFO
+
+PAYLOAD = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+
+
+def vars_of(snapshot: MinerSnapshot) -> dict[str, Any]:
+    """Return the init fields of a snapshot."""
+    return {
+        spec.name: getattr(snapshot, spec.name)
+        for spec in fields(snapshot)
+        if spec.init
+    }
+
+
+def test_from_payload_parses_fields() -> None:
+    """Payload keys are parsed into typed attributes."""
+    snapshot = MinerSnapshot.from_payload(PAYLOAD)
+
+    assert snapshot.hashrate == PAYLOAD["hashRate"]
+    assert snapshot.hostname == PAYLOAD["hostname"]
+    assert snapshot.stratum.mode == PAYLOAD["stratum"]["activePoolMode"]
+    assert len(snapshot.stratum.pools) == len(PAYLOAD["stratum"]["pools"])
+    assert snapshot.schema_errors == frozenset()
+
+
+def test_snapshot_is_immutable_and_slotted() -> None:
+    """Snapshots cannot be mutated and carry no per-instance dict."""
+    snapshot = MinerSnapshot.from_payload(PAYLOAD)
+
+    with pytest.raises(FrozenInstanceError):
+        snapshot.hashrate = 1  # type: ignore[misc]
+    assert not hasattr(snapshot, "__dict__")
+
+
+@pytest.mark.parametrize(
+    ("payload", "field", "expected"),
+    [
+        ({"hashRate": "fast"}, "hashrate", None),
+        ({"hashRate": True}, "hashrate", None),
+        ({"asicTemps": [50, "hot"]}, "asic_temps", ()),
+        ({"stratum": []}, "stratum", StratumView()),
+    ],
+)
+def test_unexpected_types_are_recorded(
+    payload: dict[str, Any], field: str, expected: Any
+) -> None:
+    """A field of the wrong type is left unset and its key recorded."""
+    snapshot = MinerSnapshot.from_payload(payload)
+
+    assert getattr(snapshot, field) == expected
+    assert snapshot.schema_errors == frozenset(payload)
+
+
+def test_integral_floats_parse_as_counts() -> None:
+    """Counts reported as integral floats are accepted."""
+    snapshot = MinerSnapshot.from_payload({"sharesAccepted": 12.0})
+
+    assert snapshot.shares_accepted == 12
+    assert snapshot.schema_errors == frozenset()
+
+
+def test_blank_strings_are_unset() -> None:
+    """The firmware reports unconfigured text fields as empty strings."""
+    snapshot = MinerSnapshot.from_payload({"stratumURL": "  ", "hostname": ""})
+
+    assert snapshot.stratum_url is None
+    assert snapshot.hostname is None
+    assert snapshot.schema_errors == frozenset()
+
+
+def test_merge_replaces_present_fields_only() -> None:
+    """A partial update keeps every field it does not carry."""
+    snapshot = MinerSnapshot.from_payload(PAYLOAD)
+
+    merged = snapshot.merge({"hashRate": 1, "temp": None})
+
+    assert merged.hashrate == 1
+    assert merged.temp is None
+    assert merged.hostname == snapshot.hostname
+    assert merged.changed_keys(snapshot) == {"hashRate", "temp"}
+
+
+def test_merge_resolves_derived_values() -> None:
+    """A merged snapshot matches one built through the dataclass init."""
+    snapshot = MinerSnapshot.from_payload(PAYLOAD)
+
+    merged = snapshot.merge({"asicTemps": [50, 70], "fanCount": 1})
+
+    assert merged == MinerSnapshot(
+        **{**vars_of(snapshot), "asic_temps": (50, 70), "fan_count": 1}
+    )
+    assert merged.asic == AsicTemperatures(maximum=70, mean=60, spread=20, hottest=2)
+    assert not merged.has_second_fan
+    assert merged.pool == snapshot.pool
+
+
+def test_merge_clears_schema_errors_of_reparsed_keys() -> None:
+    """A key parsed again with a valid value no longer counts as an error."""
+    snapshot = MinerSnapshot.from_payload({"hashRate": "fast", "temp": "hot"})
+
+    merged = snapshot.merge({"hashRate": 10})
+
+    assert merged.hashrate == 10
+    assert merged.schema_errors == frozenset({"temp"})
+
+
+def test_pool_state_resolved_at_parse_time() -> None:
+    """The pool state spanning several fields is resolved with the snapshot."""
+    snapshot = MinerSnapshot.from_payload(
+        {
+            "stratum": {
+                "activePoolMode": 0,
+                "usingFallback": True,
+                "pools": [
+                    {"connected": False, "active": False},
+                    {"connected": True, "active": True},
+                ],
+            }
+        }
+    )
+
+    assert snapshot.pool.connected is True
+    assert snapshot.pool.using_fallback is True
+    assert snapshot.pool.index == POOL_INDEX_FALLBACK
+
+    dual = snapshot.merge({"stratum": {"activePoolMode": POOL_MODE_DUAL}})
+    assert dual.pool.index == POOL_INDEX_PRIMARY
+    assert dual.pool.connected is False
+
+
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        ({"fanCount": 2}, True),
+        # Single-fan boards still send the second fan's readings as 0
+        ({"fanCount": 1, "fanrpm2": 0, "fanspeed2": 0}, False),
+        ({"fanCount": 1, "fanrpm2": 3000}, False),
+        # Older firmware without fanCount: a non-zero reading reveals a fan
+        ({"fanrpm2": 3000}, True),
+        ({"fanrpm2": 0}, False),
+        ({}, False),
+    ],
+)
+def test_has_second_fan(payload: dict[str, Any], expected: bool) -> None:
+    """``fanCount`` is authoritative, second-fan readings the fallback."""
+    assert MinerSnapshot.from_payload(payload).has_second_fan is expected
+
+
+@pytest.mark.parametrize(
+    ("temps", "expected"),
+    [
+        (
+            [58.5, 60, 59],
+            AsicTemperatures(maximum=60, mean=59.17, spread=1.5, hottest=2),
+        ),
+        # Unsensed chips report 0 and are left out of the aggregates
+        (
+            [0, 61.5, 0, 57],
+            AsicTemperatures(maximum=61.5, mean=59.25, spread=4.5, hottest=2),
+        ),
+        ([0, 0], None),
+        ([], None),
+    ],
+)
+def test_asic_temperatures(
+    temps: list[float], expected: AsicTemperatures | None
+) -> None:
+    """Per-ASIC temperatures are aggregated once, at parse time."""
+    assert MinerSnapshot.from_payload({"asicTemps": temps}).asic == expected
+
+
+def test_as_payload_round_trips() -> None:
+    """The payload view keeps parsed keys only and parses back identically."""
+    snapshot = MinerSnapshot.from_payload(PAYLOAD)
+
+    payload = snapshot.as_payload()
+
+    assert payload.keys() <= SNAPSHOT_KEYS
+    assert MinerSnapshot.from_payload(payload) == snapshot
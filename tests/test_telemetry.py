@@ -0,0 +1,122 @@
+"""Test the NerdQAxe+ rolling telemetry buffer."""
+
+import random
+import statistics
+
+import pytest
+
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+from custom_components.nerdqaxe.telemetry import TELEMETRY_FIELDS, TelemetryBuffer
+
+
+def _sample(**fields: float | None) -> MinerSnapshot:
+    """Return a snapshot carrying the given telemetry fields."""
+    return MinerSnapshot(**fields)
+
+
+def test_fixed_capacity() -> None:
+    """The rings are sized once from the window and the sample spacing."""
+    buffer = TelemetryBuffer(window=3600, spacing=15)
+
+    assert buffer.capacity == 241
+    assert buffer.as_dict()["memory_bytes"] == 8 * 241 * (1 + len(TELEMETRY_FIELDS))
+
+
+def test_matches_reference_statistics() -> None:
+    """Incremental statistics match a full recomputation over the window."""
+    rng = random.Random(42)  # noqa: S311 - reproducible test data
+    buffer = TelemetryBuffer(window=300, spacing=10)
+    window: list[tuple[float, float]] = []
+
+    now = 0.0
+    for _ in range(500):
+        now += rng.uniform(10, 40)
+        temp = rng.uniform(40, 80)
+        buffer.append(now, _sample(temp=temp))
+        window = [(t, v) for t, v in [*window, (now, temp)] if t >= now - 300]
+
+        values = [v for _, v in window]
+        stats = buffer.stats("temp", now)
+        assert stats is not None
+        assert stats["samples"] == len(values)
+        assert stats["min"] == min(values)
+        assert stats["max"] == max(values)
+        assert stats["mean"] == pytest.approx(statistics.fmean(values), abs=0.01)
+        if len(values) > 1:
+            assert stats["stddev"] == pytest.approx(statistics.stdev(values), abs=0.01)
+
+
+def test_ring_overflow_evicts_oldest() -> None:
+    """Once every slot is used, the oldest sample makes room for the next."""
+    buffer = TelemetryBuffer(window=30, spacing=10)
+    for second, power in enumerate((10.0, 20.0, 30.0, 40.0, 50.0)):
+        buffer.append(second * 10, _sample(power=power))
+
+    assert len(buffer) == buffer.capacity == 4
+    assert buffer.stats("power", 40) == {
+        "min": 20.0,
+        "max": 50.0,
+        "mean": 35.0,
+        "stddev": pytest.approx(12.91, abs=0.01),
+        "samples": 4,
+    }
+
+
+def test_samples_closer_than_spacing_are_skipped() -> None:
+    """Bursts of updates are thinned to one sample per spacing."""
+    buffer = TelemetryBuffer(window=600, spacing=15)
+
+    assert buffer.append(0, _sample(hashrate=1000.0))
+    assert not buffer.append(5, _sample(hashrate=2000.0))
+    assert buffer.append(15, _sample(hashrate=1200.0))
+    assert buffer.stats("hashrate", 15)["max"] == 1200.0
+
+
+def test_missing_readings_are_ignored() -> None:
+    """A field missing from a snapshot does not count towards its stats."""
+    buffer = TelemetryBuffer(window=600, spacing=15)
+    buffer.append(0, _sample(temp=50.0, vr_temp=None))
+    buffer.append(15, _sample(temp=52.0, vr_temp=60.0))
+
+    assert buffer.stats("temp", 15)["samples"] == 2
+    assert buffer.stats("vr_temp", 15) == {
+        "min": 60.0,
+        "max": 60.0,
+        "mean": 60.0,
+        "stddev": None,
+        "samples": 1,
+    }
+    assert buffer.stats("fan_rpm", 15) is None
+
+
+def test_stale_window_expires() -> None:
+    """Samples older than the window are dropped when statistics are read."""
+    buffer = TelemetryBuffer(window=600, spacing=15)
+    buffer.append(0, _sample(temp=50.0))
+
+    assert buffer.stats("temp", 600) is not None
+    assert buffer.stats("temp", 601) is None
+    assert len(buffer) == 0
+
+
+def test_resized_keeps_samples_that_fit() -> None:
+    """Resizing replays the samples still inside the new window and spacing."""
+    buffer = TelemetryBuffer(window=600, spacing=15)
+    for second, temp in ((0, 40.0), (15, 50.0), (30, 60.0), (45, 70.0)):
+        buffer.append(second, _sample(temp=temp))
+
+    # Twice the spacing thins every other sample
+    thinned = buffer.resized(window=600, spacing=30)
+    assert thinned.capacity == 21
+    assert thinned.stats("temp", 45)["samples"] == 2
+    assert thinned.stats("temp", 45)["mean"] == 50.0
+
+    # A smaller ring keeps the newest samples
+    shrunk = buffer.resized(window=15, spacing=15)
+    assert shrunk.stats("temp", 45) == {
+        "min": 60.0,
+        "max": 70.0,
+        "mean": 65.0,
+        "stddev": 7.07,
+        "samples": 2,
+    }
@@ -1,17 +1,24 @@
 """Test the NerdQAxe+ Miner firmware update entity."""
 
-from unittest.mock import MagicMock, patch
+from collections.abc import Callable
+from unittest.mock import MagicMock
 
 import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 from multidict import CIMultiDict
 import pytest
 from yarl import URL
 
 from custom_components.nerdqaxe.exceptions import NerdQAxeApiError, NerdQAxeError
-from custom_components.nerdqaxe.update import (
-    NerdQAxeUpdateEntity,
+from custom_components.nerdqaxe.releases import (
+    FirmwareAsset,
+    FirmwareRelease,
+    async_get_release_index,
     normalize_device_model,
 )
+from custom_components.nerdqaxe.snapshot import MinerSnapshot
+from custom_components.nerdqaxe.update import NerdQAxeUpdateEntity
 
 from .conftest import MOCK_ASIC_DATA, MOCK_HOST, MOCK_SYSTEM_INFO
 
@@ -19,6 +26,9 @@ _DOWNLOAD_URL = (
     "https://github.com/shufps/ESP-Miner-NerdQAxePlus/releases/download/"
     "v1.0.40/esp-miner-factory-NerdQAxe+-v1.0.40.bin"
 )
+_FACTORY_IMAGE = FirmwareAsset(
+    name="esp-miner-factory-NerdQAxe+-v1.0.40.bin", url=_DOWNLOAD_URL
+)
 
 
 def _client_response_error(status: int) -> aiohttp.ClientResponseError:
@@ -104,8 +114,11 @@ def _make_update_entity(
     coordinator.host = MOCK_HOST
     coordinator.base_url = f"http://{MOCK_HOST}"
     coordinator.session = session
-    coordinator.data = {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+    coordinator.data = MinerSnapshot.from_payload(
+        {**MOCK_SYSTEM_INFO, **MOCK_ASIC_DATA}
+    )
     entity = NerdQAxeUpdateEntity(coordinator)
+    entity._release = FirmwareRelease(tag_name="v1.0.40")
     entity._download_url = download_url
     return entity
 
@@ -114,6 +127,8 @@ async def test_install_success_async_202() -> None:
     """A 202 'started' response from the async OTA endpoint succeeds."""
     entity = _make_update_entity(_session_with_post(_PostResponse(202)))
     await entity.async_install(None, False)
+    # The coordinator follows the update until the miner runs the release
+    entity.coordinator.async_track_ota.assert_called_once_with("1.0.40")
 
 
 async def test_install_tolerates_reboot_disconnect() -> None:
@@ -122,6 +137,7 @@ async def test_install_tolerates_reboot_disconnect() -> None:
     entity = _make_update_entity(session)
     # Must not raise: the miner reboots and tears down the connection.
     await entity.async_install(None, False)
+    entity.coordinator.async_track_ota.assert_called_once_with("1.0.40")
 
 
 async def test_install_tolerates_timeout() -> None:
@@ -137,6 +153,7 @@ async def test_install_raises_when_busy_409() -> None:
     entity = _make_update_entity(session)
     with pytest.raises(NerdQAxeError):
         await entity.async_install(None, False)
+    entity.coordinator.async_track_ota.assert_not_called()
 
 
 async def test_install_raises_on_http_error() -> None:
@@ -156,57 +173,53 @@ async def test_install_raises_without_download_url() -> None:
         await entity.async_install(None, False)
 
 
-async def test_check_latest_release_finds_firmware() -> None:
-    """The GitHub check resolves the latest version and the factory image."""
-    releases = [
-        {
-            "tag_name": "v1.0.40",
-            "prerelease": False,
-            "body": "Release notes",
-            "assets": [
-                {
-                    "name": "esp-miner-factory-NerdQAxe+-v1.0.40.bin",
-                    "browser_download_url": (
-                        "https://github.com/shufps/ESP-Miner-NerdQAxePlus/"
-                        "releases/download/v1.0.40/"
-                        "esp-miner-factory-NerdQAxe+-v1.0.40.bin"
-                    ),
-                }
-            ],
-        }
-    ]
-    entity = _make_update_entity(_session_with_get(releases), download_url=None)
-    entity.coordinator.data = {"deviceModel": "NerdQAxe+", "version": "1.0.39"}
-
-    await entity._async_check_latest_release()
+async def test_resolve_release_finds_firmware(hass: HomeAssistant) -> None:
+    """The factory image of the device model is picked from the release."""
+    async_get_release_index(hass).latest = FirmwareRelease(
+        tag_name="v1.0.40",
+        body="Release notes",
+        factory_images={
+            "NerdQAxe+": FirmwareAsset(name="factory.bin", url=_DOWNLOAD_URL)
+        },
+    )
+    entity = _make_update_entity(MagicMock(), download_url=None)
+    entity.hass = hass
+    entity.coordinator.data = MinerSnapshot.from_payload(
+        {"deviceModel": "NerdQAxe+", "version": "1.0.39"}
+    )
+
+    entity._async_resolve_release()
 
     assert entity.latest_version == "1.0.40"
-    assert entity._download_url is not None
+    assert entity._download_url == _DOWNLOAD_URL
     assert await entity.async_release_notes() == "Release notes"
 
 
-async def test_check_latest_release_no_matching_firmware() -> None:
-    """A release without a matching factory image leaves the URL unset."""
-    releases = [
-        {
-            "tag_name": "v1.0.40",
-            "prerelease": False,
-            "body": "Notes",
-            "assets": [
-                {
-                    "name": "esp-miner-factory-NerdOtherModel-v1.0.40.bin",
-                    "browser_download_url": "https://github.com/other.bin",
-                }
-            ],
-        }
-    ]
-    entity = _make_update_entity(_session_with_get(releases), download_url=None)
-    entity.coordinator.data = {"deviceModel": "NerdQAxe+", "version": "1.0.39"}
-
-    await entity._async_check_latest_release()
+async def test_resolve_release_no_matching_firmware(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """A model without a factory image is reported once per release."""
+    index = async_get_release_index(hass)
+    index.latest = FirmwareRelease(
+        tag_name="v1.0.40",
+        factory_images={
+            "NerdOtherModel": FirmwareAsset(
+                name="o.bin", url="https://github.com/o.bin"
+            )
+        },
+    )
+    entity = _make_update_entity(MagicMock(), download_url=None)
+    entity.hass = hass
+    entity.coordinator.data = MinerSnapshot.from_payload(
+        {"deviceModel": "NerdQAxe+", "version": "1.0.39"}
+    )
+
+    entity._async_resolve_release()
+    entity._async_resolve_release()
 
     assert entity.latest_version == "1.0.40"
     assert entity._download_url is None
+    assert caplog.text.count("No factory firmware for model") == 1
 
 
 @pytest.mark.parametrize(
@@ -223,26 +236,40 @@ def test_normalize_device_model(raw: str, expected: str) -> None:
     assert normalize_device_model(raw) == expected
 
 
-async def test_added_to_hass_schedules_background_release_check() -> None:
-    """The initial release check runs in background, not blocking startup."""
-    entity = _make_update_entity(_session_with_get([]))
-    entity.hass = MagicMock()
-    entity.entity_id = "update.nerdqaxe_update"
+async def test_update_entities_share_release_index(hass: HomeAssistant) -> None:
+    """Every miner reads the release index, fetched once for all of them."""
+    index = async_get_release_index(hass)
+    index.latest = FirmwareRelease(
+        tag_name="v1.0.40",
+        factory_images={
+            "NerdQAxe+": FirmwareAsset(name="factory.bin", url=_DOWNLOAD_URL)
+        },
+    )
+    index.checked = dt_util.utcnow()
+    entities = []
+    remove_callbacks: list[Callable[[], None]] = []
+    for _ in range(3):
+        entity = _make_update_entity(MagicMock(), download_url=None)
+        entity.coordinator.data = MinerSnapshot.from_payload(
+            {"deviceModel": "NerdQAxe+", "version": "1.0.39"}
+        )
+        entity.hass = hass
+        entity.entity_id = "update.nerdqaxe_update"
+        entity.async_write_ha_state = MagicMock()
+        entity.async_on_remove = remove_callbacks.append
+        await entity.async_added_to_hass()
+        entities.append(entity)
 
-    # super().async_added_to_hass() registers a coordinator listener on remove.
-    remove_callbacks: list[object] = []
-    entity.async_on_remove = remove_callbacks.append
+    # The stored release is fresh: no request at startup
+    assert index._refresh_task is None
+    assert all(entity._download_url == _DOWNLOAD_URL for entity in entities)
 
-    with patch(
-        "custom_components.nerdqaxe.update.NerdQAxeUpdateEntity."
-        "_async_check_latest_release",
-        new=MagicMock(return_value=MagicMock()),
-    ):
-        await entity.async_added_to_hass()
+    index.latest = FirmwareRelease(tag_name="v1.0.41")
+    for listener in list(index._listeners):
+        listener()
+    assert all(entity.latest_version == "1.0.41" for entity in entities)
+    assert all(entity._download_url is None for entity in entities)
 
-    # The GitHub check must be scheduled as a background task, not awaited.
-    entity.hass.async_create_background_task.assert_called_once()
-    name = entity.hass.async_create_background_task.call_args.kwargs["name"]
-    assert "initial release check" in name
-    # Periodic 6h timer + coordinator listener are both registered.
-    assert len(remove_callbacks) == 2
+    for remove in remove_callbacks:
+        remove()
+    assert index._unsub_refresh is None